@@ -7,50 +7,266 @@ Bu servis LoL Client (LCU API) ile konuşur ve masaüstü uygulamasına (PyQt) H
 
 from __future__ import annotations
 
+import asyncio
 import json
 import os
 import re
 import threading
 import time
+from collections.abc import Mapping
+from contextlib import asynccontextmanager
+from dataclasses import asdict
 from typing import Any
 
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel, Field
 
 from app_meta import __version__
 
-from runepilot.domain.champions import champion_slug_from_alias
+from runepilot.application.dataset_reloader import DatasetReloader
+from runepilot.application.engine import AutomationEngine
+from runepilot.application.scheduler import (
+    ALL_URIS,
+    CHAMP_SELECT_SESSION_URI,
+    GAMEFLOW_PHASE_URI,
+    READY_CHECK_URI,
+    WAKEUP_EVENT,
+    WAKEUP_TIMER,
+    PhaseScheduler,
+)
+from runepilot.domain.automation_plan import AutomationPlan, AutomationRuntime, compile_plan
+from runepilot.domain.champions import (
+    champion_slug_from_alias,  # noqa: F401  re-exported: tests call api.champion_slug_from_alias
+    normalize_champion_id,
+)
+from runepilot.domain.queue_state import (
+    ACTION_CREATE_LOBBY,
+    ACTION_READ_LOBBY,
+    ACTION_RECREATE_LOBBY,
+    ACTION_SET_ROLES,
+    ACTION_START_SEARCH,
+    MAX_ACTIONS_PER_TICK,
+    QueueStateMachine,
+)
+from runepilot.domain.rune_index import RuneIndex, compile_runes
+from runepilot.domain.rune_index import safe_int_list as _safe_int_list
+from runepilot.domain.selection import Selection
+from runepilot.domain.session_diff import (
+    PART_ACTIONS,
+    PART_BANS,
+    PART_LOCAL_PLAYER,
+    PART_PLAYERS,
+    PART_TIMER_PHASE,
+    SessionDispatcher,
+)
+from runepilot.domain.session_index import index_session
+from runepilot.domain.spells import extract_spell_pair, normalize_spell_id  # noqa: F401  re-exported
+from runepilot.infrastructure.champion_id_cache import (
+    BANNABLE_CHAMPION_IDS_URI,
+    PICKABLE_CHAMPION_IDS_URI,
+    ChampionIdCache,
+)
 from runepilot.infrastructure.champion_repo import ChampionRepo
-from runepilot.infrastructure.lcu_client import lcu_request
+from runepilot.infrastructure.file_watcher import FileWatcher
+from runepilot.infrastructure.lcu_async import AsyncLcuClient
+from runepilot.infrastructure.lcu_client import (
+    get_default_client,
+    lcu_request,
+    single_flight_stats,
+)
+from runepilot.infrastructure.lcu_deadline import champ_select_deadline
+from runepilot.infrastructure.lcu_events import LcuEvent, LcuEventBuffer, LcuEventSubscriber
+from runepilot.infrastructure.lcu_metrics import LCU_METRICS
+from runepilot.infrastructure.lockfile_watcher import get_default_watcher
 from runepilot.infrastructure.resource_paths import resource_path
+from runepilot.infrastructure.rune_pack import RunePack, open_rune_pack, source_digest
+from runepilot.infrastructure.rune_pages import RUNE_PAGES_URI, RunePageInventory, page_matches
 
-app = FastAPI()
 
-STYLE_ID_BY_NAME: dict[str, int] = {
-    "precision": 8000,
-    "domination": 8100,
-    "sorcery": 8200,
-    "inspiration": 8300,
-    "resolve": 8400,
-}
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """
+    Otomasyon motoru servisin event loop'unda çalışır; servis kapanırken iptal edilir.
+
+    Rün verisi arka planda ısıtılır (`rune_index`): açılış beklemez, ilk öneri de
+    (büyük olasılıkla) yükleme maliyetini ödemez. Veri dosyaları servis boyunca izlenir
+    ve değiştiklerinde yeniden yüklenir (`reload_runes`).
+    """
+    AUTOMATION_ENGINE.attach(asyncio.get_running_loop())
+    # İzleyici ısınmadan önce başlar: arada değişen dosya kaçırılmasın.
+    RUNES_WATCHER.start()
+    warm_up = asyncio.create_task(asyncio.to_thread(rune_index), name="runes-warm-up")
+    try:
+        yield
+    finally:
+        await AUTOMATION_ENGINE.shutdown()
+        await asyncio.to_thread(RUNES_WATCHER.stop)
+        await asyncio.gather(warm_up, return_exceptions=True)
+
+
+app = FastAPI(lifespan=lifespan)
 
 champion_repo = ChampionRepo()
 MAX_RUNE_PAGE_NAME_LEN = 16
 LAST_BAN_SKIP: tuple[int, int] | None = None
 
 RUNES_FILE = resource_path("runes.json")
+RUNES_PACK_FILE = resource_path("runes.bin")
+
 
-def load_runes() -> dict[str, Any]:
-    """`runes.json` içeriğini okur; hata durumunda boş dict döndürür."""
+def load_rune_pack() -> RunePack | None:
+    """
+    `runes.bin` paketini açar; yoksa, bozuksa veya `runes.json`'dan eskiyse `None`.
+
+    Paket, yanındaki `runes.json`'un özetini taşır; JSON sonradan değiştiyse (ör. yeniden
+    scrape edildi) eski paket yerine JSON kullanılır.
+    """
+    if not os.path.exists(RUNES_PACK_FILE):
+        return None
+    try:
+        pack = open_rune_pack(RUNES_PACK_FILE)
+    except (OSError, ValueError) as e:
+        print(f"[RUNES] Ignoring rune pack {RUNES_PACK_FILE}: {e}")
+        return None
+    try:
+        stale = os.path.exists(RUNES_FILE) and source_digest(RUNES_FILE) != pack.source_digest
+    except OSError:
+        stale = False
+    if stale:
+        print("[RUNES] runes.bin is older than runes.json; rebuild it with tools/build_rune_pack.py")
+        pack.close()
+        return None
+    return pack
+
+
+def read_runes() -> Mapping[str, Any]:
+    """
+    Öneri verisi: varsa `runes.bin` paketi (şampiyon başına tembel çözülür), yoksa
+    `runes.json` içeriği. JSON okunamazsa hata fırlatır.
+    """
+    pack = load_rune_pack()
+    if pack is not None:
+        return pack
     if not os.path.exists(RUNES_FILE):
         return {}
+    with open(RUNES_FILE, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError("runes.json must contain a JSON object")
+    return data
+
+
+def load_runes() -> Mapping[str, Any]:
+    """`read_runes`; hata durumunda boş dict döndürür."""
     try:
-        with open(RUNES_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return read_runes()
     except Exception:
         return {}
 
-RUNES_DATA = load_runes()
+
+# Import sırasında okunmaz: ilk öneride veya lifespan ısınmasında yüklenir (`runes_data`).
+RUNES_DATA: Mapping[str, Any] | None = None
+# (kaynak veri, indeks): indeks, `RUNES_DATA` hangi nesneyse onun derlemesidir.
+_RUNE_INDEX: tuple[Mapping[str, Any], RuneIndex] | None = None
+_RUNES_LOCK = threading.Lock()
+
+
+def runes_data() -> Mapping[str, Any]:
+    """Öneri verisi; ilk çağrıda yüklenir (thread-safe, yalnızca bir kez)."""
+    global RUNES_DATA
+    data = RUNES_DATA
+    if data is None:
+        with _RUNES_LOCK:
+            data = RUNES_DATA
+            if data is None:
+                started = time.perf_counter()
+                data = RUNES_DATA = load_runes()
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                print(
+                    f"[RUNES] Loaded {len(data)} entries from {_runes_source(data)} "
+                    f"in {elapsed_ms:.1f} ms"
+                )
+    return data
+
+
+def _runes_source(data: Mapping[str, Any]) -> str:
+    return "runes.bin" if isinstance(data, RunePack) else "runes.json"
+
+
+def _compile_index(data: Mapping[str, Any]) -> RuneIndex:
+    return data.index() if isinstance(data, RunePack) else compile_runes(data)
+
+
+def rune_index() -> RuneIndex:
+    """`RUNES_DATA`'nın derlenmiş öneri indeksi (veri nesnesi değişince yeniden derlenir)."""
+    global _RUNE_INDEX
+    compiled = _RUNE_INDEX
+    if compiled is not None and compiled[0] is RUNES_DATA:
+        return compiled[1]
+    data = runes_data()
+    with _RUNES_LOCK:
+        # Kilit altında yeniden okunur: bu arada bir yeniden yükleme yayınlanmış olabilir.
+        data = RUNES_DATA if RUNES_DATA is not None else data
+        compiled = _RUNE_INDEX
+        if compiled is None or compiled[0] is not data:
+            compiled = _RUNE_INDEX = (data, _compile_index(data))
+        return compiled[1]
+
+
+def _build_rune_data() -> tuple[Mapping[str, Any], RuneIndex]:
+    data = read_runes()
+    return data, _compile_index(data)
+
+
+def _publish_rune_data(built: tuple[Mapping[str, Any], RuneIndex]) -> None:
+    global RUNES_DATA, _RUNE_INDEX
+    # Veri ve indeks tek kilit altında birlikte değişir; `rune_index` ya eski ya yeni
+    # çifti görür. Eski paket açıkça kapatılmaz: süren bir öneri eski indeksten okuyor
+    # olabilir. Son okuyucu bıraktığında referans sayımı `mmap`'i serbest bırakır.
+    with _RUNES_LOCK:
+        _RUNE_INDEX = built
+        RUNES_DATA = built[0]
+
+
+RUNES_RELOADER = DatasetReloader(_build_rune_data, _publish_rune_data, name="rune_data")
+
+
+def reload_runes() -> dict[str, Any]:
+    """
+    Rün verisini dosyadan yeniden okur, indeksi yeniden derler ve tek atamayla yayınlar.
+
+    Okuma/derleme yayındaki indekse dokunmaz; başarısız olursa eski veri kullanılmaya
+    devam eder.
+    """
+    result = RUNES_RELOADER.reload()
+    data = runes_data()
+    duration_ms = result.duration * 1000
+    if result.ok:
+        print(
+            f"[RUNES] Reloaded {len(data)} entries from {_runes_source(data)} "
+            f"in {duration_ms:.1f} ms"
+        )
+    else:
+        print(f"[RUNES] Reload failed, keeping the current data: {result.error}")
+    return {
+        "reloaded": result.ok,
+        "entries": len(data),
+        "source": _runes_source(data),
+        "duration_ms": round(duration_ms, 3),
+        "error": result.error,
+    }
+
+
+def _on_rune_files_changed(paths: list[str]) -> None:
+    print(f"[RUNES] {', '.join(os.path.basename(p) for p in paths)} changed; reloading")
+    reload_runes()
+
+
+RUNES_WATCHER = FileWatcher(
+    lambda: (RUNES_FILE, RUNES_PACK_FILE), _on_rune_files_changed, name="runes-watcher"
+)
+
 
 def build_rune_page_name(*, prefix: str, champion_name: str) -> str:
     """LoL client rune sayfası isim limitine göre güvenli bir isim üretir."""
@@ -78,169 +294,53 @@ def build_rune_page_name(*, prefix: str, champion_name: str) -> str:
     return f"{prefix}{sep}{champ_trunc}"
 
 
-def _safe_int_list(values) -> list[int]:
-    """Liste içindeki değerleri int'e çevirir; çevrilemeyenleri atlar."""
-    result: list[int] = []
-    if not isinstance(values, list):
-        return result
-    for v in values:
-        try:
-            result.append(int(v))
-        except (TypeError, ValueError):
-            continue
-    return result
+def get_recommended_page_for_champion(champ_id: int, role: str = "") -> dict | None:
+    """
+    Şampiyon için (verilen rolde) en yüksek win rate'li geçerli öneri sayfası.
 
+    Rol için veri yoksa herhangi bir role, güncel patch için veri yoksa önceki patch'lere
+    düşülür (bkz. `rune_index`, `RuneIndex.fallback_chain`).
 
-def get_recommended_page_for_champion(champ_id: int) -> dict | None:
-    """
-    Supports 2 formats:
+    Supports 3 formats:
     1) { "123": {"primaryStyleId":..., "subStyleId":..., "selectedPerkIds":[...]}, ... }
     2) { "annie": {"rune_1": {"Domination":[...], "Sorcery":[...], "Shards":[...]}, ...}, ... }
+    3) { "annie": {"MIDDLE": {"emerald_plus": {"15.23": {"rune_1": {...}, ...}}}}, ... }
     """
-    # Format 1: direct champId -> payload
-    direct = RUNES_DATA.get(str(champ_id))
-    if isinstance(direct, dict) and "primaryStyleId" in direct and "subStyleId" in direct and "selectedPerkIds" in direct:
-        try:
-            primary_style_id = int(direct.get("primaryStyleId"))
-            sub_style_id = int(direct.get("subStyleId"))
-        except (TypeError, ValueError):
-            return None
-
-        selected = _safe_int_list(direct.get("selectedPerkIds"))
-        if len(selected) != 9:
-            return None
-
-        return {"primaryStyleId": primary_style_id, "subStyleId": sub_style_id, "selectedPerkIds": selected}
-
-    # Format 2: slug -> rune_1 -> tree lists
-    slug = champion_repo.get_slug_by_id(champ_id)
-    if not slug:
-        return None
-    champ_blob = RUNES_DATA.get(slug)
-    if not isinstance(champ_blob, dict):
-        return None
-
-    def _parse_win_rate(value) -> float | None:
-        if value is None:
-            return None
-        if isinstance(value, (int, float)):
-            return float(value)
-        s = str(value).strip()
-        if not s:
-            return None
-        s = s.replace(",", ".")
-        m = re.search(r"(\d+(?:\.\d+)?)", s)
-        if not m:
-            return None
-        try:
-            return float(m.group(1))
-        except ValueError:
-            return None
-
-    rune_candidates: list[tuple[float, str, dict]] = []
-    default_blob: dict | None = None
-    fallback_blob: dict | None = None
-
-    for k, v in champ_blob.items():
-        if not (isinstance(k, str) and k.startswith("rune_") and isinstance(v, dict)):
-            continue
-        if fallback_blob is None:
-            fallback_blob = v
-        if k == "rune_1":
-            default_blob = v
-
-        win_rate = (
-            v.get("Win Rate")
-            or v.get("win_rate")
-            or v.get("WinRate")
-            or v.get("winRate")
-            or v.get("WIN RATE")
-        )
-        parsed_wr = _parse_win_rate(win_rate)
-        if parsed_wr is None:
-            parsed_wr = -1.0
-        rune_candidates.append((parsed_wr, k, v))
-
-    if not rune_candidates:
+    page = rune_index().best(champ_id, champion_repo.get_slug_by_id, role)
+    if page is None:
         return None
-
-    # Sort by winrate desc, then by rune_* key for stability.
-    rune_candidates.sort(key=lambda t: (t[0], t[1]), reverse=True)
-
-    def _convert_blob_to_page(rune_blob: dict) -> dict | None:
-        style_entries: list[tuple[str, int, int]] = []
-        for k, v in rune_blob.items():
-            if not isinstance(k, str):
-                continue
-            style_id = STYLE_ID_BY_NAME.get(k.strip().lower())
-            if style_id is None:
-                continue
-            if not isinstance(v, list):
-                continue
-            style_entries.append((k, style_id, len(v)))
-
-        if len(style_entries) < 2:
-            return None
-
-        primary_key = next((k for k, _sid, ln in style_entries if ln == 4), style_entries[0][0])
-        secondary_key = next(
-            (k for k, _sid, ln in style_entries if ln == 2 and k != primary_key),
-            style_entries[1][0] if style_entries[1][0] != primary_key else style_entries[0][0],
+    if page.win_rate is not None:
+        print(
+            f"[RUNES] Recommended rune selected: {champ_id}:{page.name} "
+            f"role={role or 'ANY'} winRate={page.win_rate}"
         )
-
-        primary_style_id = STYLE_ID_BY_NAME.get(primary_key.strip().lower())
-        secondary_style_id = STYLE_ID_BY_NAME.get(secondary_key.strip().lower())
-        if primary_style_id is None or secondary_style_id is None:
-            return None
-
-        primary_ids = _safe_int_list(rune_blob.get(primary_key))
-        secondary_ids = _safe_int_list(rune_blob.get(secondary_key))
-
-        shards_ids: list[int] = []
-        for k, v in rune_blob.items():
-            if isinstance(k, str) and k.strip().lower() == "shards":
-                shards_ids = _safe_int_list(v)
-                break
-
-        selected = primary_ids[:4] + secondary_ids[:2] + shards_ids[:3]
-        if len(selected) != 9:
-            return None
-
-        return {
-            "primaryStyleId": primary_style_id,
-            "subStyleId": secondary_style_id,
-            "selectedPerkIds": selected,
-        }
-
-    # Try highest winrate first; if conversion fails, fall back to rune_1 then first available.
-    for _wr, _name, blob in rune_candidates:
-        page = _convert_blob_to_page(blob)
-        if page:
-            if _wr >= 0:
-                print(f"[RUNES] Recommended rune selected: {slug}:{_name} winRate={_wr}")
-            else:
-                print(f"[RUNES] Recommended rune selected: {slug}:{_name}")
-            return page
-
-    if default_blob is not None:
-        page = _convert_blob_to_page(default_blob)
-        if page:
-            return page
-
-    if fallback_blob is not None:
-        page = _convert_blob_to_page(fallback_blob)
-        if page:
-            return page
-
-    return None
+    return page.as_page()
 
 # -----------------------------------------------------------------------------
 # GLOBAL STATE
 # -----------------------------------------------------------------------------
-RUNNING = False
 CURRENT_CONFIG: dict[str, Any] = {}
-AUTOMATION_THREAD: threading.Thread | None = None
-AUTOMATION_LOCK = threading.Lock()
+# WebSocket olaylarını otomasyon döngüsüne taşır; her olay motoru uyandırır.
+# (`AUTOMATION_ENGINE` aşağıda, döngü gövdesi tanımlandıktan sonra oluşturulur.)
+AUTOMATION_EVENTS = LcuEventBuffer(on_wake=lambda: AUTOMATION_ENGINE.wake())
+# Faza göre polling aralığı ve okunacak uri'ler (ChampSelect hızlı, oyun içi neredeyse boşta).
+AUTOMATION_SCHEDULER = PhaseScheduler()
+
+# Rün sayfası envanteri; perks olayları ve kendi yazmalarımızla güncel tutulur.
+RUNE_PAGES = RunePageInventory()
+# Oturum boyunca sabit şampiyon listeleri; yeni oturumda / reddedilen PATCH'te düşer.
+PICKABLE_IDS = ChampionIdCache(PICKABLE_CHAMPION_IDS_URI)
+BANNABLE_IDS = ChampionIdCache(BANNABLE_CHAMPION_IDS_URI)
+
+LOBBY_URI = "/lol-lobby/v2/lobby"
+POSITION_PREFERENCES_URI = "/lol-lobby/v2/lobby/members/localMember/position-preferences"
+SEARCH_URI = "/lol-lobby/v2/lobby/matchmaking/search"
+
+# Rün sayfası ve lobi olayları yalnızca önbellekleri besler; zamanlayıcı onları poll etmez.
+AUTOMATION_EVENT_URIS = (*ALL_URIS, RUNE_PAGES_URI, LOBBY_URI)
+
+# İstemci kapalıyken döngü lockfile izleyicisinin olayını bekler; bu yalnızca emniyet ağı.
+CLIENT_DOWN_RECHECK_INTERVAL = 30.0
 
 # -----------------------------------------------------------------------------
 # MODELS
@@ -264,194 +364,101 @@ class AutomationConfig(BaseModel):
     # role -> champId(str) -> skinId(int)
     custom_skins: dict[str, dict[str, int]] = Field(default_factory=dict)
     auto_queue: bool = True
+    # Rün sayfasını FINALIZATION'ı beklemeden, şampiyon belli olur olmaz yaz (opt-in).
+    prestage_runes: bool = False
 
 # -----------------------------------------------------------------------------
 # HELPERS
 # -----------------------------------------------------------------------------
 def is_banned(session: dict[str, Any], champ_id: int) -> bool:
     """Şampiyon seçim ekranında verilen champ_id için ban durumunu döndürür."""
-    bans = session.get("bans") or {}
-    if not isinstance(bans, dict):
-        return False
-
-    all_bans_raw = (bans.get("myTeamBans") or []) + (bans.get("theirTeamBans") or [])
-    all_bans = set(_safe_int_list(all_bans_raw))
-    try:
-        champ_id_int = int(champ_id)
-    except (TypeError, ValueError):
-        return False
-    return champ_id_int in all_bans
+    cid = normalize_champion_id(champ_id)
+    return cid is not None and index_session(session).is_banned(cid)
 
 
 def is_picked(session: dict[str, Any], champ_id: int) -> bool:
     """Şampiyon seçim ekranında champ_id'nin picklenmiş olup olmadığını döndürür."""
-    try:
-        champ_id_int = int(champ_id)
-    except (TypeError, ValueError):
-        return False
-
-    for team_key in ("myTeam", "theirTeam"):
-        for player in session.get(team_key, []) or []:
-            if not isinstance(player, dict):
-                continue
-            try:
-                picked = int(player.get("championId") or 0)
-            except (TypeError, ValueError):
-                picked = 0
-            if picked == champ_id_int and champ_id_int != 0:
-                return True
-
-    return False
+    cid = normalize_champion_id(champ_id)
+    return cid is not None and index_session(session).is_picked(cid)
 
 def is_teammate_showing(session: dict[str, Any], champ_id: int) -> bool:
     """Takım arkadaşının champ_id'yi gösteriyor/niyet ediyor olup olmadığını kontrol eder."""
-    try:
-        cid = int(champ_id)
-    except (TypeError, ValueError):
-        return False
+    cid = normalize_champion_id(champ_id)
+    return cid is not None and index_session(session).is_teammate_showing(cid)
 
-    for p in session.get("myTeam", []):
-        if not isinstance(p, dict):
-            continue
-        try:
-            shown = int(p.get("championId") or 0)
-        except (TypeError, ValueError):
-            shown = 0
-        if shown == cid and cid != 0:
-            return True
+def do_ban(session: dict[str, Any], champ_id: int) -> bool:
+    """
+    Oyuncunun ban aksiyonu açıksa, champ_id için ban atmayı dener.
 
+    Dönüş: ban isteği başarısız olduysa False (tekrar denenmeli), aksi halde True.
+    """
+    global LAST_BAN_SKIP
+    action = index_session(session).open_action("ban")
+    if action is None:
+        return True
+
+    action_id = action.get("id")
+    skip_reason = None
+    if is_teammate_showing(session, champ_id):
+        skip_reason = "a teammate is showing it"
+    else:
+        bannable = get_bannable_champion_ids(session)
+        if bannable is not None and champ_id not in bannable:
+            skip_reason = "it is not bannable"
+    if skip_reason is not None:
         try:
-            intent = int(p.get("championPickIntent") or 0)
+            key = (int(action_id), int(champ_id))
         except (TypeError, ValueError):
-            intent = 0
-        if intent == cid and cid != 0:
-            return True
-
-    return False
-
-def do_ban(session: dict[str, Any], champ_id: int) -> None:
-    """Oyuncunun ban aksiyonu açıksa, champ_id için ban atmayı dener."""
-    global LAST_BAN_SKIP
-    my_cell = session.get("localPlayerCellId")
-
-    for group in session.get("actions", []) or []:
-        if not isinstance(group, list):
-            continue
-        for action in group:
-            if not isinstance(action, dict):
-                continue
-            if action.get("type") != "ban":
-                continue
-            if action.get("actorCellId") != my_cell:
-                continue
-            if action.get("completed"):
-                continue
-
-            action_id = action.get("id")
-            if is_teammate_showing(session, champ_id):
-                try:
-                    key = (int(action_id), int(champ_id))
-                except (TypeError, ValueError):
-                    key = None
-
-                if key is not None and LAST_BAN_SKIP != key:
-                    champ_name = champion_repo.get_name_by_id(int(champ_id)) or str(champ_id)
-                    print(
-                        f"[BAN] Skipping ban for {champ_name} ({champ_id}) because a teammate is showing it"
-                    )
-                    LAST_BAN_SKIP = key
-                return
+            key = None
 
-            LAST_BAN_SKIP = None
-            try:
-                lcu_request(
-                    "PATCH",
-                    f"/lol-champ-select/v1/session/actions/{action_id}",
-                    {"championId": champ_id, "completed": True},
-                )
-            except Exception as e:
-                print(f"[BAN] Failed to ban championId={champ_id}: {e}")
-            return
+        if key is not None and LAST_BAN_SKIP != key:
+            champ_name = champion_repo.get_name_by_id(int(champ_id)) or str(champ_id)
+            print(f"[BAN] Skipping ban for {champ_name} ({champ_id}) because {skip_reason}")
+            LAST_BAN_SKIP = key
+        return True
 
-def normalize_champion_id(value: Any) -> int | None:
-    """Kullanıcı/LCU inputunu pozitif champ_id değerine normalize eder."""
+    LAST_BAN_SKIP = None
     try:
-        cid = int(value)
-    except (TypeError, ValueError):
-        return None
-    return cid if cid > 0 else None
-
-
-def normalize_spell_id(value: Any) -> int | None:
-    """Kullanıcı/LCU inputunu pozitif spell_id değerine normalize eder."""
-    try:
-        sid = int(value)
-    except (TypeError, ValueError):
-        return None
-    return sid if sid > 0 else None
+        res = lcu_request(
+            "PATCH",
+            f"/lol-champ-select/v1/session/actions/{action_id}",
+            {"championId": champ_id, "completed": True},
+        )
+        if res.status_code not in (200, 204):
+            print(f"[BAN] Ban rejected for championId={champ_id}: {res.status_code} {res.text}")
+            BANNABLE_IDS.invalidate()
+            return False
+    except Exception as e:
+        print(f"[BAN] Failed to ban championId={champ_id}: {e}")
+        return False
+    return True
 
 
-def extract_spell_pair(entry: Any) -> tuple[bool, int | None, bool, int | None]:
-    """
-    Summoner spell çiftini farklı formatlardan çözer.
-
-    Dönüş: (has_spell1, spell1_id, has_spell2, spell2_id)
-    """
-    has_s1 = False
-    has_s2 = False
-    s1: int | None = None
-    s2: int | None = None
-
-    if isinstance(entry, dict):
-        if "spell1Id" in entry or "spell1" in entry:
-            has_s1 = True
-        if "spell2Id" in entry or "spell2" in entry:
-            has_s2 = True
-
-        if "spell1Id" in entry:
-            s1 = normalize_spell_id(entry.get("spell1Id"))
-        elif "spell1" in entry:
-            s1 = normalize_spell_id(entry.get("spell1"))
-
-        if "spell2Id" in entry:
-            s2 = normalize_spell_id(entry.get("spell2Id"))
-        elif "spell2" in entry:
-            s2 = normalize_spell_id(entry.get("spell2"))
-    elif isinstance(entry, (list, tuple)) and len(entry) >= 2:
-        has_s1 = True
-        has_s2 = True
-        s1 = normalize_spell_id(entry[0])
-        s2 = normalize_spell_id(entry[1])
-
-    return has_s1, s1, has_s2, s2
-
-def get_pickable_champion_ids() -> set[int] | None:
+def get_pickable_champion_ids(session: dict[str, Any] | None = None) -> set[int] | None:
     """
     Returns the set of champion ids the player can currently pick in champ select.
     If the endpoint isn't available (not in champ select, etc.), returns None.
+
+    The list is cached for the champ-select session (see `PICKABLE_IDS`).
     """
     try:
-        res = lcu_request("GET", "/lol-champ-select/v1/pickable-champion-ids")
-        if res.status_code != 200:
-            return None
+        ids = PICKABLE_IDS.get(index_session(session).session_key if session else None)
+        return set(ids) if ids is not None else None
+    except Exception as e:
+        print(f"[AUTO-PICK] Error fetching pickable champion ids: {e}")
+        return None
 
-        ids = res.json()
-        if not isinstance(ids, list):
-            return None
 
-        pickable: set[int] = set()
-        for cid in ids:
-            try:
-                cid_int = int(cid)
-            except (TypeError, ValueError):
-                continue
-            if cid_int > 0:
-                pickable.add(cid_int)
-        return pickable
+def get_bannable_champion_ids(session: dict[str, Any] | None = None) -> set[int] | None:
+    """Champ select'te banlanabilir şampiyon id'leri (oturum boyunca önbellekli)."""
+    try:
+        ids = BANNABLE_IDS.get(index_session(session).session_key if session else None)
+        return set(ids) if ids is not None else None
     except Exception as e:
-        print(f"[AUTO-PICK] Error fetching pickable champion ids: {e}")
+        print(f"[BAN] Error fetching bannable champion ids: {e}")
         return None
 
+
 def auto_pick_impl(session: dict[str, Any], champion_ids: list[int]) -> dict[str, Any]:
     """
     Tercih listesinden ilk uygun şampiyonu picklemeyi dener.
@@ -470,34 +477,26 @@ def auto_pick_impl(session: dict[str, Any], champion_ids: list[int]) -> dict[str
     if not valid_ids:
         return {"status": "no_preference"}
 
-    pickable_ids = get_pickable_champion_ids()
+    index = index_session(session)
+    pick_action = index.open_action("pick")
+    action_id = pick_action.get("id") if pick_action is not None else None
+    if action_id is None:
+        # Checked first: no pickable-ids lookup once our pick is done.
+        return {"status": "no_pick_available"}
+
+    pickable_ids = get_pickable_champion_ids(session)
     candidate_ids = valid_ids
     if pickable_ids is not None:
         candidate_ids = [cid for cid in candidate_ids if cid in pickable_ids]
 
-    candidate_ids = [cid for cid in candidate_ids if not is_banned(session, cid) and not is_picked(session, cid)]
+    candidate_ids = [
+        cid for cid in candidate_ids if not index.is_banned(cid) and not index.is_picked(cid)
+    ]
 
     if not candidate_ids:
         print(f"[AUTO-PICK] No pickable preferred champions. preferred={valid_ids}")
         return {"status": "all_unavailable", "attempted": valid_ids}
 
-    my_cell = session.get("localPlayerCellId")
-    action_id = None
-    for group in session.get("actions", []):
-        for action in group:
-            if (
-                action.get("type") == "pick"
-                and action.get("actorCellId") == my_cell
-                and not action.get("completed")
-            ):
-                action_id = action.get("id")
-                break
-        if action_id is not None:
-            break
-
-    if action_id is None:
-        return {"status": "no_pick_available"}
-
     last_error = None
     for champ_to_pick in candidate_ids:
         print(f"[AUTO-PICK] Picking champion {champ_to_pick}")
@@ -516,6 +515,8 @@ def auto_pick_impl(session: dict[str, Any], champion_ids: list[int]) -> dict[str
                 "body": res.text,
             }
             print(f"[AUTO-PICK] Pick failed for {champ_to_pick}: {res.status_code} {res.text}")
+            # The cached pickable list may be out of date (e.g. a trade or an owned-champion change).
+            PICKABLE_IDS.invalidate()
         except Exception as e:
             last_error = {"champion": champ_to_pick, "error": str(e)}
             print(f"[AUTO-PICK] Pick error for {champ_to_pick}: {e}")
@@ -534,155 +535,180 @@ def get_champions():
 @app.get("/health")
 def health():
     """Basit health-check endpoint'i."""
-    return {"status": "ok", "running": RUNNING, "version": __version__}
-
-def get_gameflow_phase_safe() -> str | None:
-    """LCU gameflow-phase okur; hata durumunda `None` döndürür."""
+    return {
+        "status": "ok",
+        "running": AUTOMATION_ENGINE.running,
+        "version": __version__,
+        "lcu_single_flight": asdict(single_flight_stats()),
+    }
+
+def render_metrics() -> str:
+    """Servis metriklerini Prometheus text formatında üretir."""
+    flights = single_flight_stats()
+    lines = [
+        "# HELP lcu_single_flight_calls_total GET calls routed through single-flight.",
+        "# TYPE lcu_single_flight_calls_total counter",
+        f"lcu_single_flight_calls_total {flights.calls}",
+        "# HELP lcu_single_flight_hits_total GET calls that shared an in-flight request.",
+        "# TYPE lcu_single_flight_hits_total counter",
+        f"lcu_single_flight_hits_total {flights.hits}",
+        "# HELP lcu_single_flight_coalesced_total In-flight requests shared by several callers.",
+        "# TYPE lcu_single_flight_coalesced_total counter",
+        f"lcu_single_flight_coalesced_total {flights.coalesced}",
+    ]
+    return (
+        LCU_METRICS.render_prometheus()
+        + "\n".join(lines)
+        + "\n"
+        + AUTOMATION_SCHEDULER.render_prometheus()
+        + RUNES_RELOADER.render_prometheus()
+    )
+
+
+@app.post("/runes/reload")
+def runes_reload():
+    """Rün verisini yeniden yükler (dosya izleyicisini beklemeden)."""
+    return reload_runes()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus scrape endpoint'i (LCU istek gecikmeleri, hatalar, birleştirmeler)."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
+def _phase_from_response(res: Any) -> str | None:
+    """gameflow-phase yanıtını çözer; hata/uygunsuz yanıtta `None` döndürür."""
+    if isinstance(res, Exception) or res.status_code != 200:
+        return None
     try:
-        res = lcu_request("GET", "/lol-gameflow/v1/gameflow-phase")
-        if res.status_code != 200:
-            return None
         phase = res.json()
-        if isinstance(phase, str):
-            return phase
+    except Exception:
         return None
+    return phase if isinstance(phase, str) else None
+
+
+def _ready_check_from_response(res: Any) -> dict[str, Any] | None:
+    """ready-check yanıtını çözer; hata/uygunsuz yanıtta `None` döndürür."""
+    if isinstance(res, Exception) or res.status_code != 200:
+        return None
+    try:
+        rc_json = res.json()
     except Exception:
         return None
+    return rc_json if isinstance(rc_json, dict) else None
 
 
-def ensure_lobby(queue_id: int) -> bool:
-    """
-    Ensure a lobby exists with the given queue id.
-    Returns True if a lobby exists/created successfully.
-    """
+def _session_from_response(res: Any) -> dict[str, Any] | None:
+    """Seçim oturumu yanıtını çözer; seçim ekranı dışında `None` (bağlantı hatası fırlar)."""
+    if isinstance(res, Exception):
+        raise res
+    if res.status_code != 200:
+        return None
     try:
-        res = lcu_request("GET", "/lol-lobby/v2/lobby")
-        if res.status_code == 200:
-            lobby = res.json()
-            current_queue = None
-            try:
-                current_queue = int((lobby.get("gameConfig") or {}).get("queueId"))
-            except Exception:
-                current_queue = None
+        session = res.json()
+    except Exception:
+        return None
+    return session if isinstance(session, dict) and session else None
 
-            if current_queue == queue_id:
-                return True
 
-            # Wrong queue: leave and recreate.
-            lcu_request("DELETE", "/lol-lobby/v2/lobby")
-            time.sleep(0.5)
+def get_gameflow_phase_safe() -> str | None:
+    """LCU gameflow-phase okur; istemci kapalıysa veya hata durumunda `None` döndürür."""
+    if not get_default_watcher().client_up:
+        return None
+    try:
+        return _phase_from_response(lcu_request("GET", GAMEFLOW_PHASE_URI))
     except Exception:
-        pass
+        return None
+
+
+def read_lobby() -> dict[str, Any] | None:
+    """Mevcut lobiyi okur; lobi yoksa `None` (okuma hatası istisna fırlatır)."""
+    res = lcu_request("GET", LOBBY_URI)
+    if res.status_code == 404:
+        return None
+    if res.status_code != 200:
+        raise RuntimeError(f"GET {LOBBY_URI} -> {res.status_code}")
+    lobby = res.json()
+    return lobby if isinstance(lobby, dict) else None
 
+
+def create_lobby(queue_id: int, *, replace: bool = False) -> dict[str, Any] | None:
+    """
+    Verilen kuyrukta lobi oluşturur (`replace`: önce mevcut lobiden çıkar).
+
+    Dönüş: oluşturulan lobinin yükü, başarısızsa `None`.
+    """
     try:
-        create_res = lcu_request("POST", "/lol-lobby/v2/lobby", {"queueId": int(queue_id)})
+        if replace:
+            # Wrong queue: leave and recreate.
+            lcu_request("DELETE", LOBBY_URI)
+            time.sleep(0.5)
+        create_res = lcu_request("POST", LOBBY_URI, {"queueId": int(queue_id)})
         if create_res.status_code in (200, 201, 204):
             print(f"[QUEUE] Lobby created queueId={queue_id}")
-            return True
+            try:
+                lobby = create_res.json()
+            except ValueError:
+                lobby = None
+            if isinstance(lobby, dict) and lobby:
+                return lobby
+            return {"gameConfig": {"queueId": int(queue_id)}}
         print(f"[QUEUE] Failed to create lobby: {create_res.status_code} {create_res.text}")
     except Exception as e:
         print(f"[QUEUE] Error creating lobby: {e}")
+    return None
 
-    return False
-
-
-def ensure_matchmaking_searching() -> None:
-    """
-    Start matchmaking search if it isn't already searching.
-    """
-    try:
-        state_res = lcu_request("GET", "/lol-lobby/v2/lobby/matchmaking/search-state")
-        if state_res.status_code == 200:
-            state = state_res.json()
-            if isinstance(state, dict) and state.get("searchState") == "Searching":
-                return
-    except Exception:
-        # Some client versions may not expose the search-state endpoint.
-        pass
 
+def start_matchmaking_search() -> bool:
+    """Matchmaking aramasını başlatır."""
     try:
-        res = lcu_request("POST", "/lol-lobby/v2/lobby/matchmaking/search")
+        res = lcu_request("POST", SEARCH_URI)
         if res.status_code in (200, 204):
             print("[QUEUE] Matchmaking search started")
-            return
+            return True
         print(f"[QUEUE] Failed to start search: {res.status_code} {res.text}")
     except Exception as e:
         print(f"[QUEUE] Error starting search: {e}")
+    return False
 
 
-def apply_runes_impl(session: dict[str, Any], cfg: dict[str, Any]) -> bool:
+def apply_runes_impl(session: dict[str, Any], plan: AutomationPlan) -> bool:
     """
     Seçili şampiyon için rün sayfasını uygular.
 
     Öncelik:
     1) Kullanıcının seçtiği özel preset (varsa)
-    2) `runes.json` içinden en yüksek kazanma oranına sahip öneri
+    2) `runes.json` içinden atanmış rol için en yüksek kazanma oranına sahip öneri
     """
-    my_cell = session.get("localPlayerCellId")
-    my_champ_id = 0
-    for p in session.get("myTeam", []):
-        if p.get("cellId") == my_cell:
-            my_champ_id = p.get("championId", 0) or 0
-            if my_champ_id == 0:
-                my_champ_id = p.get("championPickIntent", 0) or 0
-            break
-
+    index = index_session(session)
+    my_champ_id = index.local_champion_id
     if my_champ_id == 0:
         return False
 
     try:
-        champ_key = str(my_champ_id)
-
-        selection = 0
-        try:
-            selection_map = cfg.get("rune_selection") or {}
-            if isinstance(selection_map, dict):
-                selection = int(selection_map.get(champ_key, 0) or 0)
-        except (TypeError, ValueError):
-            selection = 0
-        if selection not in (0, 1, 2, 3):
-            selection = 0
-
+        selection = plan.rune_slots.get(my_champ_id, 0)
         page_data: dict | None = None
         used_custom = False
         used_slot: int | None = None
 
-        if selection in (1, 2, 3):
-            custom_runes = cfg.get("custom_runes") or {}
-            champ_presets = custom_runes.get(champ_key) if isinstance(custom_runes, dict) else None
-            champ_presets = champ_presets if isinstance(champ_presets, dict) else {}
-            custom_page = champ_presets.get(str(selection))
-
-            if isinstance(custom_page, dict):
-                candidate = {
-                    "primaryStyleId": custom_page.get("primaryStyleId"),
-                    "subStyleId": custom_page.get("subStyleId"),
-                    "selectedPerkIds": custom_page.get("selectedPerkIds"),
-                }
-                try:
-                    int(candidate.get("primaryStyleId"))
-                    int(candidate.get("subStyleId"))
-                except (TypeError, ValueError):
-                    candidate = None
-
-                if candidate is not None and len(_safe_int_list(candidate.get("selectedPerkIds"))) != 9:
-                    candidate = None
-
-                if candidate is None:
-                    print(
-                        f"[RUNES] Invalid custom rune preset slot={selection} championId={my_champ_id}, falling back to recommended"
-                    )
-                else:
-                    page_data = candidate
-                    used_custom = True
-                    used_slot = selection
-            else:
+        if selection:
+            if (my_champ_id, selection) not in plan.rune_presets:
                 print(
                     f"[RUNES] Custom rune preset not found slot={selection} championId={my_champ_id}, falling back to recommended"
                 )
+            elif (preset := plan.rune_presets[(my_champ_id, selection)]) is None:
+                print(
+                    f"[RUNES] Invalid custom rune preset slot={selection} championId={my_champ_id}, falling back to recommended"
+                )
+            else:
+                page_data = preset.as_page()
+                used_custom = True
+                used_slot = selection
 
         if page_data is None:
-            recommended = get_recommended_page_for_champion(my_champ_id)
+            role = plan.role_key(index.assigned_role)
+            recommended = get_recommended_page_for_champion(my_champ_id, role)
             if not recommended:
                 print(f"[RUNES] No recommended runes found for championId={my_champ_id}")
                 return False
@@ -709,13 +735,9 @@ def apply_runes_impl(session: dict[str, Any], cfg: dict[str, Any]) -> bool:
             print(f"[RUNES] Invalid selectedPerkIds for championId={my_champ_id}: {page_data.get('selectedPerkIds')}")
             return False
 
-        res = lcu_request("GET", "/lol-perks/v1/pages")
-        if res.status_code != 200:
-            print(f"[RUNES] Failed to fetch rune pages: {res.status_code} {res.text}")
-            return False
-        pages = res.json()
-        if not isinstance(pages, list):
-            print(f"[RUNES] Unexpected /lol-perks/v1/pages response: {type(pages)}")
+        # In-memory model: no GET round-trip when it is fresh (events/own writes keep it so).
+        pages = RUNE_PAGES.pages()
+        if pages is None:
             return False
 
         def _page_id(page: dict) -> int | None:
@@ -758,13 +780,24 @@ def apply_runes_impl(session: dict[str, Any], cfg: dict[str, Any]) -> bool:
                 "selectedPerkIds": selected,
                 "current": True,
             }
+            if page_matches(page, payload):
+                print(f"[RUNES] Rune page id={pid} name={name} already up to date")
+                return True
             put_res = lcu_request("PUT", f"/lol-perks/v1/pages/{pid}", payload)
             if put_res.status_code in (200, 201, 204):
+                RUNE_PAGES.record_put(pid, payload)
                 print(f"[RUNES] Updated rune page id={pid} name={name}")
                 return True
+            RUNE_PAGES.invalidate()
             print(f"[RUNES] Failed to update rune page: {put_res.status_code} {put_res.text}")
             return False
 
+        def _record_create(res: Any) -> None:
+            try:
+                RUNE_PAGES.record_create(res.json())
+            except Exception:
+                RUNE_PAGES.invalidate()
+
         # 1) Update existing automation page (best case)
         for p in pages:
             if isinstance(p, dict) and _is_editable(p) and _is_automation_page_name(_page_name(p)):
@@ -782,6 +815,7 @@ def apply_runes_impl(session: dict[str, Any], cfg: dict[str, Any]) -> bool:
         }
         create_res = lcu_request("POST", "/lol-perks/v1/pages", create_payload)
         if create_res.status_code in (200, 201, 204):
+            _record_create(create_res)
             print(f"[RUNES] Created rune page {desired_page_name}")
             return True
 
@@ -813,11 +847,13 @@ def apply_runes_impl(session: dict[str, Any], cfg: dict[str, Any]) -> bool:
                     continue
                 del_res = lcu_request("DELETE", f"/lol-perks/v1/pages/{pid}")
                 if del_res.status_code in (200, 204):
+                    RUNE_PAGES.record_delete(pid)
                     deleted_any = True
 
             if deleted_any:
                 retry_res = lcu_request("POST", "/lol-perks/v1/pages", create_payload)
                 if retry_res.status_code in (200, 201, 204):
+                    _record_create(retry_res)
                     print(f"[RUNES] Created rune page {desired_page_name} (after cleanup)")
                     return True
 
@@ -833,231 +869,408 @@ def apply_runes_impl(session: dict[str, Any], cfg: dict[str, Any]) -> bool:
                 if _put_page(target, name=desired_page_name):
                     return True
 
+        RUNE_PAGES.invalidate()
         print(f"[RUNES] Failed to create rune page: {create_res.status_code} {create_res.text}")
         return False
 
     except Exception as e:
+        RUNE_PAGES.invalidate()
         print(f"[RUNES] Error applying runes: {e}")
         return False
 
 
-def automation_loop() -> None:
-    """Arka planda çalışan otomasyon döngüsü (thread target)."""
-    global RUNNING, CURRENT_CONFIG
-    print("[AUTO] Automation loop started")
-    last_queue_action_ts = 0.0
+def get_ready_check_safe() -> dict[str, Any] | None:
+    """LCU ready-check durumunu okur; hata durumunda `None` döndürür."""
+    try:
+        return _ready_check_from_response(lcu_request("GET", READY_CHECK_URI))
+    except Exception:
+        return None
+
+
+def get_champ_select_session() -> dict[str, Any] | None:
+    """Şampiyon seçim oturumunu okur; seçim ekranı dışında `None` döndürür."""
+    return _session_from_response(lcu_request("GET", CHAMP_SELECT_SESSION_URI))
 
-    while RUNNING:
+
+def _set_position_preferences(plan: AutomationPlan) -> bool:
+    """Plandaki birincil/ikincil rolü lobi pozisyon tercihi olarak gönderir."""
+    try:
+        res = lcu_request("PUT", POSITION_PREFERENCES_URI, dict(plan.position_preferences))
+    except Exception as e:
+        print(f"[QUEUE] Error setting position preferences: {e}")
+        return False
+    if res.status_code not in (200, 201, 204):
+        print(f"[QUEUE] Failed to set position preferences: {res.status_code} {res.text}")
+        return False
+    return True
+
+
+def _run_queue_action(
+    action: str, plan: AutomationPlan, queue: QueueStateMachine, now: float
+) -> bool:
+    """Tek bir kuyruk aksiyonunu uygular ve sonucu durum makinesine işler."""
+    if action == ACTION_READ_LOBBY:
         try:
-            cfg = CURRENT_CONFIG
-            if not cfg:
-                time.sleep(1)
-                continue
+            queue.observe_lobby(read_lobby())
+        except Exception as e:
+            print(f"[QUEUE] Failed to read lobby: {e}")
+            return False
+        return True
+    if action in (ACTION_CREATE_LOBBY, ACTION_RECREATE_LOBBY):
+        lobby = create_lobby(plan.queue_id or 0, replace=action == ACTION_RECREATE_LOBBY)
+        if lobby is None:
+            return False
+        queue.observe_lobby(lobby)
+        return True
+    if action == ACTION_SET_ROLES:
+        if not _set_position_preferences(plan):
+            return False
+        queue.record_roles(plan.position_preferences)
+        return True
+    if action == ACTION_START_SEARCH:
+        if not start_matchmaking_search():
+            return False
+        queue.record_search(now)
+        return True
+    return False
 
-            primary_role = cfg.get("primary_role")
-            secondary_role = cfg.get("secondary_role")
 
-            auto_queue = bool(cfg.get("auto_queue", True))
-            queue_id = cfg.get("queue_id")
-            try:
-                queue_id_int = int(queue_id) if queue_id is not None else None
-            except Exception:
-                queue_id_int = None
-
-            flow_phase = get_gameflow_phase_safe()
-            if auto_queue and queue_id_int:
-                # Only try to create lobby / start search in idle/lobby phases.
-                if flow_phase in (None, "None", "Lobby"):
-                    now = time.time()
-                    if now - last_queue_action_ts > 5:
-                        if ensure_lobby(queue_id_int):
-                            # Position preferences require an active lobby.
-                            if primary_role or secondary_role:
-                                body_roles: dict[str, str] = {}
-                                if primary_role:
-                                    body_roles["firstPreference"] = str(primary_role).upper()
-                                if secondary_role:
-                                    body_roles["secondPreference"] = str(secondary_role).upper()
-                                if body_roles:
-                                    lcu_request(
-                                        "PUT",
-                                        "/lol-lobby/v2/lobby/members/localMember/position-preferences",
-                                        body_roles,
-                                    )
-
-                            ensure_matchmaking_searching()
-
-                        last_queue_action_ts = now
-            else:
-                # Keep old behavior: only set roles (if lobby exists) but don't start queue.
-                if primary_role or secondary_role:
-                    body_roles: dict[str, str] = {}
-                    if primary_role:
-                        body_roles["firstPreference"] = str(primary_role).upper()
-                    if secondary_role:
-                        body_roles["secondPreference"] = str(secondary_role).upper()
-                    if body_roles:
-                        lcu_request(
-                            "PUT",
-                            "/lol-lobby/v2/lobby/members/localMember/position-preferences",
-                            body_roles,
-                        )
+def handle_queue(plan: AutomationPlan, queue: QueueStateMachine, flow_phase: str | None) -> None:
+    """
+    Lobi/kuyruk adımı: durum makinesinin istediği geçişleri sırayla uygular.
+
+    Doğrulanmış durumda (roller zaten ayarlı, arama sürüyor...) hiç istek atılmaz;
+    auto-queue açıksa lobi kurma, roller ve arama aynı turda zincirlenir.
+    """
+    queue.observe_phase(flow_phase)
+    now = time.monotonic()
+    for _ in range(MAX_ACTIONS_PER_TICK):
+        action = queue.next_action(plan, now)
+        if action is None:
+            return
+        if not _run_queue_action(action, plan, queue, now):
+            queue.record_failure(now)
+            return
+
+
+def ready_check_needs_accept(rc_json: dict[str, Any] | None) -> bool:
+    """Ready-check açık ve henüz kabul edilmemiş mi?"""
+    # State stays InProgress until everyone answers; don't re-accept on every fast tick.
+    return bool(
+        rc_json
+        and rc_json.get("state") == "InProgress"
+        and rc_json.get("playerResponse") != "Accepted"
+    )
+
+
+def handle_ready_check(rc_json: dict[str, Any] | None) -> None:
+    """Ready-check açıksa kabul eder."""
+    if not ready_check_needs_accept(rc_json):
+        return
+    try:
+        lcu_request("POST", "/lol-matchmaking/v1/ready-check/accept")
+    except Exception:
+        pass
+
+
+# Champ select adımları; her biri oturumun yalnızca ilgilendiği parçaları değişince çalışır.
+CHAMP_SELECT_STEPS = SessionDispatcher()
+
+
+@CHAMP_SELECT_STEPS.subscribe(PART_ACTIONS, PART_BANS, PART_PLAYERS)
+def _ban_step(session: dict[str, Any], plan: AutomationPlan, runtime: AutomationRuntime) -> bool:
+    ban_id = plan.ban_for(plan.role_key(index_session(session).assigned_role))
+    return ban_id is None or do_ban(session, ban_id)
+
+
+@CHAMP_SELECT_STEPS.subscribe(PART_ACTIONS, PART_BANS, PART_PLAYERS)
+def _pick_step(session: dict[str, Any], plan: AutomationPlan, runtime: AutomationRuntime) -> bool:
+    my_champs = plan.picks_for(plan.role_key(index_session(session).assigned_role))
+    if not my_champs:
+        return True
+    return auto_pick_impl(session, list(my_champs)).get("status") != "pick_failed"
+
+
+@CHAMP_SELECT_STEPS.subscribe(PART_LOCAL_PLAYER, PART_TIMER_PHASE)
+def _rune_step(session: dict[str, Any], plan: AutomationPlan, runtime: AutomationRuntime) -> bool:
+    index = index_session(session)
+    my_champ_id = index.local_champion_id
+    staging = bool(plan.prestage_runes and my_champ_id)
+    if staging and my_champ_id != runtime.runes_staged_for:
+        # Pick intent/lock is known: write the page now, off the FINALIZATION critical path.
+        # Only a champion change (or a failed write) triggers another write.
+        runtime.runes_staged_for = my_champ_id if apply_runes_impl(session, plan) else 0
+
+    if index.timer_phase != "FINALIZATION":
+        runtime.runes_applied = False
+        # A failed pre-stage keeps the step due so it is retried before FINALIZATION.
+        return not staging or runtime.runes_staged_for == my_champ_id
+    if not runtime.runes_applied:
+        if runtime.runes_staged_for == my_champ_id != 0 or apply_runes_impl(session, plan):
+            runtime.runes_applied = True
+    return runtime.runes_applied
+
+
+@CHAMP_SELECT_STEPS.subscribe(PART_LOCAL_PLAYER)
+def _selection_step(
+    session: dict[str, Any], plan: AutomationPlan, runtime: AutomationRuntime
+) -> bool:
+    index = index_session(session)
+    role = plan.role_key(index.assigned_role)
+    my_champ_id = index.local_champion_id
+    s1, s2 = plan.spells_for(role, my_champ_id)
+    desired = Selection(spell1_id=s1, spell2_id=s2, skin_id=plan.skin_for(role, my_champ_id))
+    body = runtime.selection.plan(session, desired, my_champ_id)
+    if not body:
+        return True
+    try:
+        res = lcu_request("PATCH", "/lol-champ-select/v1/session/my-selection", body)
+    except Exception as e:
+        print(f"[SELECTION] Failed to update my-selection {body}: {e}")
+        return False
+    if res.status_code not in (200, 204):
+        print(f"[SELECTION] my-selection rejected {body}: {res.status_code} {res.text}")
+        return False
+    runtime.selection.applied(my_champ_id, body)
+    return True
+
+
+def handle_champ_select(
+    session: dict[str, Any], plan: AutomationPlan, runtime: AutomationRuntime
+) -> None:
+    """
+    Seçim ekranı adımı: ban, pick, rün, summoner spell ve kostüm.
+
+    Oturum önceki yükle farklanır; ilgili parçası değişmeyen (ve bekleyen işi
+    olmayan) adım çağrılmaz.
+    """
+    CHAMP_SELECT_STEPS.dispatch(runtime.session_diff, session, plan, runtime)
+
+
+def _forget_client_state() -> None:
+    """İstemciden önbelleğe alınmış durumu düşürür (yeni bağlantı/istemci)."""
+    RUNE_PAGES.invalidate()
+    PICKABLE_IDS.invalidate()
+    BANNABLE_IDS.invalidate()
+
+
+class _LiveState:
+    """Otomasyonun bildiği son LCU durumu (REST polling veya WebSocket olaylarıyla güncellenir)."""
+
+    def __init__(self) -> None:
+        self.phase: str | None = None
+        self.ready_check: dict[str, Any] | None = None
+        self.session: dict[str, Any] | None = None
+
+    async def poll(self, scheduler: PhaseScheduler, client: AsyncLcuClient) -> None:
+        """
+        Mevcut fazın ihtiyaç duyduğu kaynakları REST üzerinden eşzamanlı okur.
+
+        Okuma faz değişimi gösterirse yeni fazın eksik kaynakları aynı turda okunur
+        (ör. Matchmaking → ChampSelect geçişinde oturum bir tur beklemez). Fazın hiç
+        ihtiyaç duymadığı kaynaklar o fazda geçersizdir ve temizlenir.
+        """
+        polled: list[str] = []
+        phase = self.phase
+        while True:
+            uris = [uri for uri in scheduler.policy(phase).uris if uri not in polled]
+            if not uris:
+                break
+            scheduler.record_poll(phase, uris)
+            for uri, res in zip(uris, await client.gather(uris), strict=True):
+                if uri == GAMEFLOW_PHASE_URI:
+                    self.phase = _phase_from_response(res)
+                elif uri == READY_CHECK_URI:
+                    self.ready_check = _ready_check_from_response(res)
+                elif uri == CHAMP_SELECT_SESSION_URI:
+                    self.session = _session_from_response(res)
+            polled += uris
+            phase = self.phase
+        needed = scheduler.policy(phase).uris
+        if READY_CHECK_URI not in needed:
+            self.ready_check = None
+        if CHAMP_SELECT_SESSION_URI not in needed:
+            self.session = None
+
+    def apply_events(self, events: dict[str, LcuEvent]) -> None:
+        """WebSocket olaylarını duruma işler (`Delete` → kaynak artık yok)."""
+        for uri, event in events.items():
+            data = None if event.event_type == "Delete" else event.data
+            if uri == GAMEFLOW_PHASE_URI:
+                self.phase = data if isinstance(data, str) else None
+            elif uri == READY_CHECK_URI:
+                self.ready_check = data if isinstance(data, dict) else None
+            elif uri == CHAMP_SELECT_SESSION_URI:
+                self.session = data if isinstance(data, dict) and data else None
+            elif uri == RUNE_PAGES_URI:
+                RUNE_PAGES.replace(data)
+
+
+def _run_handlers(
+    plan: AutomationPlan,
+    runtime: AutomationRuntime,
+    live: _LiveState,
+    queue: QueueStateMachine,
+) -> None:
+    """Yazan (senkron) handler'ları sırayla çalıştırır; worker thread'inde çağrılır."""
+    handle_queue(plan, queue, live.phase)
+    handle_ready_check(live.ready_check)
+    if live.session:
+        # Okumalar faz bitmeden kesilir; kalan süre pick/ban PATCH'ine kalır.
+        with champ_select_deadline(live.session):
+            handle_champ_select(live.session, plan, runtime)
+
+
+def _work_due_in(
+    plan: AutomationPlan,
+    runtime: AutomationRuntime,
+    live: _LiveState,
+    queue: QueueStateMachine,
+) -> float | None:
+    """Olay gelmeden yapılacak işin vadesine kalan süre (0: şimdi); iş yoksa `None`."""
+    now = time.monotonic()
+    if ready_check_needs_accept(live.ready_check) or (
+        live.session and CHAMP_SELECT_STEPS.due(runtime.session_diff, live.session)
+    ):
+        return 0.0
+    due_at = queue.due_at(plan, now)
+    return None if due_at is None else max(0.0, due_at - now)
+
+
+async def automation_loop(engine: AutomationEngine) -> None:
+    """
+    Otomasyon döngüsü (`AUTOMATION_ENGINE` görevinin gövdesi).
+
+    LCU WebSocket'ine bağlıyken handler'lar olay geldiği anda çalışır ve REST
+    okumaları yalnızca fazın emniyet ağı aralığında yapılır. Bağlantı yoksa
+    `AUTOMATION_SCHEDULER` faza göre hangi kaynağın ne sıklıkla okunacağını seçer
+    (ChampSelect'te oturum 150 ms'de bir, oyun içinde yalnızca faz, seyrek).
+    İstemci kapalıyken (lockfile yok) döngü park eder ve hiç LCU isteği atmaz.
+
+    Okumalar event loop üzerinde non-blocking yapılır. Yazan handler'lar (lobi, ready-check,
+    ban/pick/rün/seçim) senkron `lcu_request` ve senkron cache'ler (`RUNE_PAGES`,
+    `PICKABLE_IDS`...) üzerine kurulu olduğundan async istemciye taşınmadı; worker
+    thread'ine yalnızca bir yazma gerektiğinde geçilir: kuyruk durum makinesi bir aksiyon
+    istiyor, ready-check kabul bekliyor veya oturum farkı bir champ select adımını
+    tetikliyor. Bu karar saf ve I/O'suzdur; yazacak bir şey yoksa tur thread'e geçmez.
+    Yazma başarısız kaldıysa aynı karar bir sonraki uyanmayı da öne çeker.
+    Geçiş `engine.run_in_thread` ile yapılır: durdurulan/yeniden başlatılan döngünün
+    yarıda kalan yazması bitmeden yeni döngünün handler'ları çalışmaz.
+    """
+    print("[AUTO] Automation loop started")
+    # Lobi/kuyruk bilgisi istemciye aittir; plan değişse de korunur.
+    queue = QueueStateMachine()
+    live = _LiveState()
+    client = AsyncLcuClient()
+    AUTOMATION_EVENTS.drain()
+    watcher = get_default_watcher()
+    unsubscribe_watcher = watcher.subscribe(lambda _event: engine.wake())
+    subscriber = LcuEventSubscriber(
+        AUTOMATION_EVENT_URIS, AUTOMATION_EVENTS.publish, watcher=watcher
+    )
+    subscriber.start()
+    last_poll_ts = 0.0
+    polled_generation = -1
+    parked = False
+
+    try:
+        while True:
+            if not watcher.client_up:
+                if not parked:
+                    print("[AUTO] League client is not running; waiting for it to start")
+                    parked = True
+                await engine.wait(CLIENT_DOWN_RECHECK_INTERVAL)
+                AUTOMATION_EVENTS.drain()
+                continue
+            if parked:
+                print("[AUTO] League client detected; resuming automation")
+                parked = False
+                polled_generation = -1
 
             try:
-                rc_res = lcu_request("GET", "/lol-matchmaking/v1/ready-check")
-                if rc_res.status_code == 200:
-                    rc_json = rc_res.json()
-                    if rc_json.get("state") == "InProgress":
-                        lcu_request("POST", "/lol-matchmaking/v1/ready-check/accept")
-            except Exception:
-                pass
-
-            session = None
-            res = lcu_request("GET", "/lol-champ-select/v1/session")
-            if res.status_code == 200:
-                try:
-                    session = res.json()
-                except Exception:
-                    session = None
-
-            if session:
-                phase = session.get("timer", {}).get("phase", "")
-
-                my_cell = session.get("localPlayerCellId")
-                assigned_role = ""
-                for p in session.get("myTeam", []):
-                    if p.get("cellId") == my_cell:
-                        assigned_role = p.get("assignedPosition", "").upper()
-                        break
-
-                role_bans = cfg.get("role_bans") or {}
-                ban_id = normalize_champion_id(role_bans.get(assigned_role)) if assigned_role else None
-                if ban_id is None and assigned_role == "":
-                    p_role = str(cfg.get("primary_role", "")).upper()
-                    ban_id = normalize_champion_id(role_bans.get(p_role))
-
-                if ban_id is not None:
-                    do_ban(session, ban_id)
-
-                role_champs = cfg.get("role_champions", {})
-                my_champs = role_champs.get(assigned_role, [])
-                if not my_champs and assigned_role == "":
-                    p_role = str(cfg.get("primary_role", "")).upper()
-                    my_champs = role_champs.get(p_role, [])
-
-                if my_champs:
-                    auto_pick_impl(session, my_champs)
-
-                if phase == "FINALIZATION":
-                    if not cfg.get("runes_applied"):
-                        if apply_runes_impl(session, cfg):
-                            cfg["runes_applied"] = True
-                else:
-                    cfg["runes_applied"] = False
-
-                spell_role_key = assigned_role or str(cfg.get("primary_role", "")).upper()
-
-                role_spell_map = cfg.get("role_summoner_spells")
-                role_entry = role_spell_map.get(spell_role_key) if isinstance(role_spell_map, dict) else None
-
-                my_spell_champ_id = 0
-                for p in session.get("myTeam", []):
-                    if p.get("cellId") == my_cell:
-                        my_spell_champ_id = normalize_champion_id(p.get("championId") or 0) or 0
-                        if my_spell_champ_id == 0:
-                            my_spell_champ_id = normalize_champion_id(p.get("championPickIntent") or 0) or 0
-                        break
-
-                custom_entry = None
-                custom_spell_map = cfg.get("custom_summoner_spells")
-                if my_spell_champ_id and isinstance(custom_spell_map, dict):
-                    role_custom = custom_spell_map.get(spell_role_key)
-                    if isinstance(role_custom, dict):
-                        custom_entry = role_custom.get(str(my_spell_champ_id))
-                        if custom_entry is None:
-                            custom_entry = role_custom.get(my_spell_champ_id)
-
-                has_s1, s1, has_s2, s2 = extract_spell_pair(custom_entry)
-                r_has_s1, r_s1, r_has_s2, r_s2 = extract_spell_pair(role_entry)
-
-                if not has_s1 and r_has_s1:
-                    has_s1 = True
-                    s1 = r_s1
-                if not has_s2 and r_has_s2:
-                    has_s2 = True
-                    s2 = r_s2
-
-                if not has_s1:
-                    s1 = normalize_spell_id(cfg.get("primary_summoner_spell"))
-                if not has_s2:
-                    s2 = normalize_spell_id(cfg.get("secondary_summoner_spell"))
-
-                if s1 or s2:
-                    body = {}
-                    if s1:
-                        body["spell1Id"] = s1
-                    if s2:
-                        body["spell2Id"] = s2
-                    if body:
-                        lcu_request("PATCH", "/lol-champ-select/v1/session/my-selection", body)
-
-                try:
-                    if my_spell_champ_id:
-                        base_skin_id = int(my_spell_champ_id) * 1000
-                        desired_skin_id = base_skin_id
-
-                        custom_skins = cfg.get("custom_skins")
-                        if isinstance(custom_skins, dict):
-                            role_skins = custom_skins.get(spell_role_key)
-                            if isinstance(role_skins, dict):
-                                raw = role_skins.get(str(my_spell_champ_id))
-                                if raw is None:
-                                    raw = role_skins.get(my_spell_champ_id)
-                                try:
-                                    desired_skin_id = int(raw)
-                                except (TypeError, ValueError):
-                                    desired_skin_id = base_skin_id
-
-                        skin_key = f"{my_spell_champ_id}:{desired_skin_id}"
-                        if cfg.get("skin_applied_key") != skin_key:
-                            lcu_request(
-                                "PATCH",
-                                "/lol-champ-select/v1/session/my-selection",
-                                {"selectedSkinId": int(desired_skin_id)},
-                            )
-                            cfg["skin_applied_key"] = skin_key
-                    else:
-                        cfg.pop("skin_applied_key", None)
-                except Exception as e:
-                    print(f"[SKIN] Failed to apply skin: {e}")
-        except Exception as e:
-            print(f"[AUTO] Loop error: {e}")
-            time.sleep(1)
+                state = engine.state
+                if state is None:
+                    await asyncio.sleep(1)
+                    continue
+                # Plan and runtime were swapped together; this tick never mixes two configs.
+                plan, runtime = state
+
+                now = time.monotonic()
+                pending = AUTOMATION_EVENTS.drain()
+                generation = subscriber.generation
+                connected = subscriber.connected and generation == polled_generation
+                live.apply_events(pending)
+                lobby_event = pending.get(LOBBY_URI)
+                if lobby_event is not None:
+                    queue.observe_lobby(
+                        None if lobby_event.event_type == "Delete" else lobby_event.data
+                    )
+                if AUTOMATION_SCHEDULER.poll_due(
+                    live.phase, connected=connected, since_poll=now - last_poll_ts
+                ):
+                    # WebSocket yok ya da yeni bağlandı (kaçırılmış olay olabilir): REST ile senkronize ol.
+                    if generation != polled_generation:
+                        # New connection/client: cached client state may be from another session.
+                        _forget_client_state()
+                        queue.reset()
+                    await live.poll(AUTOMATION_SCHEDULER, client)
+                    last_poll_ts = now
+                    polled_generation = generation
+
+                queue.observe_phase(live.phase)
+                if _work_due_in(plan, runtime, live, queue) == 0.0:
+                    await engine.run_in_thread(_run_handlers, plan, runtime, live, queue)
+                if not live.session:
+                    runtime.leave_champ_select()
+                    PICKABLE_IDS.invalidate()
+                    BANNABLE_IDS.invalidate()
+                # Başarısız adım/kuyruk denemesi yeni bir olay beklemeden yeniden denenir.
+                due_in = _work_due_in(plan, runtime, live, queue)
+            except Exception as e:
+                print(f"[AUTO] Loop error: {e}")
+                await asyncio.sleep(1)
+                due_in = None
+
+            wait = AUTOMATION_SCHEDULER.next_wait(
+                live.phase,
+                connected=subscriber.connected,
+                since_poll=time.monotonic() - last_poll_ts,
+                due_in=due_in,
+            )
+            woke = await engine.wait(wait)
+            AUTOMATION_SCHEDULER.record_wakeup(WAKEUP_EVENT if woke else WAKEUP_TIMER)
+    finally:
+        unsubscribe_watcher()
+        await client.aclose()
+        # Joining the subscriber thread must not block the shared event loop.
+        await asyncio.to_thread(subscriber.stop)
+        print("[AUTO] Automation loop stopped")
 
-        time.sleep(1)
+
+# Otomasyon görevi; FastAPI lifespan'i servis loop'unu verir, yoksa kendi loop'unu açar.
+AUTOMATION_ENGINE = AutomationEngine(automation_loop)
 
 # -----------------------------------------------------------------------------
 # ENDPOINTS
 # -----------------------------------------------------------------------------
 @app.post("/start_automation")
 def start_automation(config: AutomationConfig):
-    """Otomasyonu başlatır veya çalışan konfigürasyonu günceller."""
-    global RUNNING, CURRENT_CONFIG, AUTOMATION_THREAD
-    with AUTOMATION_LOCK:
-        CURRENT_CONFIG = config.model_dump()
-        already_running = bool(RUNNING)
-        RUNNING = True
-
-        if AUTOMATION_THREAD is None or not AUTOMATION_THREAD.is_alive():
-            AUTOMATION_THREAD = threading.Thread(target=automation_loop, daemon=True)
-            AUTOMATION_THREAD.start()
+    """Otomasyonu başlatır veya çalışan planı atomik olarak değiştirir."""
+    global CURRENT_CONFIG
+    config_dict = config.model_dump()
+    # Parsing/validation happens here once; the loop only does O(1) plan lookups.
+    plan = compile_plan(config_dict)
+    recorder = get_default_client().recorder
+    if recorder is not None:
+        # Tekrar oynatma (`runepilot.testing.replay`) kayıttaki config ile başlar.
+        recorder.note("config", config_dict)
+    already_running = AUTOMATION_ENGINE.start(plan, AutomationRuntime())
+    CURRENT_CONFIG = config_dict
 
     return {"status": "updated" if already_running else "started", "config": CURRENT_CONFIG}
 
 @app.post("/stop_automation")
 def stop_automation():
-    """Otomasyonu durdurur (thread bir sonraki turda döngüden çıkar)."""
-    global RUNNING
-    with AUTOMATION_LOCK:
-        RUNNING = False
+    """Otomasyonu durdurur (döngü görevi hemen iptal edilir)."""
+    AUTOMATION_ENGINE.stop()
     return {"status": "stopped"}
@@ -4,3 +4,6 @@ import os
 import sys
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# `fake_lcu` gibi paylaşılan fixture'lar.
+pytest_plugins = ["runepilot.testing.fixtures"]
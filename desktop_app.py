@@ -47,7 +47,9 @@ from PyQt6.QtCore import Qt, QTimer, QObject, QEvent, pyqtSignal, QSize
 
 from win10toast import ToastNotifier
 
+from runepilot.infrastructure.lcu_async import lcu_gather
 from runepilot.infrastructure.lcu_client import lcu_request
+from runepilot.infrastructure.lockfile_watcher import get_default_watcher
 from runepilot.infrastructure.resource_paths import resource_path
 from skins_dialog import SkinSelectDialog
 from rune_presets_dialog import RunePresetsDialog
@@ -1247,8 +1249,18 @@ class MainWindow(QMainWindow):
         champ_id_int = int(champ_id)
         base_skin_id = champ_id_int * 1000
 
+        # Şampiyon verisi ve kostüm envanteri birbirinden bağımsız: eşzamanlı çek.
+        champ_res, inv_res = lcu_gather(
+            [
+                f"/lol-game-data/assets/v1/champions/{champ_id_int}.json",
+                "/lol-inventory/v2/inventory/CHAMPION_SKIN",
+            ]
+        )
+        for res in (champ_res, inv_res):
+            if isinstance(res, Exception):
+                raise res
+
         skin_name_by_id: dict[int, str] = {}
-        champ_res = lcu_request("GET", f"/lol-game-data/assets/v1/champions/{champ_id_int}.json")
         if champ_res.status_code == 200:
             try:
                 champ_json = champ_res.json()
@@ -1268,7 +1280,6 @@ class MainWindow(QMainWindow):
                         skin_name_by_id[sid] = name.strip()
 
         owned_skin_ids: set[int] = set()
-        inv_res = lcu_request("GET", "/lol-inventory/v2/inventory/CHAMPION_SKIN")
         if inv_res.status_code == 200:
             try:
                 inv = inv_res.json()
@@ -1991,9 +2002,18 @@ class MainWindow(QMainWindow):
                 cb.clear()
                 cb.addItem("Seçiniz", None)
 
+        # Tüm şampiyonlar ve sahip olunanlar bağımsız okumalar: eşzamanlı çek.
+        summary_res, owned_res = lcu_gather(
+            [
+                "/lol-game-data/assets/v1/champion-summary.json",
+                "/lol-champions/v1/owned-champions-minimal",
+            ]
+        )
+
         try:
-            res = lcu_request("GET", "/lol-game-data/assets/v1/champion-summary.json")
-            all_champs = res.json()
+            if isinstance(summary_res, Exception):
+                raise summary_res
+            all_champs = summary_res.json()
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Şampiyon listesi alınamadı:\n{e}")
             return
@@ -2013,8 +2033,9 @@ class MainWindow(QMainWindow):
         # Pick: prefer owned / free-to-play champions to prevent pick errors
         pick_entries = {}
         try:
-            res = lcu_request("GET", "/lol-champions/v1/owned-champions-minimal")
-            owned_champs = res.json()
+            if isinstance(owned_res, Exception):
+                raise owned_res
+            owned_champs = owned_res.json()
             if isinstance(owned_champs, list):
                 for champ in owned_champs:
                     try:
@@ -2059,6 +2080,9 @@ class MainWindow(QMainWindow):
         LCU gameflow fazını izler.
         GameStart veya InProgress olduğunda bir kere bildirim atar.
         """
+        # İstemci kapalıyken her tikte exception üretmek yerine lockfile izleyicisine sor.
+        if not get_default_watcher().client_up:
+            return
         try:
             res = lcu_request("GET", "/lol-gameflow/v1/gameflow-phase")
             phase = res.json()
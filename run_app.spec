@@ -7,6 +7,7 @@ a = Analysis(
     binaries=[],
     datas=[
         ('runes.json', '.'),
+        ('runes.bin', '.'),
         ('assets/app_icon.png', 'assets'),
         ('assets/app_icon.ico', 'assets'),
     ],
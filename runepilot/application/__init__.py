@@ -0,0 +1,4 @@
+"""Application katmanı: otomasyon orkestrasyonu (zamanlama, akış kararları).
+
+Domain mantığını infrastructure erişimiyle birleştirir; HTTP/GUI'den bağımsızdır.
+"""
@@ -0,0 +1,108 @@
+"""
+Veri setlerinin (rün önerileri) servis çalışırken yeniden yüklenmesi.
+
+`DatasetReloader`, veriyi `build` ile baştan kurar ve hazır olunca `publish` ile tek
+seferde yayınlar. Kurulum yayındaki veriye dokunmaz; okuyucular yeniden yükleme
+sürerken eski, sonra yeni veriyi eksiksiz görür. Kurulum hata verirse (ör. yarım
+yazılmış JSON) eski veri yerinde kalır.
+
+Aynı anda tek yeniden yükleme çalışır (izleyici ve `/runes/reload` çakışırsa ikincisi
+bekler). Süreler ve sonuçlar Prometheus formatında dışa aktarılır (`/metrics`).
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+# Saniye cinsinden histogram üst sınırları (paket açmak ~ms, JSON derlemek ~10 ms).
+RELOAD_BUCKETS: tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+@dataclass(frozen=True)
+class ReloadResult:
+    """Bir yeniden yüklemenin sonucu (`error` yalnızca başarısızlıkta dolu)."""
+
+    ok: bool
+    duration: float
+    error: str | None = None
+
+
+class DatasetReloader(Generic[T]):
+    """Veriyi arka planda kurup atomik olarak yayınlayan yeniden yükleyici."""
+
+    def __init__(
+        self, build: Callable[[], T], publish: Callable[[T], None], *, name: str = "dataset"
+    ) -> None:
+        self._build = build
+        self._publish = publish
+        self.name = name
+        self._reload_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._buckets = [0] * (len(RELOAD_BUCKETS) + 1)
+        self._results = {"ok": 0, "error": 0}
+        self._total = 0.0
+        self.last: ReloadResult | None = None
+
+    def reload(self) -> ReloadResult:
+        """Veriyi yeniden kurar ve yayınlar; hata olursa yayındaki veri korunur."""
+        with self._reload_lock:
+            started = time.perf_counter()
+            try:
+                built = self._build()
+            except Exception as e:
+                result = ReloadResult(False, time.perf_counter() - started, str(e) or repr(e))
+            else:
+                self._publish(built)
+                result = ReloadResult(True, time.perf_counter() - started)
+            self._observe(result)
+            return result
+
+    def _observe(self, result: ReloadResult) -> None:
+        bucket = bisect_left(RELOAD_BUCKETS, result.duration)
+        with self._lock:
+            self._buckets[bucket] += 1
+            self._results["ok" if result.ok else "error"] += 1
+            self._total += result.duration
+            self.last = result
+
+    def snapshot(self) -> dict[str, object]:
+        """Test/teşhis için sayaçların kopyası."""
+        with self._lock:
+            return {
+                "results": dict(self._results),
+                "sum": self._total,
+                "buckets": list(self._buckets),
+            }
+
+    def render_prometheus(self) -> str:
+        """Yeniden yükleme sayaçlarını ve süre histogramını Prometheus formatında döndürür."""
+        snapshot = self.snapshot()
+        results: dict[str, int] = snapshot["results"]  # type: ignore[assignment]
+        buckets: list[int] = snapshot["buckets"]  # type: ignore[assignment]
+        prefix = f"{self.name}_reload"
+        lines = [
+            f"# HELP {prefix}s_total Dataset reloads by result.",
+            f"# TYPE {prefix}s_total counter",
+        ]
+        for outcome, n in sorted(results.items()):
+            lines.append(f'{prefix}s_total{{result="{outcome}"}} {n}')
+        lines += [
+            f"# HELP {prefix}_duration_seconds Time to rebuild and publish the dataset.",
+            f"# TYPE {prefix}_duration_seconds histogram",
+        ]
+        cumulative = 0
+        for upper, n in zip(RELOAD_BUCKETS, buckets[:-1], strict=True):
+            cumulative += n
+            lines.append(f'{prefix}_duration_seconds_bucket{{le="{upper}"}} {cumulative}')
+        count = sum(results.values())
+        lines.append(f'{prefix}_duration_seconds_bucket{{le="+Inf"}} {count}')
+        lines.append(f"{prefix}_duration_seconds_sum {snapshot['sum']}")
+        lines.append(f"{prefix}_duration_seconds_count {count}")
+        return "\n".join(lines) + "\n"
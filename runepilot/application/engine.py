@@ -0,0 +1,195 @@
+"""
+asyncio tabanlı otomasyon motoru.
+
+Otomasyon döngüsü bir thread yerine tek bir asyncio görevi olarak çalışır:
+
+- FastAPI lifespan'i `attach` ile servisin event loop'unu verir; HTTP ve otomasyon
+  aynı loop'u paylaşır. Loop verilmemişse (testler, benchmark, lifespan'siz
+  kullanım) motor kendi arka plan loop thread'ini açar.
+- `stop` görevi iptal eder; durdurma bir uyku aralığını beklemez.
+- `start` plan ve tur durumunu tek bir atama ile değiştirir; döngü her turda
+  `state` üzerinden tutarlı bir (plan, runtime) çifti okur.
+- İptal, worker thread'inde süren senkron bir yazmayı durduramaz. Yazmalar
+  `run_in_thread` ile tek kilit altında sırayla çalışır: yeni döngü eskisinin yarıda
+  kalan yazması bitmeden yazmaya başlamaz, durdurulmuş döngünün henüz başlamamış
+  yazmaları ise hiç çalışmaz (nesil kontrolü).
+
+Tüm public metotlar thread-safe'tir; loop'a `call_soon_threadsafe` ile geçilir.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections.abc import Callable, Coroutine
+from typing import Any, TypeVar
+
+from runepilot.domain.automation_plan import AutomationPlan, AutomationRuntime
+
+EngineBody = Callable[["AutomationEngine"], Coroutine[Any, Any, None]]
+EngineState = tuple[AutomationPlan, AutomationRuntime]
+T = TypeVar("T")
+
+
+class AutomationEngine:
+    """Otomasyon döngüsünü (`body`) bir asyncio görevinde başlatıp durduran motor."""
+
+    def __init__(self, body: EngineBody) -> None:
+        self._body = body
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._hosted = False
+        self._task: asyncio.Task[None] | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._running = False
+        self._state: EngineState | None = None
+        self._stopped = threading.Event()
+        self._stopped.set()
+        # Worker thread'indeki yazmalar; iptal edilen görevin yazması da bitene kadar tutulur.
+        self._writes = threading.Lock()
+        self._generation = 0
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    @property
+    def state(self) -> EngineState | None:
+        """Geçerli (plan, runtime) çifti; tek atama ile değiştiği için her zaman tutarlı."""
+        return self._state
+
+    def attach(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Motoru servisin event loop'una bağlar (FastAPI lifespan başlangıcı)."""
+        with self._lock:
+            if self._loop is None:
+                self._loop, self._hosted = loop, True
+
+    async def shutdown(self) -> None:
+        """Görevi iptal eder, bitmesini bekler ve loop bağını çözer (lifespan sonu)."""
+        self.stop()
+        task = self._task
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            await asyncio.gather(task, return_exceptions=True)
+        with self._lock:
+            if self._hosted and self._task is None:
+                self._loop, self._hosted = None, False
+
+    def start(self, plan: AutomationPlan, runtime: AutomationRuntime) -> bool:
+        """Planı atomik olarak değiştirir, gerekiyorsa döngüyü başlatır; zaten çalışıyorsa True."""
+        with self._lock:
+            self._state = (plan, runtime)
+            already_running = self._running
+            self._running = True
+            if not already_running:
+                self._stopped.clear()
+            loop = self._ensure_loop()
+        loop.call_soon_threadsafe(self._spawn)
+        self.wake()
+        return already_running
+
+    def stop(self) -> None:
+        """Döngü görevini iptal eder (bekleme veya LCU okuması ortasında da olsa)."""
+        with self._lock:
+            self._running = False
+            self._generation += 1
+            loop = self._loop
+        if loop is not None:
+            self._call_soon(loop, self._cancel)
+
+    def join(self, timeout: float | None = None) -> bool:
+        """Döngü görevi ve yarıda kalan yazması bitene kadar bekler (testler/benchmark için)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if not self._stopped.wait(timeout):
+            return False
+        remaining = -1 if deadline is None else max(0.0, deadline - time.monotonic())
+        if not self._writes.acquire(timeout=remaining):
+            return False
+        self._writes.release()
+        return True
+
+    def wake(self) -> None:
+        """Bekleyen döngüyü uyandırır (WebSocket olayı, lockfile değişimi, yeni plan)."""
+        loop, wakeup = self._loop, self._wakeup
+        if loop is not None and wakeup is not None:
+            self._call_soon(loop, wakeup.set)
+
+    async def wait(self, timeout: float) -> bool:
+        """`wake` çağrılana (True) veya süre dolana (False) kadar bekler."""
+        wakeup = self._wakeup
+        if wakeup is None:
+            await asyncio.sleep(timeout)
+            return False
+        try:
+            async with asyncio.timeout(timeout):
+                await wakeup.wait()
+            return True
+        except TimeoutError:
+            return False
+        finally:
+            wakeup.clear()
+
+    async def run_in_thread(self, fn: Callable[..., T], *args: Any) -> T | None:
+        """
+        Senkron bir yazmayı worker thread'inde, diğer yazmalarla sırayla çalıştırır.
+
+        Çağıran döngü bu arada durdurulduysa veya yerine yenisi başladıysa `fn` hiç
+        çalışmaz ve `None` döner.
+        """
+        with self._lock:
+            generation = self._generation
+        return await asyncio.to_thread(self._run_exclusive, generation, fn, *args)
+
+    def _run_exclusive(self, generation: int, fn: Callable[..., T], *args: Any) -> T | None:
+        with self._writes:
+            if generation != self._generation:
+                return None
+            return fn(*args)
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="automation", daemon=True).start()
+            self._loop = loop
+        return self._loop
+
+    @staticmethod
+    def _call_soon(loop: asyncio.AbstractEventLoop, callback: Callable[[], Any]) -> None:
+        try:
+            loop.call_soon_threadsafe(callback)
+        except RuntimeError:
+            pass  # loop kapandı (servis kapanıyor)
+
+    def _spawn(self) -> None:
+        with self._lock:
+            if self._task is not None:
+                return  # çalışan görev yeni planı bir sonraki turda okur
+            if not self._running:
+                self._stopped.set()
+                return
+            self._wakeup = asyncio.Event()
+            self._generation += 1
+            self._task = asyncio.get_running_loop().create_task(self._body(self))
+        self._task.add_done_callback(self._on_done)
+
+    def _cancel(self) -> None:
+        task = self._task
+        if task is not None:
+            task.cancel()
+        else:
+            self._spawn()
+
+    def _on_done(self, task: asyncio.Task[None]) -> None:
+        cancelled = task.cancelled()
+        if not cancelled and task.exception() is not None:
+            print(f"[AUTO] Automation engine crashed: {task.exception()}")
+        with self._lock:
+            self._task = None
+            if not cancelled:
+                self._running = False  # döngü kendiliğinden bitti/çöktü; yeniden başlatılmaz
+            restart = self._running
+        if restart:
+            # stop → start hızlıca art arda geldi: iptal edilen görevin yerine yenisi.
+            self._spawn()
+        else:
+            self._stopped.set()
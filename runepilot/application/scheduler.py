@@ -0,0 +1,191 @@
+"""
+Gameflow fazına duyarlı otomasyon zamanlayıcısı.
+
+Otomasyon döngüsü her turda hangi LCU kaynaklarını okuyacağını ve ne kadar
+bekleyeceğini buradan öğrenir:
+
+- `ChampSelect`: yalnızca faz + champ select oturumu, 150 ms'de bir (pick penceresi).
+- `Matchmaking` / `ReadyCheck`: faz + ready-check, 250 ms'de bir.
+- `Lobby` / `None`: yalnızca faz, saniyede bir. Kuyruk adımı doğrulanmış durumda hiç
+  istek atmaz (`QueueStateMachine`); başarısız bir aksiyon `RETRY_INTERVAL` sonra
+  yeniden denenir.
+- Oyun içi fazlar: yalnızca faz, 10 sn'de bir (WebSocket varken dakikada bir).
+
+WebSocket bağlıyken olaylar zaten anında gelir; polling aralığı yerine fazın
+`resync_interval` emniyet ağı kullanılır. Olay beklemeden vadesi gelen iş varsa
+(başarısız bir champ select adımı, kuyruk yeniden denemesi) bekleme o vadeye kısalır. Kararlar ve uyanma sayıları Prometheus
+formatında dışa aktarılır (`/metrics`).
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+
+GAMEFLOW_PHASE_URI = "/lol-gameflow/v1/gameflow-phase"
+READY_CHECK_URI = "/lol-matchmaking/v1/ready-check"
+CHAMP_SELECT_SESSION_URI = "/lol-champ-select/v1/session"
+ALL_URIS = (GAMEFLOW_PHASE_URI, READY_CHECK_URI, CHAMP_SELECT_SESSION_URI)
+
+WAKEUP_EVENT = "event"
+WAKEUP_TIMER = "timer"
+
+
+@dataclass(frozen=True)
+class PhasePolicy:
+    """Bir faz için polling aralığı (sn), WebSocket varken emniyet ağı aralığı ve uri'ler."""
+
+    interval: float
+    resync_interval: float
+    uris: tuple[str, ...]
+
+
+_IDLE = PhasePolicy(1.0, 5.0, (GAMEFLOW_PHASE_URI,))
+_QUEUE = PhasePolicy(0.25, 5.0, (GAMEFLOW_PHASE_URI, READY_CHECK_URI))
+_CHAMP_SELECT = PhasePolicy(0.15, 5.0, (GAMEFLOW_PHASE_URI, CHAMP_SELECT_SESSION_URI))
+_IN_GAME = PhasePolicy(10.0, 60.0, (GAMEFLOW_PHASE_URI,))
+
+# Faz bilinmiyorsa (ilk tur, hata) her şey okunur; eski davranışla aynı.
+DEFAULT_POLICY = PhasePolicy(1.0, 5.0, ALL_URIS)
+
+PHASE_POLICIES: dict[str, PhasePolicy] = {
+    "None": _IDLE,
+    "Lobby": _IDLE,
+    "Matchmaking": _QUEUE,
+    "ReadyCheck": _QUEUE,
+    "ChampSelect": _CHAMP_SELECT,
+    "GameStart": _IN_GAME,
+    "InProgress": _IN_GAME,
+    "Reconnect": _IN_GAME,
+    "WaitingForStats": _IN_GAME,
+    "PreEndOfGame": _IN_GAME,
+    "EndOfGame": _IDLE,
+}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class PhaseScheduler:
+    """
+    Faza göre hangi uri'lerin ne sıklıkla okunacağına karar verir ve sayar.
+
+    Saf karar + sayaç nesnesidir; beklemeyi/isteği çağıran yapar. Sayaçlar
+    `/metrics` isteğiyle farklı thread'den okunduğu için kilit altındadır.
+    """
+
+    def __init__(
+        self,
+        policies: dict[str, PhasePolicy] | None = None,
+        default: PhasePolicy = DEFAULT_POLICY,
+    ) -> None:
+        self._policies = PHASE_POLICIES if policies is None else policies
+        self._default = default
+        self._lock = threading.Lock()
+        self._wakeups: dict[str, int] = {}
+        self._decisions: dict[tuple[str, str], int] = {}
+        self._polls: dict[tuple[str, str], int] = {}
+        self._last_wait = 0.0
+
+    def policy(self, phase: str | None) -> PhasePolicy:
+        if phase is None:
+            return self._default
+        return self._policies.get(phase, self._default)
+
+    def poll_due(self, phase: str | None, *, connected: bool, since_poll: float) -> bool:
+        """WebSocket yoksa her tur REST okunur; varsa yalnızca emniyet ağı aralığında."""
+        return not connected or since_poll >= self.policy(phase).resync_interval
+
+    def next_wait(
+        self,
+        phase: str | None,
+        *,
+        connected: bool,
+        since_poll: float,
+        due_in: float | None = None,
+    ) -> float:
+        """
+        Bir sonraki tura kadar beklenecek süre (olay gelirse daha erken uyanılır).
+
+        `due_in`: olay gelmeden yapılacak işin vadesine kalan süre (başarısız bir adım hâlâ
+        bekliyor → 0, kuyruk yeniden denemesi → kalan süre). WebSocket bağlıyken bile
+        bekleme bu süreyle, en az fazın polling aralığı olacak şekilde kısaltılır.
+        """
+        policy = self.policy(phase)
+        if connected:
+            mode, wait = "events", max(0.0, policy.resync_interval - since_poll)
+        else:
+            mode, wait = "poll", policy.interval
+        if due_in is not None and max(due_in, policy.interval) < wait:
+            mode, wait = "due", max(due_in, policy.interval)
+        key = (_label(phase), mode)
+        with self._lock:
+            self._decisions[key] = self._decisions.get(key, 0) + 1
+            self._last_wait = wait
+        return wait
+
+    def record_wakeup(self, reason: str) -> None:
+        """Döngünün neden uyandığını sayar (`WAKEUP_EVENT` / `WAKEUP_TIMER`)."""
+        with self._lock:
+            self._wakeups[reason] = self._wakeups.get(reason, 0) + 1
+
+    def record_poll(self, phase: str | None, uris: tuple[str, ...] | list[str]) -> None:
+        label = _label(phase)
+        with self._lock:
+            for uri in uris:
+                key = (label, uri)
+                self._polls[key] = self._polls.get(key, 0) + 1
+
+    def snapshot(self) -> dict[str, object]:
+        """Test/teşhis için sayaçların kopyası."""
+        with self._lock:
+            return {
+                "wakeups": dict(self._wakeups),
+                "decisions": dict(self._decisions),
+                "polls": dict(self._polls),
+                "last_wait": self._last_wait,
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._wakeups.clear()
+            self._decisions.clear()
+            self._polls.clear()
+            self._last_wait = 0.0
+
+    def render_prometheus(self) -> str:
+        """Zamanlayıcı sayaçlarını Prometheus text exposition formatında döndürür."""
+        snap = self.snapshot()
+        lines = [
+            "# HELP automation_wakeups_total Automation loop wakeups by reason.",
+            "# TYPE automation_wakeups_total counter",
+        ]
+        for reason, n in sorted(snap["wakeups"].items()):  # type: ignore[union-attr]
+            lines.append(f'automation_wakeups_total{{reason="{_escape(reason)}"}} {n}')
+        lines += [
+            "# HELP automation_schedule_decisions_total Scheduling decisions by phase and mode.",
+            "# TYPE automation_schedule_decisions_total counter",
+        ]
+        for (phase, mode), n in sorted(snap["decisions"].items()):  # type: ignore[union-attr]
+            lines.append(
+                f'automation_schedule_decisions_total{{phase="{_escape(phase)}",mode="{mode}"}} {n}'
+            )
+        lines += [
+            "# HELP automation_polls_total REST reads issued by the automation loop.",
+            "# TYPE automation_polls_total counter",
+        ]
+        for (phase, uri), n in sorted(snap["polls"].items()):  # type: ignore[union-attr]
+            lines.append(
+                f'automation_polls_total{{phase="{_escape(phase)}",uri="{_escape(uri)}"}} {n}'
+            )
+        lines += [
+            "# HELP automation_next_wait_seconds Most recent wait chosen by the scheduler.",
+            "# TYPE automation_next_wait_seconds gauge",
+            f"automation_next_wait_seconds {snap['last_wait']}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def _label(phase: str | None) -> str:
+    return phase if phase is not None else "unknown"
@@ -0,0 +1,249 @@
+"""
+Otomasyon konfigürasyonunun derlenmiş, değişmez yürütme planı (saf domain mantığı).
+
+GUI'den gelen ham `AutomationConfig` sözlüğü `/start_automation` başına bir kez
+`compile_plan` ile doğrulanıp normalize edilir: roller büyük harfe çevrilir, id'ler
+pozitif tamsayıya indirgenir, spell çiftleri (şampiyon özel → rol → varsayılan)
+önceliğiyle önceden çözülür ve geçersiz girdiler atılır. Otomasyon döngüsü her turda
+yalnızca (rol, championId) anahtarlı O(1) sorgular yapar.
+
+Tur boyunca değişen bayraklar (rünlerin uygulanması/ön hazırlığı, kostüm
+uzlaştırıcısı, oturum farkı) plana değil `AutomationRuntime`'a aittir.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any
+
+from runepilot.domain.champions import normalize_champion_id
+from runepilot.domain.selection import SelectionReconciler
+from runepilot.domain.session_diff import SessionDiffer
+from runepilot.domain.spells import extract_spell_pair, normalize_spell_id
+
+RUNE_PRESET_SLOTS = (1, 2, 3)
+RUNE_PAGE_PERK_COUNT = 9
+
+SpellPair = tuple[int | None, int | None]
+
+
+@dataclass(frozen=True)
+class RunePreset:
+    """Kullanıcının kaydettiği, doğrulanmış özel rün sayfası."""
+
+    primary_style_id: int
+    sub_style_id: int
+    selected_perk_ids: tuple[int, ...]
+
+    def as_page(self) -> dict[str, Any]:
+        return {
+            "primaryStyleId": self.primary_style_id,
+            "subStyleId": self.sub_style_id,
+            "selectedPerkIds": list(self.selected_perk_ids),
+        }
+
+
+def _frozen(mapping: dict) -> Mapping:
+    return MappingProxyType(mapping)
+
+
+@dataclass(frozen=True)
+class AutomationPlan:
+    """`AutomationConfig`'ten derlenen değişmez plan; tüm sorgular O(1)."""
+
+    primary_role: str = ""
+    queue_id: int | None = None
+    auto_queue: bool = True
+    prestage_runes: bool = False
+    position_preferences: Mapping[str, str] = field(default_factory=lambda: _frozen({}))
+    bans: Mapping[str, int] = field(default_factory=lambda: _frozen({}))
+    picks: Mapping[str, tuple[int, ...]] = field(default_factory=lambda: _frozen({}))
+    default_spells: SpellPair = (None, None)
+    role_spells: Mapping[str, SpellPair] = field(default_factory=lambda: _frozen({}))
+    champion_spells: Mapping[tuple[str, int], SpellPair] = field(
+        default_factory=lambda: _frozen({})
+    )
+    skins: Mapping[tuple[str, int], int] = field(default_factory=lambda: _frozen({}))
+    rune_slots: Mapping[int, int] = field(default_factory=lambda: _frozen({}))
+    # (championId, slot) → preset; `None` değeri "kayıt var ama geçersiz" demektir.
+    rune_presets: Mapping[tuple[int, int], RunePreset | None] = field(
+        default_factory=lambda: _frozen({})
+    )
+
+    def role_key(self, assigned_role: str) -> str:
+        """Atanmış rol yoksa (blind pick, custom) birincil rol kullanılır."""
+        return assigned_role or self.primary_role
+
+    def ban_for(self, role: str) -> int | None:
+        return self.bans.get(role)
+
+    def picks_for(self, role: str) -> tuple[int, ...]:
+        return self.picks.get(role, ())
+
+    def spells_for(self, role: str, champion_id: int) -> SpellPair:
+        if champion_id:
+            pair = self.champion_spells.get((role, champion_id))
+            if pair is not None:
+                return pair
+        return self.role_spells.get(role, self.default_spells)
+
+    def skin_for(self, role: str, champion_id: int) -> int | None:
+        """Hedef kostüm: rol/şampiyon için seçilen, yoksa varsayılan kostüm."""
+        if not champion_id:
+            return None
+        return self.skins.get((role, champion_id), champion_id * 1000)
+
+
+@dataclass
+class AutomationRuntime:
+    """Otomasyonun tur boyunca değişen durumu (her `/start_automation` ile sıfırlanır)."""
+
+    runes_applied: bool = False
+    # Ön hazırlık modu: rün sayfası yazılan şampiyon (0: yok).
+    runes_staged_for: int = 0
+    selection: SelectionReconciler = field(default_factory=SelectionReconciler)
+    # Son oturum yükünün özetleri: handler'lar yalnızca ilgili parça değişince çalışır.
+    session_diff: SessionDiffer = field(default_factory=SessionDiffer)
+
+    def leave_champ_select(self) -> None:
+        """Champ select bitti; bir sonraki oturum sıfırdan başlar."""
+        self.runes_applied = False
+        self.runes_staged_for = 0
+        self.selection.reset()
+        self.session_diff.reset()
+
+
+def _role(value: Any) -> str:
+    return str(value).upper() if value else ""
+
+
+def _resolve_spells(custom_entry: Any, role_entry: Any, defaults: SpellPair) -> SpellPair:
+    has_s1, s1, has_s2, s2 = extract_spell_pair(custom_entry)
+    r_has_s1, r_s1, r_has_s2, r_s2 = extract_spell_pair(role_entry)
+    if not has_s1 and r_has_s1:
+        has_s1, s1 = True, r_s1
+    if not has_s2 and r_has_s2:
+        has_s2, s2 = True, r_s2
+    if not has_s1:
+        s1 = defaults[0]
+    if not has_s2:
+        s2 = defaults[1]
+    return s1, s2
+
+
+def _rune_preset(raw: Any) -> RunePreset | None:
+    if not isinstance(raw, dict):
+        return None
+    try:
+        primary = int(raw.get("primaryStyleId"))  # type: ignore[arg-type]
+        sub = int(raw.get("subStyleId"))  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return None
+    perks: list[int] = []
+    for value in raw.get("selectedPerkIds") or []:
+        try:
+            perks.append(int(value))
+        except (TypeError, ValueError):
+            continue
+    if len(perks) != RUNE_PAGE_PERK_COUNT:
+        return None
+    return RunePreset(primary, sub, tuple(perks))
+
+
+def _dict(value: Any) -> dict:
+    return value if isinstance(value, dict) else {}
+
+
+def compile_plan(config: Mapping[str, Any]) -> AutomationPlan:
+    """Ham konfigürasyon sözlüğünü (`AutomationConfig.model_dump()`) plana derler."""
+    position_preferences: dict[str, str] = {}
+    if config.get("primary_role"):
+        position_preferences["firstPreference"] = _role(config["primary_role"])
+    if config.get("secondary_role"):
+        position_preferences["secondPreference"] = _role(config["secondary_role"])
+
+    try:
+        queue_id = int(config.get("queue_id") or 0) or None
+    except (TypeError, ValueError):
+        queue_id = None
+
+    bans: dict[str, int] = {}
+    for role, raw in _dict(config.get("role_bans")).items():
+        champion_id = normalize_champion_id(raw)
+        if champion_id is not None:
+            bans[_role(role)] = champion_id
+
+    picks: dict[str, tuple[int, ...]] = {}
+    for role, raw in _dict(config.get("role_champions")).items():
+        ids = [normalize_champion_id(c) for c in raw] if isinstance(raw, list) else []
+        picks[_role(role)] = tuple(c for c in ids if c is not None)
+
+    defaults = (
+        normalize_spell_id(config.get("primary_summoner_spell")),
+        normalize_spell_id(config.get("secondary_summoner_spell")),
+    )
+    role_entries = {_role(r): e for r, e in _dict(config.get("role_summoner_spells")).items()}
+    role_spells = {
+        role: _resolve_spells(None, entry, defaults) for role, entry in role_entries.items()
+    }
+    champion_spells: dict[tuple[str, int], SpellPair] = {}
+    for role, per_champion in _dict(config.get("custom_summoner_spells")).items():
+        role = _role(role)
+        for champ_key, entry in _dict(per_champion).items():
+            champion_id = normalize_champion_id(champ_key)
+            if champion_id is not None:
+                champion_spells[(role, champion_id)] = _resolve_spells(
+                    entry, role_entries.get(role), defaults
+                )
+
+    skins: dict[tuple[str, int], int] = {}
+    for role, per_champion in _dict(config.get("custom_skins")).items():
+        for champ_key, raw in _dict(per_champion).items():
+            champion_id = normalize_champion_id(champ_key)
+            try:
+                skin_id = int(raw)
+            except (TypeError, ValueError):
+                continue
+            if champion_id is not None:
+                skins[(_role(role), champion_id)] = skin_id
+
+    rune_slots: dict[int, int] = {}
+    for champ_key, raw in _dict(config.get("rune_selection")).items():
+        champion_id = normalize_champion_id(champ_key)
+        try:
+            slot = int(raw or 0)
+        except (TypeError, ValueError):
+            continue
+        if champion_id is not None and slot in RUNE_PRESET_SLOTS:
+            rune_slots[champion_id] = slot
+
+    rune_presets: dict[tuple[int, int], RunePreset | None] = {}
+    for champ_key, presets in _dict(config.get("custom_runes")).items():
+        champion_id = normalize_champion_id(champ_key)
+        if champion_id is None:
+            continue
+        for slot_key, raw in _dict(presets).items():
+            try:
+                slot = int(slot_key)
+            except (TypeError, ValueError):
+                continue
+            if slot in RUNE_PRESET_SLOTS:
+                rune_presets[(champion_id, slot)] = _rune_preset(raw)
+
+    return AutomationPlan(
+        primary_role=_role(config.get("primary_role")),
+        queue_id=queue_id,
+        auto_queue=bool(config.get("auto_queue", True)),
+        prestage_runes=bool(config.get("prestage_runes", False)),
+        position_preferences=_frozen(position_preferences),
+        bans=_frozen(bans),
+        picks=_frozen(picks),
+        default_spells=defaults,
+        role_spells=_frozen(role_spells),
+        champion_spells=_frozen(champion_spells),
+        skins=_frozen(skins),
+        rune_slots=_frozen(rune_slots),
+        rune_presets=_frozen(rune_presets),
+    )
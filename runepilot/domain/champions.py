@@ -7,6 +7,8 @@
 
 from __future__ import annotations
 
+from typing import Any
+
 # LCU alias'ı ile runes.json slug'ının ayrıştığı özel durumlar.
 _SPECIAL_SLUGS: dict[str, str] = {
     "MonkeyKing": "wukong",
@@ -20,3 +22,12 @@ def champion_slug_from_alias(alias: str) -> str:
     if alias in _SPECIAL_SLUGS:
         return _SPECIAL_SLUGS[alias]
     return alias.lower()
+
+
+def normalize_champion_id(value: Any) -> int | None:
+    """Kullanıcı/LCU inputunu pozitif champ_id değerine normalize eder."""
+    try:
+        cid = int(value)
+    except (TypeError, ValueError):
+        return None
+    return cid if cid > 0 else None
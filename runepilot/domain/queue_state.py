@@ -0,0 +1,196 @@
+"""
+Lobi/kuyruk durum makinesi (saf domain mantığı).
+
+Otomasyon lobiyi her turda yeniden sorgulamak yerine doğrulanmış durumu hatırlar
+ve yalnızca bir geçiş gerektiğinde aksiyon üretir:
+
+    NoLobby → LobbyWrongQueue → LobbyReady → RolesSet → Searching
+
+Durum şu kaynaklardan öğrenilir; hiçbiri periyodik okuma değildir:
+
+- gameflow fazı: `"None"` → lobi yok, `Matchmaking` → arama sürüyor, kuyruk dışı
+  fazlar (ChampSelect, oyun içi...) → lobi bilgisi geçersiz; okunamayan faz (`None`)
+  lobinin yokluğu sayılmaz, lobi yeniden okunur,
+- `/lol-lobby/v2/lobby` WebSocket olayları ve okuması (kuyruk, yerel oyuncunun rolleri),
+- kendi yazmalarımızın başarılı yanıtları (lobi oluşturma, rol PUT'u, arama POST'u).
+
+Lobi okuması yalnızca durum bilinmiyorsa yapılır. Başarısız bir aksiyon
+`RETRY_INTERVAL` boyunca tekrarlanmaz; arama başlatıldığı halde faz
+`SEARCH_CONFIRM_TIMEOUT` içinde `Matchmaking`'e geçmezse arama yeniden denenir.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+from runepilot.domain.automation_plan import AutomationPlan
+
+UNKNOWN = "Unknown"
+NO_LOBBY = "NoLobby"
+LOBBY_WRONG_QUEUE = "LobbyWrongQueue"
+LOBBY_READY = "LobbyReady"
+ROLES_SET = "RolesSet"
+SEARCHING = "Searching"
+
+ACTION_READ_LOBBY = "read_lobby"
+ACTION_CREATE_LOBBY = "create_lobby"
+ACTION_RECREATE_LOBBY = "recreate_lobby"
+ACTION_SET_ROLES = "set_roles"
+ACTION_START_SEARCH = "start_search"
+
+# Lobi/kuyruk aksiyonlarının yapılabildiği gameflow fazları.
+QUEUE_ACTION_PHASES = (None, "None", "Lobby")
+MATCHMAKING_PHASE = "Matchmaking"
+
+RETRY_INTERVAL = 5.0
+# Bir turda zincirlenebilecek en fazla aksiyon: okuma + lobi + roller + arama.
+MAX_ACTIONS_PER_TICK = 4
+SEARCH_CONFIRM_TIMEOUT = 5.0
+
+# Lobi yükündeki yerel oyuncu alanları → position-preferences gövdesi anahtarları.
+_LOBBY_ROLE_KEYS = {
+    "firstPositionPreference": "firstPreference",
+    "secondPositionPreference": "secondPreference",
+}
+
+_UNSET: Any = object()
+
+
+def _lobby_queue_id(lobby: Mapping[str, Any]) -> int:
+    try:
+        return int((lobby.get("gameConfig") or {}).get("queueId") or 0)
+    except (TypeError, ValueError, AttributeError):
+        return 0
+
+
+def _lobby_roles(lobby: Mapping[str, Any]) -> dict[str, str] | None:
+    member = lobby.get("localMember")
+    if not isinstance(member, dict):
+        return None
+    roles = {
+        key: str(member.get(field) or "").upper()
+        for field, key in _LOBBY_ROLE_KEYS.items()
+        if member.get(field)
+    }
+    return roles or None
+
+
+class QueueStateMachine:
+    """Lobi/kuyruk adımının doğrulanmış durumu ve bir sonraki aksiyonu."""
+
+    def __init__(self) -> None:
+        self._retry_at = 0.0
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Lobi bilgisini unutur (yeni istemci/bağlantı: kaçırılmış değişiklik olabilir).
+
+        Başarısızlık sonrası bekleme korunur; yeniden bağlanma denemeyi hızlandırmaz.
+        """
+        self._phase: Any = _UNSET
+        # UNKNOWN: okunmadı; None: lobi yok; int: lobinin queueId'si (0: bilinmiyor).
+        self._lobby: Any = UNKNOWN
+        self._roles: dict[str, str] | None = None
+        self._searching = False
+        self._search_started_at = 0.0
+
+    def observe_phase(self, phase: str | None) -> None:
+        """
+        Gameflow fazını işler; yalnızca faz değiştiğinde bilgi güncellenir.
+
+        `None` okunamayan fazdır; istemcinin bildirdiği "lobi yok" fazı `"None"` string'idir.
+        """
+        if phase == self._phase:
+            return
+        previous, self._phase = self._phase, phase
+        if phase is None:
+            # Faz okunamadı (hata/zaman aşımı): lobi hâlâ var olabilir. Lobi oluşturmak
+            # premade grubu dağıtabileceği için önce lobi yeniden okunur.
+            self._lobby, self._roles = UNKNOWN, None
+        elif phase == "None":
+            self._lobby, self._roles, self._searching = None, None, False
+        elif phase == "Lobby":
+            # Lobi (kendi oluşturduğumuz veya aramadan dönülen) aynıdır.
+            if previous == MATCHMAKING_PHASE:
+                self._searching = False  # arama iptal edildi/bitti
+        elif phase == MATCHMAKING_PHASE:
+            self._searching = True
+        else:
+            # Kuyruk dışına çıkıldı; dönüşte lobi bir kez yeniden okunur.
+            self._lobby, self._roles, self._searching = UNKNOWN, None, False
+
+    def observe_lobby(self, lobby: Any) -> None:
+        """Lobi yükünü (okuma, olay veya oluşturma yanıtı) işler; `None` → lobi yok."""
+        if not isinstance(lobby, dict) or not lobby:
+            self._lobby, self._roles, self._searching = None, None, False
+            return
+        self._lobby = _lobby_queue_id(lobby)
+        self._roles = _lobby_roles(lobby)
+
+    def record_roles(self, preferences: Mapping[str, str]) -> None:
+        """Başarılı position-preferences PUT'u."""
+        self._roles = dict(preferences)
+
+    def record_search(self, now: float) -> None:
+        """Başarılı arama POST'u."""
+        self._searching = True
+        self._search_started_at = now
+
+    def record_failure(self, now: float) -> None:
+        """Aksiyon başarısız: durum yeniden okunur, deneme `RETRY_INTERVAL` sonra."""
+        self._lobby, self._roles, self._searching = UNKNOWN, None, False
+        self._retry_at = now + RETRY_INTERVAL
+
+    def state(self, plan: AutomationPlan) -> str:
+        if self._lobby is UNKNOWN:
+            return UNKNOWN
+        if self._lobby is None:
+            return NO_LOBBY
+        if self._searching:
+            return SEARCHING
+        if plan.auto_queue and plan.queue_id and self._lobby != plan.queue_id:
+            return LOBBY_WRONG_QUEUE
+        if not plan.position_preferences or self._roles == dict(plan.position_preferences):
+            return ROLES_SET
+        return LOBBY_READY
+
+    def due_at(self, plan: AutomationPlan, now: float) -> float | None:
+        """
+        Yeni bir gözlem olmadan `next_action`'ın aksiyon döndüreceği en erken an.
+
+        Başarısızlık beklemesi veya arama onayı sürüyorsa o an, aksiyon şimdi gerekiyorsa
+        `now`, hiçbir şey beklenmiyorsa `None`.
+        """
+        if self._phase not in QUEUE_ACTION_PHASES:
+            return None
+        if now < self._retry_at:
+            return self._retry_at
+        if self.state(plan) == SEARCHING:
+            return max(now, self._search_started_at + SEARCH_CONFIRM_TIMEOUT)
+        return now if self.next_action(plan, now) else None
+
+    def next_action(self, plan: AutomationPlan, now: float) -> str | None:
+        """Planın gerektirdiği bir sonraki aksiyon; yapılacak bir şey yoksa `None`."""
+        if self._phase not in QUEUE_ACTION_PHASES or now < self._retry_at:
+            return None
+        auto_queue = bool(plan.auto_queue and plan.queue_id)
+        state = self.state(plan)
+        if state == SEARCHING:
+            if now - self._search_started_at < SEARCH_CONFIRM_TIMEOUT:
+                return None
+            # Arama başladı ama faz Matchmaking'e geçmedi (ör. ceza süresi): yeniden dene.
+            self._searching = False
+            state = self.state(plan)
+        if state == UNKNOWN:
+            return ACTION_READ_LOBBY
+        if state == NO_LOBBY:
+            return ACTION_CREATE_LOBBY if auto_queue else None
+        if state == LOBBY_WRONG_QUEUE:
+            return ACTION_RECREATE_LOBBY
+        if state == LOBBY_READY:
+            return ACTION_SET_ROLES
+        if state == ROLES_SET and auto_queue:
+            return ACTION_START_SEARCH
+        return None
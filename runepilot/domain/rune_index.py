@@ -0,0 +1,387 @@
+"""
+`runes.json`'un önceden derlenmiş öneri indeksi (saf domain mantığı).
+
+Öneri verisi üç biçimde olabilir (aynı dosyada karışık da):
+
+1) `{"123": {"primaryStyleId", "subStyleId", "selectedPerkIds"}}` — şampiyon id'sine
+   doğrudan sayfa,
+2) `{"annie": {"rune_1": {"Domination": [...], "Sorcery": [...], "Shards": [...],
+   "Win Rate": "51.72%", ...}}}` — slug başına istatistikli aday sayfalar,
+3) `{"annie": {"MIDDLE": {"emerald_plus": {"15.23": {"rune_1": {...}, ...}}}}}` — aynı
+   aday sayfalar rol (`TOP`..`UTILITY`), tier ve patch'e göre. Herhangi bir boyutta
+   `any` anahtarı "boyutsuz" veri demektir; 2. biçim `(any, any, any)` varyantıdır.
+
+`compile_runes` veriyi bir kez dolaşır: her aday sayfa doğrulanır (iki ağaç, 9 perk),
+istatistikler ("52.49%", "116 Games") sayıya çevrilir ve adaylar öneri sırasına
+(win rate azalan, eşitlikte `rune_N` anahtarı azalan) dizilir. Öneri artık bir sözlük
+okumasıdır; id → slug eşlemesi de şampiyon başına bir kez çözülüp (`bind`) indekste
+saklanır.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+STYLE_ID_BY_NAME: dict[str, int] = {
+    "precision": 8000,
+    "domination": 8100,
+    "sorcery": 8200,
+    "inspiration": 8300,
+    "resolve": 8400,
+}
+
+PAGE_PERK_COUNT = 9
+
+# Varyant boyutlarında "herhangi biri": eski (boyutsuz) veri bu varyanta düşer.
+ANY = ""
+ANY_KEY = "any"
+ROLES = ("TOP", "JUNGLE", "MIDDLE", "BOTTOM", "UTILITY")
+
+_WIN_RATE_KEYS = ("Win Rate", "win_rate", "WinRate", "winRate", "WIN RATE")
+_PICK_RATE_KEYS = ("Pick Rate", "pick_rate", "PickRate", "pickRate")
+_GAME_COUNT_KEYS = ("Game Count", "game_count", "GameCount", "gameCount", "Games")
+_DIRECT_KEYS = ("primaryStyleId", "subStyleId", "selectedPerkIds")
+_NUMBER = re.compile(r"(\d+(?:\.\d+)?)")
+
+
+def safe_int_list(values: Any) -> list[int]:
+    """Liste içindeki değerleri int'e çevirir; çevrilemeyenleri atlar."""
+    result: list[int] = []
+    if not isinstance(values, list):
+        return result
+    for v in values:
+        try:
+            result.append(int(v))
+        except (TypeError, ValueError):
+            continue
+    return result
+
+
+def parse_stat(value: Any) -> float | None:
+    """İstatistik metnindeki ilk sayı ("51.72%" → 51.72, "116 Games" → 116); yoksa `None`."""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip().replace(",", ".")
+    match = _NUMBER.search(text)
+    if not match:
+        return None
+    try:
+        return float(match.group(1))
+    except ValueError:
+        return None
+
+
+def _first_stat(blob: Mapping[str, Any], keys: tuple[str, ...]) -> float | None:
+    return parse_stat(next((blob[k] for k in keys if blob.get(k)), None))
+
+
+@dataclass(frozen=True)
+class CompiledPage:
+    """Doğrulanmış bir öneri sayfası ve sayısal istatistikleri."""
+
+    name: str
+    primary_style_id: int
+    sub_style_id: int
+    selected_perk_ids: tuple[int, ...]
+    win_rate: float | None = None
+    pick_rate: float | None = None
+    games: int | None = None
+
+    def as_page(self) -> dict[str, Any]:
+        return {
+            "primaryStyleId": self.primary_style_id,
+            "subStyleId": self.sub_style_id,
+            "selectedPerkIds": list(self.selected_perk_ids),
+        }
+
+
+# (rol, tier, patch); her boyutta `ANY` joker.
+Variant = tuple[str, str, str]
+ANY_VARIANT: Variant = (ANY, ANY, ANY)
+ChampionPages = Mapping[Variant, tuple[CompiledPage, ...]]
+
+
+def _compile_direct(name: str, blob: Mapping[str, Any]) -> CompiledPage | None:
+    try:
+        primary_style_id = int(blob.get("primaryStyleId"))
+        sub_style_id = int(blob.get("subStyleId"))
+    except (TypeError, ValueError):
+        return None
+    selected = safe_int_list(blob.get("selectedPerkIds"))
+    if len(selected) != PAGE_PERK_COUNT:
+        return None
+    return CompiledPage(name, primary_style_id, sub_style_id, tuple(selected))
+
+
+def _compile_tree_page(name: str, blob: Mapping[str, Any]) -> CompiledPage | None:
+    """Ağaç listeli aday sayfayı doğrular; 4 perk'li ağaç birincil, 2 perk'li ikincildir."""
+    style_entries: list[tuple[str, int, int]] = []
+    shards: list[int] = []
+    shards_seen = False
+    for key, value in blob.items():
+        if not isinstance(key, str):
+            continue
+        normalized = key.strip().lower()
+        if normalized == "shards" and not shards_seen:
+            shards, shards_seen = safe_int_list(value), True
+            continue
+        style_id = STYLE_ID_BY_NAME.get(normalized)
+        if style_id is not None and isinstance(value, list):
+            style_entries.append((key, style_id, len(value)))
+
+    if len(style_entries) < 2:
+        return None
+    primary_key, primary_style_id, _ = next(
+        (entry for entry in style_entries if entry[2] == 4), style_entries[0]
+    )
+    fallback = style_entries[1] if style_entries[1][0] != primary_key else style_entries[0]
+    secondary_key, sub_style_id, _ = next(
+        (entry for entry in style_entries if entry[2] == 2 and entry[0] != primary_key), fallback
+    )
+
+    selected = (
+        safe_int_list(blob.get(primary_key))[:4]
+        + safe_int_list(blob.get(secondary_key))[:2]
+        + shards[:3]
+    )
+    if len(selected) != PAGE_PERK_COUNT:
+        return None
+    games = _first_stat(blob, _GAME_COUNT_KEYS)
+    return CompiledPage(
+        name,
+        primary_style_id,
+        sub_style_id,
+        tuple(selected),
+        win_rate=_first_stat(blob, _WIN_RATE_KEYS),
+        pick_rate=_first_stat(blob, _PICK_RATE_KEYS),
+        games=int(games) if games is not None else None,
+    )
+
+
+def _compile_pages(blob: Mapping[str, Any]) -> tuple[CompiledPage, ...]:
+    """`rune_N` aday sayfalarını doğrulayıp öneri sırasına dizer."""
+    candidates: list[tuple[float, str, CompiledPage]] = []
+    for key, value in blob.items():
+        if not (isinstance(key, str) and key.startswith("rune_") and isinstance(value, dict)):
+            continue
+        page = _compile_tree_page(key, value)
+        if page is not None:
+            rank = page.win_rate if page.win_rate is not None else -1.0
+            candidates.append((rank, key, page))
+    candidates.sort(key=lambda c: (c[0], c[1]), reverse=True)
+    return tuple(page for _, _, page in candidates)
+
+
+def patch_sort_key(patch: str) -> tuple[int, ...]:
+    """Patch sıralama anahtarı ("15.23" → (15, 23)); sayısal olmayan parçalar en eskidir."""
+    return tuple(int(part) if part.isdigit() else -1 for part in patch.split("."))
+
+
+def _dimension(value: Any) -> str:
+    text = str(value).strip()
+    return ANY if text.lower() == ANY_KEY else text
+
+
+def _role_key(key: Any) -> str | None:
+    """Şampiyon blob'undaki rol anahtarı (`TOP`, ..., `any`); rol değilse `None`."""
+    if not isinstance(key, str):
+        return None
+    role = key.strip().upper()
+    if role in ROLES:
+        return role
+    return ANY if role == ANY_KEY.upper() else None
+
+
+def _compile_champion(
+    blob: Mapping[str, Any], tiers: dict[str, None], patches: set[str]
+) -> dict[Variant, tuple[CompiledPage, ...]]:
+    """Şampiyonun (rol, tier, patch) varyantları; geçerli sayfası olmayanlar atlanır."""
+    variants: dict[Variant, tuple[CompiledPage, ...]] = {}
+    legacy = _compile_pages(blob)
+    if legacy:
+        variants[ANY_VARIANT] = legacy
+    for key, by_tier in blob.items():
+        role = _role_key(key)
+        if role is None or not isinstance(by_tier, dict):
+            continue
+        for tier_key, by_patch in by_tier.items():
+            if not isinstance(by_patch, dict):
+                continue
+            tier = _dimension(tier_key)
+            for patch_key, pages_blob in by_patch.items():
+                if not isinstance(pages_blob, dict):
+                    continue
+                pages = _compile_pages(pages_blob)
+                if not pages:
+                    continue
+                patch = _dimension(patch_key)
+                variants[(role, tier, patch)] = pages
+                if tier:
+                    tiers.setdefault(tier)
+                if patch:
+                    patches.add(patch)
+    return variants
+
+
+class RuneIndex:
+    """
+    Şampiyon id'si / slug'ı → öneri sırasındaki doğrulanmış sayfalar.
+
+    Slug sayfaları (rol, tier, patch) varyantlarına ayrılır (`by_slug`; herhangi bir
+    `Mapping` olabilir, ör. şampiyonu ilk erişimde çözen paket). İstenen varyant yoksa
+    `fallback_chain` sırasıyla aranır: önce atanmış rol, sonra herhangi bir rol; her
+    rolde istenen (verilmediyse veride ilk görülen) tier, sonra tier'sız veri; her
+    tier'da istenen (verilmediyse en yeni) patch, sonra daha eski patch'ler, en son
+    patch'siz veri. Bir (slug, rol, tier, patch) sorgusunun sonucu saklanır; sonraki
+    sorgular tek sözlük okumasıdır.
+    """
+
+    def __init__(
+        self,
+        direct: dict[int, tuple[CompiledPage, ...]],
+        by_slug: Mapping[str, ChampionPages],
+        *,
+        tiers: Iterable[str] = (),
+        patches: Iterable[str] = (),
+    ) -> None:
+        self._direct = direct
+        self._by_slug = by_slug
+        self.tiers = tuple(tiers)
+        self.patches = tuple(sorted(patches, key=patch_sort_key, reverse=True))
+        self._slug_by_id: dict[int, str] = {}
+        self._resolved: dict[tuple[str, str, str | None, str | None], tuple[CompiledPage, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._direct) + len(self._by_slug)
+
+    def direct_items(self) -> Iterator[tuple[int, tuple[CompiledPage, ...]]]:
+        """Veride doğrudan id ile verilmiş sayfalar."""
+        yield from self._direct.items()
+
+    def slug_items(self) -> Iterator[tuple[str, ChampionPages]]:
+        yield from self._by_slug.items()
+
+    def variants_for_slug(self, slug: str) -> ChampionPages:
+        return self._by_slug.get(slug, {})
+
+    def fallback_chain(
+        self, role: str = ANY, tier: str | None = None, patch: str | None = None
+    ) -> Iterator[Variant]:
+        """Bir sorgu için denenecek varyantlar, tercih sırasıyla."""
+        roles = (role, ANY) if role else (ANY,)
+        tiers = ((tier,) if tier else self.tiers) + (ANY,)
+        if patch:
+            newest = patch_sort_key(patch)
+            older = tuple(p for p in self.patches if patch_sort_key(p) < newest)
+            patches = (patch, *older, ANY)
+        else:
+            patches = (*self.patches, ANY)
+        for r in roles:
+            for t in tiers:
+                for p in patches:
+                    yield r, t, p
+
+    def pages_for_slug(
+        self, slug: str, role: str = ANY, *, tier: str | None = None, patch: str | None = None
+    ) -> tuple[CompiledPage, ...]:
+        """Slug'ın sorguya en uygun varyantının sayfaları (yoksa boş)."""
+        key = (slug, role, tier, patch)
+        pages = self._resolved.get(key)
+        if pages is None:
+            pages = ()
+            variants = self._by_slug.get(slug)
+            if variants:
+                for variant in self.fallback_chain(role, tier, patch):
+                    pages = variants.get(variant, ())
+                    if pages:
+                        break
+            self._resolved[key] = pages
+        return pages
+
+    def bind(self, champ_id: int, slug: str) -> str:
+        """Id'yi slug'a bağlar; sonraki sorgular slug çözümü gerektirmez."""
+        return self._slug_by_id.setdefault(champ_id, slug)
+
+    def best(
+        self,
+        champ_id: int,
+        resolve_slug: Callable[[int], str | None],
+        role: str = ANY,
+        *,
+        tier: str | None = None,
+        patch: str | None = None,
+    ) -> CompiledPage | None:
+        """Şampiyonun (rol için) en iyi sayfası; slug yalnızca id ilk kez sorulduğunda çözülür."""
+        direct = self._direct.get(champ_id)
+        if direct is not None:
+            return direct[0] if direct else None
+        slug = self._slug_by_id.get(champ_id)
+        if slug is None:
+            slug = resolve_slug(champ_id)
+            if not slug:
+                return None  # çözülemedi (LCU kapalı olabilir): bağlanmaz, sonra tekrar denenir
+            slug = self.bind(champ_id, slug)
+        pages = self.pages_for_slug(slug, role, tier=tier, patch=patch)
+        return pages[0] if pages else None
+
+
+def compile_runes(data: Mapping[str, Any]) -> RuneIndex:
+    """Ham öneri verisini (tüm biçimler) tek geçişte indekse derler."""
+    direct: dict[int, tuple[CompiledPage, ...]] = {}
+    by_slug: dict[str, dict[Variant, tuple[CompiledPage, ...]]] = {}
+    tiers: dict[str, None] = {}
+    patches: set[str] = set()
+    for key, blob in data.items():
+        if not isinstance(blob, dict):
+            continue
+        if all(k in blob for k in _DIRECT_KEYS):
+            try:
+                champ_id = int(key)
+            except (TypeError, ValueError):
+                champ_id = None
+            if champ_id is not None:
+                # Geçersiz doğrudan sayfa da "öneri yok" olarak kaydedilir (slug'a düşülmez).
+                page = _compile_direct(str(key), blob)
+                direct[champ_id] = (page,) if page is not None else ()
+                continue
+        by_slug[str(key)] = _compile_champion(blob, tiers, patches)
+    return RuneIndex(direct, by_slug, tiers=tiers, patches=patches)
+
+
+def put_variant_pages(
+    data: dict[str, Any], slug: str, variant: Variant, pages: Mapping[str, Any]
+) -> None:
+    """Ham veriye (3. biçim) bir (rol, tier, patch) hücresinin aday sayfalarını yazar."""
+    role, tier, patch = (value or ANY_KEY for value in variant)
+    champion = data.setdefault(slug, {})
+    champion.setdefault(role, {}).setdefault(tier, {})[patch] = dict(pages)
+
+
+def prune_patches(data: dict[str, Any], keep: int) -> int:
+    """
+    Her (şampiyon, rol, tier) hücresinde en yeni `keep` patch'i bırakır; silineni sayar.
+
+    Eski patch'ler yalnızca geri düşüş içindir; sınırsız birikmeleri veri setini büyütür.
+    """
+    removed = 0
+    for champion in data.values():
+        if not isinstance(champion, dict):
+            continue
+        for key, by_tier in champion.items():
+            if _role_key(key) is None or not isinstance(by_tier, dict):
+                continue
+            for by_patch in by_tier.values():
+                if not isinstance(by_patch, dict):
+                    continue
+                patches = sorted(
+                    (p for p in by_patch if _dimension(p)), key=patch_sort_key, reverse=True
+                )
+                for patch in patches[keep:]:
+                    del by_patch[patch]
+                    removed += 1
+    return removed
@@ -0,0 +1,96 @@
+"""
+Champ select `my-selection` için hedef durum uzlaştırıcısı (saf domain mantığı).
+
+Otomasyon her turda "olması gereken" seçimi (summoner spell'ler + kostüm) hesaplar;
+uzlaştırıcı bunu oturumdaki yerel oyuncunun mevcut `spell1Id` / `spell2Id` /
+`selectedSkinId` değerleriyle karşılaştırıp yalnızca farklı alanları içeren tek bir
+PATCH gövdesi üretir. Her şey zaten istendiği gibiyse istek atılmaz.
+
+Kostüm bir kez uygulanır: hedef (şampiyon, kostüm) çifti gönderildikten veya oturumda
+görüldükten sonra kullanıcı kostümü elle değiştirirse geri alınmaz. Summoner spell'ler
+ise her turda hedefe çekilir (önceki davranışla aynı).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from runepilot.domain.session_index import index_session
+
+
+@dataclass(frozen=True)
+class Selection:
+    """Yerel oyuncunun seçimi; `None` alan "bu alana dokunma" demektir."""
+
+    spell1_id: int | None = None
+    spell2_id: int | None = None
+    skin_id: int | None = None
+
+
+def _int_or_none(value: Any) -> int | None:
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number > 0 else None
+
+
+def local_player(session: dict[str, Any]) -> dict[str, Any] | None:
+    """Oturumdaki yerel oyuncu (`localPlayerCellId`) kaydını döndürür (oturum indeksinden)."""
+    return index_session(session).local_player
+
+
+def current_selection(session: dict[str, Any]) -> Selection:
+    """Oturumdan yerel oyuncunun mevcut spell/kostüm seçimini okur."""
+    player = local_player(session) or {}
+    return Selection(
+        spell1_id=_int_or_none(player.get("spell1Id")),
+        spell2_id=_int_or_none(player.get("spell2Id")),
+        skin_id=_int_or_none(player.get("selectedSkinId")),
+    )
+
+
+def selection_patch(desired: Selection, current: Selection) -> dict[str, int]:
+    """Hedef ile mevcut durum arasındaki farkı `my-selection` PATCH gövdesine çevirir."""
+    body: dict[str, int] = {}
+    if desired.spell1_id and desired.spell1_id != current.spell1_id:
+        body["spell1Id"] = desired.spell1_id
+    if desired.spell2_id and desired.spell2_id != current.spell2_id:
+        body["spell2Id"] = desired.spell2_id
+    if desired.skin_id and desired.skin_id != current.skin_id:
+        body["selectedSkinId"] = desired.skin_id
+    return body
+
+
+class SelectionReconciler:
+    """
+    Hedef seçimi oturumla karşılaştırıp gerekli minimal PATCH gövdesini üretir.
+
+    Yalnızca "hangi kostüm hedefi zaten yerine oturdu" bilgisini tutar; bu durum
+    kullanıcı konfigürasyonundan ayrıdır.
+    """
+
+    def __init__(self) -> None:
+        self._settled_skin: tuple[int, int] | None = None
+
+    def reset(self) -> None:
+        self._settled_skin = None
+
+    def plan(self, session: dict[str, Any], desired: Selection, champion_id: int) -> dict[str, int]:
+        """Gönderilmesi gereken PATCH gövdesini döndürür (boş sözlük: istek gerekmez)."""
+        current = current_selection(session)
+        skin_key = (champion_id, desired.skin_id) if champion_id and desired.skin_id else None
+        if skin_key is None:
+            self._settled_skin = None
+        elif current.skin_id == desired.skin_id:
+            self._settled_skin = skin_key
+        if skin_key is None or self._settled_skin == skin_key:
+            desired = Selection(desired.spell1_id, desired.spell2_id, None)
+        return selection_patch(desired, current)
+
+    def applied(self, champion_id: int, body: dict[str, int]) -> None:
+        """PATCH gönderildikten sonra çağrılır; kostüm isteği tekrar gönderilmez."""
+        skin_id = body.get("selectedSkinId")
+        if champion_id and skin_id:
+            self._settled_skin = (champion_id, skin_id)
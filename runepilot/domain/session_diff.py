@@ -0,0 +1,234 @@
+"""
+Ardışık champ select oturum yükleri arasındaki yapısal fark (saf domain mantığı).
+
+LCU oturum yükü her olayda (ve polling'de her turda) baştan gelir; çoğu zaman
+yalnızca sayaç alanları (`timer.adjustedTimeLeftInPhase`...) değişmiştir.
+`SessionDiffer` yükü parçalara ayırıp her parçanın özetini tutar:
+
+- aksiyonlar (`id` başına),
+- oyuncular (`cellId` başına; yerel oyuncu ayrıca işaretlenir),
+- ban listeleri,
+- timer fazı.
+
+`SessionDispatcher` handler'ları ilgilendikleri parçalara abone eder: ilgili bir
+değişiklik yoksa handler çağrılmaz ve tur yalnızca özet karşılaştırmasına mal olur.
+Aynı sözlük nesnesi tekrar gelirse (yeni olay/okuma yok) özet bile hesaplanmaz.
+
+`SessionDispatcher.due`, farkı kaydetmeden yükün bir handler çağırıp çağırmayacağını
+söyler; otomasyon döngüsü yazan handler'ları yalnızca o zaman worker thread'ine taşır.
+
+Handler `False` döndürürse işi tamamlanmamış sayılır (ör. PATCH başarısız) ve
+değişiklik olmasa da bir sonraki turda yeniden çağrılır. Yeni oturum (`gameId`
+değişti) veya `reset` sonrası ilk yük tüm handler'ları çalıştırır.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+PART_ACTIONS = "actions"
+PART_PLAYERS = "players"
+PART_LOCAL_PLAYER = "local_player"
+PART_BANS = "bans"
+PART_TIMER_PHASE = "timer_phase"
+
+ALL_PARTS = frozenset((PART_ACTIONS, PART_PLAYERS, PART_LOCAL_PLAYER, PART_BANS, PART_TIMER_PHASE))
+
+SessionHandler = Callable[..., "bool | None"]
+
+
+def _digest(value: Any) -> int:
+    return hash(json.dumps(value, sort_keys=True, separators=(",", ":"), default=str))
+
+
+def _keyed_digests(items: Iterable[Any], key: str) -> dict[Any, int]:
+    digests: dict[Any, int] = {}
+    for item in items:
+        if isinstance(item, dict):
+            digests.setdefault(item.get(key), _digest(item))
+    return digests
+
+
+def _changed_keys(old: dict[Any, int], new: dict[Any, int]) -> frozenset[Any]:
+    return frozenset(k for k in old.keys() | new.keys() if old.get(k) != new.get(k))
+
+
+@dataclass(frozen=True)
+class SessionDiff:
+    """İki yük arasındaki fark; `reset` True ise önceki yük yok/başka oturum."""
+
+    actions: frozenset[Any] = frozenset()
+    players: frozenset[Any] = frozenset()
+    local_player: bool = False
+    bans: bool = False
+    timer_phase: bool = False
+    reset: bool = False
+
+    @property
+    def parts(self) -> frozenset[str]:
+        if self.reset:
+            return ALL_PARTS
+        changed = []
+        if self.actions:
+            changed.append(PART_ACTIONS)
+        if self.players:
+            changed.append(PART_PLAYERS)
+        if self.local_player:
+            changed.append(PART_LOCAL_PLAYER)
+        if self.bans:
+            changed.append(PART_BANS)
+        if self.timer_phase:
+            changed.append(PART_TIMER_PHASE)
+        return frozenset(changed)
+
+    @property
+    def empty(self) -> bool:
+        return not self.parts
+
+    def touches(self, parts: Iterable[str]) -> bool:
+        return not self.parts.isdisjoint(parts)
+
+
+NO_CHANGE = SessionDiff()
+
+
+class SessionDiffer:
+    """Son oturum yükünün parça özetleri; `diff` her yükü bir öncekiyle karşılaştırır."""
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self._session: dict[str, Any] | None = None
+        self._game_id: Any = None
+        self._local_cell_id: Any = None
+        self._actions: dict[Any, int] = {}
+        self._players: dict[Any, int] = {}
+        self._bans = 0
+        self._timer_phase = ""
+        # `peek` ile hesaplanmış ama henüz kaydedilmemiş son fark (aynı yük için yeniden
+        # hesaplanmaz).
+        self._peeked: tuple[dict[str, Any], SessionDiff, tuple[Any, ...]] | None = None
+        # Son çalışmasında işini bitiremeyen handler'lar (bkz. `SessionDispatcher`).
+        self.pending: set[str] = set()
+
+    def peek(self, session: dict[str, Any]) -> SessionDiff:
+        """Yükün farkını kaydetmeden döndürür (ardından gelen `diff` yeniden hesaplamaz)."""
+        if session is self._session:
+            return NO_CHANGE
+        peeked = self._peeked
+        if peeked is None or peeked[0] is not session:
+            peeked = self._peeked = (session, *self._compute(session))
+        return peeked[1]
+
+    def diff(self, session: dict[str, Any]) -> SessionDiff:
+        """Yükü bir öncekiyle karşılaştırır ve kaydeder."""
+        if session is self._session:
+            return NO_CHANGE
+        peeked, self._peeked = self._peeked, None
+        if peeked is not None and peeked[0] is session:
+            result, state = peeked[1], peeked[2]
+        else:
+            result, state = self._compute(session)
+        (
+            self._session,
+            self._game_id,
+            self._local_cell_id,
+            self._actions,
+            self._players,
+            self._bans,
+            self._timer_phase,
+        ) = state
+        return result
+
+    def _compute(self, session: dict[str, Any]) -> tuple[SessionDiff, tuple[Any, ...]]:
+        first = self._session is None
+        game_id = session.get("gameId") or None
+        local_cell_id = session.get("localPlayerCellId")
+        actions = _keyed_digests(
+            (a for group in session.get("actions") or [] if isinstance(group, list) for a in group),
+            "id",
+        )
+        players = _keyed_digests(
+            [*(session.get("myTeam") or []), *(session.get("theirTeam") or [])], "cellId"
+        )
+        bans = _digest(session.get("bans"))
+        timer = session.get("timer")
+        timer_phase = timer.get("phase", "") if isinstance(timer, dict) else ""
+
+        changed_players = _changed_keys(self._players, players)
+        result = SessionDiff(
+            actions=_changed_keys(self._actions, actions),
+            players=changed_players,
+            local_player=local_cell_id != self._local_cell_id or local_cell_id in changed_players,
+            bans=bans != self._bans,
+            timer_phase=timer_phase != self._timer_phase,
+            reset=first or game_id != self._game_id,
+        )
+        state = (session, game_id, local_cell_id, actions, players, bans, timer_phase)
+        return result, state
+
+
+@dataclass(frozen=True)
+class Subscription:
+    name: str
+    parts: frozenset[str]
+    handler: SessionHandler = field(compare=False)
+
+
+class SessionDispatcher:
+    """Oturum parçalarına abone handler'ların kaydı; durum çağıranın `SessionDiffer`'ındadır."""
+
+    def __init__(self) -> None:
+        self._subscriptions: list[Subscription] = []
+
+    def subscribe(self, *parts: str) -> Callable[[SessionHandler], SessionHandler]:
+        """Dekoratör: handler'ı verilen parçalardan biri değiştiğinde çağrılacak şekilde kaydeder."""
+        unknown = set(parts) - ALL_PARTS
+        if unknown:
+            raise ValueError(f"Unknown session parts: {sorted(unknown)}")
+
+        def register(handler: SessionHandler) -> SessionHandler:
+            self._subscriptions.append(Subscription(handler.__name__, frozenset(parts), handler))
+            return handler
+
+        return register
+
+    def due(self, differ: SessionDiffer, session: dict[str, Any]) -> bool:
+        """
+        Yük bir handler çağıracak mı (bekleyen iş veya abone olunan bir parça değişti)?
+
+        Fark kaydedilmez; ardından gelen `dispatch` aynı yük için onu yeniden hesaplamaz.
+        """
+        if differ.pending:
+            return True
+        changed = differ.peek(session).parts
+        return any(not changed.isdisjoint(sub.parts) for sub in self._subscriptions)
+
+    def dispatch(self, differ: SessionDiffer, session: dict[str, Any], *args: Any) -> SessionDiff:
+        """
+        Yükü farklar ve ilgili (veya bekleyen) handler'ları kayıt sırasıyla çağırır.
+
+        Hata veren handler'ın hatası yazdırılır ve handler bekleyenlere eklenir; aynı
+        değişikliğe abone sonraki handler'lar yine çağrılır.
+        """
+        diff = differ.diff(session)
+        if diff.empty and not differ.pending:
+            return diff
+        changed = diff.parts
+        for sub in self._subscriptions:
+            if changed.isdisjoint(sub.parts) and sub.name not in differ.pending:
+                continue
+            try:
+                settled = sub.handler(session, *args) is not False
+            except Exception as e:
+                print(f"[CHAMP SELECT] Step {sub.name} failed: {e}")
+                settled = False  # the payload is already recorded; retry next tick
+            if settled:
+                differ.pending.discard(sub.name)
+            else:
+                differ.pending.add(sub.name)
+        return diff
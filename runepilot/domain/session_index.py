@@ -0,0 +1,144 @@
+"""
+Champ select oturumunun tek geçişte çıkarılmış indeksi (saf domain mantığı).
+
+LCU oturum yükü her karar için yeniden taranmak yerine bir kez dolaşılır: ban'lanan,
+picklenen ve takım arkadaşlarının gösterdiği şampiyon id kümeleri, cellId → oyuncu
+haritası, yerel oyuncu ve (tür, actorCellId) başına açık aksiyonlar çıkarılır.
+Sonrasındaki her sorgu O(1)'dir; tercih listesi uzadıkça tur maliyeti artmaz.
+
+Aynı oturum sözlüğü bir turda birkaç handler'a gider; `index_session` son indeksi
+nesne kimliğiyle hatırlar ve yeniden kurmaz.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+def _positive_int(value: Any) -> int:
+    try:
+        number = int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+    return number if number > 0 else 0
+
+
+def _dicts(values: Any) -> list[dict[str, Any]]:
+    if not isinstance(values, list):
+        return []
+    return [value for value in values if isinstance(value, dict)]
+
+
+class SessionIndex:
+    """Bir champ select oturum yükünün salt-okunur indeksi."""
+
+    __slots__ = (
+        "session",
+        "local_cell_id",
+        "local_player",
+        "players_by_cell",
+        "banned_ids",
+        "picked_ids",
+        "teammate_shown_ids",
+        "open_actions",
+        "timer_phase",
+        "game_id",
+        "session_key",
+    )
+
+    def __init__(self, session: dict[str, Any]) -> None:
+        self.session = session
+        self.local_cell_id = session.get("localPlayerCellId")
+        self.players_by_cell: dict[Any, dict[str, Any]] = {}
+        picked: set[int] = set()
+        shown: set[int] = set()
+
+        my_team = _dicts(session.get("myTeam"))
+        for player in my_team:
+            self.players_by_cell.setdefault(player.get("cellId"), player)
+            champion_id = _positive_int(player.get("championId"))
+            intent_id = _positive_int(player.get("championPickIntent"))
+            if champion_id:
+                picked.add(champion_id)
+                shown.add(champion_id)
+            if intent_id:
+                shown.add(intent_id)
+        for player in _dicts(session.get("theirTeam")):
+            self.players_by_cell.setdefault(player.get("cellId"), player)
+            champion_id = _positive_int(player.get("championId"))
+            if champion_id:
+                picked.add(champion_id)
+
+        self.local_player = next(
+            (p for p in my_team if p.get("cellId") == self.local_cell_id), None
+        )
+
+        banned: set[int] = set()
+        bans = session.get("bans")
+        if isinstance(bans, dict):
+            for key in ("myTeamBans", "theirTeamBans"):
+                for value in bans.get(key) or []:
+                    banned.add(_positive_int(value))
+            banned.discard(0)
+
+        self.open_actions: dict[tuple[Any, Any], list[dict[str, Any]]] = {}
+        for group in session.get("actions") or []:
+            for action in _dicts(group):
+                if action.get("completed"):
+                    continue
+                key = (action.get("type"), action.get("actorCellId"))
+                self.open_actions.setdefault(key, []).append(action)
+
+        self.game_id = session.get("gameId") or None
+        # Oturum kapsamlı önbelleklerin anahtarı: (gameId, champ select `id`). Özel
+        # lobilerde gameId boş gelebilir; iki oturum ayırt edilemez → None (önbellek yok).
+        self.session_key = (self.game_id, session.get("id") or None) if self.game_id else None
+        timer = session.get("timer")
+        self.timer_phase = timer.get("phase", "") if isinstance(timer, dict) else ""
+        self.banned_ids = frozenset(banned)
+        self.picked_ids = frozenset(picked)
+        self.teammate_shown_ids = frozenset(shown)
+
+    def is_banned(self, champion_id: int) -> bool:
+        return champion_id in self.banned_ids
+
+    def is_picked(self, champion_id: int) -> bool:
+        return champion_id in self.picked_ids
+
+    def is_teammate_showing(self, champion_id: int) -> bool:
+        return champion_id in self.teammate_shown_ids
+
+    def open_action(self, action_type: str, actor_cell_id: Any = None) -> dict[str, Any] | None:
+        """Verilen oyuncunun (varsayılan: yerel oyuncu) ilk tamamlanmamış aksiyonu."""
+        if actor_cell_id is None:
+            actor_cell_id = self.local_cell_id
+        actions = self.open_actions.get((action_type, actor_cell_id))
+        return actions[0] if actions else None
+
+    @property
+    def assigned_role(self) -> str:
+        """Yerel oyuncunun atanmış pozisyonu (büyük harf; yoksa boş string)."""
+        player = self.local_player or {}
+        return str(player.get("assignedPosition") or "").upper()
+
+    @property
+    def local_champion_id(self) -> int:
+        """Yerel oyuncunun kilitlediği, yoksa gösterdiği şampiyon (yoksa 0)."""
+        player = self.local_player or {}
+        return _positive_int(player.get("championId")) or _positive_int(
+            player.get("championPickIntent")
+        )
+
+
+_last_index: SessionIndex | None = None
+
+
+def index_session(session: dict[str, Any]) -> SessionIndex:
+    """Oturumun indeksini döndürür; aynı sözlük için son indeks yeniden kullanılır."""
+    global _last_index
+    last = _last_index
+    if last is not None and last.session is session:
+        return last
+    index = SessionIndex(session)
+    _last_index = index
+    return index
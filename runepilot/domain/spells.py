@@ -0,0 +1,54 @@
+"""
+Summoner spell id çözümleme yardımcıları (saf domain mantığı).
+
+Konfigürasyondaki spell girdileri farklı biçimlerde gelebilir
+(`{"spell1Id": 4}`, `{"spell1": 4}`, `[4, 14]`); hepsi aynı demete indirgenir.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+def normalize_spell_id(value: Any) -> int | None:
+    """Kullanıcı/LCU inputunu pozitif spell_id değerine normalize eder."""
+    try:
+        sid = int(value)
+    except (TypeError, ValueError):
+        return None
+    return sid if sid > 0 else None
+
+
+def extract_spell_pair(entry: Any) -> tuple[bool, int | None, bool, int | None]:
+    """
+    Summoner spell çiftini farklı formatlardan çözer.
+
+    Dönüş: (has_spell1, spell1_id, has_spell2, spell2_id)
+    """
+    has_s1 = False
+    has_s2 = False
+    s1: int | None = None
+    s2: int | None = None
+
+    if isinstance(entry, dict):
+        if "spell1Id" in entry or "spell1" in entry:
+            has_s1 = True
+        if "spell2Id" in entry or "spell2" in entry:
+            has_s2 = True
+
+        if "spell1Id" in entry:
+            s1 = normalize_spell_id(entry.get("spell1Id"))
+        elif "spell1" in entry:
+            s1 = normalize_spell_id(entry.get("spell1"))
+
+        if "spell2Id" in entry:
+            s2 = normalize_spell_id(entry.get("spell2Id"))
+        elif "spell2" in entry:
+            s2 = normalize_spell_id(entry.get("spell2"))
+    elif isinstance(entry, (list, tuple)) and len(entry) >= 2:
+        has_s1 = True
+        has_s2 = True
+        s1 = normalize_spell_id(entry[0])
+        s2 = normalize_spell_id(entry[1])
+
+    return has_s1, s1, has_s2, s2
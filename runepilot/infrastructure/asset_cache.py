@@ -0,0 +1,261 @@
+"""
+Statik LCU oyun verisi için kalıcı (diskte), yama sürümüne bağlı cache.
+
+`/lol-game-data/assets/v1/*` (champion-summary, `champions/{id}.json`, perks.json, ikonlar)
+ve `/lol-perks/v1/styles|perks` yanıtları yalnızca istemci yamalandığında değişir. Bu
+yüzden kayıtlar istemcinin build sürümü + endpoint ile anahtarlanır:
+
+- Aynı build için taze kayıt → ağ hiç kullanılmaz.
+- `revalidate_after` süresini aşmış kayıt → `If-None-Match` / `If-Modified-Since` ile
+  koşullu istek; 304 gelirse kayıt tazelenir, istemci kapalıysa eski kayıt döner.
+- Yeni bir build görüldüğünde eski build'in kayıtları silinir.
+- Toplam boyut `max_bytes`'ı aşarsa en uzun süredir kullanılmayan kayıtlar atılır (LRU).
+
+Dizin yapısı: `<root>/index.json` (metadata) ve `<root>/blobs/<sha1>.bin` (gövdeler).
+Index atomik (`os.replace`) yazılır; bozuk/okunamayan index boş cache sayılır.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from app_meta import APP_ID
+
+# Cache'lenen (statik) endpoint önekleri.
+CACHEABLE_PREFIXES: tuple[str, ...] = (
+    "/lol-game-data/assets/v1/",
+    "/lol-perks/v1/styles",
+    "/lol-perks/v1/perks",
+)
+
+# İstemcinin build sürümünü veren endpoint (cache anahtarının parçası).
+BUILD_VERSION_ENDPOINT = "/lol-patch/v1/game-version"
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_REVALIDATE_AFTER = 24 * 60 * 60.0
+# Yalnızca LRU kullanım zamanı değiştiyse index en fazla bu aralıkla diske yazılır.
+INDEX_FLUSH_INTERVAL = 30.0
+
+
+def is_cacheable(endpoint: str) -> bool:
+    """Endpoint statik oyun verisi mi (query string'li istekler hariç)?"""
+    return "?" not in endpoint and endpoint.startswith(CACHEABLE_PREFIXES)
+
+
+def parse_build_version(status_code: int, content: bytes) -> str | None:
+    """`BUILD_VERSION_ENDPOINT` yanıtını çözer (JSON string, ör. "14.1.553.1234")."""
+    if status_code != 200:
+        return None
+    try:
+        version = json.loads(content)
+    except ValueError:
+        return None
+    return version.strip() or None if isinstance(version, str) else None
+
+
+def default_cache_dir() -> str:
+    """`%APPDATA%\\RunePilot\\lcu-assets` (override: `RUNEPILOT_ASSET_CACHE_DIR`)."""
+    override = os.getenv("RUNEPILOT_ASSET_CACHE_DIR")
+    if override:
+        return override
+    base_dir = os.getenv("APPDATA") or os.path.expanduser("~")
+    return os.path.join(base_dir, APP_ID, "lcu-assets")
+
+
+def _header(headers: Mapping[str, str], name: str) -> str | None:
+    # requests büyük/küçük harf duyarsız dict, `LcuResponse` küçük harfli dict verir.
+    for key, value in headers.items():
+        if key.lower() == name.lower():
+            return value
+    return None
+
+
+@dataclass(frozen=True)
+class CachedAsset:
+    """Diskteki bir kaydın içeriği ve doğrulama bilgileri."""
+
+    endpoint: str
+    content: bytes
+    content_type: str
+    etag: str | None
+    last_modified: str | None
+    validated_at: float
+    fresh: bool
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class AssetCache:
+    """Thread-safe, boyut sınırlı ve build sürümüne bağlı disk cache'i."""
+
+    def __init__(
+        self,
+        root: str | None = None,
+        *,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        revalidate_after: float = DEFAULT_REVALIDATE_AFTER,
+    ) -> None:
+        self.root = root or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.revalidate_after = revalidate_after
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, Any]] | None = None
+        self._dirty = False
+        self._last_flush = 0.0
+
+    # -- index ----------------------------------------------------------------
+    @property
+    def _index_path(self) -> str:
+        return os.path.join(self.root, "index.json")
+
+    def _blob_path(self, key: str) -> str:
+        return os.path.join(self.root, "blobs", f"{key}.bin")
+
+    @staticmethod
+    def _key(version: str, endpoint: str) -> str:
+        return hashlib.sha1(f"{version}\0{endpoint}".encode()).hexdigest()
+
+    def _load_locked(self) -> dict[str, dict[str, Any]]:
+        if self._entries is not None:
+            return self._entries
+        entries: dict[str, dict[str, Any]] = {}
+        try:
+            with open(self._index_path, encoding="utf-8") as f:
+                raw = json.load(f)
+            if isinstance(raw, dict) and isinstance(raw.get("entries"), dict):
+                entries = {
+                    k: v
+                    for k, v in raw["entries"].items()
+                    if isinstance(v, dict) and os.path.exists(self._blob_path(k))
+                }
+        except (OSError, ValueError):
+            pass
+        self._entries = entries
+        return entries
+
+    def _flush_locked(self, *, force: bool = True) -> None:
+        if not self._dirty or self._entries is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_flush < INDEX_FLUSH_INTERVAL:
+            return
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            tmp_path = f"{self._index_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"entries": self._entries}, f)
+            os.replace(tmp_path, self._index_path)
+            self._dirty = False
+            self._last_flush = now
+        except OSError as e:
+            print(f"[CACHE] Could not write asset cache index: {e}")
+
+    def _remove_locked(self, key: str) -> None:
+        if self._entries is not None:
+            self._entries.pop(key, None)
+        try:
+            os.remove(self._blob_path(key))
+        except OSError:
+            pass
+        self._dirty = True
+
+    # -- okuma/yazma ----------------------------------------------------------
+    def get(self, version: str, endpoint: str) -> CachedAsset | None:
+        """Kaydı döndürür (yoksa `None`); `fresh=False` ise yeniden doğrulanmalıdır."""
+        key = self._key(version, endpoint)
+        with self._lock:
+            meta = self._load_locked().get(key)
+            if meta is None:
+                return None
+            try:
+                with open(self._blob_path(key), "rb") as f:
+                    content = f.read()
+            except OSError:
+                self._remove_locked(key)
+                return None
+            meta["last_used"] = time.time()
+            self._dirty = True
+            self._flush_locked(force=False)
+            validated_at = float(meta.get("validated_at") or 0.0)
+            return CachedAsset(
+                endpoint=endpoint,
+                content=content,
+                content_type=str(meta.get("content_type") or "application/json"),
+                etag=meta.get("etag"),
+                last_modified=meta.get("last_modified"),
+                validated_at=validated_at,
+                fresh=time.time() - validated_at < self.revalidate_after,
+            )
+
+    def put(self, version: str, endpoint: str, content: bytes, headers: Mapping[str, str]) -> None:
+        """200 yanıtını kaydeder; eski build'leri ve LRU fazlasını temizler."""
+        if len(content) > self.max_bytes:
+            return
+        key = self._key(version, endpoint)
+        now = time.time()
+        with self._lock:
+            entries = self._load_locked()
+            for old_key in [k for k, v in entries.items() if v.get("version") != version]:
+                self._remove_locked(old_key)
+            try:
+                os.makedirs(os.path.dirname(self._blob_path(key)), exist_ok=True)
+                tmp_path = f"{self._blob_path(key)}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(content)
+                os.replace(tmp_path, self._blob_path(key))
+            except OSError as e:
+                print(f"[CACHE] Could not store {endpoint}: {e}")
+                return
+            entries[key] = {
+                "version": version,
+                "endpoint": endpoint,
+                "size": len(content),
+                "content_type": _header(headers, "Content-Type") or "application/json",
+                "etag": _header(headers, "ETag"),
+                "last_modified": _header(headers, "Last-Modified"),
+                "validated_at": now,
+                "last_used": now,
+            }
+            self._dirty = True
+            self._evict_locked()
+            self._flush_locked()
+
+    def mark_validated(self, version: str, endpoint: str) -> None:
+        """304 sonrası kaydın doğrulama zamanını yeniler."""
+        key = self._key(version, endpoint)
+        with self._lock:
+            meta = self._load_locked().get(key)
+            if meta is not None:
+                meta["validated_at"] = time.time()
+                self._dirty = True
+                self._flush_locked()
+
+    def _evict_locked(self) -> None:
+        entries = self._entries or {}
+        total = sum(int(v.get("size") or 0) for v in entries.values())
+        for key in sorted(entries, key=lambda k: float(entries[k].get("last_used") or 0.0)):
+            if total <= self.max_bytes:
+                break
+            total -= int(entries[key].get("size") or 0)
+            self._remove_locked(key)
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(int(v.get("size") or 0) for v in self._load_locked().values())
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
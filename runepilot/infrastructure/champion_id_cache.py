@@ -0,0 +1,81 @@
+"""
+Champ select oturumu boyunca sabit kalan şampiyon id listelerinin önbelleği.
+
+`/lol-champ-select/v1/pickable-champion-ids` ve `bannable-champion-ids` bir oturum
+içinde (pratikte) değişmez; otomasyon her turda yeniden GET etmek yerine sonucu
+oturum anahtarına (`SessionIndex.session_key`: `gameId` + champ select `id`) bağlı
+tutar. Anahtar yoksa (`None`, ör. `gameId`'siz özel lobi) sonuç önbelleğe alınmaz.
+Kayıt şu durumlarda düşer:
+
+- farklı bir oturum kimliği görülürse,
+- `invalidate()` çağrılırsa (oturum bitti, pick/ban PATCH'i reddedildi).
+
+Başarısız okumalar önbelleğe alınmaz; bir sonraki çağrı yeniden dener.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+from typing import Any
+
+from runepilot.infrastructure.lcu_client import lcu_request
+
+PICKABLE_CHAMPION_IDS_URI = "/lol-champ-select/v1/pickable-champion-ids"
+BANNABLE_CHAMPION_IDS_URI = "/lol-champ-select/v1/bannable-champion-ids"
+
+_UNSET = object()
+
+
+def parse_champion_ids(data: Any) -> frozenset[int] | None:
+    """LCU id listesini pozitif tamsayı kümesine çevirir; liste değilse `None`."""
+    if not isinstance(data, list):
+        return None
+    ids: set[int] = set()
+    for value in data:
+        try:
+            cid = int(value)
+        except (TypeError, ValueError):
+            continue
+        if cid > 0:
+            ids.add(cid)
+    return frozenset(ids)
+
+
+def _fetch(endpoint: str) -> frozenset[int] | None:
+    res = lcu_request("GET", endpoint)
+    if res.status_code != 200:
+        return None
+    return parse_champion_ids(res.json())
+
+
+class ChampionIdCache:
+    """Tek bir id listesi endpoint'i için oturum kapsamlı önbellek."""
+
+    def __init__(
+        self,
+        endpoint: str,
+        fetch: Callable[[str], frozenset[int] | None] = _fetch,
+    ) -> None:
+        self.endpoint = endpoint
+        self._fetch = fetch
+        self._lock = threading.Lock()
+        self._key: Any = _UNSET
+        self._ids: frozenset[int] | None = None
+        self.fetches = 0
+
+    def get(self, session_key: Any) -> frozenset[int] | None:
+        """Oturumun id kümesi; önbellekte yoksa okunur (hata/uygun değil: `None`)."""
+        with self._lock:
+            if session_key is not None and self._key == session_key:
+                return self._ids
+        ids = self._fetch(self.endpoint)
+        with self._lock:
+            self.fetches += 1
+            if ids is not None and session_key is not None:
+                self._key, self._ids = session_key, ids
+        return ids
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._key, self._ids = _UNSET, None
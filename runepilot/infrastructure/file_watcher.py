@@ -0,0 +1,96 @@
+"""
+Veri dosyalarının (ör. `runes.json`, `runes.bin`) değişimini izleyen basit izleyici.
+
+Her dosya için `(mtime, boyut)` imzası tutulur; bir arka plan thread'i `poll_interval`
+aralığıyla birkaç `os.stat` çağrısı yapar. Değişen bir dosya hemen bildirilmez: imzası
+art arda iki taramada aynı kaldığında (yazım bitti) dinleyici çağrılır. Böylece
+`json.dump` gibi yerinde yazımların yarım hali okunmaz. Silinen dosyalar da değişim
+sayılır.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections.abc import Callable, Iterable
+
+DEFAULT_POLL_INTERVAL = 1.0
+
+Signature = tuple[int, int] | None
+
+
+def file_signature(path: str) -> Signature:
+    """Dosyanın `(mtime_ns, boyut)` imzası; dosya yoksa `None`."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class FileWatcher:
+    """
+    Yol listesindeki dosyaları izler; yazımı durulmuş değişimleri `on_change`'e bildirir.
+
+    `check()` tek bir tarama yapar (testlerde doğrudan çağrılabilir); `start()` bunu arka
+    plan thread'inde tekrarlar. Dinleyici izleyici thread'inde çalışır.
+    """
+
+    def __init__(
+        self,
+        paths: Callable[[], Iterable[str]],
+        on_change: Callable[[list[str]], None],
+        *,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        name: str = "file-watcher",
+    ) -> None:
+        self._paths = paths
+        self._on_change = on_change
+        self._poll_interval = poll_interval
+        self._name = name
+        self._lock = threading.Lock()
+        self._seen: dict[str, Signature] = {}
+        self._pending: dict[str, Signature] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def prime(self) -> None:
+        """Mevcut imzaları kaydeder; bundan önceki durum değişim sayılmaz."""
+        current = {path: file_signature(path) for path in self._paths()}
+        with self._lock:
+            self._seen, self._pending = current, {}
+
+    def check(self) -> list[str]:
+        """Dosyaları bir kez tarar; yazımı durulmuş değişimleri bildirip döndürür."""
+        current = {path: file_signature(path) for path in self._paths()}
+        with self._lock:
+            changed = {p: sig for p, sig in current.items() if sig != self._seen.get(p)}
+            settled = [p for p, sig in changed.items() if self._pending.get(p, False) == sig]
+            self._pending = changed
+            for path in settled:
+                self._seen[path] = changed[path]
+                del self._pending[path]
+        if settled:
+            try:
+                self._on_change(settled)
+            except Exception as e:
+                print(f"[WATCH] Change listener error: {e}")
+        return settled
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self.prime()
+        self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._poll_interval):
+            self.check()
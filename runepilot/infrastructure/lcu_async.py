@@ -0,0 +1,460 @@
+"""
+Asyncio tabanlı LCU istemcisi.
+
+`LcuClient` ile aynı endpoint semantiğini (aynı lockfile kimlik cache'i, aynı
+`method/endpoint/json_body` imzası) non-blocking I/O ile sunar; birbirinden bağımsız
+okumalar `asyncio.gather` ile eşzamanlı gönderilebilir. Böylece bir turun süresi
+isteklerin toplamı yerine en yavaş isteğin süresine iner.
+
+Ek bağımlılık olmaması için HTTP/1.1 (keep-alive, Content-Length ve chunked gövde)
+`asyncio.open_connection` üzerinde yazılmıştır; LCU'nun sunduğundan fazlası yoktur.
+
+Özdeş GET'ler, senkron istemciyle aynı single-flight grubunu ve statik veri disk
+cache'ini paylaşır: bir thread'in uçuştaki isteği ile `lcu_gather` içindeki aynı GET tek
+istekte birleşir, cache'teki oyun verisi için hiç istek atılmaz.
+
+Senkron kod (GUI, otomasyon thread'i) için `lcu_gather` cephesi, paylaşılan bir arka
+plan event loop'u üzerinden aynı eşzamanlılığı sağlar; çağıranın etkin son tarihi
+(bkz. `lcu_deadline`) o loop'taki isteklere de taşınır.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import ssl
+import threading
+import time
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+import requests
+
+from runepilot.infrastructure.asset_cache import (
+    BUILD_VERSION_ENDPOINT,
+    CachedAsset,
+    is_cacheable,
+    parse_build_version,
+)
+from runepilot.infrastructure.lcu_client import (
+    POOL_MAXSIZE,
+    LcuClient,
+    LcuCredentials,
+    flight_key,
+    get_default_client,
+)
+from runepilot.infrastructure.lcu_deadline import (
+    DEFAULT_TIMEOUT,
+    Deadline,
+    LcuDeadlineExceeded,
+    call_budget,
+    current_deadline,
+    lcu_deadline,
+)
+
+# `lcu_gather` girdisi: "/endpoint" (GET) veya (method, endpoint[, json_body]).
+RequestSpec = str | Sequence[Any]
+
+
+class LcuResponse:
+    """`requests.Response` ile uyumlu (status_code/text/content/json) hafif yanıt."""
+
+    def __init__(self, status_code: int, headers: dict[str, str], content: bytes, url: str):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if not self.ok:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}", response=None)
+
+    def __repr__(self) -> str:
+        return f"<LcuResponse [{self.status_code}]>"
+
+
+def _ssl_context() -> ssl.SSLContext:
+    context = ssl.create_default_context()
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    return context
+
+
+class _Connection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, key: tuple):
+        self.reader = reader
+        self.writer = writer
+        self.key = key
+
+    def close(self) -> None:
+        try:
+            self.writer.close()
+        except Exception:
+            pass
+
+
+async def _read_body(reader: asyncio.StreamReader, headers: dict[str, str]) -> tuple[bytes, bool]:
+    """Gövdeyi okur; (gövde, bağlantı yeniden kullanılabilir mi) döndürür."""
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        chunks: list[bytes] = []
+        while True:
+            size_line = await reader.readline()
+            size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+            if size == 0:
+                # Trailer başlıkları (varsa) boş satıra kadar atlanır.
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                return b"".join(chunks), True
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+    if "content-length" in headers:
+        return await reader.readexactly(int(headers["content-length"])), True
+    return await reader.read(), False
+
+
+class AsyncLcuClient:
+    """
+    Non-blocking LCU istemcisi (tek bir event loop'a bağlıdır).
+
+    Kimlik bilgileri paylaşılan `LcuClient`'tan alınır (lockfile cache'i tek yerde);
+    istemci yeniden başladığında port değişeceği için havuz anahtarı (port, şifre)dir.
+    """
+
+    def __init__(
+        self,
+        sync_client: LcuClient | None = None,
+        *,
+        max_connections: int = POOL_MAXSIZE,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> None:
+        self._sync_client = sync_client
+        self._timeout = timeout
+        self._idle: list[_Connection] = []
+        self._slots = asyncio.Semaphore(max_connections)
+        self._ssl = _ssl_context()
+
+    def _sync(self) -> LcuClient:
+        return self._sync_client or get_default_client()
+
+    async def credentials(self) -> LcuCredentials:
+        """
+        Paylaşılan istemcinin cache'li kimlik bilgileri.
+
+        Cache doluyken event loop'ta hiç disk I/O'su yapılmaz; lockfile (stat + okuma)
+        yalnızca cache boşken (ilk istek, istemci yeniden başladı) worker thread'inde okunur.
+        """
+        sync = self._sync()
+        creds = sync.cached_credentials()
+        if creds is None:
+            creds = await asyncio.to_thread(sync.credentials)
+        return creds
+
+    async def _acquire(self, creds: LcuCredentials) -> tuple[_Connection, bool]:
+        key = (creds.port, creds.password)
+        while self._idle:
+            conn = self._idle.pop()
+            if conn.key == key and not conn.reader.at_eof():
+                return conn, True
+            conn.close()
+        reader, writer = await asyncio.open_connection(
+            "127.0.0.1", int(creds.port), ssl=self._ssl, server_hostname="127.0.0.1"
+        )
+        return _Connection(reader, writer, key), False
+
+    async def _exchange(
+        self,
+        conn: _Connection,
+        creds: LcuCredentials,
+        method: str,
+        endpoint: str,
+        body: bytes,
+        extra_headers: dict[str, str] | None = None,
+    ) -> tuple[int, dict[str, str], bytes, bool]:
+        auth = base64.b64encode(f"riot:{creds.password}".encode()).decode("ascii")
+        head = [
+            f"{method} {endpoint} HTTP/1.1",
+            f"Host: 127.0.0.1:{creds.port}",
+            f"Authorization: Basic {auth}",
+            "Accept: application/json",
+            "Connection: keep-alive",
+        ]
+        head.extend(f"{name}: {value}" for name, value in (extra_headers or {}).items())
+        if body or method not in ("GET", "HEAD", "DELETE"):
+            head.append("Content-Type: application/json")
+            head.append(f"Content-Length: {len(body)}")
+        conn.writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await conn.writer.drain()
+
+        status_line = await conn.reader.readline()
+        if not status_line:
+            raise ConnectionResetError("LCU bağlantıyı kapattı")
+        parts = status_line.decode("latin-1").split(" ", 2)
+        status = int(parts[1])
+        headers: dict[str, str] = {}
+        while True:
+            line = await conn.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            content, reusable = b"", True
+        else:
+            content, reusable = await _read_body(conn.reader, headers)
+        if headers.get("connection", "").lower() == "close":
+            reusable = False
+        return status, headers, content, reusable
+
+    async def request(
+        self,
+        method: str,
+        endpoint: str,
+        json_body: Any | None = None,
+        *,
+        timeout: float | None = None,
+    ) -> LcuResponse:
+        """
+        LCU API'ye authenticated istek atar.
+
+        `endpoint` değeri `/lol-...` gibi başlamalıdır. `timeout` verilmezse istemcinin
+        zaman aşımı kullanılır; etkin bir son tarih süreyi ayrıca kısaltabilir.
+        """
+        method = str(method).upper()
+        creds = await self.credentials()
+        if method == "GET" and json_body is None:
+            return await self._sync().single_flight.do_async(
+                flight_key(creds, endpoint), lambda: self._get(creds, endpoint, timeout)
+            )
+        body = json.dumps(json_body).encode("utf-8") if json_body is not None else b""
+        return await self._send(creds, method, endpoint, body, timeout=timeout)
+
+    async def _build_version(self, creds: LcuCredentials) -> str | None:
+        sync = self._sync()
+        version = sync.known_build_version(creds)
+        if version is not None:
+            return version
+        try:
+            res = await self._send(creds, "GET", BUILD_VERSION_ENDPOINT, b"")
+        except (OSError, asyncio.IncompleteReadError):
+            return None
+        version = parse_build_version(res.status_code, res.content)
+        if version is not None:
+            sync.remember_build_version(creds, version)
+        return version
+
+    async def _get(
+        self, creds: LcuCredentials, endpoint: str, timeout: float | None = None
+    ) -> LcuResponse:
+        """
+        `LcuClient._get` ile aynı cache akışı (taze → disk, bayat → koşullu istek).
+
+        Disk cache'i worker thread'inde okunur/yazılır; loop'taki diğer istekler beklemez.
+        """
+        cache = self._sync().asset_cache
+        if cache is None or not is_cacheable(endpoint):
+            return await self._send(creds, "GET", endpoint, b"", timeout=timeout)
+        version = await self._build_version(creds)
+        if version is None:
+            return await self._send(creds, "GET", endpoint, b"", timeout=timeout)
+
+        url = f"{creds.base_url}{endpoint}"
+        cached = await asyncio.to_thread(cache.get, version, endpoint)
+        if cached is not None and cached.fresh:
+            return self._cached_response(cached, url, endpoint)
+        try:
+            res = await self._send(
+                creds,
+                "GET",
+                endpoint,
+                b"",
+                cached.conditional_headers() if cached else None,
+                timeout=timeout,
+            )
+        except (OSError, asyncio.IncompleteReadError):
+            if cached is not None:
+                return self._cached_response(cached, url, endpoint)
+            raise
+        if res.status_code == 304 and cached is not None:
+            await asyncio.to_thread(cache.mark_validated, version, endpoint)
+            return self._cached_response(cached, url, endpoint)
+        if res.status_code == 200:
+            await asyncio.to_thread(cache.put, version, endpoint, res.content, res.headers)
+        return res
+
+    async def _send(
+        self,
+        creds: LcuCredentials,
+        method: str,
+        endpoint: str,
+        body: bytes,
+        extra_headers: dict[str, str] | None = None,
+        *,
+        timeout: float | None = None,
+    ) -> LcuResponse:
+        budget, deadline_bound = call_budget(method, self._timeout if timeout is None else timeout)
+        if budget <= 0:
+            self._deadline_missed(method, endpoint)
+            raise LcuDeadlineExceeded(f"{method} {endpoint}: deadline passed")
+        started = time.perf_counter()
+        connecting = False
+        # Bütçe havuzda slot beklemeyi ve TCP+TLS bağlantısını da kapsar: el sıkışmayı
+        # tamamlamayan bir soket de zaman aşımına uğrar.
+        try:
+            async with asyncio.timeout(budget) as scope, self._slots:
+                for attempt in range(2):
+                    connecting = True
+                    conn, reused = await self._acquire(creds)
+                    connecting = False
+                    try:
+                        status, headers, content, reusable = await self._exchange(
+                            conn, creds, method, endpoint, body, extra_headers
+                        )
+                    except (ConnectionError, asyncio.IncompleteReadError, OSError):
+                        conn.close()
+                        # Havuzdaki bağlantı karşı tarafça kapatılmış olabilir: bir kez taze
+                        # bağlantıyla dene. Taze bağlantı da düşerse istemci gerçekten kapalıdır.
+                        if reused and attempt == 0:
+                            continue
+                        raise
+                    except BaseException:
+                        conn.close()
+                        raise
+
+                    if reusable:
+                        self._idle.append(conn)
+                    else:
+                        conn.close()
+                    self._observe(method, endpoint, started, status, body, content)
+                    return LcuResponse(status, headers, content, f"{creds.base_url}{endpoint}")
+        except TimeoutError as e:
+            # Askıda kalan bağlantı/endpoint: istemci ayakta olabilir, yeniden denenmez.
+            self._observe(method, endpoint, started, None, body)
+            if connecting:
+                self._sync().invalidate()
+            if deadline_bound and scope.expired():
+                self._deadline_missed(method, endpoint)
+                raise LcuDeadlineExceeded(f"{method} {endpoint}: deadline exceeded") from e
+            raise
+        except (ConnectionError, asyncio.IncompleteReadError, OSError):
+            self._observe(method, endpoint, started, None, body)
+            # İstemci kapanmış/yeniden başlamış olabilir: sonraki çağrı lockfile'ı yeniden
+            # okusun.
+            self._sync().invalidate()
+            raise
+
+        raise RuntimeError("unreachable")
+
+    def _deadline_missed(self, method: str, endpoint: str) -> None:
+        metrics = self._sync().metrics
+        if metrics is not None:
+            metrics.observe_deadline_miss(method, endpoint)
+
+    def _cached_response(self, cached: CachedAsset, url: str, endpoint: str) -> LcuResponse:
+        recorder = self._sync().recorder
+        if recorder is not None:
+            recorder.record_request("GET", endpoint, 200, 0.0, None, cached.content, cached=True)
+        return _response_from_cache(cached, url)
+
+    def _observe(
+        self,
+        method: str,
+        endpoint: str,
+        started: float,
+        status: int | None,
+        body: bytes = b"",
+        content: bytes = b"",
+    ) -> None:
+        sync = self._sync()
+        latency = time.perf_counter() - started
+        if sync.metrics is not None:
+            sync.metrics.observe(method, endpoint, latency, status)
+        if sync.recorder is not None:
+            sync.recorder.record_request(method, endpoint, status, latency, body, content)
+
+    async def get(self, endpoint: str) -> LcuResponse:
+        return await self.request("GET", endpoint)
+
+    async def gather(
+        self, specs: Iterable[RequestSpec], *, return_exceptions: bool = True
+    ) -> list[Any]:
+        """Birden fazla isteği eşzamanlı gönderir; sonuçlar girdi sırasıyla döner."""
+        return await asyncio.gather(
+            *(self.request(*_normalize_spec(spec)) for spec in specs),
+            return_exceptions=return_exceptions,
+        )
+
+    async def aclose(self) -> None:
+        idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+def _response_from_cache(cached: CachedAsset, url: str) -> LcuResponse:
+    return LcuResponse(200, {"content-type": cached.content_type}, cached.content, url)
+
+
+def _normalize_spec(spec: RequestSpec) -> tuple[str, str, Any | None]:
+    if isinstance(spec, str):
+        return "GET", spec, None
+    method, endpoint, *rest = spec
+    return str(method), str(endpoint), rest[0] if rest else None
+
+
+class _LoopThread:
+    """Senkron cephe için arka planda çalışan tek bir event loop ve onun istemcisi."""
+
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.client: AsyncLcuClient | None = None
+        self._thread = threading.Thread(target=self.loop.run_forever, name="lcu-async", daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._init_client(), self.loop).result()
+
+    async def _init_client(self) -> None:
+        self.client = AsyncLcuClient()
+
+    async def gather(self, specs: list[RequestSpec], deadline: Deadline | None) -> list[Any]:
+        assert self.client is not None
+        # Çağıran thread'in son tarihi bu loop'a kendiliğinden geçmez (ayrı bağlam).
+        with lcu_deadline(deadline):
+            return await self.client.gather(specs)
+
+
+_LOOP_THREAD: _LoopThread | None = None
+_LOOP_THREAD_LOCK = threading.Lock()
+
+
+def _loop_thread() -> _LoopThread:
+    global _LOOP_THREAD
+    with _LOOP_THREAD_LOCK:
+        if _LOOP_THREAD is None:
+            _LOOP_THREAD = _LoopThread()
+        return _LOOP_THREAD
+
+
+def lcu_gather(specs: Iterable[RequestSpec]) -> list[LcuResponse | Exception]:
+    """
+    Senkron cephe: istekleri paylaşılan async istemciyle eşzamanlı gönderir ve bekler.
+
+    Her eleman ya bir `LcuResponse` ya da o isteğin fırlattığı exception'dır; böylece
+    bir isteğin hatası diğerlerinin sonucunu kaybettirmez.
+    """
+    specs = list(specs)
+    if not specs:
+        return []
+    runner = _loop_thread()
+    future = asyncio.run_coroutine_threadsafe(runner.gather(specs, current_deadline()), runner.loop)
+    return future.result()
@@ -5,15 +5,37 @@ League of Legends istemcisi, yerel makinede (127.0.0.1) HTTPS üzerinden bir API
 yayınlar. Bu API'ye erişim için lockfile içindeki port/şifre bilgisi gerekir.
 
 Bu modül, tüm uygulamanın LCU'ya eriştiği **tek** noktadır (infrastructure katmanı).
+İstekler paylaşılan bir `LcuClient` üzerinden gider: keep-alive bağlantı havuzu
+(her istekte yeni TCP+TLS el sıkışması yok) ve lockfile değişene kadar cache'lenen
+kimlik bilgileri (her istekte dosya okuma yok). Aynı anda gelen özdeş GET'ler tek
+istekte birleştirilir (bkz. `single_flight`); statik oyun verisi GET'leri yama sürümüne
+bağlı disk cache'inden okunur (bkz. `asset_cache`). Her istek bir zaman aşımıyla ve
+varsa etkin son tarihe göre gönderilir (bkz. `lcu_deadline`).
 """
 
 from __future__ import annotations
 
 import os
+import threading
+import time
+from dataclasses import dataclass
 from typing import Any
 
 import requests
 import urllib3
+from requests.adapters import HTTPAdapter
+
+from runepilot.infrastructure.asset_cache import (
+    BUILD_VERSION_ENDPOINT,
+    AssetCache,
+    CachedAsset,
+    is_cacheable,
+    parse_build_version,
+)
+from runepilot.infrastructure.lcu_deadline import LcuDeadlineExceeded, call_budget
+from runepilot.infrastructure.lcu_metrics import LCU_METRICS, LcuMetrics
+from runepilot.infrastructure.lcu_recorder import LcuRecorder, recorder_from_env
+from runepilot.infrastructure.single_flight import SingleFlight, SingleFlightStats
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -23,22 +45,45 @@ DEFAULT_LOCKFILE_PATHS: tuple[str, ...] = (
     r"C:\Program Files (x86)\Riot Games\League of Legends\lockfile",
 )
 
+# Aynı anda LCU'ya istek atabilen thread sayısı (FastAPI threadpool, otomasyon, GUI
+# worker'ları) için yeterli keep-alive bağlantı sayısı.
+POOL_MAXSIZE = 8
 
-def find_lockfile_path() -> str:
+
+@dataclass(frozen=True)
+class LcuCredentials:
+    """Lockfile'dan okunan bağlantı bilgileri."""
+
+    pid: str
+    port: str
+    password: str
+    protocol: str
+    lockfile_path: str
+
+    @property
+    def base_url(self) -> str:
+        return f"https://127.0.0.1:{self.port}"
+
+
+def lockfile_candidates() -> list[str]:
     """
-    Lockfile yolunu bulur.
+    Lockfile için aday yolları öncelik sırasıyla döndürür.
 
     Öncelik:
     1) `LOL_LOCKFILE` / `LOL_LOCKFILE_PATH` ortam değişkeni
     2) Yaygın kurulum yolları (`DEFAULT_LOCKFILE_PATHS`)
     """
+    candidates: list[str] = []
     env_path = os.getenv("LOL_LOCKFILE") or os.getenv("LOL_LOCKFILE_PATH")
     if env_path:
-        env_path = os.path.expandvars(env_path)
-        if os.path.exists(env_path):
-            return env_path
+        candidates.append(os.path.expandvars(env_path))
+    candidates.extend(DEFAULT_LOCKFILE_PATHS)
+    return candidates
 
-    for path in DEFAULT_LOCKFILE_PATHS:
+
+def find_lockfile_path() -> str:
+    """Mevcut ilk lockfile adayını döndürür (bkz. `lockfile_candidates`)."""
+    for path in lockfile_candidates():
         if os.path.exists(path):
             return path
 
@@ -48,13 +93,12 @@ def find_lockfile_path() -> str:
     )
 
 
-def get_lcu_credentials(lockfile_path: str | None = None) -> tuple[str, str]:
+def read_lockfile(path: str) -> LcuCredentials:
     """
-    Lockfile'dan (port, password) okur.
+    Lockfile'ı okuyup `LcuCredentials` döndürür.
 
     Lockfile formatı genelde: `name:pid:port:password:protocol`
     """
-    path = lockfile_path or find_lockfile_path()
     with open(path, encoding="utf-8", errors="replace") as f:
         parts = f.read().strip().split(":")
 
@@ -65,21 +109,353 @@ def get_lcu_credentials(lockfile_path: str | None = None) -> tuple[str, str]:
     password = parts[3].strip()
     if not port or not password:
         raise ValueError(f"Lockfile içinde port/şifre boş: {path}")
-    return port, password
+    return LcuCredentials(
+        pid=parts[1].strip(),
+        port=port,
+        password=password,
+        protocol=parts[4].strip() if len(parts) > 4 else "https",
+        lockfile_path=path,
+    )
+
+
+def get_lcu_credentials(lockfile_path: str | None = None) -> tuple[str, str]:
+    """Lockfile'dan (port, password) okur (her çağrıda dosyayı yeniden okur)."""
+    creds = read_lockfile(lockfile_path or find_lockfile_path())
+    return creds.port, creds.password
 
 
-def lcu_request(method: str, endpoint: str, json_body: Any | None = None) -> requests.Response:
+def _new_session() -> requests.Session:
+    """LCU için keep-alive havuzlu bir `requests.Session` üretir."""
+    session = requests.Session()
+    session.verify = False
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_MAXSIZE)
+    session.mount("https://", adapter)
+    return session
+
+
+class LcuClient:
     """
-    LCU API'ye authenticated istek atar.
+    LCU API istemcisi: kalıcı bağlantı havuzu + cache'li kimlik bilgileri.
+
+    Kimlik bilgileri lockfile'ın (yol, mtime, boyut) imzası değişene kadar bellekte
+    tutulur; her istekte yalnızca ucuz bir `os.stat` yapılır. İmza değiştiğinde
+    (istemci yeniden başladı → yeni pid/port/şifre) lockfile yeniden okunur ve eski
+    bağlantı havuzu kapatılır.
+
+    Eşzamanlı özdeş GET'ler `single_flight` üzerinden tek istek olarak gider; takipçiler
+    liderin yanıt nesnesini (ve içeriğini) paylaşır. `asset_cache` verilirse statik
+    endpoint'ler (`is_cacheable`) önce diskten okunur. Ağa giden her istek `metrics`
+    deposuna (gecikme, durum kodu, taşıma hatası) kaydedilir; `recorder` verilirse
+    istek/yanıt gövdeleriyle birlikte kayıt dosyasına da yazılır (bkz. `lcu_recorder`).
+    """
+
+    def __init__(
+        self,
+        lockfile_path: str | None = None,
+        *,
+        session_factory=_new_session,
+        asset_cache: AssetCache | None = None,
+        metrics: LcuMetrics | None = LCU_METRICS,
+        recorder: LcuRecorder | None = None,
+    ) -> None:
+        self._lockfile_path = lockfile_path
+        self._session_factory = session_factory
+        self._lock = threading.Lock()
+        self._session: requests.Session | None = None
+        self._credentials: LcuCredentials | None = None
+        self._signature: tuple[Any, ...] | None = None
+        self._resolved_path: str | None = None
+        self._env_override: str | None = None
+        self.single_flight = SingleFlight()
+        self.asset_cache = asset_cache
+        self.metrics = metrics
+        self.recorder = recorder
+        # (port, şifre) -> istemci build sürümü; sürüm yalnızca istemci yeniden başlayınca değişir.
+        self._build_versions: dict[tuple[str, str], str] = {}
+
+    def _lockfile_signature(self) -> tuple[str, tuple[Any, ...]]:
+        """Güncel lockfile yolunu ve (yol, mtime, boyut) imzasını döndürür."""
+        env_override = os.getenv("LOL_LOCKFILE") or os.getenv("LOL_LOCKFILE_PATH")
+        path = self._lockfile_path
+        if path is None:
+            if env_override != self._env_override:
+                self._resolved_path = None
+                self._env_override = env_override
+            path = self._resolved_path
+        try:
+            if path is None:
+                raise FileNotFoundError
+            st = os.stat(path)
+        except OSError:
+            if self._lockfile_path is not None:
+                raise
+            # Kurulum yolu değişmiş olabilir: adayları baştan tara.
+            path = find_lockfile_path()
+            st = os.stat(path)
+        if self._lockfile_path is None:
+            self._resolved_path = path
+        return path, (path, st.st_mtime_ns, st.st_size)
+
+    def credentials(self) -> LcuCredentials:
+        """Cache'li kimlik bilgilerini döndürür; lockfile değiştiyse yeniden okur."""
+        with self._lock:
+            path, signature = self._lockfile_signature()
+            if self._credentials is not None and signature == self._signature:
+                return self._credentials
+
+            creds = read_lockfile(path)
+            previous = self._credentials
+            if previous is not None and (previous.pid, previous.port) != (creds.pid, creds.port):
+                # Yeni istemci süreci: eski keep-alive bağlantıları artık ölü.
+                self._close_session_locked()
+            self._credentials = creds
+            self._signature = signature
+            return creds
+
+    def cached_credentials(self) -> LcuCredentials | None:
+        """
+        Cache'teki kimlik bilgileri (disk I/O'su yok); cache boşsa `None`.
+
+        Lockfile imzası kontrol edilmez: istemci yeniden başlayınca cache'i lockfile
+        izleyicisi veya bağlantı hatası (`invalidate`) boşaltır.
+        """
+        return self._credentials
+
+    def invalidate(self) -> None:
+        """Kimlik cache'ini ve bağlantı havuzunu sıfırlar (bağlantı hatası sonrası)."""
+        with self._lock:
+            self._credentials = None
+            self._signature = None
+            self._close_session_locked()
+
+    def close(self) -> None:
+        """Bağlantı havuzunu (ve varsa kaydı) kapatır."""
+        with self._lock:
+            self._close_session_locked()
+        if self.recorder is not None:
+            self.recorder.close()
+
+    def _close_session_locked(self) -> None:
+        if self._session is not None:
+            try:
+                self._session.close()
+            except Exception:
+                pass
+            self._session = None
+
+    def _get_session(self) -> requests.Session:
+        with self._lock:
+            if self._session is None:
+                self._session = self._session_factory()
+            return self._session
+
+    def request(
+        self,
+        method: str,
+        endpoint: str,
+        json_body: Any | None = None,
+        *,
+        timeout: float | None = None,
+    ) -> requests.Response:
+        """
+        LCU API'ye authenticated istek atar.
+
+        `endpoint` değeri `/lol-...` gibi başlamalıdır. `timeout` verilmezse
+        `DEFAULT_TIMEOUT` kullanılır; etkin bir son tarih süreyi ayrıca kısaltabilir.
+        """
+        method = str(method).upper()
+        creds = self.credentials()
+        if method == "GET" and json_body is None:
+            return self.single_flight.do(
+                flight_key(creds, endpoint), lambda: self._get(creds, endpoint, timeout)
+            )
+        return self._send(creds, method, endpoint, json_body, timeout=timeout)
+
+    # -- statik veri cache'i --------------------------------------------------
+    def known_build_version(self, creds: LcuCredentials) -> str | None:
+        return self._build_versions.get((creds.port, creds.password))
+
+    def remember_build_version(self, creds: LcuCredentials, version: str) -> None:
+        self._build_versions[(creds.port, creds.password)] = version
+
+    def build_version(self, creds: LcuCredentials) -> str | None:
+        """İstemcinin build sürümü (istemci süreci başına bir kez sorulur)."""
+        version = self.known_build_version(creds)
+        if version is not None:
+            return version
+        try:
+            res = self._send(creds, "GET", BUILD_VERSION_ENDPOINT, None)
+        except requests.RequestException:
+            return None
+        version = parse_build_version(res.status_code, res.content)
+        if version is not None:
+            self.remember_build_version(creds, version)
+        return version
+
+    def _get(
+        self, creds: LcuCredentials, endpoint: str, timeout: float | None = None
+    ) -> requests.Response:
+        cache = self.asset_cache
+        if cache is None or not is_cacheable(endpoint):
+            return self._send(creds, "GET", endpoint, None, timeout=timeout)
+        version = self.build_version(creds)
+        if version is None:
+            return self._send(creds, "GET", endpoint, None, timeout=timeout)
+
+        url = f"{creds.base_url}{endpoint}"
+        cached = cache.get(version, endpoint)
+        if cached is not None and cached.fresh:
+            return self._cached_response(cached, url, endpoint)
+        try:
+            res = self._send(
+                creds,
+                "GET",
+                endpoint,
+                None,
+                cached.conditional_headers() if cached else None,
+                timeout=timeout,
+            )
+        except requests.RequestException:
+            if cached is not None:
+                return self._cached_response(cached, url, endpoint)
+            raise
+        if res.status_code == 304 and cached is not None:
+            cache.mark_validated(version, endpoint)
+            return self._cached_response(cached, url, endpoint)
+        if res.status_code == 200:
+            cache.put(version, endpoint, res.content, res.headers)
+        return res
+
+    def _send(
+        self,
+        creds: LcuCredentials,
+        method: str,
+        endpoint: str,
+        json_body: Any | None,
+        headers: dict[str, str] | None = None,
+        *,
+        timeout: float | None = None,
+    ) -> requests.Response:
+        budget, deadline_bound = call_budget(method, timeout)
+        if budget <= 0:
+            # Son tarih geçti: okuma gönderilmez, pencere kritik yazmaya kalır.
+            self._deadline_missed(method, endpoint)
+            raise LcuDeadlineExceeded(f"{method} {endpoint}: deadline passed")
+        session = self._get_session()
+        started = time.perf_counter()
+        try:
+            res = session.request(
+                method=method,
+                url=f"{creds.base_url}{endpoint}",
+                json=json_body,
+                auth=("riot", creds.password),
+                headers=headers,
+                # Oturum düzeyindeki verify=False, REQUESTS_CA_BUNDLE ortam değişkeni
+                # tarafından ezilir; LCU self-signed sertifikası için istek başına kapatılır.
+                verify=False,
+                timeout=budget,
+            )
+        except requests.Timeout as e:
+            self._observe(method, endpoint, started, None, json_body)
+            if isinstance(e, requests.ConnectTimeout):
+                self.invalidate()
+            if deadline_bound:
+                self._deadline_missed(method, endpoint)
+                raise LcuDeadlineExceeded(f"{method} {endpoint}: deadline exceeded") from e
+            raise
+        except requests.ConnectionError:
+            self._observe(method, endpoint, started, None, json_body)
+            # İstemci kapanmış/yeniden başlamış olabilir: sonraki çağrı lockfile'ı
+            # yeniden okusun ve temiz bir havuzla başlasın.
+            self.invalidate()
+            raise
+        except requests.RequestException:
+            self._observe(method, endpoint, started, None, json_body)
+            raise
+        self._observe(method, endpoint, started, res.status_code, json_body, res)
+        return res
+
+    def _deadline_missed(self, method: str, endpoint: str) -> None:
+        if self.metrics is not None:
+            self.metrics.observe_deadline_miss(method, endpoint)
+
+    def _cached_response(self, cached: CachedAsset, url: str, endpoint: str) -> requests.Response:
+        if self.recorder is not None:
+            self.recorder.record_request(
+                "GET", endpoint, 200, 0.0, None, cached.content, cached=True
+            )
+        return _response_from_cache(cached, url)
+
+    def _observe(
+        self,
+        method: str,
+        endpoint: str,
+        started: float,
+        status: int | None,
+        request_body: Any = None,
+        res: requests.Response | None = None,
+    ) -> None:
+        latency = time.perf_counter() - started
+        if self.metrics is not None:
+            self.metrics.observe(method, endpoint, latency, status)
+        if self.recorder is not None:
+            content = res.content if res is not None else None
+            self.recorder.record_request(method, endpoint, status, latency, request_body, content)
+
+
+def _response_from_cache(cached: CachedAsset, url: str) -> requests.Response:
+    """Disk kaydını ağdan gelmiş gibi bir `requests.Response`'a çevirir."""
+    res = requests.Response()
+    res.status_code = 200
+    res._content = cached.content
+    res.headers["Content-Type"] = cached.content_type
+    res.url = url
+    res.encoding = "utf-8"
+    return res
+
+
+def flight_key(creds: LcuCredentials, endpoint: str) -> tuple[str, str, str]:
+    """Single-flight anahtarı: farklı istemci süreçlerinin yanıtları karışmasın."""
+    return (creds.port, creds.password, endpoint)
+
+
+_DEFAULT_CLIENT: LcuClient | None = None
+_DEFAULT_CLIENT_LOCK = threading.Lock()
+
+
+def get_default_client() -> LcuClient:
+    """Uygulama genelinde paylaşılan `LcuClient` örneğini döndürür."""
+    global _DEFAULT_CLIENT
+    client = _DEFAULT_CLIENT
+    if client is not None:
+        return client
+    with _DEFAULT_CLIENT_LOCK:
+        if _DEFAULT_CLIENT is None:
+            _DEFAULT_CLIENT = LcuClient(asset_cache=AssetCache(), recorder=recorder_from_env())
+        return _DEFAULT_CLIENT
+
+
+def set_default_client(client: LcuClient | None) -> None:
+    """Paylaşılan istemciyi değiştirir (`None` → bir sonraki çağrıda yeniden oluşturulur)."""
+    global _DEFAULT_CLIENT
+    with _DEFAULT_CLIENT_LOCK:
+        previous = _DEFAULT_CLIENT
+        _DEFAULT_CLIENT = client
+    if previous is not None and previous is not client:
+        previous.close()
+
+
+def lcu_request(
+    method: str, endpoint: str, json_body: Any | None = None, *, timeout: float | None = None
+) -> requests.Response:
+    """
+    LCU API'ye authenticated istek atar (paylaşılan `LcuClient` üzerinden).
 
     `endpoint` değeri `/lol-...` gibi başlamalıdır.
     """
-    port, password = get_lcu_credentials()
-    url = f"https://127.0.0.1:{port}{endpoint}"
-    return requests.request(
-        method=str(method).upper(),
-        url=url,
-        json=json_body,
-        auth=("riot", password),
-        verify=False,
-    )
+    return get_default_client().request(method, endpoint, json_body, timeout=timeout)
+
+
+def single_flight_stats() -> SingleFlightStats:
+    """Paylaşılan istemcinin GET birleştirme sayaçlarını döndürür."""
+    return get_default_client().single_flight.stats()
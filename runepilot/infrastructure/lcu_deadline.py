@@ -0,0 +1,142 @@
+"""
+LCU çağrıları için süre sınırları (deadline).
+
+Her LCU isteği bir zaman aşımıyla gönderilir (`DEFAULT_TIMEOUT`, çağrı başına
+`timeout` ile değiştirilebilir); askıda kalan bir endpoint otomasyon döngüsünü
+süresiz bekletemez.
+
+Champ select sırasında bunun üzerine oturumun timer'ından türetilmiş bir son tarih
+konur (`champ_select_deadline`). `timer.adjustedTimeLeftInPhase`, LCU'nun
+`internalNowInEpochMs` anındaki kalan süredir; yükün bize ulaşana kadar geçen süresi
+düşülerek fazın bitiş anı `time.monotonic` cinsinden hesaplanır:
+
+- yazmalar (pick/ban PATCH'i...) faz bitişinden `WRITE_MARGIN` öncesine kadar,
+- okumalar ise `READ_RESERVE` daha erken bitecek şekilde sınırlanır: süre azaldığında
+  yavaş bir okuma beklenmez, kalan pencere kritik yazmaya bırakılır.
+
+Son tarih bir `ContextVar`'dadır; `asyncio.to_thread` bağlamı kopyaladığı için worker
+thread'indeki senkron handler'lar da döngünün kurduğu son tarihe uyar. Süresi geçmiş
+bir okuma hiç gönderilmez; son tarih yüzünden kesilen veya atlanan her istek
+`LcuMetrics` deadline sayacına yazılır.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import time
+from collections.abc import Iterator, Mapping
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+import requests
+
+DEFAULT_TIMEOUT = 10.0
+
+# Yazmanın LCU'ya faz bitmeden ulaşıp işlenmesi için bırakılan pay (sn).
+WRITE_MARGIN = 0.3
+# Okumalar, kritik yazmaya bu kadar süre kalacak şekilde erken kesilir (sn).
+READ_RESERVE = 1.5
+# Son tarih ne kadar yakın olursa olsun bir yazmaya tanınan en kısa süre (sn).
+MIN_WRITE_TIMEOUT = 0.25
+
+
+class LcuDeadlineExceeded(requests.Timeout):
+    """İstek, içinde bulunulan son tarihe yetişmedi (gönderilmedi veya yarıda kesildi)."""
+
+
+@dataclass(frozen=True)
+class Deadline:
+    """Okuma ve yazmaların bitmesi gereken anlar (`time.monotonic`)."""
+
+    read_by: float
+    write_by: float
+
+    def remaining(self, method: str, now: float | None = None) -> float:
+        now = time.monotonic() if now is None else now
+        if method == "GET":
+            return self.read_by - now
+        return max(self.write_by - now, MIN_WRITE_TIMEOUT)
+
+
+_CURRENT: ContextVar[Deadline | None] = ContextVar("lcu_deadline", default=None)
+
+
+def current_deadline() -> Deadline | None:
+    return _CURRENT.get()
+
+
+@contextlib.contextmanager
+def lcu_deadline(deadline: Deadline | None) -> Iterator[Deadline | None]:
+    """
+    Blok içindeki LCU çağrılarını `deadline` ile sınırlar.
+
+    `None` dıştaki son tarihi değiştirmez; iç içe son tarihlerde erken olan geçerlidir.
+    """
+    outer = _CURRENT.get()
+    if deadline is None:
+        deadline = outer
+    elif outer is not None:
+        deadline = Deadline(
+            min(outer.read_by, deadline.read_by), min(outer.write_by, deadline.write_by)
+        )
+    token = _CURRENT.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _CURRENT.reset(token)
+
+
+def call_budget(method: str, timeout: float | None = None) -> tuple[float, bool]:
+    """
+    Bir isteğin zaman aşımı ve bu sınırın son tarihten gelip gelmediği.
+
+    Dönen süre sıfır veya negatifse son tarih geçmiştir; istek gönderilmemelidir.
+    """
+    budget = DEFAULT_TIMEOUT if timeout is None else timeout
+    deadline = _CURRENT.get()
+    if deadline is None:
+        return budget, False
+    remaining = deadline.remaining(method)
+    if remaining < budget:
+        return remaining, True
+    return budget, False
+
+
+def phase_time_left(timer: Any, now_epoch_ms: float | None = None) -> float | None:
+    """Champ select timer'ından fazın kalan süresi (sn); süresiz/bilinmiyorsa `None`."""
+    if not isinstance(timer, Mapping) or timer.get("isInfinite"):
+        return None
+    try:
+        left_ms = float(timer["adjustedTimeLeftInPhase"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    try:
+        stamped_ms = float(timer.get("internalNowInEpochMs") or 0)
+    except (TypeError, ValueError):
+        stamped_ms = 0.0
+    if stamped_ms > 0:
+        now_ms = time.time() * 1000 if now_epoch_ms is None else now_epoch_ms
+        # Yük, LCU'nun damgasından bu yana bekledi (olay kuyruğu, polling aralığı).
+        left_ms -= max(0.0, now_ms - stamped_ms)
+    return left_ms / 1000
+
+
+def session_deadline(session: Mapping[str, Any] | None) -> Deadline | None:
+    """Oturumun timer'ından son tarih; timer yoksa/süresizse `None`."""
+    if not session:
+        return None
+    left = phase_time_left(session.get("timer"))
+    if left is None:
+        return None
+    phase_end = time.monotonic() + left
+    return Deadline(
+        read_by=phase_end - WRITE_MARGIN - READ_RESERVE, write_by=phase_end - WRITE_MARGIN
+    )
+
+
+def champ_select_deadline(
+    session: Mapping[str, Any] | None,
+) -> contextlib.AbstractContextManager[Deadline | None]:
+    """Champ select oturumunun timer'ına göre son tarih bağlamı (timer yoksa sınırsız)."""
+    return lcu_deadline(session_deadline(session))
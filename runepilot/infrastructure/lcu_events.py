@@ -0,0 +1,397 @@
+"""
+LCU WebSocket olay aboneliği (WAMP 1.0 `OnJsonApiEvent`).
+
+LCU, REST API ile aynı port üzerinden `wss://127.0.0.1:<port>/` adresinde bir
+WebSocket yayınlar. Bir kaynağa `[5, "OnJsonApiEvent_<uri>"]` mesajıyla abone olunur;
+kaynak değiştikçe `[8, topic, {"uri", "eventType", "data"}]` mesajları gelir.
+
+Ek bağımlılık gerektirmemek için RFC 6455'in ihtiyaç duyduğumuz alt kümesi (el sıkışma,
+maskeli metin çerçeveleri, ping/pong, close) burada stdlib ile yazılmıştır.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import os
+import socket
+import ssl
+import struct
+import threading
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from runepilot.infrastructure.lcu_client import LcuClient, get_default_client
+from runepilot.infrastructure.lockfile_watcher import CLIENT_UP, LockfileEvent, LockfileWatcher
+
+WAMP_SUBSCRIBE = 5
+WAMP_EVENT = 8
+
+_WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+OPCODE_CONTINUATION = 0x0
+OPCODE_TEXT = 0x1
+OPCODE_BINARY = 0x2
+OPCODE_CLOSE = 0x8
+OPCODE_PING = 0x9
+OPCODE_PONG = 0xA
+
+
+class WebSocketClosed(Exception):
+    """Karşı taraf bağlantıyı kapattı (close çerçevesi veya EOF)."""
+
+
+@dataclass(frozen=True)
+class LcuEvent:
+    """Tek bir `OnJsonApiEvent` bildirimi."""
+
+    uri: str
+    event_type: str  # "Create" | "Update" | "Delete"
+    data: Any
+
+
+def topic_for_uri(uri: str) -> str:
+    """`/lol-gameflow/v1/gameflow-phase` → `OnJsonApiEvent_lol-gameflow_v1_gameflow-phase`."""
+    return "OnJsonApiEvent" + uri.replace("/", "_")
+
+
+def parse_wamp_event(message: str) -> LcuEvent | None:
+    """WAMP EVENT mesajını `LcuEvent`'e çevirir; başka mesaj tiplerinde `None` döner."""
+    try:
+        decoded = json.loads(message)
+    except (TypeError, ValueError):
+        return None
+    if not (isinstance(decoded, list) and len(decoded) >= 3 and decoded[0] == WAMP_EVENT):
+        return None
+    payload = decoded[2]
+    if not isinstance(payload, dict) or not isinstance(payload.get("uri"), str):
+        return None
+    return LcuEvent(
+        uri=payload["uri"],
+        event_type=str(payload.get("eventType") or "Update"),
+        data=payload.get("data"),
+    )
+
+
+def websocket_accept_key(key: str) -> str:
+    """`Sec-WebSocket-Key` için beklenen `Sec-WebSocket-Accept` değeri."""
+    digest = hashlib.sha1((key + _WS_GUID).encode("ascii")).digest()
+    return base64.b64encode(digest).decode("ascii")
+
+
+def _apply_mask(payload: bytes, mask: bytes) -> bytes:
+    if not payload:
+        return payload
+    n = len(payload)
+    repeated = (mask * (n // 4 + 1))[:n]
+    return (int.from_bytes(payload, "big") ^ int.from_bytes(repeated, "big")).to_bytes(n, "big")
+
+
+def encode_ws_frame(opcode: int, payload: bytes, *, mask: bool) -> bytes:
+    """Tek (FIN) bir WebSocket çerçevesi üretir; istemci tarafı `mask=True` kullanır."""
+    header = bytearray([0x80 | opcode])
+    mask_bit = 0x80 if mask else 0
+    n = len(payload)
+    if n < 126:
+        header.append(mask_bit | n)
+    elif n < 65536:
+        header.append(mask_bit | 126)
+        header += struct.pack("!H", n)
+    else:
+        header.append(mask_bit | 127)
+        header += struct.pack("!Q", n)
+    if mask:
+        key = os.urandom(4)
+        header += key
+        payload = _apply_mask(payload, key)
+    return bytes(header) + payload
+
+
+class WebSocketConnection:
+    """El sıkışması tamamlanmış bir soket üzerinde WebSocket çerçeve okuma/yazma."""
+
+    def __init__(self, sock: socket.socket, *, client_side: bool, buffered: bytes = b"") -> None:
+        self._sock = sock
+        self._client_side = client_side
+        self._buffer = bytearray(buffered)
+        self._send_lock = threading.Lock()
+        self._closed = False
+
+    def _recv_exact(self, n: int) -> bytes:
+        while len(self._buffer) < n:
+            chunk = self._sock.recv(max(65536, n - len(self._buffer)))
+            if not chunk:
+                raise WebSocketClosed("EOF")
+            self._buffer += chunk
+        data = bytes(self._buffer[:n])
+        del self._buffer[:n]
+        return data
+
+    def _send_frame(self, opcode: int, payload: bytes) -> None:
+        frame = encode_ws_frame(opcode, payload, mask=self._client_side)
+        with self._send_lock:
+            self._sock.sendall(frame)
+
+    def send_text(self, text: str) -> None:
+        self._send_frame(OPCODE_TEXT, text.encode("utf-8"))
+
+    def recv_text(self) -> str:
+        """Bir sonraki tam metin mesajını döndürür (ping'lere otomatik pong verir)."""
+        fragments: list[bytes] = []
+        while True:
+            b1, b2 = self._recv_exact(2)
+            opcode = b1 & 0x0F
+            length = b2 & 0x7F
+            if length == 126:
+                (length,) = struct.unpack("!H", self._recv_exact(2))
+            elif length == 127:
+                (length,) = struct.unpack("!Q", self._recv_exact(8))
+            mask = self._recv_exact(4) if b2 & 0x80 else None
+            payload = self._recv_exact(length)
+            if mask is not None:
+                payload = _apply_mask(payload, mask)
+
+            if opcode == OPCODE_CLOSE:
+                self.close()
+                raise WebSocketClosed("close frame")
+            if opcode == OPCODE_PING:
+                self._send_frame(OPCODE_PONG, payload)
+                continue
+            if opcode == OPCODE_PONG:
+                continue
+            if opcode in (OPCODE_TEXT, OPCODE_BINARY, OPCODE_CONTINUATION):
+                fragments.append(payload)
+                if b1 & 0x80:
+                    return b"".join(fragments).decode("utf-8", errors="replace")
+
+    def close(self) -> None:
+        """Close çerçevesi gönderip soketi kapatır (birden fazla çağrı güvenli)."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._send_frame(OPCODE_CLOSE, b"")
+        except OSError:
+            pass
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
+
+
+def open_lcu_websocket(port: int, password: str, *, timeout: float = 5.0) -> WebSocketConnection:
+    """`wss://127.0.0.1:<port>/` adresine `riot` kimliğiyle WAMP WebSocket bağlantısı açar."""
+    context = ssl.create_default_context()
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+
+    raw = socket.create_connection(("127.0.0.1", int(port)), timeout=timeout)
+    try:
+        sock = context.wrap_socket(raw, server_hostname="127.0.0.1")
+        key = base64.b64encode(os.urandom(16)).decode("ascii")
+        auth = base64.b64encode(f"riot:{password}".encode()).decode("ascii")
+        request = (
+            "GET / HTTP/1.1\r\n"
+            f"Host: 127.0.0.1:{port}\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\n"
+            "Sec-WebSocket-Version: 13\r\n"
+            "Sec-WebSocket-Protocol: wamp\r\n"
+            f"Authorization: Basic {auth}\r\n"
+            "\r\n"
+        )
+        sock.sendall(request.encode("ascii"))
+
+        response = b""
+        while b"\r\n\r\n" not in response:
+            chunk = sock.recv(4096)
+            if not chunk:
+                raise WebSocketClosed("handshake EOF")
+            response += chunk
+        head, _, rest = response.partition(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        if len(lines[0].split()) < 2 or lines[0].split()[1] != "101":
+            raise ConnectionError(f"WebSocket el sıkışması reddedildi: {lines[0]}")
+        headers = {
+            k.strip().lower(): v.strip() for k, _, v in (line.partition(":") for line in lines[1:])
+        }
+        if headers.get("sec-websocket-accept") != websocket_accept_key(key):
+            raise ConnectionError("Geçersiz Sec-WebSocket-Accept")
+
+        # Olay akışı uzun süre sessiz kalabilir: okuma zaman aşımını kaldır.
+        sock.settimeout(None)
+        return WebSocketConnection(sock, client_side=True, buffered=rest)
+    except BaseException:
+        raw.close()
+        raise
+
+
+class LcuEventBuffer:
+    """
+    Son olayları uri bazında tutan (en yeni kazanır) ve tüketiciyi uyandıran kutu.
+
+    Abone thread'i `publish` ile yazar; otomasyon döngüsü `wait` + `drain` ile okur.
+    Böylece handler'lar tek thread'de çalışır ve aynı kaynağın art arda gelen
+    güncellemeleri tek işleme indirgenir.
+
+    `on_wake` verilirse her uyandırmada çağrılır (ör. asyncio tüketicisini uyandırmak
+    için); abone thread'inden çağrıldığı için thread-safe olmalıdır.
+    """
+
+    def __init__(self, on_wake: Callable[[], None] | None = None) -> None:
+        self._lock = threading.Lock()
+        self._pending: dict[str, LcuEvent] = {}
+        self._wakeup = threading.Event()
+        self._on_wake = on_wake
+
+    def publish(self, event: LcuEvent) -> None:
+        with self._lock:
+            self._pending[event.uri] = event
+            self._wakeup.set()
+        if self._on_wake is not None:
+            self._on_wake()
+
+    def wake(self) -> None:
+        """Olay olmadan bekleyen tüketiciyi uyandırır (ör. durdurma/konfig değişimi)."""
+        self._wakeup.set()
+        if self._on_wake is not None:
+            self._on_wake()
+
+    def wait(self, timeout: float | None) -> bool:
+        """Yeni olay gelene (True) veya süre dolana (False) kadar bekler."""
+        return self._wakeup.wait(timeout)
+
+    def drain(self) -> dict[str, LcuEvent]:
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+            self._wakeup.clear()
+        return pending
+
+
+class LcuEventSubscriber:
+    """
+    Arka plan thread'inde LCU WebSocket'ine bağlanıp verilen uri'lere abone olur.
+
+    Bağlantı koparsa (istemci kapandı/yeniden başladı) `reconnect_delay` sonra tekrar
+    dener. `connected` yalnızca abonelik mesajları gönderildikten sonra True olur;
+    `generation` her başarılı bağlantıda artar (tüketici, kaçırılmış olaylar için
+    REST ile tam bir senkronizasyon yapması gerektiğini buradan anlar).
+
+    `watcher` verilirse istemci kapalıyken bağlanmayı denemez (lockfile belirene kadar
+    uyur) ve kimlik değişiminde eski bağlantıyı hemen kapatıp yenisiyle bağlanır.
+    """
+
+    def __init__(
+        self,
+        uris: Iterable[str],
+        on_event: Callable[[LcuEvent], None],
+        *,
+        client: LcuClient | None = None,
+        watcher: LockfileWatcher | None = None,
+        reconnect_delay: float = 2.0,
+    ) -> None:
+        self._uris = tuple(dict.fromkeys(uris))
+        self._uri_set = frozenset(self._uris)
+        self._on_event = on_event
+        self._client = client
+        self._watcher = watcher
+        self._unsubscribe_watcher: Callable[[], None] | None = None
+        self._reconnect_delay = reconnect_delay
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+        self._connected = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._ws: WebSocketConnection | None = None
+        self._generation = 0
+
+    @property
+    def connected(self) -> bool:
+        return self._connected.is_set()
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def wait_connected(self, timeout: float | None = None) -> bool:
+        return self._connected.wait(timeout)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        if self._watcher is not None and self._unsubscribe_watcher is None:
+            self._unsubscribe_watcher = self._watcher.subscribe(self._on_lockfile_event)
+        self._thread = threading.Thread(target=self._run, name="lcu-events", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        self._wakeup.set()
+        if self._unsubscribe_watcher is not None:
+            self._unsubscribe_watcher()
+            self._unsubscribe_watcher = None
+        ws = self._ws
+        if ws is not None:
+            ws.close()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _on_lockfile_event(self, event: LockfileEvent) -> None:
+        if event.kind != CLIENT_UP:
+            # İstemci kapandı ya da yeni kimlikle yeniden başladı: eski soket ölü.
+            ws = self._ws
+            if ws is not None:
+                ws.close()
+        self._wakeup.set()
+
+    def _sleep(self, timeout: float | None) -> None:
+        self._wakeup.wait(timeout)
+        self._wakeup.clear()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            if self._watcher is not None and not self._watcher.client_up:
+                self._sleep(None)
+                continue
+            try:
+                client = self._client or get_default_client()
+                creds = client.credentials()
+                ws = open_lcu_websocket(int(creds.port), creds.password)
+            except Exception:
+                self._sleep(self._reconnect_delay)
+                continue
+
+            self._ws = ws
+            try:
+                for uri in self._uris:
+                    ws.send_text(json.dumps([WAMP_SUBSCRIBE, topic_for_uri(uri)]))
+                self._generation += 1
+                self._connected.set()
+                print("[EVENTS] Subscribed to LCU WebSocket events")
+
+                while not self._stop.is_set():
+                    event = parse_wamp_event(ws.recv_text())
+                    if event is None or event.uri not in self._uri_set:
+                        continue
+                    if client.recorder is not None:
+                        client.recorder.record_event(event.uri, event.event_type, event.data)
+                    try:
+                        self._on_event(event)
+                    except Exception as e:
+                        print(f"[EVENTS] Handler error for {event.uri}: {e}")
+            except (OSError, ValueError, WebSocketClosed):
+                pass
+            finally:
+                self._connected.clear()
+                self._ws = None
+                ws.close()
+
+            if not self._stop.is_set():
+                print("[EVENTS] LCU WebSocket disconnected, retrying")
+                self._sleep(self._reconnect_delay)
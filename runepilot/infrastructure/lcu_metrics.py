@@ -0,0 +1,168 @@
+"""
+LCU istek metrikleri (Prometheus text formatında dışa aktarılır).
+
+Her ağ isteği için (method, endpoint şablonu) başına istek sayısı, durum kodları,
+taşıma hataları, son tarih kaçırmaları (bkz. `lcu_deadline`) ve gecikme histogramı
+tutulur. Endpoint'lerdeki sayısal id'ler
+(`/actions/12` → `/actions/{id}`) ve statik ikon yolları şablona indirgenir; böylece
+seri sayısı sınırlı kalır.
+
+Kayıt maliyeti bir `perf_counter` farkı, bir `bisect` ve kilit altında birkaç tamsayı
+artırımıdır; üretimde açık kalacak kadar ucuzdur.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from bisect import bisect_left
+from functools import lru_cache
+
+# Saniye cinsinden histogram üst sınırları (LCU yerel: çoğu istek ilk birkaç kovada).
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+_NUMERIC_SEGMENT = re.compile(r"/-?\d+(?=/|\.json$|$)")
+_STATIC_ASSET_PREFIX = "/lol-game-data/assets/"
+
+
+@lru_cache(maxsize=2048)
+def endpoint_template(endpoint: str) -> str:
+    """Endpoint'i metrik etiketi olarak kullanılacak şablona indirger."""
+    path = endpoint.split("?", 1)[0]
+    if path.startswith(_STATIC_ASSET_PREFIX) and not path.endswith(".json"):
+        # Perk/şampiyon ikonları: yüzlerce farklı yol, tek seri.
+        return _STATIC_ASSET_PREFIX + "{asset}"
+    return _NUMERIC_SEGMENT.sub("/{id}", path)
+
+
+class _Series:
+    __slots__ = ("buckets", "count", "total", "errors", "deadline_misses", "statuses")
+
+    def __init__(self) -> None:
+        # Son eleman +Inf kovası; dışa aktarırken kümülatife çevrilir.
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.errors = 0
+        self.deadline_misses = 0
+        self.statuses: dict[int, int] = {}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class LcuMetrics:
+    """Thread-safe istek metrikleri deposu."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._series: dict[tuple[str, str], _Series] = {}
+
+    def observe(
+        self, method: str, endpoint: str, seconds: float, status: int | None = None
+    ) -> None:
+        """Bir isteği kaydeder; `status=None` taşıma hatası (yanıt yok) demektir."""
+        bucket = bisect_left(LATENCY_BUCKETS, seconds)
+        with self._lock:
+            series = self._series_locked(method, endpoint)
+            series.buckets[bucket] += 1
+            series.count += 1
+            series.total += seconds
+            if status is None:
+                series.errors += 1
+            else:
+                series.statuses[status] = series.statuses.get(status, 0) + 1
+
+    def observe_deadline_miss(self, method: str, endpoint: str) -> None:
+        """Son tarihe yetişmeyen (atlanan veya yarıda kesilen) bir isteği sayar."""
+        with self._lock:
+            self._series_locked(method, endpoint).deadline_misses += 1
+
+    def _series_locked(self, method: str, endpoint: str) -> _Series:
+        key = (method, endpoint_template(endpoint))
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _Series()
+        return series
+
+    def snapshot(self) -> dict[tuple[str, str], dict[str, object]]:
+        """Test/teşhis için serilerin kopyası."""
+        with self._lock:
+            return {
+                key: {
+                    "count": s.count,
+                    "errors": s.errors,
+                    "deadline_misses": s.deadline_misses,
+                    "sum": s.total,
+                    "statuses": dict(s.statuses),
+                    "buckets": list(s.buckets),
+                }
+                for key, s in self._series.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def render_prometheus(self) -> str:
+        """Metrikleri Prometheus text exposition formatında döndürür."""
+        snapshot = self.snapshot()
+        lines = [
+            "# HELP lcu_requests_total LCU HTTP responses by method, endpoint and status code.",
+            "# TYPE lcu_requests_total counter",
+        ]
+        for (method, endpoint), s in sorted(snapshot.items()):
+            labels = f'method="{_escape(method)}",endpoint="{_escape(endpoint)}"'
+            for status, n in sorted(s["statuses"].items()):  # type: ignore[union-attr]
+                lines.append(f'lcu_requests_total{{{labels},status="{status}"}} {n}')
+
+        lines += [
+            "# HELP lcu_request_errors_total LCU requests that failed without a response.",
+            "# TYPE lcu_request_errors_total counter",
+        ]
+        for (method, endpoint), s in sorted(snapshot.items()):
+            labels = f'method="{_escape(method)}",endpoint="{_escape(endpoint)}"'
+            lines.append(f"lcu_request_errors_total{{{labels}}} {s['errors']}")
+
+        lines += [
+            "# HELP lcu_request_deadline_misses_total LCU requests skipped or cut off by a deadline.",
+            "# TYPE lcu_request_deadline_misses_total counter",
+        ]
+        for (method, endpoint), s in sorted(snapshot.items()):
+            labels = f'method="{_escape(method)}",endpoint="{_escape(endpoint)}"'
+            lines.append(f"lcu_request_deadline_misses_total{{{labels}}} {s['deadline_misses']}")
+
+        lines += [
+            "# HELP lcu_request_duration_seconds LCU request latency.",
+            "# TYPE lcu_request_duration_seconds histogram",
+        ]
+        for (method, endpoint), s in sorted(snapshot.items()):
+            labels = f'method="{_escape(method)}",endpoint="{_escape(endpoint)}"'
+            cumulative = 0
+            buckets: list[int] = s["buckets"]  # type: ignore[assignment]
+            for upper, n in zip(LATENCY_BUCKETS, buckets[:-1], strict=True):
+                cumulative += n
+                lines.append(
+                    f'lcu_request_duration_seconds_bucket{{{labels},le="{upper}"}} {cumulative}'
+                )
+            lines.append(f'lcu_request_duration_seconds_bucket{{{labels},le="+Inf"}} {s["count"]}')
+            lines.append(f"lcu_request_duration_seconds_sum{{{labels}}} {s['sum']}")
+            lines.append(f"lcu_request_duration_seconds_count{{{labels}}} {s['count']}")
+        return "\n".join(lines) + "\n"
+
+
+# Uygulama genelinde paylaşılan metrik deposu (senkron ve async istemci birlikte yazar).
+LCU_METRICS = LcuMetrics()
@@ -0,0 +1,135 @@
+"""
+LCU trafiğinin kaydı (çevrimdışı tekrar oynatma ve performans regresyonu için).
+
+Kayıt açıkken istemcinin yaptığı her REST isteği (method, endpoint, durum kodu,
+gecikme, istek ve yanıt gövdesi) ve gelen her WebSocket olayı, gzip ile sıkıştırılmış
+JSON satırları olarak bir dosyaya eklenir. Satırlar kısa anahtarlı sözlüklerdir:
+
+- `{"k": "req", "t", "m", "e", "s", "l", "q", "b"}` — ağ isteği (`s`: taşıma hatasında
+  `None`, `l`: gecikme sn, `q`/`b`: istek/yanıt gövdesi; `c: 1` → disk cache'inden),
+- `{"k": "evt", "t", "u", "y", "d"}` — WebSocket olayı (uri, eventType, data),
+- `{"k": "note", "t", "n", "d"}` — serbest not (ör. otomasyonun başlatıldığı config).
+
+`t`, Unix zamanıdır ama açılıştaki duvar saatine eklenen `time.monotonic` farkıyla
+hesaplanır (saat ayarı kaydın içinde geri sıçrama yaratmaz). Her açılışta yeni bir gzip
+üyesi eklenir; `read_recording` ardışık üyeleri tek akış olarak okur.
+
+Kayıt `RUNEPILOT_LCU_RECORD=<dosya>` ortam değişkeniyle paylaşılan istemcide açılır
+(bkz. `lcu_client.get_default_client`); tekrar oynatma için `runepilot.testing.replay`.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import threading
+import time
+from typing import Any
+
+RECORD_ENV = "RUNEPILOT_LCU_RECORD"
+
+KIND_REQUEST = "req"
+KIND_EVENT = "evt"
+KIND_NOTE = "note"
+
+# Sıkıştırılmış akış en fazla bu kadar saniyede bir diske boşaltılır.
+FLUSH_INTERVAL = 1.0
+
+
+def decode_body(payload: Any) -> Any:
+    """Ham gövdeyi (bytes) JSON değerine çevirir; boş veya JSON olmayan gövde → `None`."""
+    if not isinstance(payload, (bytes, bytearray)):
+        return payload
+    if not payload:
+        return None
+    try:
+        return json.loads(payload)
+    except (UnicodeDecodeError, ValueError):
+        return None  # ikon vb. ikili içerik kaydedilmez
+
+
+class LcuRecorder:
+    """LCU isteklerini ve olaylarını sıkıştırılmış bir log dosyasına ekler (thread-safe)."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._file: gzip.GzipFile | None = gzip.open(path, "ab")
+        self._origin = time.monotonic()
+        self._wall_origin = time.time()
+        self._flushed_at = self._origin
+
+    def record_request(
+        self,
+        method: str,
+        endpoint: str,
+        status: int | None,
+        latency: float,
+        request_body: Any = None,
+        response_body: Any = None,
+        *,
+        cached: bool = False,
+    ) -> None:
+        entry: dict[str, Any] = {
+            "k": KIND_REQUEST,
+            "m": method,
+            "e": endpoint,
+            "s": status,
+            "l": round(latency, 6),
+            "q": decode_body(request_body),
+            "b": decode_body(response_body),
+        }
+        if cached:
+            entry["c"] = 1
+        self._write(entry)
+
+    def record_event(self, uri: str, event_type: str, data: Any) -> None:
+        self._write({"k": KIND_EVENT, "u": uri, "y": event_type, "d": data})
+
+    def note(self, name: str, data: Any = None) -> None:
+        self._write({"k": KIND_NOTE, "n": name, "d": data})
+
+    def close(self) -> None:
+        with self._lock:
+            file, self._file = self._file, None
+        if file is not None:
+            file.close()
+
+    def _write(self, entry: dict[str, Any]) -> None:
+        now = time.monotonic()
+        entry["t"] = round(self._wall_origin + now - self._origin, 6)
+        line = json.dumps(entry, separators=(",", ":"), default=str).encode("utf-8") + b"\n"
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line)
+            if now - self._flushed_at >= FLUSH_INTERVAL:
+                self._file.flush()
+                self._flushed_at = now
+
+
+def recorder_from_env() -> LcuRecorder | None:
+    """`RUNEPILOT_LCU_RECORD` tanımlıysa o dosyaya yazan bir kaydedici."""
+    path = os.getenv(RECORD_ENV)
+    if not path:
+        return None
+    print(f"[LCU] Recording LCU traffic to {path}")
+    return LcuRecorder(path)
+
+
+def read_recording(path: str) -> list[dict[str, Any]]:
+    """Kayıt dosyasındaki girdileri yazılış sırasıyla döndürür (yarım son satır atlanır)."""
+    entries: list[dict[str, Any]] = []
+    with gzip.open(path, "rb") as f:
+        try:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue
+        except EOFError:
+            pass  # kayıt kapatılmadan süreç sonlandı: boşaltılmış kısım okunur
+    return entries
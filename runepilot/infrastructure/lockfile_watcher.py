@@ -0,0 +1,319 @@
+"""
+League Client lockfile izleyicisi.
+
+İstemci açıldığında lockfile oluşturulur, kapandığında silinir, yeniden başladığında
+yeni pid/port/şifre ile yeniden yazılır. Bu modül `lockfile_candidates()` yollarını
+(`LOL_LOCKFILE` override dahil) izler ve durum değişimlerini abonelere yayınlar:
+
+- `CLIENT_UP`: lockfile belirdi (istemci açıldı)
+- `CLIENT_DOWN`: lockfile kayboldu (istemci kapandı)
+- `CREDENTIALS_CHANGED`: lockfile yeni pid/port/şifre ile yeniden yazıldı
+
+Linux'ta aday dizinler inotify ile izlenir (olay gelene kadar uyur); inotify yoksa
+(ör. Windows) birkaç `os.stat` çağrısından ibaret ucuz bir polling yapılır. Böylece
+tüketiciler istemci kapalıyken her saniye exception üretmek yerine bekleyebilir.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import sys
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from runepilot.infrastructure.lcu_client import (
+    LcuCredentials,
+    get_default_client,
+    lockfile_candidates,
+    read_lockfile,
+)
+
+CLIENT_UP = "client_up"
+CLIENT_DOWN = "client_down"
+CREDENTIALS_CHANGED = "credentials_changed"
+
+DEFAULT_POLL_INTERVAL = 1.0
+# inotify varken bile bu aralıkta bir tam tarama yapılır (henüz var olmayan dizinler,
+# ağ sürücüleri vb. için emniyet ağı).
+INOTIFY_SAFETY_INTERVAL = 10.0
+
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_IN_WATCH_MASK = (
+    0x00000002  # IN_MODIFY
+    | 0x00000004  # IN_ATTRIB
+    | 0x00000008  # IN_CLOSE_WRITE
+    | 0x00000040  # IN_MOVED_FROM
+    | 0x00000080  # IN_MOVED_TO
+    | 0x00000100  # IN_CREATE
+    | 0x00000200  # IN_DELETE
+    | 0x00000400  # IN_DELETE_SELF
+    | 0x00000800  # IN_MOVE_SELF
+)
+
+
+@dataclass(frozen=True)
+class LockfileEvent:
+    """İstemci durum değişimi (`credentials` yalnızca DOWN'da `None`)."""
+
+    kind: str
+    credentials: LcuCredentials | None
+
+
+class _Inotify:
+    """Dizin izlemek için minimal ctypes inotify sarmalayıcısı (yalnızca Linux)."""
+
+    def __init__(self) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.fd = fd
+        self._watched: set[str] = set()
+
+    def watch(self, directory: str) -> bool:
+        if directory in self._watched:
+            return True
+        wd = self._add_watch(self.fd, os.fsencode(directory), _IN_WATCH_MASK)
+        if wd < 0:
+            return False
+        self._watched.add(directory)
+        return True
+
+    def forget(self, directory: str) -> None:
+        # Dizin silinince kernel watch'u kendisi düşürür; tekrar eklenebilsin diye unut.
+        self._watched.discard(directory)
+
+    def wait(self, timeout: float, wake_fd: int) -> bool:
+        """
+        Olay gelene kadar (True) veya süre dolana kadar (False) bekler; kuyruğu boşaltır.
+
+        `wake_fd` okunabilir olursa (durdurma isteği) da beklemeden çıkılır.
+        """
+        ready, _, _ = select.select([self.fd, wake_fd], [], [], timeout)
+        if self.fd not in ready:
+            return False
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def _open_inotify() -> _Inotify | None:
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        return _Inotify()
+    except (OSError, AttributeError):
+        return None
+
+
+class LockfileWatcher:
+    """
+    Lockfile adaylarını izleyip istemci up/down/kimlik değişimi olaylarını yayınlar.
+
+    `check()` tek bir tarama yapar (testlerde doğrudan çağrılabilir); `start()` bunu
+    arka plan thread'inde inotify veya polling ile tekrarlar.
+    """
+
+    def __init__(
+        self,
+        *,
+        candidates: Callable[[], list[str]] = lockfile_candidates,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        use_inotify: bool = True,
+    ) -> None:
+        self._candidates = candidates
+        self._poll_interval = poll_interval
+        self._use_inotify = use_inotify
+        self._lock = threading.Lock()
+        self._listeners: list[Callable[[LockfileEvent], None]] = []
+        self._credentials: LcuCredentials | None = None
+        self._signature: tuple[Any, ...] | None = None
+        self._up = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._wake_w: int | None = None
+        self._inotify: _Inotify | None = None
+        self.using_inotify = False
+
+    # -- durum ----------------------------------------------------------------
+    @property
+    def client_up(self) -> bool:
+        return self._up.is_set()
+
+    @property
+    def credentials(self) -> LcuCredentials | None:
+        return self._credentials
+
+    def wait_until_up(self, timeout: float | None = None) -> bool:
+        return self._up.wait(timeout)
+
+    def subscribe(self, listener: Callable[[LockfileEvent], None]) -> Callable[[], None]:
+        """Olay dinleyicisi ekler; dinleyiciyi kaldıran bir fonksiyon döndürür."""
+        with self._lock:
+            self._listeners.append(listener)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+
+        return unsubscribe
+
+    # -- tarama ---------------------------------------------------------------
+    def _current(self) -> tuple[str, tuple[Any, ...]] | None:
+        for path in self._candidates():
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            return path, (path, st.st_mtime_ns, st.st_size)
+        return None
+
+    def check(self) -> LockfileEvent | None:
+        """Adayları bir kez tarar; durum değiştiyse olayı yayınlayıp döndürür."""
+        current = self._current()
+        with self._lock:
+            if current is None:
+                if self._credentials is None:
+                    return None
+                event = LockfileEvent(CLIENT_DOWN, None)
+                self._credentials = None
+                self._signature = None
+                self._up.clear()
+            else:
+                path, signature = current
+                if signature == self._signature:
+                    return None
+                try:
+                    creds = read_lockfile(path)
+                except (OSError, ValueError):
+                    # İstemci dosyayı yazarken yakalamış olabiliriz: bir sonraki turda tekrar.
+                    return None
+                previous = self._credentials
+                self._signature = signature
+                self._credentials = creds
+                self._up.set()
+                if previous is None:
+                    event = LockfileEvent(CLIENT_UP, creds)
+                elif (previous.pid, previous.port, previous.password) != (
+                    creds.pid,
+                    creds.port,
+                    creds.password,
+                ):
+                    event = LockfileEvent(CREDENTIALS_CHANGED, creds)
+                else:
+                    return None
+            listeners = list(self._listeners)
+
+        for listener in listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                print(f"[LOCKFILE] Listener error: {e}")
+        return event
+
+    # -- yaşam döngüsü --------------------------------------------------------
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        # Watch'lar ilk taramadan önce kurulur: arada yazılan lockfile kaçırılmasın.
+        self._inotify = _open_inotify() if self._use_inotify else None
+        self.using_inotify = self._inotify is not None
+        if self._inotify is not None:
+            self._watch_candidate_dirs(self._inotify)
+        self.check()
+        self._thread = threading.Thread(target=self._run, name="lockfile-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        wake_w = self._wake_w
+        if wake_w is not None:
+            try:
+                os.write(wake_w, b"x")
+            except OSError:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _watch_candidate_dirs(self, inotify: _Inotify) -> bool:
+        """Aday dizinleri inotify'a ekler; hepsi izlenebiliyorsa True döndürür."""
+        watched_all = True
+        for path in self._candidates():
+            directory = os.path.dirname(path) or "."
+            if os.path.isdir(directory):
+                watched_all = inotify.watch(directory) and watched_all
+            else:
+                inotify.forget(directory)
+                watched_all = False
+        return watched_all
+
+    def _run(self) -> None:
+        inotify, self._inotify = self._inotify, None
+        if inotify is None:
+            while not self._stop.wait(self._poll_interval):
+                self.check()
+            return
+
+        wake_r, self._wake_w = os.pipe()
+        try:
+            while not self._stop.is_set():
+                watched_all = self._watch_candidate_dirs(inotify)
+                # Var olmayan dizinler (henüz kurulmamış yol) olayla izlenemez: kısa aralık.
+                timeout = INOTIFY_SAFETY_INTERVAL if watched_all else self._poll_interval
+                inotify.wait(timeout, wake_r)
+                if not self._stop.is_set():
+                    self.check()
+        finally:
+            inotify.close()
+            os.close(wake_r)
+            os.close(self._wake_w)
+            self._wake_w = None
+
+
+_DEFAULT_WATCHER: LockfileWatcher | None = None
+_DEFAULT_WATCHER_LOCK = threading.Lock()
+
+
+def _reset_default_client_pool(event: LockfileEvent) -> None:
+    # Kapanan/yeniden başlayan istemcinin keep-alive bağlantıları artık ölü.
+    if event.kind in (CLIENT_DOWN, CREDENTIALS_CHANGED):
+        get_default_client().invalidate()
+
+
+def get_default_watcher() -> LockfileWatcher:
+    """Uygulama genelinde paylaşılan (ilk çağrıda başlatılan) izleyiciyi döndürür."""
+    global _DEFAULT_WATCHER
+    with _DEFAULT_WATCHER_LOCK:
+        if _DEFAULT_WATCHER is None:
+            watcher = LockfileWatcher()
+            watcher.subscribe(_reset_default_client_pool)
+            watcher.start()
+            _DEFAULT_WATCHER = watcher
+        return _DEFAULT_WATCHER
+
+
+def set_default_watcher(watcher: LockfileWatcher | None) -> None:
+    """Paylaşılan izleyiciyi değiştirir (`None` → bir sonraki çağrıda yeniden başlatılır)."""
+    global _DEFAULT_WATCHER
+    with _DEFAULT_WATCHER_LOCK:
+        previous = _DEFAULT_WATCHER
+        _DEFAULT_WATCHER = watcher
+    if previous is not None and previous is not watcher:
+        previous.stop()
@@ -0,0 +1,293 @@
+"""
+Rün öneri verisinin kompakt, sürümlü ikili biçimi (`runes.bin`).
+
+`runes.json` girintili metindir: her perk id'si `"8112"`, her istatistik `"52.49%"` gibi
+bir string'dir ve açılışta tamamı iç içe dict'lere çözülür. Paket, aynı veriyi
+derlenmiş haliyle (bkz. `runepilot.domain.rune_index`) saklar: sayfalar doğrulanmış ve
+öneri sırasına dizilmiş olarak yazılır, açılışta yalnızca başlık, string tablosu ve
+şampiyon ofset tablosu okunur. Bir şampiyonun varyantları ve sayfaları ilk
+sorulduğunda `mmap` üzerinden çözülür ve saklanır.
+
+Düzen (little-endian):
+
+- başlık `HEADER`: sihirli değer, sürüm, tablo boyları, kaynak JSON'un özeti
+  (`source_digest`; paketin eskiyip eskimediği buradan anlaşılır),
+- string tablosu: `u16` uzunluk + UTF-8 (şampiyon anahtarları, sayfa adları, rol/tier/
+  patch değerleri; her biri bir kez),
+- boyut tabloları: veride görülen tier'lar (görülme sırası) ve patch'ler,
+- şampiyon ofset tablosu `ENTRY`: anahtar, tür (slug / doğrudan şampiyon id'si) ve
+  şampiyonun varyant aralığı,
+- varyant tablosu `VARIANT`: (rol, tier, patch) string indeksleri ve sayfa aralığı,
+- sayfa düzeni tablosu `CONFIG`: `u16` stil ve perk id'leri; aynı düzen (rol/patch
+  değişse de seçilen perk'ler çoğunlukla aynıdır) bir kez yazılır,
+- sayfa kayıtları `PAGE`: ad, düzen indeksi, `f32` win/pick rate (`NaN` = yok), `i32`
+  oyun sayısı (`-1` = yok).
+
+Matris (rol × tier × patch) büyüdükçe yalnızca 20 baytlık varyant ve sayfa kayıtları
+çoğalır; perk düzenleri ve string'ler paylaşılır.
+
+Dönüştürücü: `python tools/build_rune_pack.py` (`runes.json` → `runes.bin`).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import mmap
+import os
+import struct
+from collections.abc import Iterator, Mapping
+from typing import Any
+
+from runepilot.domain.rune_index import (
+    ANY_VARIANT,
+    PAGE_PERK_COUNT,
+    ChampionPages,
+    CompiledPage,
+    RuneIndex,
+    Variant,
+    compile_runes,
+)
+
+MAGIC = b"RPRN"
+VERSION = 2
+DIGEST_SIZE = 16
+
+HEADER = struct.Struct(f"<4sHHIIIII{DIGEST_SIZE}s")
+ENTRY = struct.Struct("<IBxxxII")
+VARIANT = struct.Struct("<IIIII")
+CONFIG = struct.Struct(f"<HH{PAGE_PERK_COUNT}H")
+PAGE = struct.Struct("<IIffi")
+_COUNT = struct.Struct("<H")
+_LENGTH = struct.Struct("<H")
+
+KIND_SLUG = 0
+KIND_DIRECT = 1
+
+# f32, JSON'daki "51.72" gibi değerleri tam taşıyamaz; çözerken bu hassasiyete yuvarlanır.
+_STAT_DIGITS = 4
+
+
+def source_digest(path: str) -> bytes:
+    """Kaynak JSON dosyasının özeti (paketin bu dosyadan üretilip üretilmediğini gösterir)."""
+    with open(path, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=DIGEST_SIZE).digest()
+
+
+def _stat(value: float | None) -> float:
+    return math.nan if value is None else value
+
+
+def _unstat(value: float) -> float | None:
+    return None if math.isnan(value) else round(value, _STAT_DIGITS)
+
+
+def encode_rune_pack(index: RuneIndex, digest: bytes = b"") -> bytes:
+    """Derlenmiş indeksi paket baytlarına çevirir (stil/perk id'leri 16 bit'e sığmalıdır)."""
+    strings: dict[str, int] = {}
+    configs: dict[tuple[int, ...], int] = {}
+
+    def intern(text: str) -> int:
+        return strings.setdefault(text, len(strings))
+
+    entries: list[tuple[int, int, ChampionPages]] = []
+    for champ_id, pages in index.direct_items():
+        entries.append((intern(str(champ_id)), KIND_DIRECT, {ANY_VARIANT: pages}))
+    for slug, variants in index.slug_items():
+        entries.append((intern(slug), KIND_SLUG, variants))
+
+    entry_blob, variant_blob, config_blob, page_blob = (bytearray() for _ in range(4))
+    n_variants = n_pages = 0
+    for key, kind, variants in entries:
+        entry_blob += ENTRY.pack(key, kind, n_variants, len(variants))
+        for (role, tier, patch), pages in variants.items():
+            variant_blob += VARIANT.pack(
+                intern(role), intern(tier), intern(patch), n_pages, len(pages)
+            )
+            for page in pages:
+                layout = (page.primary_style_id, page.sub_style_id, *page.selected_perk_ids)
+                config = configs.get(layout)
+                if config is None:
+                    try:
+                        config_blob += CONFIG.pack(*layout)
+                    except struct.error as e:
+                        raise ValueError(
+                            f"Page {page.name!r} does not fit the pack format: {e}"
+                        ) from e
+                    config = configs[layout] = len(configs)
+                page_blob += PAGE.pack(
+                    intern(page.name),
+                    config,
+                    _stat(page.win_rate),
+                    _stat(page.pick_rate),
+                    -1 if page.games is None else page.games,
+                )
+            n_pages += len(pages)
+        n_variants += len(variants)
+
+    dims = bytearray()
+    for values in (index.tiers, index.patches):
+        dims += _COUNT.pack(len(values))
+        dims += b"".join(struct.pack("<I", intern(value)) for value in values)
+
+    string_blob = bytearray()
+    for text in strings:
+        raw = text.encode("utf-8")
+        string_blob += _LENGTH.pack(len(raw)) + raw
+
+    header = HEADER.pack(
+        MAGIC,
+        VERSION,
+        0,
+        len(strings),
+        len(entries),
+        n_variants,
+        len(configs),
+        n_pages,
+        digest.ljust(DIGEST_SIZE, b"\0"),
+    )
+    return b"".join((header, string_blob, dims, entry_blob, variant_blob, config_blob, page_blob))
+
+
+def build_rune_pack(json_path: str, pack_path: str) -> RunePack:
+    """`runes.json`'u derleyip pakete yazar (atomik: yarım yazılmış paket görülmez)."""
+    with open(json_path, "rb") as f:
+        raw = f.read()
+    index = compile_runes(json.loads(raw.decode("utf-8")))
+    digest = hashlib.blake2b(raw, digest_size=DIGEST_SIZE).digest()
+    tmp_path = f"{pack_path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(encode_rune_pack(index, digest))
+    os.replace(tmp_path, pack_path)
+    return open_rune_pack(pack_path)
+
+
+class RunePack(Mapping[str, ChampionPages]):
+    """
+    `mmap` ile açılmış paket; slug → (rol, tier, patch) varyantları → sayfalar.
+
+    Bir şampiyonun varyantları ilk erişimde çözülür ve saklanır. Doğrudan (id ile)
+    kayıtlar `direct_items` ile okunur; `index()` paketi `RuneIndex` olarak sunar.
+    """
+
+    def __init__(self, buffer: Any, *, close: Any = None) -> None:
+        self._buffer = buffer
+        self._close = close
+        try:
+            magic, version, _flags, n_strings, n_entries, n_variants, n_configs, n_pages, digest = (
+                HEADER.unpack_from(buffer, 0)
+            )
+        except struct.error as e:
+            raise ValueError(f"Truncated rune pack: {e}") from e
+        if magic != MAGIC:
+            raise ValueError("Not a rune pack")
+        if version != VERSION:
+            raise ValueError(f"Unsupported rune pack version {version} (expected {VERSION})")
+        self.source_digest: bytes = digest
+
+        try:
+            offset = HEADER.size
+            strings: list[str] = []
+            for _ in range(n_strings):
+                (length,) = _LENGTH.unpack_from(buffer, offset)
+                offset += _LENGTH.size
+                strings.append(buffer[offset : offset + length].decode("utf-8"))
+                offset += length
+            dims: list[tuple[str, ...]] = []
+            for _ in range(2):
+                (count,) = _COUNT.unpack_from(buffer, offset)
+                offset += _COUNT.size
+                values = struct.unpack_from(f"<{count}I", buffer, offset)
+                dims.append(tuple(strings[i] for i in values))
+                offset += 4 * count
+        except struct.error as e:
+            raise ValueError(f"Truncated rune pack: {e}") from e
+        self._strings = strings
+        self.tiers, self.patches = dims
+
+        self._slugs: dict[str, tuple[int, int]] = {}
+        self._direct: dict[int, tuple[int, int]] = {}
+        for key, kind, first, count in ENTRY.iter_unpack(
+            buffer[offset : offset + n_entries * ENTRY.size]
+        ):
+            if kind == KIND_DIRECT:
+                self._direct[int(strings[key])] = (first, count)
+            else:
+                self._slugs[strings[key]] = (first, count)
+        self._variants_offset = offset + n_entries * ENTRY.size
+        self._configs_offset = self._variants_offset + n_variants * VARIANT.size
+        self._pages_offset = self._configs_offset + n_configs * CONFIG.size
+        if len(buffer) < self._pages_offset + n_pages * PAGE.size:
+            raise ValueError("Truncated rune pack")
+        self._decoded: dict[str, ChampionPages] = {}
+
+    def _decode_pages(self, first: int, count: int) -> tuple[CompiledPage, ...]:
+        start = self._pages_offset + first * PAGE.size
+        pages = []
+        for name, config, win_rate, pick_rate, games in PAGE.iter_unpack(
+            self._buffer[start : start + count * PAGE.size]
+        ):
+            primary, sub, *perks = CONFIG.unpack_from(
+                self._buffer, self._configs_offset + config * CONFIG.size
+            )
+            pages.append(
+                CompiledPage(
+                    self._strings[name],
+                    primary,
+                    sub,
+                    tuple(perks),
+                    win_rate=_unstat(win_rate),
+                    pick_rate=_unstat(pick_rate),
+                    games=None if games < 0 else games,
+                )
+            )
+        return tuple(pages)
+
+    def _decode(self, first: int, count: int) -> dict[Variant, tuple[CompiledPage, ...]]:
+        start = self._variants_offset + first * VARIANT.size
+        strings = self._strings
+        return {
+            (strings[role], strings[tier], strings[patch]): self._decode_pages(page, n_pages)
+            for role, tier, patch, page, n_pages in VARIANT.iter_unpack(
+                self._buffer[start : start + count * VARIANT.size]
+            )
+        }
+
+    def __getitem__(self, slug: str) -> ChampionPages:
+        variants = self._decoded.get(slug)
+        if variants is None:
+            first, count = self._slugs[slug]
+            variants = self._decoded[slug] = self._decode(first, count)
+        return variants
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._slugs)
+
+    def __len__(self) -> int:
+        return len(self._slugs)
+
+    def direct_items(self) -> Iterator[tuple[int, tuple[CompiledPage, ...]]]:
+        for champ_id, (first, count) in self._direct.items():
+            yield champ_id, self._decode(first, count).get(ANY_VARIANT, ())
+
+    def index(self) -> RuneIndex:
+        return RuneIndex(dict(self.direct_items()), self, tiers=self.tiers, patches=self.patches)
+
+    def close(self) -> None:
+        if self._close is not None:
+            self._close()
+            self._close = None
+
+
+def open_rune_pack(path: str) -> RunePack:
+    """Paketi salt okunur `mmap` ile açar; biçim/sürüm uymuyorsa `ValueError`."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError("Empty rune pack")
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        return RunePack(mapped, close=mapped.close)
+    except Exception:
+        mapped.close()
+        raise
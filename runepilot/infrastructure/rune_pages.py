@@ -0,0 +1,140 @@
+"""
+Oyuncunun rün sayfalarının bellekteki modeli (`/lol-perks/v1/pages`).
+
+Rün uygulaması her seferinde tüm sayfaları GET etmek yerine bu envanteri kullanır:
+hedef sayfa id'si round-trip olmadan bulunur ve içeriği zaten istenenle aynı olan
+sayfaya PUT atılmaz. Envanter şu durumlarda güncellenir:
+
+- `/lol-perks/v1/pages` WebSocket olayı (tam liste gelir),
+- kendi yazmalarımızdan sonra (PUT/POST/DELETE yanıtı modele işlenir),
+- anlık görüntü `max_age`'den eskiyse veya geçersiz kılındıysa bir sonraki okumada GET.
+
+Kullanıcı istemcide sayfa düzenlerse WebSocket olayı modeli yeniler; bağlantı yoksa
+`max_age` bayat veriyle yazma atlanmasını sınırlar.
+"""
+
+from __future__ import annotations
+
+import copy
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from runepilot.infrastructure.lcu_client import lcu_request
+
+RUNE_PAGES_URI = "/lol-perks/v1/pages"
+DEFAULT_MAX_AGE = 30.0
+
+# Sayfa içeriğini belirleyen alanlar; hepsi aynıysa PUT no-op'tur.
+PAGE_CONTENT_KEYS = ("name", "primaryStyleId", "subStyleId", "selectedPerkIds")
+
+
+def page_matches(page: dict[str, Any], payload: dict[str, Any]) -> bool:
+    """Mevcut sayfa, yazılacak içerikle (ve seçili olma durumuyla) aynı mı?"""
+    for key in PAGE_CONTENT_KEYS:
+        if key not in payload:
+            continue
+        current, desired = page.get(key), payload[key]
+        if key == "selectedPerkIds":
+            if not isinstance(current, list) or [str(v) for v in current] != [
+                str(v) for v in desired
+            ]:
+                return False
+        elif str(current) != str(desired):
+            return False
+    if payload.get("current") is True and page.get("current") is not True:
+        return False
+    return True
+
+
+def _fetch_pages() -> list[dict[str, Any]] | None:
+    res = lcu_request("GET", RUNE_PAGES_URI)
+    if res.status_code != 200:
+        print(f"[RUNES] Failed to fetch rune pages: {res.status_code} {res.text}")
+        return None
+    pages = res.json()
+    if not isinstance(pages, list):
+        print(f"[RUNES] Unexpected {RUNE_PAGES_URI} response: {type(pages)}")
+        return None
+    return pages
+
+
+class RunePageInventory:
+    """Thread-safe rün sayfası envanteri; okumalar kopya döndürür."""
+
+    def __init__(
+        self,
+        fetch: Callable[[], list[dict[str, Any]] | None] = _fetch_pages,
+        *,
+        max_age: float = DEFAULT_MAX_AGE,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._fetch = fetch
+        self._max_age = max_age
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._pages: list[dict[str, Any]] | None = None
+        self._loaded_at = 0.0
+        self.fetches = 0
+
+    def pages(self) -> list[dict[str, Any]] | None:
+        """Sayfaların kopyası; model yoksa/bayatsa LCU'dan okunur (hata: `None`)."""
+        with self._lock:
+            if self._pages is not None and self._clock() - self._loaded_at < self._max_age:
+                return copy.deepcopy(self._pages)
+        pages = self._fetch()
+        self.fetches += 1
+        if pages is None:
+            return None
+        self.replace(pages)
+        return copy.deepcopy([p for p in pages if isinstance(p, dict)])
+
+    def replace(self, pages: Any) -> None:
+        """Tam listeyi (GET yanıtı veya WebSocket olayı) model olarak alır."""
+        if not isinstance(pages, list):
+            self.invalidate()
+            return
+        with self._lock:
+            self._pages = copy.deepcopy([p for p in pages if isinstance(p, dict)])
+            self._loaded_at = self._clock()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._pages = None
+
+    def find(self, page_id: int) -> dict[str, Any] | None:
+        with self._lock:
+            for page in self._pages or []:
+                if str(page.get("id")) == str(page_id):
+                    return copy.deepcopy(page)
+        return None
+
+    def record_put(self, page_id: int, payload: dict[str, Any]) -> None:
+        """Başarılı PUT'u modele işler (seçili sayfa değiştiyse diğerleri seçili değildir)."""
+        with self._lock:
+            if self._pages is None:
+                return
+            for page in self._pages:
+                if str(page.get("id")) == str(page_id):
+                    page.update(copy.deepcopy(payload))
+                elif payload.get("current") is True:
+                    page["current"] = False
+
+    def record_create(self, page: Any) -> None:
+        """Başarılı POST yanıtını modele ekler; yanıt gövdesi yoksa model geçersizdir."""
+        if not isinstance(page, dict) or page.get("id") is None:
+            self.invalidate()
+            return
+        with self._lock:
+            if self._pages is None:
+                return
+            if page.get("current") is True:
+                for existing in self._pages:
+                    existing["current"] = False
+            self._pages.append(copy.deepcopy(page))
+
+    def record_delete(self, page_id: int) -> None:
+        with self._lock:
+            if self._pages is not None:
+                self._pages = [p for p in self._pages if str(p.get("id")) != str(page_id)]
@@ -0,0 +1,118 @@
+"""
+Single-flight: aynı anahtar için eşzamanlı çağrıları tek bir işe indirger.
+
+Birden fazla thread (FastAPI threadpool, otomasyon thread'i, GUI worker'ları) aynı
+LCU GET'ini aynı anda isteyebilir. İlk gelen çağrı ("lider") isteği gönderir; o
+uçuştayken aynı anahtarla gelen çağrılar yeni istek atmak yerine liderin sonucunu
+(veya exception'ını) paylaşır. Uçuş bittiğinde anahtar serbest kalır; yani bu bir
+cache değildir, yalnızca çakışan istekleri birleştirir.
+
+Bekleme `concurrent.futures.Future` üzerinden yapıldığı için senkron (`do`) ve
+asyncio (`do_async`) çağıranlar aynı uçuşu paylaşabilir.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable, Hashable
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class SingleFlightStats:
+    """
+    Sayaçlar.
+
+    - `calls`: single-flight'tan geçen toplam çağrı
+    - `executed`: gerçekten gönderilen istek (lider) sayısı
+    - `hits`: uçuştaki bir isteğin sonucunu paylaşan (istek atmayan) çağrı sayısı
+    - `coalesced`: en az bir takipçisi olan, yani birleştirme yapılan uçuş sayısı
+    """
+
+    calls: int = 0
+    executed: int = 0
+    hits: int = 0
+    coalesced: int = 0
+
+
+class _Flight:
+    __slots__ = ("future", "followers")
+
+    def __init__(self) -> None:
+        self.future: Future[Any] = Future()
+        self.followers = 0
+
+
+class SingleFlight:
+    """Thread-safe single-flight grubu."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flights: dict[Hashable, _Flight] = {}
+        self._calls = 0
+        self._executed = 0
+        self._hits = 0
+        self._coalesced = 0
+
+    def _join(self, key: Hashable) -> tuple[_Flight, bool]:
+        """Uçuşa katılır; (uçuş, lider mi) döndürür."""
+        with self._lock:
+            self._calls += 1
+            flight = self._flights.get(key)
+            if flight is not None:
+                if flight.followers == 0:
+                    self._coalesced += 1
+                flight.followers += 1
+                self._hits += 1
+                return flight, False
+            flight = _Flight()
+            self._flights[key] = flight
+            self._executed += 1
+            return flight, True
+
+    def _land(self, key: Hashable, flight: _Flight) -> None:
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """`fn()` sonucunu döndürür; `key` zaten uçuştaysa onun sonucunu bekler."""
+        flight, leader = self._join(key)
+        if not leader:
+            return flight.future.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            self._land(key, flight)
+            flight.future.set_exception(e)
+            raise
+        self._land(key, flight)
+        flight.future.set_result(result)
+        return result
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """`do` ile aynı, asyncio için (lider `await fn()` çalıştırır)."""
+        flight, leader = self._join(key)
+        if not leader:
+            return await asyncio.wrap_future(flight.future)
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            # Liderin iptali takipçilerin isteğini de boşa çıkarır; onlar da iptal görür.
+            self._land(key, flight)
+            flight.future.cancel()
+            raise
+        except BaseException as e:
+            self._land(key, flight)
+            flight.future.set_exception(e)
+            raise
+        self._land(key, flight)
+        flight.future.set_result(result)
+        return result
+
+    def stats(self) -> SingleFlightStats:
+        with self._lock:
+            return SingleFlightStats(self._calls, self._executed, self._hits, self._coalesced)
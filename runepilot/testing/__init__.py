@@ -0,0 +1 @@
+"""Test ve benchmark yardımcıları (uygulama kodu tarafından import edilmez)."""
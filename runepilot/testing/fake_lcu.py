@@ -0,0 +1,403 @@
+"""
+Yerel LCU taklidi (test/benchmark için).
+
+Gerçek istemci gibi TLS üzerinde `127.0.0.1:<port>` dinler, `riot:<şifre>` Basic
+auth ister; REST endpoint'lerine `set_response` ile tanımlanan sabit yanıtları veya
+`route` ile bağlanan dinamik handler'ların yanıtlarını verir ve aynı port üzerinden WAMP
+WebSocket olay kanalı sunar. Kayıtlı olay dizileri (`RecordedEvent`) abonelere
+sırasıyla yeniden oynatılabilir.
+
+`set_fault` ile endpoint başına gecikme, jitter ve hata enjeksiyonu yapılır; rastgelelik
+`seed` ile tohumlanmış tek bir `random.Random`'dan gelir (tekrarlanabilir koşular).
+
+Sertifika (`fake_lcu_cert.pem`) yalnızca bu taklit için üretilmiş self-signed bir
+çifttir; LCU istemcimiz zaten sertifika doğrulaması yapmaz.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import os
+import random
+import re
+import ssl
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from runepilot.infrastructure.lcu_events import (
+    WAMP_EVENT,
+    WAMP_SUBSCRIBE,
+    WebSocketClosed,
+    WebSocketConnection,
+    topic_for_uri,
+    websocket_accept_key,
+)
+
+CERT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_lcu_cert.pem")
+
+# Tüm olaylara abone olmak için kullanılan genel WAMP topic'i.
+ALL_EVENTS_TOPIC = "OnJsonApiEvent"
+
+
+@dataclass(frozen=True)
+class FakeResponse:
+    """
+    Bir REST endpoint'inin sabit yanıtı (`delay`: yanıt öncesi bekleme, sn).
+
+    `headers` içinde `ETag` varsa eşleşen `If-None-Match` isteklerine 304 dönülür.
+    """
+
+    status: int = 200
+    body: Any = None
+    delay: float = 0.0
+    headers: tuple[tuple[str, str], ...] = ()
+
+
+@dataclass(frozen=True)
+class RecordedEvent:
+    """Yeniden oynatılacak tek bir LCU olayı (`delay`: önceki olaydan sonraki bekleme)."""
+
+    uri: str
+    data: Any
+    event_type: str = "Update"
+    delay: float = 0.0
+
+
+@dataclass(frozen=True)
+class Fault:
+    """Endpoint'e enjekte edilen gecikme/hata (`failure_rate`: 0..1 olasılık)."""
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    failure_rate: float = 0.0
+    failure_status: int = 503
+
+
+# Dinamik handler: (method, path, json gövdesi, path parametreleri) -> yanıt.
+RouteHandler = Callable[[str, str, Any, dict[str, str]], "FakeResponse | tuple[int, Any]"]
+
+
+def _compile_pattern(pattern: str) -> re.Pattern[str]:
+    """`/actions/{id}` gibi bir kalıbı regex'e çevirir (`*`: herhangi bir karakter dizisi)."""
+    regex = re.escape(pattern).replace(r"\*", ".*")
+    regex = re.sub(r"\\\{(\w+)\\\}", r"(?P<\1>[^/]+)", regex)
+    return re.compile(f"^{regex}$")
+
+
+class _WebSocketPeer:
+    def __init__(self, ws: WebSocketConnection) -> None:
+        self.ws = ws
+        self.topics: set[str] = set()
+
+    def wants(self, uri: str) -> bool:
+        return ALL_EVENTS_TOPIC in self.topics or topic_for_uri(uri) in self.topics
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        pass
+
+    @property
+    def fake(self) -> FakeLcuServer:
+        return self.server.fake  # type: ignore[attr-defined]
+
+    def _authorized(self) -> bool:
+        expected = base64.b64encode(f"riot:{self.fake.password}".encode()).decode("ascii")
+        return self.headers.get("Authorization") == f"Basic {expected}"
+
+    def _send(
+        self,
+        status: int,
+        body: bytes = b"",
+        content_type: str = "application/json",
+        headers: tuple[tuple[str, str], ...] = (),
+    ) -> None:
+        self.send_response(status)
+        if body:
+            self.send_header("Content-Type", content_type)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def _serve_rest(self) -> None:
+        if not self._authorized():
+            self._send(401)
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            body = json.loads(raw) if raw else None
+        except ValueError:
+            body = None
+        response = self.fake._handle_rest(self.command, self.path, body)
+        if response.delay > 0:
+            time.sleep(response.delay)
+        etag = dict(response.headers).get("ETag")
+        if etag is not None and self.headers.get("If-None-Match") == etag:
+            self._send(304, headers=response.headers)
+        elif isinstance(response.body, bytes):
+            self._send(response.status, response.body, "application/octet-stream", response.headers)
+        elif response.body is None:
+            self._send(response.status, headers=response.headers)
+        else:
+            self._send(
+                response.status, json.dumps(response.body).encode("utf-8"), headers=response.headers
+            )
+
+    def do_GET(self) -> None:
+        if (self.headers.get("Upgrade") or "").lower() == "websocket":
+            if not self._authorized():
+                self._send(401)
+                return
+            self._serve_websocket()
+            return
+        self._serve_rest()
+
+    do_POST = do_PUT = do_PATCH = do_DELETE = _serve_rest
+
+    def _serve_websocket(self) -> None:
+        key = self.headers.get("Sec-WebSocket-Key") or ""
+        self.send_response(101, "Switching Protocols")
+        self.send_header("Upgrade", "websocket")
+        self.send_header("Connection", "Upgrade")
+        self.send_header("Sec-WebSocket-Accept", websocket_accept_key(key))
+        self.send_header("Sec-WebSocket-Protocol", "wamp")
+        self.end_headers()
+        self.close_connection = True
+
+        peer = _WebSocketPeer(WebSocketConnection(self.connection, client_side=False))
+        self.fake._attach(peer)
+        try:
+            while True:
+                try:
+                    message = json.loads(peer.ws.recv_text())
+                except ValueError:
+                    continue
+                if isinstance(message, list) and len(message) >= 2:
+                    if message[0] == WAMP_SUBSCRIBE:
+                        self.fake._subscribe(peer, str(message[1]))
+        except (OSError, WebSocketClosed):
+            pass
+        finally:
+            self.fake._detach(peer)
+
+
+class FakeLcuServer:
+    """TLS + WebSocket LCU taklidi; `with FakeLcuServer(...) as server:` ile kullanılır."""
+
+    def __init__(
+        self,
+        *,
+        password: str = "fake-lcu-password",
+        pid: int = 4242,
+        events: Iterable[RecordedEvent] = (),
+        seed: int = 0,
+    ) -> None:
+        self.password = password
+        self.pid = pid
+        self.events: list[RecordedEvent] = list(events)
+        self.requests: list[tuple[str, str, Any]] = []
+        # `requests` ile aynı sırada, isteklerin varış zamanları (`time.monotonic`).
+        self.request_times: list[float] = []
+        self._responses: dict[tuple[str, str], FakeResponse] = {}
+        self._routes: list[tuple[str, re.Pattern[str], RouteHandler]] = []
+        self._faults: list[tuple[str | None, re.Pattern[str], Fault]] = []
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._peers: list[_WebSocketPeer] = []
+        self._peers_changed = threading.Condition()
+        self._httpd: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    # -- yaşam döngüsü --------------------------------------------------------
+    def start(self) -> FakeLcuServer:
+        httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        httpd.daemon_threads = True
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(CERT_FILE)
+        httpd.socket = context.wrap_socket(httpd.socket, server_side=True)
+        httpd.fake = self  # type: ignore[attr-defined]
+        self._httpd = httpd
+        self._thread = threading.Thread(target=httpd.serve_forever, name="fake-lcu", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._httpd is None:
+            return
+        self._httpd.shutdown()
+        with self._peers_changed:
+            peers = list(self._peers)
+        for peer in peers:
+            peer.ws.close()
+        self._httpd.server_close()
+        self._httpd = None
+
+    def __enter__(self) -> FakeLcuServer:
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    @property
+    def port(self) -> int:
+        if self._httpd is None:
+            raise RuntimeError("FakeLcuServer başlatılmadı")
+        return int(self._httpd.server_address[1])
+
+    def write_lockfile(self, path: str) -> str:
+        """Gerçek istemcinin lockfile formatında bağlantı bilgisini yazar."""
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"LeagueClient:{self.pid}:{self.port}:{self.password}:https")
+        return path
+
+    # -- REST -----------------------------------------------------------------
+    def set_response(
+        self,
+        method: str,
+        path: str,
+        body: Any = None,
+        *,
+        status: int = 200,
+        delay: float = 0.0,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        """`method path` için dönülecek yanıtı tanımlar (tanımsız endpoint'ler 404)."""
+        response = FakeResponse(status, body, delay, tuple((headers or {}).items()))
+        with self._lock:
+            self._responses[(method.upper(), path)] = response
+
+    def route(self, method: str, pattern: str, handler: RouteHandler) -> None:
+        """`method pattern` isteklerini dinamik handler'a bağlar (sabit yanıtlar önceliklidir)."""
+        with self._lock:
+            self._routes.append((method.upper(), _compile_pattern(pattern), handler))
+
+    def set_fault(
+        self,
+        pattern: str,
+        *,
+        method: str | None = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        failure_status: int = 503,
+    ) -> None:
+        """Kalıba uyan isteklere gecikme (`latency` + U(0, `jitter`)) ve hata enjekte eder."""
+        fault = Fault(latency, jitter, failure_rate, failure_status)
+        with self._lock:
+            self._faults.append(
+                (method.upper() if method else None, _compile_pattern(pattern), fault)
+            )
+
+    def clear_faults(self) -> None:
+        with self._lock:
+            self._faults.clear()
+
+    def _handle_rest(self, method: str, raw_path: str, body: Any) -> FakeResponse:
+        path = raw_path.split("?", 1)[0]
+        with self._lock:
+            self.requests.append((method, raw_path, body))
+            self.request_times.append(time.monotonic())
+            delay = 0.0
+            failure: FakeResponse | None = None
+            for fault_method, regex, fault in self._faults:
+                if (fault_method is None or fault_method == method) and regex.match(path):
+                    delay += fault.latency + (
+                        self._rng.uniform(0, fault.jitter) if fault.jitter else 0
+                    )
+                    if fault.failure_rate and self._rng.random() < fault.failure_rate:
+                        failure = FakeResponse(
+                            fault.failure_status, {"message": "injected failure"}
+                        )
+            response = self._responses.get((method, raw_path))
+            handler = None
+            params: dict[str, str] = {}
+            if response is None:
+                for route_method, regex, route_handler in self._routes:
+                    match = regex.match(path)
+                    if route_method == method and match:
+                        handler, params = route_handler, match.groupdict()
+                        break
+
+        if failure is not None:
+            response = failure
+        elif response is None and handler is not None:
+            result = handler(method, path, body, params)
+            if not isinstance(result, FakeResponse):
+                status, result_body = result
+                result = FakeResponse(status, result_body)
+            response = result
+        elif response is None:
+            response = FakeResponse(status=404)
+        if delay:
+            response = FakeResponse(
+                response.status, response.body, response.delay + delay, response.headers
+            )
+        return response
+
+    def request_count(self, method: str | None = None, path: str | None = None) -> int:
+        with self._lock:
+            return sum(
+                1
+                for m, p, _ in self.requests
+                if (method is None or m == method) and (path is None or p == path)
+            )
+
+    # -- WebSocket ------------------------------------------------------------
+    def _attach(self, peer: _WebSocketPeer) -> None:
+        with self._peers_changed:
+            self._peers.append(peer)
+            self._peers_changed.notify_all()
+
+    def _detach(self, peer: _WebSocketPeer) -> None:
+        with self._peers_changed:
+            if peer in self._peers:
+                self._peers.remove(peer)
+            self._peers_changed.notify_all()
+
+    def _subscribe(self, peer: _WebSocketPeer, topic: str) -> None:
+        with self._peers_changed:
+            peer.topics.add(topic)
+            self._peers_changed.notify_all()
+
+    def wait_for_subscribers(self, uris: Iterable[str], timeout: float = 5.0) -> bool:
+        """Tüm `uris` için en az bir abone oluşana kadar bekler."""
+        wanted = list(uris)
+        with self._peers_changed:
+            return self._peers_changed.wait_for(
+                lambda: all(any(p.wants(uri) for p in self._peers) for uri in wanted),
+                timeout,
+            )
+
+    def publish(self, uri: str, data: Any, event_type: str = "Update") -> int:
+        """Olayı ilgili abonelere gönderir; gönderilen abone sayısını döndürür."""
+        message = json.dumps(
+            [WAMP_EVENT, topic_for_uri(uri), {"uri": uri, "eventType": event_type, "data": data}]
+        )
+        with self._peers_changed:
+            peers = [p for p in self._peers if p.wants(uri)]
+        sent = 0
+        for peer in peers:
+            try:
+                peer.ws.send_text(message)
+                sent += 1
+            except OSError:
+                continue
+        return sent
+
+    def replay(self, events: Iterable[RecordedEvent] | None = None) -> None:
+        """Kayıtlı olayları `delay` sürelerine uyarak sırasıyla yayınlar."""
+        for event in self.events if events is None else events:
+            if event.delay > 0:
+                time.sleep(event.delay)
+            self.publish(event.uri, event.data, event.event_type)
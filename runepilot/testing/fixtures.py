@@ -0,0 +1,21 @@
+"""
+pytest fixture'ları (kök `conftest.py` içinde `pytest_plugins` ile yüklenir).
+
+`fake_lcu`: senaryolu LCU taklidini başlatır ve uygulamayı ona bağlar
+(bkz. `running_scripted_lcu`); otomasyon döngüsü League kurulu olmayan bir makinede
+uçtan uca sürülebilir.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+import pytest
+
+from runepilot.testing.scripted_lcu import ScriptedLcu, running_scripted_lcu
+
+
+@pytest.fixture
+def fake_lcu(tmp_path) -> Iterator[ScriptedLcu]:
+    with running_scripted_lcu(str(tmp_path)) as script:
+        yield script
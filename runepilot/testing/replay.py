@@ -0,0 +1,241 @@
+"""
+Kaydedilmiş LCU trafiğinin (bkz. `lcu_recorder`) otomasyona karşı tekrar oynatılması.
+
+`ReplayLcu`, bir `FakeLcuServer`'ı kayıttaki istemci gibi davrandırır:
+
+- WebSocket olayları kayıttaki zamanlarında yayınlanır; zaman `VirtualClock` ile
+  `speed` kat hızlandırılabilir (1.0 → gerçek zaman).
+- REST okumalarına, sanal saatteki ana kadar kaydedilmiş son yanıt döner (henüz
+  kaydı yoksa ilk kayıtlı yanıt); yazmalara aynı endpoint'in kayıtlı yanıtı döner.
+  Kayıtta hiç görülmemiş endpoint'ler 404'tür.
+
+Oynatma açık döngüdür: otomasyonun yazmaları sunucu durumunu değiştirmez, istemci
+kayıttaki oturumu yaşar. Otomasyonun kendi zamanlayıcıları (yeniden deneme,
+polling aralıkları) gerçek zamanda işler; yüksek `speed` yalnızca kaydın zaman
+çizelgesini sıkıştırır.
+
+`play` sonunda bir `ReplayReport` döner: otomasyonun kararları (GET dışı istekler),
+endpoint başına istek sayıları ve her kararın tepki süresi (son yayınlanan olaydan
+karara kadar geçen gerçek süre). Aynı ölçümler kayıttaki özgün koşu için de çıkarılır;
+iki sütun karşılaştırılarak performans regresyonu görülür.
+"""
+
+from __future__ import annotations
+
+import statistics
+import threading
+import time
+from bisect import bisect_right
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from runepilot.infrastructure.lcu_metrics import endpoint_template
+from runepilot.infrastructure.lcu_recorder import KIND_EVENT, KIND_NOTE, KIND_REQUEST
+from runepilot.testing.fake_lcu import FakeLcuServer, FakeResponse
+
+REPLAY_METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE")
+
+
+class VirtualClock:
+    """Kayıt zaman çizelgesi: gerçek zamanın `speed` katı hızla ilerleyen saniyeler."""
+
+    def __init__(self, speed: float = 1.0) -> None:
+        if speed <= 0:
+            raise ValueError("speed must be positive")
+        self.speed = speed
+        self._origin = time.monotonic()
+
+    def now(self) -> float:
+        return (time.monotonic() - self._origin) * self.speed
+
+    def real_delay(self, at: float) -> float:
+        """Sanal `at` anına kadar beklenecek gerçek süre (geçtiyse 0)."""
+        return max(0.0, (at - self.now()) / self.speed)
+
+    def real_to_virtual(self, monotonic: float) -> float:
+        return (monotonic - self._origin) * self.speed
+
+
+@dataclass(frozen=True)
+class Decision:
+    """Otomasyonun bir yazması (`at`: kayıt zaman çizelgesinde sn)."""
+
+    at: float
+    method: str
+    endpoint: str
+    body: Any = None
+    # Son olaydan bu karara kadar geçen gerçek süre (sn); öncesinde olay yoksa None.
+    reaction: float | None = None
+
+
+@dataclass
+class ReplayReport:
+    """Tekrar oynatılan koşunun ve kayıttaki özgün koşunun ölçümleri."""
+
+    speed: float
+    duration: float
+    decisions: list[Decision] = field(default_factory=list)
+    request_counts: Counter[tuple[str, str]] = field(default_factory=Counter)
+    recorded_decisions: list[Decision] = field(default_factory=list)
+    recorded_request_counts: Counter[tuple[str, str]] = field(default_factory=Counter)
+
+    @staticmethod
+    def _reactions(decisions: Iterable[Decision]) -> list[float]:
+        return [d.reaction for d in decisions if d.reaction is not None]
+
+    @property
+    def reactions(self) -> list[float]:
+        return self._reactions(self.decisions)
+
+    @property
+    def recorded_reactions(self) -> list[float]:
+        return self._reactions(self.recorded_decisions)
+
+    def summary(self) -> str:
+        lines = [
+            f"speed={self.speed}x duration={self.duration:.1f}s "
+            f"decisions={len(self.decisions)} (recorded {len(self.recorded_decisions)})",
+            f"{'':10s} {'replay':>28s} {'recorded':>28s}",
+            f"{'reaction':10s} {_latency_summary(self.reactions):>28s} "
+            f"{_latency_summary(self.recorded_reactions):>28s}",
+            f"{'requests':10s} {sum(self.request_counts.values()):>28d} "
+            f"{sum(self.recorded_request_counts.values()):>28d}",
+        ]
+        for key in sorted(self.request_counts.keys() | self.recorded_request_counts.keys()):
+            method, template = key
+            lines.append(
+                f"  {method:6s} {template:60s} "
+                f"{self.request_counts[key]:6d} {self.recorded_request_counts[key]:6d}"
+            )
+        lines.append("decisions:")
+        for d in self.decisions:
+            reaction = "-" if d.reaction is None else f"{d.reaction * 1000:.1f} ms"
+            lines.append(f"  {d.at:8.2f}s {d.method:6s} {d.endpoint} ({reaction})")
+        return "\n".join(lines)
+
+
+def _latency_summary(values: list[float]) -> str:
+    if not values:
+        return "-"
+    ordered = sorted(values)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return f"median {statistics.median(ordered) * 1000:.1f} / p95 {p95 * 1000:.1f} ms"
+
+
+def _path(endpoint: str) -> str:
+    return endpoint.split("?", 1)[0]
+
+
+def recorded_config(entries: Iterable[dict[str, Any]]) -> dict[str, Any] | None:
+    """Kayıttaki ilk `config` notu (otomasyonun başlatıldığı ayarlar)."""
+    for entry in entries:
+        if entry.get("k") == KIND_NOTE and entry.get("n") == "config":
+            return entry.get("d")
+    return None
+
+
+class ReplayLcu:
+    """Bir kaydı `FakeLcuServer` üzerinden sanal saatle oynatan LCU taklidi."""
+
+    def __init__(
+        self, server: FakeLcuServer, entries: Iterable[dict[str, Any]], *, speed: float = 1.0
+    ) -> None:
+        self.server = server
+        self.speed = speed
+        entries = sorted(entries, key=lambda e: e.get("t", 0.0))
+        origin = entries[0]["t"] if entries else 0.0
+        self.requests = [{**e, "t": e["t"] - origin} for e in entries if e.get("k") == KIND_REQUEST]
+        self.events = [{**e, "t": e["t"] - origin} for e in entries if e.get("k") == KIND_EVENT]
+        self.duration = max((e["t"] - origin for e in entries), default=0.0)
+
+        # (method, yol) → kayıt zamanına göre sıralı yanıtlar. 304'ler istemcinin disk
+        # cache'ine bağlıdır; oynatmadaki boş cache için anlamsız olduğundan atlanır.
+        self._times: dict[tuple[str, str], list[float]] = {}
+        self._responses: dict[tuple[str, str], list[FakeResponse]] = {}
+        for e in self.requests:
+            if e.get("s") is None or e.get("s") == 304:
+                continue
+            key = (e["m"], _path(e["e"]))
+            self._times.setdefault(key, []).append(e["t"])
+            self._responses.setdefault(key, []).append(FakeResponse(e["s"], e.get("b")))
+
+        # Kayıt ilk girdisiyle (otomasyonun ilk istekleri) başlar; oynatmada da saat
+        # otomasyon başlatılmadan hemen önce, nesne kurulurken başlar.
+        self.clock = VirtualClock(speed)
+        self._first_request = len(server.requests)
+        # (gerçek monotonic zaman, sanal zaman) — yayınlanan her olay için.
+        self.published: list[tuple[float, float]] = []
+        self._stop = threading.Event()
+        for method in REPLAY_METHODS:
+            server.route(method, "*", self._serve)
+
+    def _serve(self, method: str, path: str, body: Any, params: dict[str, str]) -> FakeResponse:
+        key = (method, path)
+        times = self._times.get(key)
+        if not times:
+            return FakeResponse(404, {"message": "not in recording"})
+        index = max(0, bisect_right(times, self.clock.now()) - 1)
+        return self._responses[key][index]
+
+    @property
+    def event_uris(self) -> list[str]:
+        return list(dict.fromkeys(e["u"] for e in self.events))
+
+    def play(self, *, tail: float = 1.0, subscribe_timeout: float = 5.0) -> ReplayReport:
+        """
+        Olayları sanal saatle yayınlar; kayıt bitip `tail` (gerçek sn) geçince rapor döner.
+
+        Otomasyon çağrıdan önce başlatılmış olmalıdır. Kayıtta yalnızca abonelik
+        sonrası alınan olaylar bulunur; yine de abonelik kurulmadan vadesi gelen bir
+        olay olursa abonelik beklenip hemen yayınlanır.
+        """
+        if self.event_uris:
+            self.server.wait_for_subscribers(self.event_uris, subscribe_timeout)
+        clock = self.clock
+        for event in self.events:
+            if self._stop.wait(clock.real_delay(event["t"])):
+                break
+            published_at = time.monotonic()
+            self.server.publish(event["u"], event.get("d"), event.get("y") or "Update")
+            self.published.append((published_at, event["t"]))
+        self._stop.wait(clock.real_delay(self.duration) + tail)
+        return self.report()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def report(self) -> ReplayReport:
+        clock, first_request = self.clock, self._first_request
+        requests = list(
+            zip(
+                self.server.requests[first_request:],
+                self.server.request_times[first_request:],
+                strict=False,
+            )
+        )
+        report = ReplayReport(speed=self.speed, duration=self.duration)
+        published_at = [real for real, _ in self.published]
+        for (method, raw_path, body), at in requests:
+            report.request_counts[(method, endpoint_template(_path(raw_path)))] += 1
+            if method == "GET":
+                continue
+            index = bisect_right(published_at, at) - 1
+            reaction = at - published_at[index] if index >= 0 else None
+            report.decisions.append(
+                Decision(clock.real_to_virtual(at), method, raw_path, body, reaction)
+            )
+
+        event_times = [e["t"] for e in self.events]
+        for e in self.requests:
+            if not e.get("c"):
+                report.recorded_request_counts[(e["m"], endpoint_template(_path(e["e"])))] += 1
+            if e["m"] == "GET":
+                continue
+            # Kayıttaki zaman isteğin tamamlandığı andır; tepki, gönderildiği an üzerinden.
+            sent = e["t"] - (e.get("l") or 0.0)
+            index = bisect_right(event_times, sent) - 1
+            reaction = max(0.0, sent - event_times[index]) if index >= 0 else None
+            report.recorded_decisions.append(Decision(e["t"], e["m"], e["e"], e.get("q"), reaction))
+        return report
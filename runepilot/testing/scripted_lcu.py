@@ -0,0 +1,483 @@
+"""
+Senaryolu LCU taklidi: `FakeLcuServer` üzerine gerçek istemcinin akışını oynayan durum.
+
+Otomasyonun kullandığı endpoint'ler (gameflow, lobi/matchmaking, ready-check, champ
+select, rün sayfaları, statik oyun verisi) istemci gibi davranır: lobi kurmak fazı
+`Lobby`'ye, aramayı başlatmak `Matchmaking`'e geçirir, `queue_pop_delay` sonra ready-check
+açılır, kabul edilince champ select başlar, pick/ban aksiyonları oturumu günceller. Her
+durum değişimi ilgili URI'ye WebSocket olayı olarak da yayınlanır. `finalization_delay`
+verilirse yerel pick ile FINALIZATION arasına (diğer oyuncuların seçimi gibi) süre girer.
+
+`timeline`, senaryodaki önemli anları (`time.monotonic`) kaydeder; uçtan uca gecikme
+ölçümleri (ör. champ select başlangıcı → pick PATCH) bunun üzerinden yapılır.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import copy
+import os
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from runepilot.infrastructure.lcu_client import set_default_client
+from runepilot.infrastructure.lockfile_watcher import set_default_watcher
+from runepilot.testing.fake_lcu import FakeLcuServer
+
+GAMEFLOW_PHASE_URI = "/lol-gameflow/v1/gameflow-phase"
+READY_CHECK_URI = "/lol-matchmaking/v1/ready-check"
+CHAMP_SELECT_SESSION_URI = "/lol-champ-select/v1/session"
+RUNE_PAGES_URI = "/lol-perks/v1/pages"
+LOBBY_URI = "/lol-lobby/v2/lobby"
+
+DEFAULT_GAME_VERSION = "14.1.553.1234"
+DEFAULT_CHAMPIONS: tuple[dict[str, Any], ...] = (
+    {"id": 1, "alias": "Annie", "name": "Annie"},
+    {"id": 2, "alias": "Olaf", "name": "Olaf"},
+    {"id": 3, "alias": "Galio", "name": "Galio"},
+    {"id": 103, "alias": "Ahri", "name": "Ahri"},
+)
+MAX_RUNE_PAGES = 20
+
+_NO_CONTENT = (204, None)
+
+
+def default_session(
+    *, local_cell: int = 2, position: str = "middle", with_ban: bool = False
+) -> dict[str, Any]:
+    """Yerel oyuncu için tek pick (ve isteğe bağlı ban) aksiyonlu bir champ select oturumu."""
+    actions: list[list[dict[str, Any]]] = []
+    if with_ban:
+        actions.append(
+            [
+                {
+                    "id": 1,
+                    "actorCellId": local_cell,
+                    "type": "ban",
+                    "championId": 0,
+                    "completed": False,
+                }
+            ]
+        )
+    actions.append(
+        [{"id": 2, "actorCellId": local_cell, "type": "pick", "championId": 0, "completed": False}]
+    )
+    return {
+        "localPlayerCellId": local_cell,
+        "timer": {"phase": "BAN_PICK", "adjustedTimeLeftInPhase": 30000},
+        "bans": {"myTeamBans": [], "theirTeamBans": []},
+        "actions": actions,
+        "myTeam": [
+            {
+                "cellId": local_cell,
+                "assignedPosition": position,
+                "championId": 0,
+                "championPickIntent": 0,
+                "spell1Id": 0,
+                "spell2Id": 0,
+                "selectedSkinId": 0,
+            }
+        ],
+        "theirTeam": [],
+    }
+
+
+class ScriptedLcu:
+    """Bir `FakeLcuServer`'a istemci akışını bağlar; durum thread-safe tutulur."""
+
+    def __init__(
+        self,
+        server: FakeLcuServer,
+        *,
+        session: dict[str, Any] | None = None,
+        pickable_champion_ids: Iterable[int] = (1, 2, 3, 103),
+        bannable_champion_ids: Iterable[int] | None = None,
+        champions: Iterable[dict[str, Any]] = DEFAULT_CHAMPIONS,
+        queue_pop_delay: float = 0.2,
+        finalization_delay: float = 0.0,
+        game_version: str = DEFAULT_GAME_VERSION,
+    ) -> None:
+        self.server = server
+        self.queue_pop_delay = queue_pop_delay
+        # Son aksiyon tamamlandıktan sonra FINALIZATION'a kadar geçen süre (diğer
+        # oyuncuların pick'lerini temsil eder).
+        self.finalization_delay = finalization_delay
+        self._session_template = session or default_session()
+        self._lock = threading.RLock()
+        self._changed = threading.Condition(self._lock)
+        self._timers: list[threading.Timer] = []
+        self.timeline: list[tuple[float, str]] = []
+
+        self.phase = "None"
+        self.lobby: dict[str, Any] | None = None
+        self.search_state = "Invalid"
+        self.ready_check: dict[str, Any] | None = None
+        self.session: dict[str, Any] | None = None
+        self.pickable_champion_ids = list(pickable_champion_ids)
+        self.bannable_champion_ids = list(
+            self.pickable_champion_ids if bannable_champion_ids is None else bannable_champion_ids
+        )
+        self.position_preferences: dict[str, Any] = {}
+        self.rune_pages: list[dict[str, Any]] = [
+            {"id": 1, "name": "Rune Page 1", "isEditable": True, "isDeletable": True}
+        ]
+        self._next_page_id = 2
+        self._game_id = 0
+
+        server.set_response("GET", "/lol-patch/v1/game-version", game_version)
+        server.set_response(
+            "GET", "/lol-game-data/assets/v1/champion-summary.json", list(champions)
+        )
+        server.set_response("GET", "/lol-perks/v1/styles", [])
+        server.set_response("GET", "/lol-perks/v1/perks", [])
+        for method, pattern, handler in (
+            ("GET", GAMEFLOW_PHASE_URI, self._get_phase),
+            ("GET", LOBBY_URI, self._get_lobby),
+            ("POST", LOBBY_URI, self._create_lobby),
+            ("DELETE", LOBBY_URI, self._delete_lobby),
+            (
+                "PUT",
+                "/lol-lobby/v2/lobby/members/localMember/position-preferences",
+                self._put_roles,
+            ),
+            ("GET", "/lol-lobby/v2/lobby/matchmaking/search-state", self._get_search_state),
+            ("POST", "/lol-lobby/v2/lobby/matchmaking/search", self._start_search),
+            ("GET", READY_CHECK_URI, self._get_ready_check),
+            ("POST", "/lol-matchmaking/v1/ready-check/accept", self._accept_ready_check),
+            ("GET", CHAMP_SELECT_SESSION_URI, self._get_session),
+            ("GET", "/lol-champ-select/v1/pickable-champion-ids", self._get_pickable),
+            ("GET", "/lol-champ-select/v1/bannable-champion-ids", self._get_bannable),
+            ("PATCH", "/lol-champ-select/v1/session/actions/{id}", self._patch_action),
+            ("PATCH", "/lol-champ-select/v1/session/my-selection", self._patch_selection),
+            ("GET", RUNE_PAGES_URI, self._get_pages),
+            ("POST", RUNE_PAGES_URI, self._create_page),
+            ("PUT", "/lol-perks/v1/pages/{id}", self._put_page),
+            ("DELETE", "/lol-perks/v1/pages/{id}", self._delete_page),
+        ):
+            server.route(method, pattern, handler)
+
+    # -- zaman çizelgesi ------------------------------------------------------
+    def mark(self, label: str) -> None:
+        with self._changed:
+            self.timeline.append((time.monotonic(), label))
+            self._changed.notify_all()
+
+    def first(self, label: str) -> float | None:
+        """`label` ile başlayan ilk işaretin zamanı."""
+        with self._lock:
+            return next((ts for ts, name in self.timeline if name.startswith(label)), None)
+
+    def wait_for(self, label: str, timeout: float = 5.0) -> float | None:
+        """`label` ile başlayan işaret görülene kadar bekler; zamanını döndürür."""
+        with self._changed:
+            self._changed.wait_for(lambda: self.first(label) is not None, timeout)
+            return self.first(label)
+
+    def close(self) -> None:
+        with self._lock:
+            timers, self._timers = self._timers, []
+        for timer in timers:
+            timer.cancel()
+
+    # -- senaryo adımları -----------------------------------------------------
+    def set_phase(self, phase: str) -> None:
+        with self._lock:
+            if phase == self.phase:
+                return
+            self.phase = phase
+            self.mark(f"phase:{phase}")
+        self.server.publish(GAMEFLOW_PHASE_URI, phase)
+
+    def enter_lobby(self, queue_id: Any) -> None:
+        """Verilen kuyrukta (rol tercihi boş) yeni bir lobi açılır."""
+        with self._lock:
+            self.lobby = {
+                "gameConfig": {"queueId": queue_id},
+                "localMember": {"firstPositionPreference": "", "secondPositionPreference": ""},
+                "members": [],
+            }
+            self.position_preferences = {}
+            self.mark(f"lobby:{queue_id}")
+        self._publish_lobby()
+        self.set_phase("Lobby")
+
+    def pop_queue(self) -> None:
+        """Kuyruk bulundu: ready-check açılır."""
+        with self._lock:
+            if self.phase != "Matchmaking":
+                return
+            self.ready_check = {"state": "InProgress", "playerResponse": "None", "timer": 0}
+            self.search_state = "Found"
+            self.mark("ready_check")
+        self.server.publish(READY_CHECK_URI, self.ready_check)
+        self.set_phase("ReadyCheck")
+
+    def enter_champ_select(self, session: dict[str, Any] | None = None) -> None:
+        with self._lock:
+            self.ready_check = None
+            self.session = copy.deepcopy(session or self._session_template)
+            self._game_id += 1
+            self.session.setdefault("gameId", self._game_id)
+        self.server.publish(READY_CHECK_URI, None, "Delete")
+        self.set_phase("ChampSelect")
+        self._publish_session()
+
+    def update_session(self, **fields: Any) -> None:
+        """Oturumu dışarıdan değiştirir (ör. timer fazı) ve olayı yayınlar."""
+        with self._lock:
+            if self.session is None:
+                return
+            self.session.update(copy.deepcopy(fields))
+        self._publish_session()
+
+    def _publish_session(self) -> None:
+        with self._lock:
+            data = copy.deepcopy(self.session)
+        self.server.publish(CHAMP_SELECT_SESSION_URI, data)
+
+    def _publish_lobby(self) -> None:
+        with self._lock:
+            data = copy.deepcopy(self.lobby)
+        self.server.publish(LOBBY_URI, data)
+
+    def _publish_pages(self) -> None:
+        with self._lock:
+            data = copy.deepcopy(self.rune_pages)
+        self.server.publish(RUNE_PAGES_URI, data)
+
+    def _local_player(self) -> dict[str, Any] | None:
+        if self.session is None:
+            return None
+        cell = self.session.get("localPlayerCellId")
+        return next((p for p in self.session["myTeam"] if p.get("cellId") == cell), None)
+
+    def _after(self, delay: float, fn: Any) -> None:
+        timer = threading.Timer(delay, fn)
+        timer.daemon = True
+        with self._lock:
+            self._timers.append(timer)
+        timer.start()
+
+    # -- handler'lar ----------------------------------------------------------
+    def _get_phase(self, method, path, body, params):
+        return 200, self.phase
+
+    def _get_lobby(self, method, path, body, params):
+        with self._lock:
+            return (200, copy.deepcopy(self.lobby)) if self.lobby else (404, {"message": "none"})
+
+    def _create_lobby(self, method, path, body, params):
+        queue_id = (body or {}).get("queueId")
+        self.enter_lobby(queue_id)
+        with self._lock:
+            return 200, copy.deepcopy(self.lobby)
+
+    def _delete_lobby(self, method, path, body, params):
+        with self._lock:
+            self.lobby = None
+            self.search_state = "Invalid"
+        self.server.publish(LOBBY_URI, None, "Delete")
+        self.set_phase("None")
+        return _NO_CONTENT
+
+    def _put_roles(self, method, path, body, params):
+        with self._lock:
+            if self.lobby is None:
+                return 404, {"message": "no lobby"}
+            self.position_preferences = dict(body or {})
+            self.lobby["localMember"] = {
+                "firstPositionPreference": self.position_preferences.get("firstPreference", ""),
+                "secondPositionPreference": self.position_preferences.get("secondPreference", ""),
+            }
+        self._publish_lobby()
+        return 201, None
+
+    def _get_search_state(self, method, path, body, params):
+        return 200, {"searchState": self.search_state}
+
+    def _start_search(self, method, path, body, params):
+        with self._lock:
+            if self.lobby is None:
+                return 400, {"message": "no lobby"}
+            self.search_state = "Searching"
+            self.mark("search")
+        self.set_phase("Matchmaking")
+        self._after(self.queue_pop_delay, self.pop_queue)
+        return _NO_CONTENT
+
+    def _get_ready_check(self, method, path, body, params):
+        with self._lock:
+            if self.ready_check is None:
+                return 404, {"message": "no ready check"}
+            return 200, copy.deepcopy(self.ready_check)
+
+    def _accept_ready_check(self, method, path, body, params):
+        with self._lock:
+            if self.ready_check is None or self.ready_check.get("state") != "InProgress":
+                return 404, {"message": "no ready check"}
+            self.ready_check = {**self.ready_check, "playerResponse": "Accepted"}
+            self.mark("accept")
+        self._after(0.0, self.enter_champ_select)
+        return _NO_CONTENT
+
+    def _get_session(self, method, path, body, params):
+        with self._lock:
+            if self.session is None:
+                return 404, {"message": "not in champ select"}
+            return 200, copy.deepcopy(self.session)
+
+    def _get_pickable(self, method, path, body, params):
+        return 200, list(self.pickable_champion_ids)
+
+    def _get_bannable(self, method, path, body, params):
+        return 200, list(self.bannable_champion_ids)
+
+    def _patch_action(self, method, path, body, params):
+        body = body or {}
+        with self._lock:
+            if self.session is None:
+                return 404, {"message": "not in champ select"}
+            action = next(
+                (
+                    a
+                    for group in self.session["actions"]
+                    for a in group
+                    if str(a.get("id")) == params["id"]
+                ),
+                None,
+            )
+            if action is None or action.get("completed"):
+                return 400, {"message": "invalid action"}
+            action.update({k: v for k, v in body.items() if k in ("championId", "completed")})
+            player = self._local_player()
+            if action.get("completed"):
+                self.mark(f"{action['type']}:{action.get('championId')}")
+                if action["type"] == "pick" and player is not None:
+                    player["championId"] = action.get("championId")
+                elif action["type"] == "ban":
+                    self.session["bans"]["myTeamBans"].append(action.get("championId"))
+            elif action["type"] == "pick" and player is not None:
+                player["championPickIntent"] = action.get("championId")
+            all_done = all(a.get("completed") for group in self.session["actions"] for a in group)
+            if all_done and not self.finalization_delay:
+                self._start_finalization()
+        if all_done and self.finalization_delay:
+            self._after(self.finalization_delay, self.finalize)
+        self._publish_session()
+        return _NO_CONTENT
+
+    def finalize(self) -> None:
+        """Tüm pick'ler bitti: oturum FINALIZATION fazına geçer."""
+        with self._lock:
+            if self.session is None:
+                return
+            self._start_finalization()
+        self._publish_session()
+
+    def _start_finalization(self) -> None:
+        self.session["timer"] = {**self.session["timer"], "phase": "FINALIZATION"}
+        self.mark("finalization")
+
+    def _patch_selection(self, method, path, body, params):
+        with self._lock:
+            player = self._local_player()
+            if player is None:
+                return 404, {"message": "not in champ select"}
+            for key in ("spell1Id", "spell2Id", "selectedSkinId"):
+                if key in (body or {}):
+                    player[key] = body[key]
+            self.mark(f"selection:{sorted((body or {}).items())}")
+        self._publish_session()
+        return _NO_CONTENT
+
+    def _get_pages(self, method, path, body, params):
+        with self._lock:
+            return 200, copy.deepcopy(self.rune_pages)
+
+    def _create_page(self, method, path, body, params):
+        with self._lock:
+            if len(self.rune_pages) >= MAX_RUNE_PAGES:
+                return 400, {"message": "Max pages reached"}
+            page = {**(body or {}), "id": self._next_page_id, "isEditable": True}
+            page["isDeletable"] = True
+            self._next_page_id += 1
+            if page.get("current"):
+                for other in self.rune_pages:
+                    other["current"] = False
+            self.rune_pages.append(page)
+            self.mark(f"runes:{page.get('name')}")
+        self._publish_pages()
+        return 200, page
+
+    def _put_page(self, method, path, body, params):
+        with self._lock:
+            index = next(
+                (i for i, p in enumerate(self.rune_pages) if str(p.get("id")) == params["id"]),
+                None,
+            )
+            if index is None:
+                return 404, {"message": "no such page"}
+            if (body or {}).get("current"):
+                for other in self.rune_pages:
+                    other["current"] = False
+            page = self.rune_pages[index] = {**self.rune_pages[index], **(body or {})}
+            self.mark(f"runes:{page.get('name')}")
+        self._publish_pages()
+        return 200, page
+
+    def _delete_page(self, method, path, body, params):
+        with self._lock:
+            before = len(self.rune_pages)
+            self.rune_pages = [p for p in self.rune_pages if str(p.get("id")) != params["id"]]
+            deleted = len(self.rune_pages) < before
+        if deleted:
+            self._publish_pages()
+        return _NO_CONTENT if deleted else (404, None)
+
+
+@contextlib.contextmanager
+def app_bound_to(server: FakeLcuServer, base_dir: str) -> Iterator[None]:
+    """
+    Uygulamayı çalışan bir `FakeLcuServer`'a bağlar; çıkışta her şeyi eski haline getirir.
+
+    Lockfile `base_dir` altındaki sahte kurulum dizinine yazılır ve `LOL_LOCKFILE` oraya
+    yönlendirilir; paylaşılan `LcuClient` ve lockfile izleyicisi sıfırlanır, böylece
+    `find_lockfile_path()` dahil tüm uygulama kodu değişmeden taklide bağlanır.
+    """
+    install_dir = os.path.join(base_dir, "Riot Games", "League of Legends")
+    os.makedirs(install_dir, exist_ok=True)
+    env = {
+        "LOL_LOCKFILE": os.path.join(install_dir, "lockfile"),
+        "RUNEPILOT_ASSET_CACHE_DIR": os.path.join(base_dir, "asset-cache"),
+    }
+    saved = {name: os.environ.get(name) for name in env}
+    server.write_lockfile(env["LOL_LOCKFILE"])
+    os.environ.update(env)
+    # Paylaşılan istemci/izleyici önceki koşunun kimlik bilgilerini tutmasın.
+    set_default_client(None)
+    set_default_watcher(None)
+    try:
+        yield
+    finally:
+        set_default_watcher(None)
+        set_default_client(None)
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+@contextlib.contextmanager
+def running_scripted_lcu(
+    base_dir: str, *, seed: int = 0, **script_kwargs: Any
+) -> Iterator[ScriptedLcu]:
+    """Taklidi başlatır ve uygulamayı ona bağlar (bkz. `app_bound_to`)."""
+    with FakeLcuServer(seed=seed) as server, app_bound_to(server, base_dir):
+        script = ScriptedLcu(server, **script_kwargs)
+        try:
+            yield script
+        finally:
+            script.close()
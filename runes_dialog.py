@@ -25,6 +25,7 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
+from runepilot.infrastructure.lcu_async import lcu_gather
 from runepilot.infrastructure.lcu_client import lcu_request
 
 MAIN_STYLE_IDS: set[int] = {8000, 8100, 8200, 8300, 8400}
@@ -34,6 +35,8 @@ DEFAULT_ICON_SIZE = QSize(24, 24)
 # Cache perk/style data per process to avoid repeated LCU calls.
 _PERK_STYLES_CACHE: list[dict[str, Any]] | None = None
 _PERKS_CACHE: list[dict[str, Any]] | None = None
+# asset path -> icon bytes (only successful fetches; failures are retried)
+_PERK_ICON_DATA_CACHE: dict[str, bytes] = {}
 
 
 def _safe_int(value: Any) -> int | None:
@@ -87,6 +90,59 @@ def _get_slot_runes(slot: Any) -> list[Any]:
     return runes if isinstance(runes, list) else []
 
 
+def _prefetch_perk_data() -> None:
+    """
+    Style ve perk listelerinden cache'te olmayanları tek turda eşzamanlı çeker.
+
+    Hatalar yutulur; eksik kalan veri `_fetch_perk_styles` / `_fetch_perks` tarafından
+    (hata mesajıyla birlikte) tekrar denenir.
+    """
+    global _PERK_STYLES_CACHE, _PERKS_CACHE
+    wanted: list[str] = []
+    if _PERK_STYLES_CACHE is None:
+        wanted.append("/lol-perks/v1/styles")
+    if _PERKS_CACHE is None:
+        wanted.append("/lol-perks/v1/perks")
+    if not wanted:
+        return
+    try:
+        results = lcu_gather(wanted)
+    except Exception:
+        return
+    for endpoint, res in zip(wanted, results, strict=True):
+        if isinstance(res, Exception) or res.status_code != 200:
+            continue
+        try:
+            data = res.json()
+        except ValueError:
+            continue
+        if not isinstance(data, list):
+            continue
+        if endpoint == "/lol-perks/v1/styles":
+            _PERK_STYLES_CACHE = data
+        else:
+            _PERKS_CACHE = data
+
+
+def _prefetch_perk_icons(asset_paths: list[str]) -> None:
+    """
+    Henüz cache'te olmayan perk ikonlarını eşzamanlı indirir (best-effort).
+
+    Yalnızca başarılı yanıtlar saklanır; alınamayan ikon bir sonraki açılışta yeniden denenir.
+    """
+    missing = [p for p in dict.fromkeys(asset_paths) if p not in _PERK_ICON_DATA_CACHE]
+    if not missing:
+        return
+    try:
+        results = lcu_gather(missing)
+    except Exception:
+        return
+    for path, res in zip(missing, results, strict=True):
+        if isinstance(res, Exception) or res.status_code != 200:
+            continue
+        _PERK_ICON_DATA_CACHE[path] = res.content
+
+
 def _fetch_perk_styles() -> list[dict[str, Any]]:
     """LCU üzerinden rune style listesini okur."""
     global _PERK_STYLES_CACHE
@@ -185,6 +241,7 @@ class RunePageDialog(QDialog):
 
         self.summary_label = QLabel("")
 
+        _prefetch_perk_data()
         try:
             styles_list = _fetch_perk_styles()
             self._styles = {
@@ -212,6 +269,7 @@ class RunePageDialog(QDialog):
 
         for cb in self.primary_rune_combos + self.secondary_rune_combos + self.shard_combos:
             cb.setIconSize(DEFAULT_ICON_SIZE)
+        self._prefetch_style_icons()
 
         self._build_ui()
         self._wire_signals()
@@ -293,6 +351,20 @@ class RunePageDialog(QDialog):
 
         self._rebuild_secondary_style_items()
 
+    def _prefetch_style_icons(self) -> None:
+        """Style slotlarında görünecek tüm perk ikonlarını tek turda eşzamanlı çeker."""
+        asset_paths: list[str] = []
+        for style in self._styles.values():
+            for slot in _get_style_slots(style):
+                for rune in _get_slot_runes(slot):
+                    extracted = _extract_rune_id_and_name(rune)
+                    if extracted is None:
+                        continue
+                    asset_path = _normalize_asset_path(self._perk_icon_paths.get(extracted[0]))
+                    if asset_path is not None:
+                        asset_paths.append(asset_path)
+        _prefetch_perk_icons(asset_paths)
+
     def _get_perk_icon(self, perk_id: Any) -> QIcon | None:
         pid = _safe_int(perk_id)
         if pid is None:
@@ -307,12 +379,16 @@ class RunePageDialog(QDialog):
             return None
 
         try:
-            res = lcu_request("GET", asset_path)
-            if res.status_code != 200:
+            data = _PERK_ICON_DATA_CACHE.get(asset_path)
+            if data is None:
+                res = lcu_request("GET", asset_path)
+                if res.status_code == 200:
+                    data = _PERK_ICON_DATA_CACHE[asset_path] = res.content
+            if data is None:
                 self._perk_icons[pid] = None
                 return None
             pixmap = QPixmap()
-            if not pixmap.loadFromData(res.content):
+            if not pixmap.loadFromData(data):
                 self._perk_icons[pid] = None
                 return None
             icon = QIcon(pixmap)
@@ -0,0 +1,117 @@
+"""
+Statik LCU verisi disk cache'i testleri: build sürümüne bağlı anahtarlama, LRU boyut
+sınırı, süreçler arası kalıcılık ve LcuClient/AsyncLcuClient okuma yolu (yerel LCU taklidi).
+"""
+
+import asyncio
+import os
+import threading
+
+import pytest
+
+from runepilot.infrastructure.asset_cache import AssetCache, is_cacheable
+from runepilot.infrastructure.lcu_async import AsyncLcuClient
+from runepilot.infrastructure.lcu_client import LcuClient
+from runepilot.testing.fake_lcu import FakeLcuServer
+
+SUMMARY = "/lol-game-data/assets/v1/champion-summary.json"
+
+
+@pytest.fixture
+def server(tmp_path):
+    with FakeLcuServer() as srv:
+        srv.lockfile = srv.write_lockfile(str(tmp_path / "lockfile"))
+        srv.set_response("GET", "/lol-patch/v1/game-version", "14.1.553")
+        yield srv
+
+
+def test_is_cacheable():
+    assert is_cacheable(SUMMARY)
+    assert is_cacheable("/lol-perks/v1/styles")
+    assert not is_cacheable("/lol-champ-select/v1/session")
+    assert not is_cacheable(SUMMARY + "?x=1")
+
+
+def test_entries_are_keyed_by_build_and_survive_restart(tmp_path):
+    cache = AssetCache(str(tmp_path))
+    cache.put("14.1", SUMMARY, b"[1]", {"ETag": '"a"'})
+
+    reopened = AssetCache(str(tmp_path))
+    hit = reopened.get("14.1", SUMMARY)
+    assert hit is not None and hit.fresh and hit.content == b"[1]"
+    assert hit.conditional_headers() == {"If-None-Match": '"a"'}
+    assert reopened.get("14.2", SUMMARY) is None
+
+    # Yeni build'in ilk kaydı eski build'i tamamen temizler.
+    reopened.put("14.2", "/lol-perks/v1/styles", b"[]", {})
+    assert reopened.get("14.1", SUMMARY) is None
+    assert len(os.listdir(tmp_path / "blobs")) == 1
+
+
+def test_lru_eviction_respects_max_bytes(tmp_path):
+    cache = AssetCache(str(tmp_path), max_bytes=10)
+    cache.put("v", "/lol-game-data/assets/v1/a", b"aaaa", {})
+    cache.put("v", "/lol-game-data/assets/v1/b", b"bbbb", {})
+    assert cache.get("v", "/lol-game-data/assets/v1/a") is not None  # a daha yeni kullanıldı
+    cache.put("v", "/lol-game-data/assets/v1/c", b"cccc", {})
+
+    assert cache.get("v", "/lol-game-data/assets/v1/b") is None
+    assert cache.get("v", "/lol-game-data/assets/v1/a") is not None
+    assert cache.total_bytes() == 8
+
+
+def test_client_serves_static_assets_from_disk(server, tmp_path):
+    server.set_response("GET", SUMMARY, [{"id": 1}], headers={"ETag": '"v1"'})
+    cache_dir = str(tmp_path / "cache")
+
+    first = LcuClient(server.lockfile, asset_cache=AssetCache(cache_dir))
+    assert first.request("GET", SUMMARY).json() == [{"id": 1}]
+
+    # Yeni süreç: aynı build için istek atılmaz, yalnızca build sürümü sorulur.
+    second = LcuClient(server.lockfile, asset_cache=AssetCache(cache_dir))
+    res = second.request("GET", SUMMARY)
+    assert res.status_code == 200 and res.json() == [{"id": 1}]
+    assert server.request_count("GET", SUMMARY) == 1
+
+    # Bayat kayıt koşullu istekle doğrulanır (304 → diskteki içerik).
+    stale = LcuClient(server.lockfile, asset_cache=AssetCache(cache_dir, revalidate_after=0))
+    assert stale.request("GET", SUMMARY).json() == [{"id": 1}]
+    assert server.request_count("GET", SUMMARY) == 2
+
+
+def test_async_client_shares_the_disk_cache(server, tmp_path):
+    server.set_response("GET", "/lol-perks/v1/styles", [{"id": 8000}])
+    sync_client = LcuClient(server.lockfile, asset_cache=AssetCache(str(tmp_path / "cache")))
+    sync_client.request("GET", "/lol-perks/v1/styles")
+
+    async def scenario():
+        client = AsyncLcuClient(sync_client)
+        res = await client.get("/lol-perks/v1/styles")
+        await client.aclose()
+        return res
+
+    assert asyncio.run(scenario()).json() == [{"id": 8000}]
+    assert server.request_count("GET", "/lol-perks/v1/styles") == 1
+
+
+def test_async_client_touches_the_disk_cache_off_the_loop(server, tmp_path):
+    server.set_response("GET", "/lol-perks/v1/styles", [{"id": 8000}])
+    cache = AssetCache(str(tmp_path / "cache"))
+    threads = []
+    for name in ("get", "put"):
+        original = getattr(cache, name)
+
+        def spy(*args, _original=original, **kwargs):
+            threads.append(threading.get_ident())
+            return _original(*args, **kwargs)
+
+        setattr(cache, name, spy)
+
+    async def scenario():
+        client = AsyncLcuClient(LcuClient(server.lockfile, asset_cache=cache))
+        await client.get("/lol-perks/v1/styles")
+        await client.aclose()
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(scenario())
+    assert threads and loop_thread not in threads
@@ -0,0 +1,172 @@
+"""
+Otomasyon planı derleme testleri: konfigürasyonun bir kez doğrulanıp (rol,
+championId) anahtarlı sorgulara indirgenmesi ve spell/kostüm/rün öncelikleri.
+"""
+
+import asyncio
+
+import pytest
+
+import api
+from runepilot.application.engine import AutomationEngine
+from runepilot.domain.automation_plan import AutomationRuntime, RunePreset, compile_plan
+
+CONFIG = {
+    "primary_role": "middle",
+    "secondary_role": "TOP",
+    "primary_summoner_spell": "4",
+    "secondary_summoner_spell": 12,
+    "queue_id": 420,
+    "role_bans": {"MIDDLE": "55", "TOP": 0},
+    "role_champions": {"middle": [103, "x", 0, "7"]},
+    "role_summoner_spells": {"MIDDLE": {"spell2Id": 14}},
+    "custom_summoner_spells": {"MIDDLE": {"103": {"spell1Id": 6}, "bad": {"spell1Id": 3}}},
+    "custom_skins": {"MIDDLE": {"103": 103005, "7": "nope"}},
+    "rune_selection": {"103": 2, "7": 9},
+    "custom_runes": {
+        "103": {
+            "2": {"primaryStyleId": 8100, "subStyleId": "8200", "selectedPerkIds": list(range(9))},
+            "3": {"primaryStyleId": 8100, "subStyleId": 8200, "selectedPerkIds": [1]},
+        }
+    },
+}
+
+
+def test_config_is_normalized_once():
+    plan = compile_plan(CONFIG)
+    assert plan.primary_role == "MIDDLE" and plan.queue_id == 420 and plan.auto_queue
+    assert dict(plan.position_preferences) == {
+        "firstPreference": "MIDDLE",
+        "secondPreference": "TOP",
+    }
+    assert plan.ban_for("MIDDLE") == 55 and plan.ban_for("TOP") is None
+    assert plan.picks_for(plan.role_key("")) == (103, 7)
+    assert plan.picks_for("SUPPORT") == ()
+
+
+def test_spell_precedence_champion_then_role_then_default():
+    plan = compile_plan(CONFIG)
+    assert plan.spells_for("MIDDLE", 103) == (6, 14)
+    assert plan.spells_for("MIDDLE", 7) == (4, 14)
+    assert plan.spells_for("TOP", 103) == (4, 12)
+
+
+def test_skins_and_rune_presets():
+    plan = compile_plan(CONFIG)
+    assert plan.skin_for("MIDDLE", 103) == 103005
+    assert plan.skin_for("MIDDLE", 7) == 7000
+    assert plan.skin_for("MIDDLE", 0) is None
+    assert plan.rune_slots == {103: 2}
+    assert plan.rune_presets[(103, 2)] == RunePreset(8100, 8200, tuple(range(9)))
+    assert plan.rune_presets[(103, 3)] is None  # kayıtlı ama geçersiz
+
+
+def test_plan_is_immutable():
+    plan = compile_plan(CONFIG)
+    with pytest.raises(AttributeError):
+        plan.queue_id = 450  # type: ignore[misc]
+    with pytest.raises(TypeError):
+        plan.bans["JUNGLE"] = 1  # type: ignore[index]
+
+
+def test_start_automation_compiles_plan_and_resets_runtime(monkeypatch):
+    async def idle(engine):
+        await asyncio.sleep(3600)
+
+    engine = AutomationEngine(idle)
+    monkeypatch.setattr(api, "AUTOMATION_ENGINE", engine)
+    monkeypatch.setattr(api, "CURRENT_CONFIG", {})
+    engine.start(compile_plan({}), AutomationRuntime(runes_applied=True))
+    try:
+        result = api.start_automation(api.AutomationConfig(primary_role="JUNGLE", queue_id=450))
+        plan, runtime = engine.state
+        assert result["status"] == "updated"
+        assert plan.queue_id == 450
+        assert plan.primary_role == "JUNGLE"
+        assert runtime.runes_applied is False
+    finally:
+        engine.stop()
+        assert engine.join(2)
+
+
+def _champ_select(champion_id=0, intent=0, timer_phase="BAN_PICK"):
+    return {
+        "localPlayerCellId": 0,
+        "timer": {"phase": timer_phase},
+        "myTeam": [{"cellId": 0, "championId": champion_id, "championPickIntent": intent}],
+    }
+
+
+class _NoContent:
+    status_code = 204
+    text = ""
+
+
+_NO_CONTENT = _NoContent()
+
+
+def test_prestaged_runes_are_rewritten_only_on_champion_change(monkeypatch):
+    applied = []
+    monkeypatch.setattr(api, "lcu_request", lambda *args: _NO_CONTENT)
+    monkeypatch.setattr(
+        api, "apply_runes_impl", lambda session, plan: applied.append(session) or True
+    )
+    plan = compile_plan({"prestage_runes": True})
+    runtime = AutomationRuntime()
+
+    api.handle_champ_select(_champ_select(intent=103), plan, runtime)
+    api.handle_champ_select(_champ_select(intent=103), plan, runtime)
+    api.handle_champ_select(_champ_select(intent=7), plan, runtime)
+    api.handle_champ_select(_champ_select(champion_id=7), plan, runtime)
+    assert len(applied) == 2
+
+    # FINALIZATION: sayfa zaten bu şampiyon için yazıldı, yeniden yazılmaz.
+    api.handle_champ_select(_champ_select(champion_id=7, timer_phase="FINALIZATION"), plan, runtime)
+    assert len(applied) == 2 and runtime.runes_applied
+
+    runtime.leave_champ_select()
+    api.handle_champ_select(_champ_select(champion_id=7), plan, runtime)
+    assert len(applied) == 3
+
+
+def test_failed_prestage_is_retried_before_finalization(monkeypatch):
+    results = [False, True]
+    applied = []
+    monkeypatch.setattr(api, "lcu_request", lambda *args: _NO_CONTENT)
+    monkeypatch.setattr(
+        api, "apply_runes_impl", lambda session, plan: applied.append(session) or results.pop(0)
+    )
+    plan = compile_plan({"prestage_runes": True})
+    runtime = AutomationRuntime()
+
+    api.handle_champ_select(_champ_select(intent=103), plan, runtime)
+    assert runtime.runes_staged_for == 0
+    # Oturum değişmedi ama yazma başarısızdı: adım bekliyor ve yeniden denenir.
+    assert api.CHAMP_SELECT_STEPS.due(runtime.session_diff, _champ_select(intent=103))
+    api.handle_champ_select(_champ_select(intent=103), plan, runtime)
+    assert len(applied) == 2 and runtime.runes_staged_for == 103
+
+    api.handle_champ_select(_champ_select(intent=103), plan, runtime)
+    api.handle_champ_select(
+        _champ_select(champion_id=103, timer_phase="FINALIZATION"), plan, runtime
+    )
+    assert len(applied) == 2 and runtime.runes_applied
+
+
+def test_runes_wait_for_finalization_by_default(monkeypatch):
+    applied = []
+    monkeypatch.setattr(api, "lcu_request", lambda *args: _NO_CONTENT)
+    monkeypatch.setattr(
+        api, "apply_runes_impl", lambda session, plan: applied.append(session) or True
+    )
+    plan, runtime = compile_plan({}), AutomationRuntime()
+
+    api.handle_champ_select(_champ_select(champion_id=103), plan, runtime)
+    assert applied == []
+    api.handle_champ_select(
+        _champ_select(champion_id=103, timer_phase="FINALIZATION"), plan, runtime
+    )
+    api.handle_champ_select(
+        _champ_select(champion_id=103, timer_phase="FINALIZATION"), plan, runtime
+    )
+    assert len(applied) == 1
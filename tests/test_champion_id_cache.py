@@ -0,0 +1,97 @@
+"""
+Oturum kapsamlı pickable/bannable şampiyon listesi önbelleği testleri.
+"""
+
+import api
+from runepilot.domain.session_index import index_session
+from runepilot.infrastructure.champion_id_cache import (
+    PICKABLE_CHAMPION_IDS_URI,
+    ChampionIdCache,
+    parse_champion_ids,
+)
+from runepilot.testing.scripted_lcu import default_session
+
+
+def test_parse_champion_ids():
+    assert parse_champion_ids([1, "2", 0, -1, "x"]) == {1, 2}
+    assert parse_champion_ids({"ids": []}) is None
+
+
+def test_cache_is_keyed_by_session_and_skips_failures():
+    results = [None, frozenset({1}), frozenset({2})]
+    cache = ChampionIdCache("/ids", fetch=lambda endpoint: results.pop(0))
+
+    assert cache.get(10) is None  # hata önbelleğe alınmaz
+    assert cache.get(10) == {1}
+    assert cache.get(10) == {1}
+    assert cache.get(11) == {2}  # yeni oturum
+    assert cache.fetches == 3
+
+    cache.invalidate()
+    results.append(frozenset({3}))
+    assert cache.get(11) == {3}
+
+
+def test_pickable_ids_are_fetched_once_per_session(fake_lcu, monkeypatch):
+    monkeypatch.setattr(api, "PICKABLE_IDS", ChampionIdCache(PICKABLE_CHAMPION_IDS_URI))
+    session = {**default_session(), "gameId": 5}
+    fake_lcu.enter_champ_select(session)
+    for _ in range(3):
+        assert api.get_pickable_champion_ids(session) == {1, 2, 3, 103}
+    assert fake_lcu.server.request_count("GET", PICKABLE_CHAMPION_IDS_URI) == 1
+
+    api.get_pickable_champion_ids({**session, "gameId": 6})
+    assert fake_lcu.server.request_count("GET", PICKABLE_CHAMPION_IDS_URI) == 2
+
+
+def test_sessions_without_a_game_id_are_not_cached(fake_lcu, monkeypatch):
+    monkeypatch.setattr(api, "PICKABLE_IDS", ChampionIdCache(PICKABLE_CHAMPION_IDS_URI))
+    # Özel lobi: iki ayrı oturum da gameId'siz gelir; ilkinin listesi ikinciye taşınmaz.
+    first = {**default_session(), "gameId": None, "id": "a"}
+    fake_lcu.enter_champ_select(first)
+    assert api.get_pickable_champion_ids(first) == {1, 2, 3, 103}
+
+    fake_lcu.pickable_champion_ids = [7]
+    second = {**default_session(), "gameId": None, "id": "b"}
+    assert api.get_pickable_champion_ids(second) == {7}
+    assert api.get_pickable_champion_ids(second) == {7}
+    assert fake_lcu.server.request_count("GET", PICKABLE_CHAMPION_IDS_URI) == 3
+
+
+def test_sessions_of_one_game_are_told_apart_by_champ_select_id():
+    results = [frozenset({1}), frozenset({2})]
+    cache = ChampionIdCache("/ids", fetch=lambda endpoint: results.pop(0))
+    first = index_session({**default_session(), "gameId": 5, "id": "a"})
+    second = index_session({**default_session(), "gameId": 5, "id": "b"})
+    assert cache.get(first.session_key) == {1}
+    assert cache.get(first.session_key) == {1}
+    assert cache.get(second.session_key) == {2}
+
+
+def test_rejected_pick_invalidates_pickable_cache(monkeypatch):
+    cache = ChampionIdCache("/ids", fetch=lambda endpoint: frozenset({103}))
+    monkeypatch.setattr(api, "PICKABLE_IDS", cache)
+
+    class _Rejected:
+        status_code = 400
+        text = "not pickable"
+
+    monkeypatch.setattr(api, "lcu_request", lambda *args: _Rejected())
+    session = default_session()
+    assert api.auto_pick_impl(session, [103])["status"] == "pick_failed"
+    api.auto_pick_impl(session, [103])
+    assert cache.fetches == 2
+
+
+def test_unbannable_champion_is_not_banned(fake_lcu, monkeypatch):
+    monkeypatch.setattr(
+        api, "BANNABLE_IDS", ChampionIdCache("/lol-champ-select/v1/bannable-champion-ids")
+    )
+    fake_lcu.bannable_champion_ids = [1, 2]
+    session = default_session(with_ban=True)
+    fake_lcu.enter_champ_select(session)
+
+    api.do_ban(session, 103)
+    assert fake_lcu.first("ban:") is None
+    api.do_ban(session, 2)
+    assert fake_lcu.wait_for("ban:2", 2)
@@ -0,0 +1,164 @@
+"""
+Otomasyon motoru testleri: iptal ile anında durdurma, atomik plan değişimi, durdur →
+başlat yeniden başlatması ve FastAPI lifespan loop'unda çalışma.
+"""
+
+import asyncio
+import threading
+import time
+
+import api
+from runepilot.application.engine import AutomationEngine
+from runepilot.domain.automation_plan import AutomationRuntime, compile_plan
+
+
+def _waiting_body(seen, started):
+    async def body(engine):
+        started.set()
+        while True:
+            await engine.wait(3600)
+            seen.append(engine.state)
+
+    return body
+
+
+def test_stop_cancels_a_long_wait_immediately():
+    started = threading.Event()
+    engine = AutomationEngine(_waiting_body([], started))
+    engine.start(compile_plan({}), AutomationRuntime())
+    assert started.wait(2) and engine.running
+
+    begin = time.monotonic()
+    engine.stop()
+    assert engine.join(2)
+    assert time.monotonic() - begin < 0.5
+    assert not engine.running
+
+
+def test_start_swaps_plan_and_runtime_together_and_wakes_the_loop():
+    seen, started = [], threading.Event()
+    engine = AutomationEngine(_waiting_body(seen, started))
+    assert engine.start(compile_plan({"queue_id": 420}), AutomationRuntime()) is False
+    assert started.wait(2)
+    runtime = AutomationRuntime()
+    try:
+        assert engine.start(compile_plan({"queue_id": 450}), runtime) is True
+        deadline = time.monotonic() + 2
+        while not any(s[0].queue_id == 450 for s in seen) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        plan, current = next(s for s in seen if s[0].queue_id == 450)
+        assert current is runtime
+    finally:
+        engine.stop()
+        assert engine.join(2)
+
+
+def test_restart_right_after_stop_runs_a_new_loop():
+    runs = []
+
+    async def body(engine):
+        runs.append(engine.state[0].queue_id)
+        while True:  # gerçek döngü gibi: uyandırılmak görevi bitirmez
+            await engine.wait(3600)
+
+    engine = AutomationEngine(body)
+    engine.start(compile_plan({"queue_id": 420}), AutomationRuntime())
+    engine.stop()
+    engine.start(compile_plan({"queue_id": 450}), AutomationRuntime())
+    deadline = time.monotonic() + 2
+    while 450 not in runs and time.monotonic() < deadline:
+        time.sleep(0.01)
+    try:
+        assert runs[-1] == 450 and engine.running
+    finally:
+        engine.stop()
+        assert engine.join(2)
+
+
+def test_engine_runs_on_the_lifespan_loop(monkeypatch):
+    loops = []
+
+    async def body(engine):
+        loops.append(asyncio.get_running_loop())
+        while True:
+            await engine.wait(3600)
+
+    engine = AutomationEngine(body)
+    monkeypatch.setattr(api, "AUTOMATION_ENGINE", engine)
+
+    async def serve():
+        async with api.lifespan(api.app):
+            engine.start(compile_plan({}), AutomationRuntime())
+            for _ in range(100):
+                if loops:
+                    break
+                await asyncio.sleep(0.01)
+            assert loops == [asyncio.get_running_loop()]
+        # Lifespan sonu görevi iptal eder ve loop bağını çözer.
+        assert not engine.running
+
+    asyncio.run(serve())
+    assert engine.join(1)
+
+
+def test_new_loop_waits_for_the_cancelled_loops_write():
+    inside, release = threading.Event(), threading.Event()
+    writes = []
+
+    def slow_write(tag):
+        writes.append(("start", tag))
+        if tag == 420:
+            inside.set()
+            release.wait(5)
+        writes.append(("end", tag))
+
+    async def body(engine):
+        tag = engine.state[0].queue_id
+        await engine.run_in_thread(slow_write, tag)
+        while True:
+            await engine.wait(3600)
+
+    engine = AutomationEngine(body)
+    engine.start(compile_plan({"queue_id": 420}), AutomationRuntime())
+    assert inside.wait(2)
+    # İptal worker thread'indeki yazmayı durduramaz; yeni döngü onu bekler.
+    engine.stop()
+    engine.start(compile_plan({"queue_id": 450}), AutomationRuntime())
+    time.sleep(0.2)
+    assert writes == [("start", 420)]
+    release.set()
+    deadline = time.monotonic() + 2
+    while len(writes) < 4 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    try:
+        assert writes == [("start", 420), ("end", 420), ("start", 450), ("end", 450)]
+    finally:
+        engine.stop()
+        assert engine.join(2)
+
+
+def test_writes_of_a_stopped_loop_are_dropped():
+    inside, release = threading.Event(), threading.Event()
+    writes = []
+
+    def write(tag):
+        writes.append(tag)
+        if tag == "first":
+            inside.set()
+            release.wait(5)
+
+    async def body(engine):
+        first = asyncio.ensure_future(engine.run_in_thread(write, "first"))
+        await asyncio.to_thread(inside.wait, 5)
+        await engine.run_in_thread(write, "queued")  # ilk yazmanın kilidini bekler
+        await first
+
+    engine = AutomationEngine(body)
+    engine.start(compile_plan({}), AutomationRuntime())
+    assert inside.wait(2)
+    time.sleep(0.1)
+    engine.stop()
+    assert not engine.join(0.2)  # yarıda kalan yazma sürüyor
+    release.set()
+    assert engine.join(2)
+    assert writes == ["first"]
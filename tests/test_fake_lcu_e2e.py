@@ -0,0 +1,197 @@
+"""
+Uçtan uca otomasyon testleri: `automation_loop` gerçek HTTP/TLS/WebSocket trafiğiyle
+senaryolu LCU taklidine (bkz. `fake_lcu` fixture'ı) karşı sürülür ve adımlar arası
+gecikmeler ölçülür.
+"""
+
+import time
+
+import pytest
+
+import api
+from runepilot.infrastructure.lcu_client import find_lockfile_path
+from runepilot.testing.scripted_lcu import running_scripted_lcu
+
+CONFIG = api.AutomationConfig(
+    primary_role="MIDDLE",
+    primary_summoner_spell=4,
+    secondary_summoner_spell=14,
+    role_champions={"MIDDLE": [103]},
+    queue_id=420,
+)
+
+
+@pytest.fixture
+def automation(fake_lcu):
+    api.start_automation(CONFIG)
+    try:
+        yield fake_lcu
+    finally:
+        api.stop_automation()
+        api.AUTOMATION_ENGINE.join(5)
+
+
+def test_fixture_lockfile_is_discovered(fake_lcu):
+    assert find_lockfile_path().endswith("lockfile")
+    assert str(fake_lcu.server.port) in open(find_lockfile_path()).read()
+
+
+def test_full_flow_from_idle_to_finalization(automation):
+    script = automation
+    assert script.wait_for("lobby:420", 10)
+    assert script.wait_for("search", 5)
+    accepted = script.wait_for("accept", 5)
+    champ_select = script.wait_for("phase:ChampSelect", 5)
+    picked = script.wait_for("pick:103", 5)
+    assert script.wait_for("selection:", 5)
+    assert script.wait_for("runes:", 5)
+
+    assert accepted - script.first("ready_check") < 1.0
+    assert picked - champ_select < 1.0
+    player = script.session["myTeam"][0]
+    assert (player["championId"], player["spell1Id"], player["spell2Id"]) == (103, 4, 14)
+    assert script.position_preferences == {"firstPreference": "MIDDLE"}
+
+
+def test_injected_failures_are_retried(fake_lcu):
+    fake_lcu.server.set_fault(
+        "/lol-champ-select/v1/pickable-champion-ids", failure_rate=1.0, failure_status=500
+    )
+    fake_lcu.server.set_fault("/lol-champ-select/v1/session/actions/*", latency=0.05, jitter=0.05)
+    fake_lcu.enter_champ_select()
+    api.start_automation(CONFIG.model_copy(update={"auto_queue": False}))
+    try:
+        # pickable listesi alınamasa da tercih listesiyle pick yapılır.
+        assert fake_lcu.wait_for("pick:103", 5)
+    finally:
+        api.stop_automation()
+        api.AUTOMATION_ENGINE.join(5)
+    assert fake_lcu.server.request_count("GET", "/lol-champ-select/v1/pickable-champion-ids") >= 1
+
+
+def test_failed_pick_is_retried_without_a_new_event(fake_lcu):
+    # Seçim PATCH'i de başarısız: başarılı bir yazmanın yayınladığı oturum olayı döngüyü uyandırmaz.
+    for path in ("/lol-champ-select/v1/session/actions/*", "/lol-champ-select/v1/session/*"):
+        fake_lcu.server.set_fault(path, method="PATCH", failure_rate=1.0, failure_status=500)
+    api.start_automation(CONFIG.model_copy(update={"auto_queue": False}))
+    try:
+        time.sleep(1.0)  # WebSocket bağlansın; champ select olayla gelir
+        fake_lcu.enter_champ_select()
+        deadline = time.monotonic() + 5
+        while (
+            not fake_lcu.server.request_count("PATCH", "/lol-champ-select/v1/session/my-selection")
+            and time.monotonic() < deadline
+        ):
+            time.sleep(0.01)
+        # Olay taşıyan ilk turlar biter; bundan sonra yeni olay gelmez.
+        time.sleep(1.0)
+        fake_lcu.server.clear_faults()
+        failed = time.monotonic()
+        picked = fake_lcu.wait_for("pick:103", 5)
+    finally:
+        api.stop_automation()
+        api.AUTOMATION_ENGINE.join(5)
+    # WebSocket bağlı ve oturum değişmedi; yeniden deneme emniyet ağı aralığını beklemez.
+    assert picked and picked - failed < 1.0
+
+
+def test_prestaged_runes_leave_finalization_without_requests(tmp_path):
+    config = CONFIG.model_copy(update={"prestage_runes": True, "auto_queue": False})
+    with running_scripted_lcu(str(tmp_path), finalization_delay=0.5) as script:
+        script.enter_champ_select()
+        api.start_automation(config)
+        try:
+            staged = script.wait_for("runes:", 5)
+            finalization = script.wait_for("finalization", 5)
+            time.sleep(0.3)
+        finally:
+            api.stop_automation()
+            api.AUTOMATION_ENGINE.join(5)
+
+    assert staged is not None and finalization is not None and staged < finalization
+    after = [
+        path
+        for (_, path, _), ts in zip(
+            script.server.requests, script.server.request_times, strict=True
+        )
+        if ts >= finalization
+    ]
+    assert not [path for path in after if path.startswith("/lol-perks/")]
+
+
+def test_idle_lobby_is_not_requeried(fake_lcu):
+    fake_lcu.enter_lobby(420)
+    api.start_automation(CONFIG.model_copy(update={"auto_queue": False}))
+    try:
+        assert fake_lcu.wait_for("phase:Lobby", 5)
+        time.sleep(2.5)
+    finally:
+        api.stop_automation()
+        api.AUTOMATION_ENGINE.join(5)
+
+    server = fake_lcu.server
+    assert fake_lcu.position_preferences == {"firstPreference": "MIDDLE"}
+    # Roller bir kez yazılır; lobi yalnızca (yeniden) senkronizasyonda okunur.
+    assert server.request_count("PUT", api.POSITION_PREFERENCES_URI) == 1
+    assert server.request_count("GET", api.LOBBY_URI) <= 2
+    assert server.request_count("POST", api.SEARCH_URI) == 0
+
+
+def test_wrong_queue_lobby_is_recreated_once(fake_lcu):
+    fake_lcu.enter_lobby(450)
+    fake_lcu.server.set_fault(api.SEARCH_URI, failure_rate=1.0, failure_status=500)
+    api.start_automation(CONFIG)
+    try:
+        assert fake_lcu.wait_for("lobby:420", 5)
+        time.sleep(1.5)
+    finally:
+        api.stop_automation()
+        api.AUTOMATION_ENGINE.join(5)
+
+    server = fake_lcu.server
+    assert server.request_count("DELETE", api.LOBBY_URI) == 1
+    assert server.request_count("POST", api.LOBBY_URI) == 1
+    # Başarısız arama 5 sn dolmadan tekrar denenmez.
+    assert server.request_count("POST", api.SEARCH_URI) == 1
+
+
+class _NoWebSocket:
+    """Hiç bağlanamayan olay aboneliği: döngü ChampSelect'te 150 ms'de bir REST okur."""
+
+    connected = False
+    generation = 0
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+
+def test_settled_champ_select_stays_on_the_event_loop(tmp_path, monkeypatch):
+    monkeypatch.setattr(api, "LcuEventSubscriber", _NoWebSocket)
+    hops = []
+    run_handlers = api._run_handlers
+    monkeypatch.setattr(
+        api, "_run_handlers", lambda *args: hops.append(time.monotonic()) or run_handlers(*args)
+    )
+    config = CONFIG.model_copy(update={"auto_queue": False})
+    with running_scripted_lcu(str(tmp_path), finalization_delay=30) as script:
+        script.enter_champ_select()
+        api.start_automation(config)
+        try:
+            assert script.wait_for("pick:103", 5)
+            assert script.wait_for("selection:", 5)
+            time.sleep(0.5)
+            settled = time.monotonic()
+            time.sleep(1.0)
+        finally:
+            api.stop_automation()
+            api.AUTOMATION_ENGINE.join(5)
+
+    # Oturum her turda yeniden okunuyor ama değişmiyor ve yazılacak bir şey yok: handler'lar
+    # worker thread'ine geçmez.
+    assert hops and not [ts for ts in hops if ts >= settled]
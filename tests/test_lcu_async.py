@@ -0,0 +1,123 @@
+"""
+AsyncLcuClient testleri: yerel LCU taklidine karşı GET/PATCH, keep-alive havuzu,
+`asyncio.gather` ile eşzamanlı okumalar ve senkron `lcu_gather` cephesi.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from runepilot.infrastructure import lcu_client as lcu_client_module
+from runepilot.infrastructure.lcu_async import AsyncLcuClient, _read_body, lcu_gather
+from runepilot.infrastructure.lcu_client import LcuClient
+from runepilot.testing.fake_lcu import FakeLcuServer
+
+
+@pytest.fixture
+def server(tmp_path):
+    with FakeLcuServer() as srv:
+        srv.lockfile = srv.write_lockfile(str(tmp_path / "lockfile"))
+        yield srv
+
+
+def test_request_roundtrip_and_connection_reuse(server):
+    server.set_response("GET", "/lol-gameflow/v1/gameflow-phase", "ChampSelect")
+    server.set_response("PATCH", "/lol-champ-select/v1/session/my-selection", status=204)
+
+    async def scenario():
+        client = AsyncLcuClient(LcuClient(server.lockfile))
+        phase = await client.get("/lol-gameflow/v1/gameflow-phase")
+        patch = await client.request(
+            "patch", "/lol-champ-select/v1/session/my-selection", {"spell1Id": 4}
+        )
+        missing = await client.get("/nope")
+        idle = len(client._idle)
+        await client.aclose()
+        return phase, patch, missing, idle
+
+    phase, patch, missing, idle = asyncio.run(scenario())
+    assert phase.status_code == 200 and phase.json() == "ChampSelect"
+    assert patch.status_code == 204 and patch.content == b""
+    assert missing.status_code == 404 and not missing.ok
+    assert idle == 1  # ardışık istekler tek keep-alive bağlantıyı paylaşmalı
+    assert ("PATCH", "/lol-champ-select/v1/session/my-selection", {"spell1Id": 4}) in (
+        server.requests
+    )
+
+
+def test_gather_runs_independent_reads_concurrently(server):
+    for path in ("/a", "/b", "/c"):
+        server.set_response("GET", path, {"path": path}, delay=0.3)
+
+    async def scenario():
+        client = AsyncLcuClient(LcuClient(server.lockfile))
+        started = time.perf_counter()
+        results = await client.gather(["/a", ("GET", "/b"), "/c"])
+        elapsed = time.perf_counter() - started
+        await client.aclose()
+        return results, elapsed
+
+    results, elapsed = asyncio.run(scenario())
+    assert [r.json()["path"] for r in results] == ["/a", "/b", "/c"]
+    assert elapsed < 0.75  # seri olsaydı >= 0.9 sn
+
+
+def test_lcu_gather_sync_facade_isolates_errors(server, monkeypatch):
+    monkeypatch.setattr(lcu_client_module, "_DEFAULT_CLIENT", LcuClient(server.lockfile))
+    server.set_response("GET", "/ok", [1, 2])
+
+    ok, missing = lcu_gather(["/ok", "/missing"])
+    assert ok.json() == [1, 2]
+    assert missing.status_code == 404
+
+
+def test_read_body_decodes_chunked():
+    async def scenario():
+        reader = asyncio.StreamReader()
+        reader.feed_data(b"4\r\nWiki\r\n5\r\npedia\r\n0\r\n\r\n")
+        reader.feed_eof()
+        return await _read_body(reader, {"transfer-encoding": "chunked"})
+
+    assert asyncio.run(scenario()) == (b"Wikipedia", True)
+
+
+def test_gather_coalesces_identical_gets(server):
+    server.set_response("GET", "/summary", [1], delay=0.2)
+
+    async def scenario():
+        client = AsyncLcuClient(LcuClient(server.lockfile))
+        results = await client.gather(["/summary", "/summary", "/summary"])
+        await client.aclose()
+        return results
+
+    results = asyncio.run(scenario())
+    assert [r.json() for r in results] == [[1], [1], [1]]
+    assert server.request_count("GET", "/summary") == 1
+
+
+def test_credentials_are_read_off_the_loop_only_when_not_cached(server):
+    server.set_response("GET", "/a", 1)
+    sync = LcuClient(server.lockfile)
+    reads = []
+    read_credentials = sync.credentials
+
+    def counting_credentials():
+        reads.append(threading.get_ident())
+        return read_credentials()
+
+    sync.credentials = counting_credentials
+
+    async def scenario():
+        client = AsyncLcuClient(sync)
+        for _ in range(3):
+            await client.get("/a")
+        sync.invalidate()  # istemci yeniden başladı / bağlantı hatası
+        await client.get("/a")
+        await client.aclose()
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(scenario())
+    assert len(reads) == 2
+    assert loop_thread not in reads
@@ -0,0 +1,165 @@
+"""
+LcuClient testleri: lockfile kimlik cache'i, bağlantı havuzu yeniden kullanımı,
+paylaşılan istemciye delegasyon ve eşzamanlı özdeş GET'lerin birleştirilmesi (ağ sahte
+session ile mock'lanır).
+"""
+
+import os
+import threading
+
+import pytest
+import requests
+
+from runepilot.infrastructure import lcu_client as lcu_client_module
+from runepilot.infrastructure.lcu_client import LcuClient, read_lockfile
+
+
+class _FakeResp:
+    status_code = 200
+
+
+class _FakeSession:
+    def __init__(self):
+        self.calls = []
+        self.closed = False
+
+    def request(self, **kwargs):
+        self.calls.append(kwargs)
+        return _FakeResp()
+
+    def close(self):
+        self.closed = True
+
+
+def _write_lockfile(path, *, pid="100", port="5000", password="pw", mtime=None):
+    path.write_text(f"LeagueClient:{pid}:{port}:{password}:https", encoding="utf-8")
+    if mtime is not None:
+        os.utime(path, ns=(mtime, mtime))
+
+
+def test_read_lockfile_parses_all_fields(tmp_path):
+    lockfile = tmp_path / "lockfile"
+    _write_lockfile(lockfile)
+    creds = read_lockfile(str(lockfile))
+    assert (creds.pid, creds.port, creds.password, creds.protocol) == ("100", "5000", "pw", "https")
+    assert creds.base_url == "https://127.0.0.1:5000"
+
+
+def test_read_lockfile_rejects_bad_format(tmp_path):
+    lockfile = tmp_path / "lockfile"
+    lockfile.write_text("broken", encoding="utf-8")
+    with pytest.raises(ValueError):
+        read_lockfile(str(lockfile))
+
+
+def test_credentials_cached_until_lockfile_changes(tmp_path, monkeypatch):
+    lockfile = tmp_path / "lockfile"
+    _write_lockfile(lockfile, mtime=1_000_000_000)
+
+    reads = []
+    real_read = lcu_client_module.read_lockfile
+    monkeypatch.setattr(
+        lcu_client_module, "read_lockfile", lambda p: reads.append(p) or real_read(p)
+    )
+
+    client = LcuClient(str(lockfile), session_factory=_FakeSession)
+    assert client.credentials().port == "5000"
+    assert client.credentials().port == "5000"
+    assert len(reads) == 1  # ikinci çağrı dosyayı tekrar okumamalı
+
+    _write_lockfile(lockfile, pid="200", port="6000", password="pw2", mtime=2_000_000_000)
+    assert client.credentials().port == "6000"
+    assert len(reads) == 2
+
+
+def test_request_reuses_session_and_resets_on_new_client_process(tmp_path):
+    lockfile = tmp_path / "lockfile"
+    _write_lockfile(lockfile, mtime=1_000_000_000)
+    sessions = []
+
+    def factory():
+        sessions.append(_FakeSession())
+        return sessions[-1]
+
+    client = LcuClient(str(lockfile), session_factory=factory)
+    client.request("get", "/lol-gameflow/v1/gameflow-phase")
+    client.request("POST", "/lol-matchmaking/v1/ready-check/accept", {"a": 1})
+    assert len(sessions) == 1
+    first, second = sessions[0].calls
+    assert first["method"] == "GET"
+    assert first["url"] == "https://127.0.0.1:5000/lol-gameflow/v1/gameflow-phase"
+    assert first["auth"] == ("riot", "pw")
+    assert second["json"] == {"a": 1}
+
+    # Yeni pid/port: eski havuz kapatılıp yenisi açılmalı.
+    _write_lockfile(lockfile, pid="200", port="6000", mtime=2_000_000_000)
+    client.request("GET", "/x")
+    assert sessions[0].closed is True
+    assert len(sessions) == 2
+    assert sessions[1].calls[0]["url"] == "https://127.0.0.1:6000/x"
+
+
+def test_connection_error_invalidates_cache(tmp_path):
+    lockfile = tmp_path / "lockfile"
+    _write_lockfile(lockfile)
+
+    class _DeadSession(_FakeSession):
+        def request(self, **kwargs):
+            raise requests.ConnectionError("refused")
+
+    client = LcuClient(str(lockfile), session_factory=_DeadSession)
+    with pytest.raises(requests.ConnectionError):
+        client.request("GET", "/x")
+    assert client._credentials is None
+
+
+def test_lcu_request_delegates_to_shared_client(monkeypatch):
+    seen = []
+
+    class _Client:
+        def request(self, method, endpoint, json_body=None, *, timeout=None):
+            seen.append((method, endpoint, json_body, timeout))
+            return "ok"
+
+    monkeypatch.setattr(lcu_client_module, "_DEFAULT_CLIENT", _Client())
+    assert lcu_client_module.lcu_request("GET", "/a") == "ok"
+    assert lcu_client_module.lcu_request("PATCH", "/b", {"x": 1}, timeout=2.0) == "ok"
+    assert seen == [("GET", "/a", None, None), ("PATCH", "/b", {"x": 1}, 2.0)]
+
+
+def test_concurrent_identical_gets_share_one_request(tmp_path):
+    lockfile = tmp_path / "lockfile"
+    _write_lockfile(lockfile)
+    release = threading.Event()
+
+    class _SlowSession(_FakeSession):
+        def request(self, **kwargs):
+            self.calls.append(kwargs)
+            release.wait(2)
+            return _FakeResp()
+
+    session = _SlowSession()
+    client = LcuClient(str(lockfile), session_factory=lambda: session)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(client.request("GET", "/summary")))
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    while client.single_flight.stats().calls < 4:
+        pass
+    release.set()
+    for t in threads:
+        t.join(2)
+
+    assert len(session.calls) == 1
+    assert len(results) == 4 and all(r is results[0] for r in results)
+    stats = client.single_flight.stats()
+    assert (stats.executed, stats.hits, stats.coalesced) == (1, 3, 1)
+
+    # Uçuş bittikten sonra yeni GET tekrar gönderilir; yazma istekleri hiç birleştirilmez.
+    client.request("GET", "/summary")
+    client.request("PATCH", "/summary", {"a": 1})
+    assert len(session.calls) == 3
+    assert client.single_flight.stats().calls == 5
@@ -0,0 +1,169 @@
+"""
+LCU son tarih testleri: champ select timer'ından kalan süre, iç içe son tarihler,
+askıda kalan endpoint'in zaman aşımı, süresi geçmiş okumanın hiç gönderilmemesi ve
+kaçırmaların metriklere yazılması.
+"""
+
+import asyncio
+import socket
+import time
+
+import pytest
+import requests
+
+import api
+from runepilot.domain.automation_plan import AutomationRuntime, compile_plan
+from runepilot.domain.queue_state import QueueStateMachine
+from runepilot.infrastructure.lcu_async import AsyncLcuClient
+from runepilot.infrastructure.lcu_client import LcuClient
+from runepilot.infrastructure.lcu_deadline import (
+    READ_RESERVE,
+    WRITE_MARGIN,
+    Deadline,
+    LcuDeadlineExceeded,
+    current_deadline,
+    lcu_deadline,
+    phase_time_left,
+    session_deadline,
+)
+from runepilot.infrastructure.lcu_metrics import LcuMetrics
+from runepilot.testing.fake_lcu import FakeLcuServer
+
+HUNG = "/lol-champ-select/v1/pickable-champion-ids"
+PICK = "/lol-champ-select/v1/session/actions/1"
+
+
+@pytest.fixture
+def server(tmp_path):
+    with FakeLcuServer() as srv:
+        srv.set_response("GET", HUNG, [1, 2], delay=1.0)
+        srv.set_response("PATCH", PICK, status=204)
+        srv.lockfile = srv.write_lockfile(str(tmp_path / "lockfile"))
+        yield srv
+
+
+def _misses(metrics, method, endpoint):
+    return metrics.snapshot()[(method, endpoint)]["deadline_misses"]
+
+
+def test_phase_time_left_discounts_payload_age():
+    timer = {"adjustedTimeLeftInPhase": 20000, "internalNowInEpochMs": 1_000_000}
+    assert phase_time_left(timer, now_epoch_ms=1_004_000) == pytest.approx(16.0)
+    assert phase_time_left({"adjustedTimeLeftInPhase": 5000}) == pytest.approx(5.0)
+    assert phase_time_left({"adjustedTimeLeftInPhase": 5000, "isInfinite": True}) is None
+    assert phase_time_left(None) is None
+
+
+def test_session_deadline_reserves_the_window_for_writes():
+    before = time.monotonic()
+    deadline = session_deadline({"timer": {"adjustedTimeLeftInPhase": 10000}})
+    assert deadline.write_by - deadline.read_by == pytest.approx(READ_RESERVE)
+    assert deadline.write_by == pytest.approx(before + 10 - WRITE_MARGIN, abs=0.1)
+    assert session_deadline({"timer": {"isInfinite": True}}) is None
+
+
+def test_nested_deadlines_keep_the_earlier_one():
+    assert current_deadline() is None
+    with lcu_deadline(Deadline(5.0, 6.0)):
+        with lcu_deadline(Deadline(10.0, 3.0)):
+            assert current_deadline() == Deadline(5.0, 3.0)
+        with lcu_deadline(None):
+            assert current_deadline() == Deadline(5.0, 6.0)
+    assert current_deadline() is None
+
+
+def test_per_call_timeout_bounds_a_hung_endpoint(server):
+    client = LcuClient(server.lockfile, metrics=LcuMetrics())
+    started = time.monotonic()
+    with pytest.raises(requests.Timeout) as excinfo:
+        client.request("GET", HUNG, timeout=0.2)
+    assert time.monotonic() - started < 0.8
+    assert not isinstance(excinfo.value, LcuDeadlineExceeded)
+    assert _misses(client.metrics, "GET", HUNG) == 0
+
+
+def test_slow_read_is_abandoned_at_the_deadline_and_counted(server):
+    client = LcuClient(server.lockfile, metrics=LcuMetrics())
+    now = time.monotonic()
+    with lcu_deadline(Deadline(read_by=now + 0.2, write_by=now + 5)):
+        with pytest.raises(LcuDeadlineExceeded):
+            client.request("GET", HUNG)
+        assert client.request("PATCH", PICK, {"championId": 1}).status_code == 204
+    assert time.monotonic() - now < 0.8
+    assert _misses(client.metrics, "GET", HUNG) == 1
+    assert "lcu_request_deadline_misses_total" in client.metrics.render_prometheus()
+
+
+def test_read_past_its_deadline_is_not_sent_but_the_write_is(server):
+    client = LcuClient(server.lockfile, metrics=LcuMetrics())
+    past = time.monotonic() - 1
+    with lcu_deadline(Deadline(read_by=past, write_by=past)):
+        with pytest.raises(LcuDeadlineExceeded):
+            client.request("GET", HUNG)
+        # Yazmaya her zaman kısa bir şans tanınır (saat tahmini hatalı olabilir).
+        assert client.request("PATCH", PICK, {"championId": 1}).status_code == 204
+    assert server.request_count("GET", HUNG) == 0
+    assert _misses(client.metrics, "GET", HUNG) == 1
+
+
+def test_async_client_honours_the_deadline(server):
+    metrics = LcuMetrics()
+
+    async def scenario():
+        client = AsyncLcuClient(LcuClient(server.lockfile, metrics=metrics))
+        now = time.monotonic()
+        with lcu_deadline(Deadline(read_by=now + 0.2, write_by=now + 5)):
+            results = await client.gather([HUNG, ("PATCH", PICK, {"championId": 1})])
+        await client.aclose()
+        return results, time.monotonic() - now
+
+    (read, write), elapsed = asyncio.run(scenario())
+    assert isinstance(read, LcuDeadlineExceeded)
+    assert write.status_code == 204
+    assert elapsed < 0.8
+    assert _misses(metrics, "GET", HUNG) == 1
+
+
+def test_async_timeout_covers_a_connect_that_never_completes(tmp_path):
+    # Bağlantıyı kabul eden ama TLS el sıkışmasını hiç yanıtlamayan soket.
+    silent = socket.create_server(("127.0.0.1", 0))
+    lockfile = tmp_path / "lockfile"
+    lockfile.write_text(f"LeagueClient:1:{silent.getsockname()[1]}:secret:https")
+    metrics = LcuMetrics()
+    sync = LcuClient(str(lockfile), metrics=metrics)
+    invalidated = []
+    sync.invalidate = lambda: invalidated.append(True)
+
+    async def scenario():
+        client = AsyncLcuClient(sync)
+        started = time.monotonic()
+        try:
+            with pytest.raises(TimeoutError):
+                await asyncio.wait_for(client.request("GET", HUNG, timeout=0.3), 5)
+        finally:
+            await client.aclose()
+        return time.monotonic() - started
+
+    try:
+        elapsed = asyncio.run(scenario())
+    finally:
+        silent.close()
+    assert elapsed < 1.0
+    assert metrics.snapshot()[("GET", HUNG)]["errors"] == 1
+    assert invalidated
+
+
+def test_champ_select_handlers_run_under_the_session_deadline(monkeypatch):
+    seen = []
+    monkeypatch.setattr(api, "handle_queue", lambda plan, queue, phase: None)
+    monkeypatch.setattr(api, "handle_ready_check", lambda ready_check: None)
+    monkeypatch.setattr(
+        api, "handle_champ_select", lambda session, plan, runtime: seen.append(current_deadline())
+    )
+    live = api._LiveState()
+    live.session = {"timer": {"phase": "BAN_PICK", "adjustedTimeLeftInPhase": 4000}}
+    api._run_handlers(compile_plan({}), AutomationRuntime(), live, QueueStateMachine())
+
+    (deadline,) = seen
+    assert deadline.write_by - time.monotonic() == pytest.approx(4 - WRITE_MARGIN, abs=0.2)
+    assert current_deadline() is None
@@ -0,0 +1,137 @@
+"""
+LCU WebSocket olay aboneliği testleri: WAMP mesaj çözümleme, yerel TLS/WebSocket
+taklidine karşı kayıtlı olayların yeniden oynatılması ve otomasyon döngüsünün
+olaylarla (polling beklemeden) handler'ları tetiklemesi.
+"""
+
+import threading
+
+import api
+from runepilot.application.engine import AutomationEngine
+from runepilot.domain.automation_plan import AutomationRuntime, compile_plan
+from runepilot.infrastructure.lcu_client import LcuClient
+from runepilot.infrastructure.lcu_events import (
+    LcuEvent,
+    LcuEventBuffer,
+    LcuEventSubscriber,
+    parse_wamp_event,
+    topic_for_uri,
+)
+from runepilot.testing.fake_lcu import FakeLcuServer, RecordedEvent
+
+RECORDED_CHAMP_SELECT = [
+    RecordedEvent("/lol-gameflow/v1/gameflow-phase", "ReadyCheck"),
+    RecordedEvent("/lol-matchmaking/v1/ready-check", {"state": "InProgress"}),
+    RecordedEvent("/lol-gameflow/v1/gameflow-phase", "ChampSelect"),
+    RecordedEvent("/lol-champ-select/v1/session", {"localPlayerCellId": 0, "myTeam": []}),
+    RecordedEvent("/lol-lobby/v2/lobby", {"ignored": True}),
+    RecordedEvent("/lol-champ-select/v1/session", None, event_type="Delete"),
+]
+
+
+def test_topic_for_uri():
+    assert (
+        topic_for_uri("/lol-gameflow/v1/gameflow-phase")
+        == "OnJsonApiEvent_lol-gameflow_v1_gameflow-phase"
+    )
+
+
+def test_parse_wamp_event():
+    msg = '[8, "OnJsonApiEvent", {"uri": "/a", "eventType": "Update", "data": 1}]'
+    assert parse_wamp_event(msg) == LcuEvent(uri="/a", event_type="Update", data=1)
+    assert parse_wamp_event("[0, 1]") is None
+    assert parse_wamp_event("not json") is None
+
+
+def test_event_buffer_keeps_latest_per_uri():
+    buf = LcuEventBuffer()
+    buf.publish(LcuEvent("/a", "Update", 1))
+    buf.publish(LcuEvent("/a", "Update", 2))
+    assert buf.wait(0) is True
+    assert buf.drain() == {"/a": LcuEvent("/a", "Update", 2)}
+    assert buf.wait(0) is False
+
+
+def test_subscriber_receives_replayed_events(tmp_path):
+    uris = [
+        "/lol-gameflow/v1/gameflow-phase",
+        "/lol-matchmaking/v1/ready-check",
+        "/lol-champ-select/v1/session",
+    ]
+    received = []
+    done = threading.Event()
+
+    def on_event(event):
+        received.append(event)
+        if event.event_type == "Delete":
+            done.set()
+
+    with FakeLcuServer(events=RECORDED_CHAMP_SELECT) as server:
+        lockfile = server.write_lockfile(str(tmp_path / "lockfile"))
+        subscriber = LcuEventSubscriber(uris, on_event, client=LcuClient(lockfile))
+        subscriber.start()
+        try:
+            assert subscriber.wait_connected(5)
+            assert server.wait_for_subscribers(uris)
+            server.replay()
+            assert done.wait(5)
+        finally:
+            subscriber.stop()
+
+    # Abone olunmayan uri (/lol-lobby/v2/lobby) filtrelenmeli, sıra korunmalı.
+    assert [(e.uri, e.event_type, e.data) for e in received] == [
+        ("/lol-gameflow/v1/gameflow-phase", "Update", "ReadyCheck"),
+        ("/lol-matchmaking/v1/ready-check", "Update", {"state": "InProgress"}),
+        ("/lol-gameflow/v1/gameflow-phase", "Update", "ChampSelect"),
+        ("/lol-champ-select/v1/session", "Update", {"localPlayerCellId": 0, "myTeam": []}),
+        ("/lol-champ-select/v1/session", "Delete", None),
+    ]
+
+
+def test_automation_loop_dispatches_events_without_polling(monkeypatch):
+    session = {"localPlayerCellId": 1, "myTeam": [{"cellId": 1}]}
+    requests_seen = []
+    handled = []
+
+    class _FakeSubscriber:
+        def __init__(self, uris, on_event, **kwargs):
+            self.on_event = on_event
+            self.connected = True
+            self.generation = 1
+
+        def start(self):
+            pass
+
+        def stop(self):
+            pass
+
+    class _FakeWatcher:
+        client_up = True
+
+        def subscribe(self, listener):
+            return lambda: None
+
+    async def fake_poll(self, scheduler, client):
+        requests_seen.append("poll")
+        self.phase = "ChampSelect"
+        # İlk senkronizasyondan sonra oturum olayı WebSocket'ten gelir.
+        api.AUTOMATION_EVENTS.publish(LcuEvent(api.CHAMP_SELECT_SESSION_URI, "Update", session))
+
+    def fake_handle(sess, plan, runtime):
+        handled.append(sess)
+        api.stop_automation()
+
+    monkeypatch.setattr(api, "LcuEventSubscriber", _FakeSubscriber)
+    monkeypatch.setattr(api, "get_default_watcher", _FakeWatcher)
+    monkeypatch.setattr(api._LiveState, "poll", fake_poll)
+    monkeypatch.setattr(api, "handle_queue", lambda plan, queue, phase: None)
+    monkeypatch.setattr(api, "handle_champ_select", fake_handle)
+    engine = AutomationEngine(api.automation_loop)
+    monkeypatch.setattr(api, "AUTOMATION_ENGINE", engine)
+
+    engine.start(compile_plan({"auto_queue": False}), AutomationRuntime())
+    assert engine.join(3)
+
+    assert not engine.running
+    assert handled == [session]
+    assert requests_seen == ["poll"]  # olay sonrası tekrar REST okuması yapılmamalı
@@ -0,0 +1,83 @@
+"""
+LCU metrik testleri: endpoint şablonlama, histogram kovaları, Prometheus çıktısı ve
+istemcilerin her ağ isteğini kaydetmesi.
+"""
+
+import requests
+
+import api
+from runepilot.infrastructure.lcu_client import LcuClient
+from runepilot.infrastructure.lcu_metrics import LcuMetrics, endpoint_template
+
+
+class _FakeResp:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+def test_endpoint_template_collapses_ids_and_assets():
+    assert endpoint_template("/lol-champ-select/v1/session/actions/12") == (
+        "/lol-champ-select/v1/session/actions/{id}"
+    )
+    assert endpoint_template("/lol-game-data/assets/v1/champions/266.json") == (
+        "/lol-game-data/assets/v1/champions/{id}.json"
+    )
+    assert endpoint_template("/lol-game-data/assets/v1/perk-images/Styles/x.png") == (
+        "/lol-game-data/assets/{asset}"
+    )
+    assert endpoint_template("/lol-perks/v1/pages?x=1") == "/lol-perks/v1/pages"
+
+
+def test_render_prometheus_histogram_and_counters():
+    metrics = LcuMetrics()
+    metrics.observe("GET", "/a/1", 0.004, 200)
+    metrics.observe("GET", "/a/2", 0.2, 404)
+    metrics.observe("GET", "/a/3", 20.0, None)
+
+    text = metrics.render_prometheus()
+    labels = 'method="GET",endpoint="/a/{id}"'
+    assert f'lcu_requests_total{{{labels},status="200"}} 1' in text
+    assert f'lcu_requests_total{{{labels},status="404"}} 1' in text
+    assert f"lcu_request_errors_total{{{labels}}} 1" in text
+    assert f'lcu_request_duration_seconds_bucket{{{labels},le="0.005"}} 1' in text
+    assert f'lcu_request_duration_seconds_bucket{{{labels},le="0.25"}} 2' in text
+    assert f'lcu_request_duration_seconds_bucket{{{labels},le="10.0"}} 2' in text
+    assert f'lcu_request_duration_seconds_bucket{{{labels},le="+Inf"}} 3' in text
+    assert f"lcu_request_duration_seconds_count{{{labels}}} 3" in text
+
+
+def test_client_records_responses_and_transport_errors(tmp_path):
+    lockfile = tmp_path / "lockfile"
+    lockfile.write_text("LeagueClient:1:5000:pw:https", encoding="utf-8")
+    outcomes = [_FakeResp(204), requests.ConnectionError("refused")]
+
+    class _Session:
+        def request(self, **kwargs):
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        def close(self):
+            pass
+
+    metrics = LcuMetrics()
+    client = LcuClient(str(lockfile), session_factory=_Session, metrics=metrics)
+    client.request("PATCH", "/lol-champ-select/v1/session/actions/7", {"completed": True})
+    try:
+        client.request("PATCH", "/lol-champ-select/v1/session/actions/8", {})
+    except requests.ConnectionError:
+        pass
+
+    series = metrics.snapshot()[("PATCH", "/lol-champ-select/v1/session/actions/{id}")]
+    assert series["count"] == 2
+    assert series["statuses"] == {204: 1}
+    assert series["errors"] == 1
+
+
+def test_metrics_route_exports_prometheus_text():
+    response = api.metrics()
+    assert response.media_type.startswith("text/plain")
+    body = response.body.decode("utf-8")
+    assert "# TYPE lcu_request_duration_seconds histogram" in body
+    assert "lcu_single_flight_hits_total" in body
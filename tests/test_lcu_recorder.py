@@ -0,0 +1,111 @@
+"""
+LCU trafik kaydı testleri: sıkıştırılmış log formatı, istemci/abonelik kancaları ve
+kaydedilmiş bir champ select'in sanal saatle otomasyona karşı tekrar oynatılması.
+"""
+
+import api
+from runepilot.infrastructure.lcu_client import LcuClient
+from runepilot.infrastructure.lcu_recorder import (
+    RECORD_ENV,
+    LcuRecorder,
+    read_recording,
+)
+from runepilot.testing.fake_lcu import FakeLcuServer
+from runepilot.testing.replay import ReplayLcu, VirtualClock, recorded_config
+from runepilot.testing.scripted_lcu import app_bound_to, running_scripted_lcu
+
+CONFIG = api.AutomationConfig(
+    primary_role="MIDDLE",
+    primary_summoner_spell=4,
+    secondary_summoner_spell=14,
+    role_champions={"MIDDLE": [103]},
+    queue_id=420,
+    auto_queue=False,
+)
+
+
+def test_recording_roundtrip_appends_across_sessions(tmp_path):
+    path = str(tmp_path / "rec" / "lcu.jsonl.gz")
+    first = LcuRecorder(path)
+    first.record_request("PATCH", "/a", 204, 0.0123, b'{"x": 1}', b"")
+    first.record_event("/b", "Update", {"y": 2})
+    first.close()
+    second = LcuRecorder(path)
+    second.note("config", {"queue_id": 420})
+    second.record_request("GET", "/icon.png", 200, 0.001, None, b"\x89PNG\x00")
+    second.close()
+
+    entries = read_recording(path)
+    assert [e["k"] for e in entries] == ["req", "evt", "note", "req"]
+    req, evt, note, icon = entries
+    assert (req["m"], req["e"], req["s"], req["l"], req["q"], req["b"]) == (
+        "PATCH",
+        "/a",
+        204,
+        0.0123,
+        {"x": 1},
+        None,
+    )
+    assert (evt["u"], evt["y"], evt["d"]) == ("/b", "Update", {"y": 2})
+    assert recorded_config(entries) == {"queue_id": 420}
+    assert icon["b"] is None  # ikili içerik kaydedilmez
+    assert entries[0]["t"] <= entries[-1]["t"]
+
+
+def test_client_records_requests_with_status_latency_and_bodies(tmp_path):
+    with FakeLcuServer() as server:
+        server.set_response("GET", "/lol-gameflow/v1/gameflow-phase", "Lobby")
+        server.set_response("PUT", "/lol-lobby/v1/x", {"ok": True}, status=201, delay=0.02)
+        lockfile = server.write_lockfile(str(tmp_path / "lockfile"))
+        client = LcuClient(lockfile, recorder=LcuRecorder(str(tmp_path / "rec.gz")))
+        client.request("GET", "/lol-gameflow/v1/gameflow-phase")
+        client.request("PUT", "/lol-lobby/v1/x", {"a": 1})
+        client.close()
+
+    get, put = read_recording(str(tmp_path / "rec.gz"))
+    assert (get["m"], get["s"], get["b"]) == ("GET", 200, "Lobby")
+    assert (put["m"], put["s"], put["q"], put["b"]) == ("PUT", 201, {"a": 1}, {"ok": True})
+    assert put["l"] >= 0.02
+
+
+def test_virtual_clock_scales_time():
+    clock = VirtualClock(4.0)
+    assert 0.9 < clock.real_delay(4.0) <= 1.0
+    assert clock.real_delay(-1) == 0.0
+
+
+def test_recorded_champ_select_replays_against_the_automation(tmp_path, monkeypatch):
+    path = str(tmp_path / "session.jsonl.gz")
+    monkeypatch.setenv(RECORD_ENV, path)
+    with running_scripted_lcu(str(tmp_path / "live"), finalization_delay=0.3) as script:
+        script.enter_champ_select()
+        api.start_automation(CONFIG)
+        try:
+            assert script.wait_for("pick:103", 5)
+            assert script.wait_for("runes:", 5)
+        finally:
+            api.stop_automation()
+            api.AUTOMATION_ENGINE.join(5)
+    monkeypatch.delenv(RECORD_ENV)
+
+    entries = read_recording(path)
+    assert any(e["k"] == "evt" for e in entries)
+    assert recorded_config(entries)["queue_id"] == 420
+
+    with FakeLcuServer() as server, app_bound_to(server, str(tmp_path / "replay")):
+        lcu = ReplayLcu(server, entries, speed=2.0)
+        api.start_automation(api.AutomationConfig(**recorded_config(entries)))
+        try:
+            report = lcu.play(tail=0.5)
+        finally:
+            api.stop_automation()
+            api.AUTOMATION_ENGINE.join(5)
+
+    decided = {(d.method, d.endpoint) for d in report.decisions}
+    recorded = {(d.method, d.endpoint) for d in report.recorded_decisions}
+    pick = ("PATCH", next(e for m, e in recorded if "/session/actions/" in e))
+    assert pick in recorded and pick in decided
+    # Tepki süresi yalnızca öncesinde olay yayınlanmış kararlar için vardır.
+    assert all(r >= 0 for r in report.reactions + report.recorded_reactions)
+    assert sum(report.request_counts.values()) > 0
+    assert "decisions:" in report.summary()
@@ -0,0 +1,119 @@
+"""
+Lockfile izleyicisi testleri: istemci up/down/kimlik değişimi olayları, Linux'ta
+inotify ile anında algılama ve istemci kapalıyken otomasyon döngüsünün park etmesi.
+"""
+
+import sys
+import threading
+
+import pytest
+
+import api
+from runepilot.application.engine import AutomationEngine
+from runepilot.domain.automation_plan import AutomationRuntime, compile_plan
+from runepilot.infrastructure.lockfile_watcher import (
+    CLIENT_DOWN,
+    CLIENT_UP,
+    CREDENTIALS_CHANGED,
+    LockfileWatcher,
+)
+
+
+def _write(path, pid, port, password):
+    path.write_text(f"LeagueClient:{pid}:{port}:{password}:https", encoding="utf-8")
+
+
+def test_check_emits_up_changed_and_down(tmp_path):
+    lockfile = tmp_path / "lockfile"
+    watcher = LockfileWatcher(candidates=lambda: [str(lockfile)])
+    events = []
+    watcher.subscribe(events.append)
+
+    assert watcher.check() is None and not watcher.client_up
+
+    _write(lockfile, 1, 5000, "a")
+    assert watcher.check().kind == CLIENT_UP
+    assert watcher.client_up and watcher.credentials.port == "5000"
+    assert watcher.check() is None  # imza değişmedi → olay yok
+
+    _write(lockfile, 2, 5001, "bb")
+    assert watcher.check().kind == CREDENTIALS_CHANGED
+    assert watcher.credentials.password == "bb"
+
+    lockfile.unlink()
+    assert watcher.check().kind == CLIENT_DOWN
+    assert not watcher.client_up and watcher.credentials is None
+    assert [e.kind for e in events] == [CLIENT_UP, CREDENTIALS_CHANGED, CLIENT_DOWN]
+
+
+def test_check_ignores_partially_written_lockfile(tmp_path):
+    lockfile = tmp_path / "lockfile"
+    lockfile.write_text("LeagueClient:1", encoding="utf-8")
+    watcher = LockfileWatcher(candidates=lambda: [str(lockfile)])
+
+    assert watcher.check() is None and not watcher.client_up
+    _write(lockfile, 1, 5000, "a")
+    assert watcher.check().kind == CLIENT_UP
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify yalnızca Linux'ta")
+def test_background_thread_reacts_to_lockfile_changes(tmp_path):
+    lockfile = tmp_path / "lockfile"
+    # Uzun polling aralığı: olayların inotify ile geldiğini doğrular.
+    watcher = LockfileWatcher(candidates=lambda: [str(lockfile)], poll_interval=30.0)
+    kinds = []
+    seen = threading.Condition()
+
+    def on_event(event):
+        with seen:
+            kinds.append(event.kind)
+            seen.notify_all()
+
+    watcher.subscribe(on_event)
+    watcher.start()
+    try:
+        _write(lockfile, 1, 5000, "a")
+        with seen:
+            assert seen.wait_for(lambda: kinds == [CLIENT_UP], 3)
+        lockfile.unlink()
+        with seen:
+            assert seen.wait_for(lambda: kinds == [CLIENT_UP, CLIENT_DOWN], 3)
+        assert watcher.using_inotify
+    finally:
+        watcher.stop()
+
+
+def test_automation_loop_parks_while_client_is_down(tmp_path, monkeypatch):
+    lockfile = tmp_path / "lockfile"
+    watcher = LockfileWatcher(candidates=lambda: [str(lockfile)])
+    polled = threading.Event()
+
+    class _FakeSubscriber:
+        def __init__(self, uris, on_event, **kwargs):
+            self.connected = False
+            self.generation = 0
+
+        def start(self):
+            pass
+
+        def stop(self):
+            pass
+
+    async def fake_poll(self, scheduler, client):
+        polled.set()
+        api.stop_automation()
+
+    monkeypatch.setattr(api, "get_default_watcher", lambda: watcher)
+    monkeypatch.setattr(api, "LcuEventSubscriber", _FakeSubscriber)
+    monkeypatch.setattr(api._LiveState, "poll", fake_poll)
+    engine = AutomationEngine(api.automation_loop)
+    monkeypatch.setattr(api, "AUTOMATION_ENGINE", engine)
+
+    engine.start(compile_plan({"auto_queue": False}), AutomationRuntime())
+    assert not polled.wait(0.3)  # istemci kapalı: hiç LCU okuması yok
+
+    _write(lockfile, 1, 5000, "a")
+    watcher.check()  # CLIENT_UP olayı döngüyü uyandırır
+    assert polled.wait(2)
+    assert engine.join(2)
+    assert not engine.running
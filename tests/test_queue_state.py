@@ -0,0 +1,147 @@
+"""
+Lobi/kuyruk durum makinesi testleri: doğrulanmış durumun hatırlanması, yalnızca
+geçişlerde aksiyon üretilmesi, başarısızlıkta bekleme ve faz değişimlerinde sıfırlama.
+"""
+
+from runepilot.domain.automation_plan import compile_plan
+from runepilot.domain.queue_state import (
+    ACTION_CREATE_LOBBY,
+    ACTION_READ_LOBBY,
+    ACTION_RECREATE_LOBBY,
+    ACTION_SET_ROLES,
+    ACTION_START_SEARCH,
+    LOBBY_READY,
+    LOBBY_WRONG_QUEUE,
+    NO_LOBBY,
+    RETRY_INTERVAL,
+    ROLES_SET,
+    SEARCH_CONFIRM_TIMEOUT,
+    SEARCHING,
+    UNKNOWN,
+    QueueStateMachine,
+)
+
+PLAN = compile_plan({"queue_id": 420, "primary_role": "middle", "secondary_role": "top"})
+ROLES = {"firstPreference": "MIDDLE", "secondPreference": "TOP"}
+
+
+def _lobby(queue_id=420, first="", second=""):
+    return {
+        "gameConfig": {"queueId": queue_id},
+        "localMember": {"firstPositionPreference": first, "secondPositionPreference": second},
+    }
+
+
+def test_auto_queue_walks_the_transitions_once():
+    queue = QueueStateMachine()
+    queue.observe_phase("None")
+    assert queue.state(PLAN) == NO_LOBBY
+    assert queue.next_action(PLAN, 0) == ACTION_CREATE_LOBBY
+
+    queue.observe_lobby(_lobby())
+    assert queue.state(PLAN) == LOBBY_READY
+    assert queue.next_action(PLAN, 0) == ACTION_SET_ROLES
+
+    queue.record_roles(ROLES)
+    assert queue.state(PLAN) == ROLES_SET
+    assert queue.next_action(PLAN, 0) == ACTION_START_SEARCH
+
+    queue.record_search(0)
+    assert queue.state(PLAN) == SEARCHING
+    # Faz olayı gecikse de arama hemen yeniden istenmez.
+    queue.observe_phase("Lobby")
+    assert queue.next_action(PLAN, 1) is None
+    queue.observe_phase("Matchmaking")
+    assert queue.next_action(PLAN, 100) is None
+
+
+def test_confirmed_lobby_state_needs_no_further_requests():
+    queue = QueueStateMachine()
+    queue.observe_phase("Lobby")
+    assert queue.state(PLAN) == UNKNOWN
+    assert queue.next_action(PLAN, 0) == ACTION_READ_LOBBY
+
+    queue.observe_lobby(_lobby(first="MIDDLE", second="TOP"))
+    plan = compile_plan(
+        {"queue_id": 420, "primary_role": "middle", "secondary_role": "top", "auto_queue": False}
+    )
+    assert queue.state(plan) == ROLES_SET
+    for now in range(100):
+        assert queue.next_action(plan, float(now)) is None
+
+
+def test_wrong_queue_is_recreated_and_no_lobby_is_left_alone_without_auto_queue():
+    queue = QueueStateMachine()
+    queue.observe_phase("Lobby")
+    queue.observe_lobby(_lobby(queue_id=450))
+    assert queue.state(PLAN) == LOBBY_WRONG_QUEUE
+    assert queue.next_action(PLAN, 0) == ACTION_RECREATE_LOBBY
+
+    manual = compile_plan({"primary_role": "middle", "auto_queue": False})
+    queue.observe_phase("None")
+    assert queue.next_action(manual, 0) is None
+
+
+def test_unreadable_phase_rereads_the_lobby_instead_of_creating_one():
+    queue = QueueStateMachine()
+    queue.observe_phase("Lobby")
+    queue.observe_lobby(_lobby(first="MIDDLE", second="TOP"))
+    queue.observe_phase(None)  # gameflow okuması başarısız/zaman aşımı
+    assert queue.state(PLAN) == UNKNOWN
+    assert queue.next_action(PLAN, 0) == ACTION_READ_LOBBY
+
+    queue.observe_lobby(_lobby(first="MIDDLE", second="TOP"))
+    assert queue.next_action(PLAN, 0) == ACTION_START_SEARCH
+
+
+def test_failure_backs_off_and_rereads():
+    queue = QueueStateMachine()
+    queue.observe_phase("Lobby")
+    queue.observe_lobby(_lobby())
+    queue.record_failure(10.0)
+    assert queue.next_action(PLAN, 10.0 + RETRY_INTERVAL - 0.1) is None
+    assert queue.next_action(PLAN, 10.0 + RETRY_INTERVAL) == ACTION_READ_LOBBY
+
+
+def test_due_at_reports_the_retry_deadline():
+    queue = QueueStateMachine()
+    queue.observe_phase("Lobby")
+    queue.observe_lobby(_lobby())
+    assert queue.due_at(PLAN, 3.0) == 3.0
+    queue.record_failure(10.0)
+    assert queue.due_at(PLAN, 11.0) == 10.0 + RETRY_INTERVAL
+    queue.observe_phase("ChampSelect")
+    assert queue.due_at(PLAN, 11.0) is None
+
+
+def test_search_that_never_reaches_matchmaking_is_retried():
+    queue = QueueStateMachine()
+    queue.observe_phase("Lobby")
+    queue.observe_lobby(_lobby(first="MIDDLE", second="TOP"))
+    queue.record_search(0.0)
+    assert queue.next_action(PLAN, SEARCH_CONFIRM_TIMEOUT - 0.1) is None
+    assert queue.next_action(PLAN, SEARCH_CONFIRM_TIMEOUT) == ACTION_START_SEARCH
+
+
+def test_leaving_the_queue_phases_forgets_the_lobby():
+    queue = QueueStateMachine()
+    queue.observe_phase("Lobby")
+    queue.observe_lobby(_lobby(first="MIDDLE", second="TOP"))
+    for phase in ("Matchmaking", "ReadyCheck", "ChampSelect", "InProgress"):
+        queue.observe_phase(phase)
+        assert queue.next_action(PLAN, 0) is None
+    queue.observe_phase("Lobby")
+    assert queue.next_action(PLAN, 0) == ACTION_READ_LOBBY
+
+    queue.observe_lobby(None)  # lobi Delete olayı
+    assert queue.state(PLAN) == NO_LOBBY
+
+
+def test_cancelled_search_is_restarted():
+    queue = QueueStateMachine()
+    queue.observe_phase("Lobby")
+    queue.observe_lobby(_lobby(first="MIDDLE", second="TOP"))
+    queue.observe_phase("Matchmaking")
+    assert queue.state(PLAN) == SEARCHING
+    queue.observe_phase("Lobby")
+    assert queue.next_action(PLAN, 0) == ACTION_START_SEARCH
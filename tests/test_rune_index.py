@@ -0,0 +1,223 @@
+"""
+Derlenmiş rün öneri indeksi testleri: doğrulama, istatistiklerin sayıya çevrilmesi,
+öneri sırası, (rol, tier, patch) varyantları ve geri düşüşleri, id → slug çözümünün
+şampiyon başına bir kez yapılması ve `api`'nin veriyi import sırasında değil ilk
+kullanımda (tek sefer) yüklemesi.
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import api
+from runepilot.domain.automation_plan import compile_plan
+from runepilot.domain.rune_index import (
+    ANY,
+    CompiledPage,
+    compile_runes,
+    parse_stat,
+    prune_patches,
+    put_variant_pages,
+)
+
+DOMINATION = ["8112", "8126", "8140", "8105"]
+SORCERY = ["8224", "8233"]
+SHARDS = ["5008", "5008", "5001"]
+
+
+def _blob(win_rate, **extra):
+    return {"Domination": DOMINATION, "Sorcery": SORCERY, "Shards": SHARDS, **extra} | (
+        {"Win Rate": win_rate} if win_rate is not None else {}
+    )
+
+
+def test_parse_stat_handles_percentages_counts_and_commas():
+    assert parse_stat("52.49%") == 52.49
+    assert parse_stat("116 Games") == 116.0
+    assert parse_stat("51,7") == 51.7
+    assert parse_stat(3) == 3.0
+    assert parse_stat("n/a") is None
+    assert parse_stat(None) is None
+
+
+def test_pages_are_validated_parsed_and_ordered_by_win_rate():
+    index = compile_runes(
+        {
+            "annie": {
+                "rune_1": _blob("48%", **{"Pick Rate": "52.49%", "Game Count": "116 Games"}),
+                "rune_2": _blob("55%"),
+                "rune_3": {"Domination": DOMINATION, "Shards": SHARDS, "Win Rate": "99%"},
+                "rune_4": _blob(None),
+                "notes": {"Win Rate": "100%"},
+            }
+        }
+    )
+    pages = index.pages_for_slug("annie")
+    # rune_3 tek ağaçlı (geçersiz) olduğu için elenir; win rate'siz sayfa en sona.
+    assert [p.name for p in pages] == ["rune_2", "rune_1", "rune_4"]
+    rune_1 = pages[1]
+    assert (rune_1.win_rate, rune_1.pick_rate, rune_1.games) == (48.0, 52.49, 116)
+    assert rune_1.as_page() == {
+        "primaryStyleId": 8100,
+        "subStyleId": 8200,
+        "selectedPerkIds": [8112, 8126, 8140, 8105, 8224, 8233, 5008, 5008, 5001],
+    }
+
+
+def test_slug_is_resolved_once_per_champion():
+    index = compile_runes({"annie": {"rune_1": _blob("50%")}})
+    calls = []
+
+    def resolve(champ_id):
+        calls.append(champ_id)
+        return "annie" if champ_id == 1 else None
+
+    assert index.best(1, resolve).name == "rune_1"
+    assert index.best(1, resolve).name == "rune_1"
+    assert index.best(2, resolve) is None
+    assert index.best(2, resolve) is None
+    # Çözülemeyen id bağlanmaz (LCU kapalıyken sorulmuş olabilir), yeniden denenir.
+    assert calls == [1, 2, 2]
+
+
+def test_direct_pages_are_keyed_by_id_and_invalid_ones_do_not_fall_back():
+    index = compile_runes(
+        {
+            "777": {"primaryStyleId": 8100, "subStyleId": 8200, "selectedPerkIds": list(range(9))},
+            "778": {"primaryStyleId": 8100, "subStyleId": 8200, "selectedPerkIds": [1, 2]},
+        }
+    )
+
+    def resolve(champ_id):
+        raise AssertionError("direct entries need no slug")
+
+    assert index.best(777, resolve) == CompiledPage("777", 8100, 8200, tuple(range(9)))
+    assert index.best(778, resolve) is None
+
+
+def test_importing_api_does_not_load_rune_data():
+    code = "import api; assert api.RUNES_DATA is None and api._RUNE_INDEX is None"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, "-c", code], cwd=root, check=True, timeout=60)
+
+
+def test_concurrent_first_lookups_load_and_compile_once(monkeypatch):
+    loads = []
+
+    def slow_load():
+        loads.append(threading.get_ident())
+        time.sleep(0.05)
+        return {"annie": {"rune_1": _blob("50%")}}
+
+    monkeypatch.setattr(api, "load_runes", slow_load)
+    monkeypatch.setattr(api, "RUNES_DATA", None)
+    monkeypatch.setattr(api, "_RUNE_INDEX", None)
+    with ThreadPoolExecutor(8) as pool:
+        indexes = list(pool.map(lambda _: api.rune_index(), range(8)))
+    assert len(loads) == 1
+    assert all(index is indexes[0] for index in indexes)
+    assert indexes[0].pages_for_slug("annie")[0].name == "rune_1"
+
+
+def test_lifespan_warms_up_the_rune_index(monkeypatch):
+    monkeypatch.setattr(api, "load_runes", lambda: {"annie": {}})
+    monkeypatch.setattr(api, "RUNES_DATA", None)
+    monkeypatch.setattr(api, "_RUNE_INDEX", None)
+
+    async def serve():
+        async with api.lifespan(api.app):
+            for _ in range(100):
+                if api._RUNE_INDEX is not None:
+                    break
+                await asyncio.sleep(0.01)
+
+    asyncio.run(serve())
+    assert api.RUNES_DATA == {"annie": {}}
+    assert api._RUNE_INDEX is not None
+
+
+def _pages(secondary_perk):
+    return {"rune_1": _blob("50%") | {"Sorcery": ["8224", str(secondary_perk)]}}
+
+
+VARIANT_DATA = {
+    "annie": {
+        **_pages(8233),  # boyutsuz (eski biçim) sayfalar: son geri düşüş
+        "MIDDLE": {"emerald_plus": {"15.23": _pages(8210), "15.22": _pages(8226)}},
+        "TOP": {"emerald_plus": {"15.22": _pages(8237)}, "any": {"any": _pages(8234)}},
+        "JUNGLE": {"emerald_plus": {"15.23": {"rune_1": {"Shards": SHARDS}}}},  # geçersiz
+    }
+}
+
+
+def _secondary(index, role=ANY, **dims):
+    pages = index.pages_for_slug("annie", role, **dims)
+    return pages[0].selected_perk_ids[5] if pages else None
+
+
+def test_variants_fall_back_by_role_then_tier_then_patch():
+    index = compile_runes(VARIANT_DATA)
+    assert index.tiers == ("emerald_plus",)
+    assert index.patches == ("15.23", "15.22")
+
+    assert _secondary(index, "MIDDLE") == 8210  # en yeni patch
+    assert _secondary(index, "MIDDLE", patch="15.22") == 8226
+    assert _secondary(index, "TOP") == 8237  # 15.23 yok → önceki patch
+    assert _secondary(index, "TOP", patch="15.24") == 8237
+    assert _secondary(index, "TOP", tier="diamond") == 8234  # tier'sız rol verisi
+    assert _secondary(index, "JUNGLE") == 8233  # rolün geçerli sayfası yok → boyutsuz
+    assert _secondary(index, "UTILITY") == 8233
+    assert _secondary(index) == 8233
+
+    chain = list(index.fallback_chain("TOP", patch="15.23"))
+    assert chain[:3] == [
+        ("TOP", "emerald_plus", "15.23"),
+        ("TOP", "emerald_plus", "15.22"),
+        ("TOP", "emerald_plus", ANY),
+    ]
+    assert chain[-1] == (ANY, ANY, ANY)
+
+
+def test_role_lookups_are_resolved_once_and_then_read_from_the_index():
+    index = compile_runes(VARIANT_DATA)
+    first = index.pages_for_slug("annie", "TOP")
+    assert index.pages_for_slug("annie", "TOP") is first
+    assert index.best(1, lambda champ_id: "annie", "MIDDLE").selected_perk_ids[5] == 8210
+    assert index.best(1, lambda champ_id: None, "TOP").selected_perk_ids[5] == 8237
+
+
+def test_scraped_cells_are_merged_and_old_patches_pruned():
+    data = {"annie": _pages(8233)}
+    for patch, perk in (("15.21", 8210), ("15.9", 8226), ("15.23", 8237), ("15.22", 8234)):
+        put_variant_pages(data, "annie", ("MIDDLE", "emerald_plus", patch), _pages(perk))
+    put_variant_pages(data, "annie", ("MIDDLE", "emerald_plus", ANY), _pages(8236))
+
+    assert prune_patches(data, keep=2) == 2
+    assert sorted(data["annie"]["MIDDLE"]["emerald_plus"]) == ["15.22", "15.23", "any"]
+    index = compile_runes(data)
+    assert index.patches == ("15.23", "15.22")
+    assert _secondary(index, "MIDDLE") == 8237
+    assert _secondary(index) == 8233
+
+
+def test_recommendation_uses_the_assigned_role(monkeypatch):
+    monkeypatch.setattr(api, "RUNES_DATA", VARIANT_DATA)
+    monkeypatch.setattr(api.champion_repo, "get_slug_by_id", lambda champ_id: "annie")
+    assert api.get_recommended_page_for_champion(1, "TOP")["selectedPerkIds"][5] == 8237
+    assert api.get_recommended_page_for_champion(1)["selectedPerkIds"][5] == 8233
+
+    roles = []
+    monkeypatch.setattr(
+        api, "get_recommended_page_for_champion", lambda champ_id, role: roles.append(role)
+    )
+    plan = compile_plan({"primary_role": "MIDDLE"})
+    me = {"cellId": 0, "championId": 1}
+    assert not api.apply_runes_impl(
+        {"localPlayerCellId": 0, "myTeam": [dict(me, assignedPosition="top")]}, plan
+    )
+    assert not api.apply_runes_impl({"localPlayerCellId": 0, "myTeam": [me]}, plan)
+    assert roles == ["TOP", "MIDDLE"]  # blind pick: birincil rol
@@ -0,0 +1,139 @@
+"""
+İkili rün paketi testleri: derlenmiş indeksle birebir gidiş-dönüş, tembel çözme,
+sürüm kontrolü ve `api.load_runes`'un paketi (eskimemişse) tercih etmesi.
+"""
+
+import json
+import os
+
+import pytest
+
+import api
+from runepilot.domain.rune_index import compile_runes
+from runepilot.infrastructure.rune_pack import (
+    CONFIG,
+    HEADER,
+    RunePack,
+    build_rune_pack,
+    encode_rune_pack,
+    open_rune_pack,
+    source_digest,
+)
+
+DATA = {
+    "777": {
+        "primaryStyleId": 8100,
+        "subStyleId": 8200,
+        "selectedPerkIds": [8112, 8126, 8140, 8105, 8224, 8233, 5008, 5008, 5001],
+    },
+    "annie": {
+        "rune_1": {
+            "Domination": ["8112", "8126", "8140", "8105"],
+            "Sorcery": ["8224", "8233"],
+            "Shards": ["5008", "5008", "5001"],
+            "Pick Rate": "52.49%",
+            "Game Count": "116 Games",
+            "Win Rate": "51.72%",
+        },
+        "rune_2": {
+            "Precision": ["8005", "9111", "9104", "8014"],
+            "Resolve": ["8444", "8451"],
+            "Shards": ["5005", "5008", "5001"],
+        },
+    },
+    "zed": {},
+}
+
+
+@pytest.fixture
+def pack_files(tmp_path):
+    json_path = str(tmp_path / "runes.json")
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(DATA, f, indent=2)
+    pack_path = str(tmp_path / "runes.bin")
+    build_rune_pack(json_path, pack_path).close()
+    return json_path, pack_path
+
+
+def test_pack_roundtrips_the_compiled_index(pack_files):
+    json_path, pack_path = pack_files
+    expected = compile_runes(DATA)
+    pack = open_rune_pack(pack_path)
+    try:
+        assert pack.source_digest == source_digest(json_path)
+        assert sorted(pack) == ["annie", "zed"]
+        assert pack._decoded == {}  # açılışta sayfa çözülmez
+        index = pack.index()
+        assert dict(index.direct_items()) == dict(expected.direct_items())
+        assert index.pages_for_slug("annie") == expected.pages_for_slug("annie")
+        assert index.pages_for_slug("zed") == ()
+        assert list(pack._decoded) == ["annie", "zed"]
+
+        best = index.best(1, lambda champ_id: "annie")
+        assert (best.name, best.win_rate, best.pick_rate, best.games) == (
+            "rune_1",
+            51.72,
+            52.49,
+            116,
+        )
+        assert index.pages_for_slug("annie")[1].win_rate is None
+    finally:
+        pack.close()
+
+
+def test_pack_keeps_role_tier_patch_variants_and_shares_page_layouts():
+    data = {"annie": dict(DATA["annie"])}
+    for role in ("MIDDLE", "TOP"):
+        for patch in ("15.22", "15.23"):
+            data["annie"][role] = data["annie"].get(role, {"emerald_plus": {}})
+            data["annie"][role]["emerald_plus"][patch] = {"rune_1": DATA["annie"]["rune_1"]}
+    expected = compile_runes(data)
+    pack = RunePack(encode_rune_pack(expected))
+    index = pack.index()
+    assert (index.tiers, index.patches) == (("emerald_plus",), ("15.23", "15.22"))
+    assert dict(index.variants_for_slug("annie")) == dict(expected.variants_for_slug("annie"))
+    assert index.pages_for_slug("annie", "TOP") == expected.pages_for_slug("annie", "TOP")
+    # Beş varyantta iki farklı sayfa düzeni var: düzen tablosu iki kayıt tutar.
+    assert pack._pages_offset - pack._configs_offset == 2 * CONFIG.size
+
+
+def test_unknown_version_and_garbage_are_rejected(tmp_path):
+    blob = bytearray(encode_rune_pack(compile_runes(DATA)))
+    blob[4:6] = (99).to_bytes(2, "little")
+    path = tmp_path / "future.bin"
+    path.write_bytes(bytes(blob))
+    with pytest.raises(ValueError, match="version 99"):
+        open_rune_pack(str(path))
+    path.write_bytes(b"{}" + bytes(HEADER.size))
+    with pytest.raises(ValueError):
+        open_rune_pack(str(path))
+
+
+def test_load_runes_prefers_a_fresh_pack(pack_files, monkeypatch):
+    json_path, pack_path = pack_files
+    monkeypatch.setattr(api, "RUNES_FILE", json_path)
+    monkeypatch.setattr(api, "RUNES_PACK_FILE", pack_path)
+    data = api.load_runes()
+    assert isinstance(data, api.RunePack)
+    data.close()
+
+    # runes.json pakete göre değişti: eski paket yok sayılır.
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump({"zed": {}}, f)
+    assert api.load_runes() == {"zed": {}}
+
+    os.remove(json_path)
+    data = api.load_runes()
+    assert sorted(data) == ["annie", "zed"]
+    data.close()
+
+
+def test_shipped_pack_matches_runes_json():
+    assert os.path.exists(api.RUNES_PACK_FILE), "run tools/build_rune_pack.py"
+    pack = open_rune_pack(api.RUNES_PACK_FILE)
+    try:
+        assert pack.source_digest == source_digest(
+            api.RUNES_FILE
+        ), "runes.bin is stale; run tools/build_rune_pack.py"
+    finally:
+        pack.close()
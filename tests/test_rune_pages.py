@@ -0,0 +1,94 @@
+"""
+Rün sayfası envanteri testleri: önbellekli okuma, kendi yazmalarımızın modele
+işlenmesi, içerik aynıysa PUT'un atlanması ve perks olaylarıyla yenileme.
+"""
+
+import api
+from runepilot.domain.automation_plan import compile_plan
+from runepilot.infrastructure.lcu_events import LcuEvent
+from runepilot.infrastructure.rune_pages import RUNE_PAGES_URI, RunePageInventory, page_matches
+
+PAGE = {
+    "id": 7,
+    "name": "Auto Ahri",
+    "primaryStyleId": 8100,
+    "subStyleId": 8200,
+    "selectedPerkIds": [1, 2, 3, 4, 5, 6, 7, 8, 9],
+    "current": True,
+}
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_page_matches_compares_content_and_current_flag():
+    assert page_matches(PAGE, {**PAGE, "selectedPerkIds": [str(i) for i in range(1, 10)]})
+    assert not page_matches(PAGE, {**PAGE, "subStyleId": 8300})
+    assert not page_matches({**PAGE, "current": False}, PAGE)
+    assert not page_matches({**PAGE, "selectedPerkIds": None}, PAGE)
+
+
+def test_inventory_caches_until_max_age_or_invalidation():
+    clock = _Clock()
+    fetched = []
+    inventory = RunePageInventory(lambda: fetched.append(1) or [dict(PAGE)], clock=clock)
+
+    assert inventory.pages() == [PAGE]
+    inventory.pages()[0]["name"] = "mutated"  # kopya döner
+    assert inventory.pages()[0]["name"] == "Auto Ahri" and len(fetched) == 1
+
+    clock.now = 31.0
+    inventory.pages()
+    inventory.invalidate()
+    inventory.pages()
+    assert len(fetched) == 3
+
+
+def test_own_writes_update_the_model():
+    inventory = RunePageInventory(lambda: [dict(PAGE), {"id": 8, "name": "Mine", "current": False}])
+    inventory.pages()
+
+    inventory.record_put(8, {"name": "Custom 1 Ahri", "current": True})
+    assert inventory.find(8)["name"] == "Custom 1 Ahri"
+    assert inventory.find(7)["current"] is False
+
+    inventory.record_create({"id": 9, "name": "Auto Annie", "current": True})
+    inventory.record_delete(7)
+    assert [p["id"] for p in inventory.pages()] == [8, 9]
+    assert inventory.find(8)["current"] is False
+
+    inventory.record_create(None)  # yanıt gövdesi yok: model bilinmiyor
+    assert inventory.find(9) is None
+
+
+def test_perks_events_replace_the_model(monkeypatch):
+    inventory = RunePageInventory(lambda: None)
+    monkeypatch.setattr(api, "RUNE_PAGES", inventory)
+    api._LiveState().apply_events({RUNE_PAGES_URI: LcuEvent(RUNE_PAGES_URI, "Update", [PAGE])})
+    assert inventory.pages() == [PAGE]
+
+
+def test_repeated_apply_skips_get_and_noop_put(fake_lcu, monkeypatch):
+    monkeypatch.setattr(api, "RUNE_PAGES", RunePageInventory())
+    session = {"localPlayerCellId": 0, "myTeam": [{"cellId": 0, "championId": 103}]}
+    plan = compile_plan({})
+    server = fake_lcu.server
+
+    assert api.apply_runes_impl(session, plan)
+    assert server.request_count("GET", RUNE_PAGES_URI) == 1
+    assert server.request_count("POST", RUNE_PAGES_URI) == 1
+
+    assert api.apply_runes_impl(session, plan)
+    assert server.request_count("GET", RUNE_PAGES_URI) == 1
+    assert server.request_count("PUT", "/lol-perks/v1/pages/2") == 0
+
+    # Kullanıcı istemcide sayfayı değiştirdi; model olayla güncellenir ve PUT gerekir.
+    edited = [dict(p, current=False) if p["id"] == 2 else p for p in fake_lcu.rune_pages]
+    api.RUNE_PAGES.replace(edited)
+    assert api.apply_runes_impl(session, plan)
+    assert server.request_count("PUT", "/lol-perks/v1/pages/2") == 1
@@ -0,0 +1,165 @@
+"""
+Rün verisinin yeniden yüklenmesi: dosya izleyicisinin yazım bitene kadar beklemesi,
+yeni indeksin tek atamayla yayınlanması, bozuk dosyada eski verinin korunması ve
+yeniden yükleme metrikleri.
+"""
+
+import gc
+import itertools
+import json
+import os
+import threading
+import time
+import weakref
+
+import pytest
+
+import api
+from runepilot.infrastructure.file_watcher import FileWatcher
+from runepilot.infrastructure.rune_pack import RunePack, build_rune_pack
+
+_STAMPS = itertools.count(1)
+PERKS = {"Domination": ["8112", "8126", "8140", "8105"], "Shards": ["5008", "5008", "5001"]}
+
+
+def _dataset(sorcery_perk):
+    page = dict(PERKS, Sorcery=["8224", str(sorcery_perk)], **{"Win Rate": "50%"})
+    return {"annie": {"rune_1": page}}
+
+
+def _write(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(data if isinstance(data, str) else json.dumps(data))
+    # Art arda iki yazım da (dosya sistemi zaman çözünürlüğünden bağımsız) farklı imza üretsin.
+    stamp = time.time_ns() + 10**9 * next(_STAMPS)
+    os.utime(path, ns=(stamp, stamp))
+
+
+def _recommended_secondary():
+    page = api.rune_index().best(1, lambda champ_id: "annie")
+    return page.selected_perk_ids[5] if page else None
+
+
+@pytest.fixture
+def runes_file(tmp_path, monkeypatch):
+    path = str(tmp_path / "runes.json")
+    _write(path, _dataset(8233))
+    monkeypatch.setattr(api, "RUNES_FILE", path)
+    monkeypatch.setattr(api, "RUNES_PACK_FILE", str(tmp_path / "missing.bin"))
+    monkeypatch.setattr(api, "RUNES_DATA", None)
+    monkeypatch.setattr(api, "_RUNE_INDEX", None)
+    return path
+
+
+def test_watcher_reports_a_change_once_the_file_settles(tmp_path):
+    path = str(tmp_path / "data.json")
+    _write(path, "{}")
+    changes = []
+    watcher = FileWatcher(lambda: [path], changes.append)
+    watcher.prime()
+    assert watcher.check() == []
+
+    _write(path, '{"a": 1}')
+    assert watcher.check() == []  # yazım sürüyor olabilir: bir tur daha beklenir
+    assert watcher.check() == [path]
+    assert watcher.check() == []
+
+    os.remove(path)
+    watcher.check()
+    assert watcher.check() == [path]
+    assert changes == [[path], [path]]
+
+
+def test_reload_swaps_in_the_new_index(runes_file):
+    assert _recommended_secondary() == 8233
+    before = api.RUNES_RELOADER.snapshot()["results"]
+
+    _write(runes_file, _dataset(8210))
+    result = api.runes_reload()
+    assert result["reloaded"] and result["source"] == "runes.json"
+    assert result["entries"] == 1
+    assert _recommended_secondary() == 8210
+
+    after = api.RUNES_RELOADER.snapshot()["results"]
+    assert after["ok"] == before["ok"] + 1
+    assert "rune_data_reload_duration_seconds_count" in api.render_metrics()
+
+
+def test_failed_reload_keeps_serving_the_previous_data(runes_file):
+    assert _recommended_secondary() == 8233
+    _write(runes_file, '{"annie": {"rune_1": ')  # yarım yazılmış dosya
+    result = api.reload_runes()
+    assert not result["reloaded"] and result["error"]
+    assert _recommended_secondary() == 8233
+    assert api.RUNES_RELOADER.last.ok is False
+
+
+def test_readers_never_see_a_half_built_index(runes_file, monkeypatch):
+    datasets = [_dataset(8233), _dataset(8210)]
+    turn = iter(range(10**6))
+    monkeypatch.setattr(api, "read_runes", lambda: datasets[next(turn) % 2])
+    stop = threading.Event()
+    seen = set()
+    errors = []
+
+    def read():
+        while not stop.is_set():
+            try:
+                seen.add(_recommended_secondary())
+            except Exception as e:  # pragma: no cover - hata raporu için
+                errors.append(e)
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    try:
+        for _ in range(200):
+            assert api.reload_runes()["reloaded"]
+    finally:
+        stop.set()
+        for reader in readers:
+            reader.join(5)
+    assert errors == []
+    assert seen <= {8233, 8210}
+
+
+def test_changed_file_is_reloaded_in_the_background(runes_file):
+    assert _recommended_secondary() == 8233
+    watcher = FileWatcher(
+        lambda: [api.RUNES_FILE, api.RUNES_PACK_FILE],
+        api._on_rune_files_changed,
+        poll_interval=0.02,
+    )
+    watcher.start()
+    try:
+        _write(runes_file, _dataset(8210))
+        deadline = time.monotonic() + 3
+        while _recommended_secondary() != 8210 and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        watcher.stop()
+    assert _recommended_secondary() == 8210
+
+
+def test_old_index_stays_readable_after_a_reload(runes_file, monkeypatch):
+    pack_path = os.path.join(os.path.dirname(runes_file), "runes.bin")
+    build_rune_pack(runes_file, pack_path).close()
+    monkeypatch.setattr(api, "RUNES_PACK_FILE", pack_path)
+    old_pack = api.runes_data()
+    assert isinstance(old_pack, RunePack)
+    old_index = api.rune_index()  # süren bir önerinin tuttuğu indeks
+    released = weakref.ref(old_pack)
+    del old_pack
+
+    _write(runes_file, _dataset(8210))
+    build_rune_pack(runes_file, pack_path).close()
+    assert api.runes_reload()["source"] == "runes.bin"
+    assert _recommended_secondary() == 8210
+    # Eski indeks hiç çözülmemiş sayfaları yeniden yüklemeden sonra da paketten okur.
+    page = old_index.best(1, lambda champ_id: "annie")
+    assert page.selected_perk_ids[5] == 8233
+
+    del old_index, page
+    gc.collect()
+    assert released() is None  # son okuyucu bırakınca eski mmap serbest kalır
+    api.runes_data().close()
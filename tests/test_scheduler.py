@@ -0,0 +1,121 @@
+"""
+Faz duyarlı zamanlayıcı testleri: faz başına aralık/uri seçimi, metrik çıktısı ve
+otomasyon döngüsünün yalnızca fazın ihtiyaç duyduğu kaynakları okuması.
+"""
+
+import asyncio
+import time
+
+import api
+from runepilot.application.scheduler import (
+    CHAMP_SELECT_SESSION_URI,
+    GAMEFLOW_PHASE_URI,
+    READY_CHECK_URI,
+    WAKEUP_EVENT,
+    PhaseScheduler,
+)
+
+
+class _Resp:
+    def __init__(self, data):
+        self.status_code = 200
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+def test_policies_follow_the_gameflow_phase():
+    scheduler = PhaseScheduler()
+    champ_select = scheduler.policy("ChampSelect")
+    assert champ_select.interval < 0.2
+    assert CHAMP_SELECT_SESSION_URI in champ_select.uris
+    assert READY_CHECK_URI in scheduler.policy("ReadyCheck").uris
+    assert scheduler.policy("InProgress").uris == (GAMEFLOW_PHASE_URI,)
+    assert scheduler.policy("InProgress").interval >= 10
+    # Bilinmeyen faz: her şey okunur.
+    assert len(scheduler.policy(None).uris) == 3
+    assert scheduler.policy("SomethingNew") == scheduler.policy(None)
+
+
+def test_websocket_mode_only_resyncs_on_the_safety_interval():
+    scheduler = PhaseScheduler()
+    assert scheduler.poll_due("InProgress", connected=False, since_poll=0.0)
+    assert not scheduler.poll_due("InProgress", connected=True, since_poll=30.0)
+    assert scheduler.poll_due("InProgress", connected=True, since_poll=61.0)
+    assert scheduler.next_wait("ChampSelect", connected=False, since_poll=0.0) == 0.15
+    assert scheduler.next_wait("Lobby", connected=True, since_poll=2.0) == 3.0
+
+
+def test_due_work_shortens_the_websocket_wait():
+    scheduler = PhaseScheduler()
+    # Başarısız adım hâlâ bekliyor: olay gelmese de polling aralığında yeniden denenir.
+    assert scheduler.next_wait("ChampSelect", connected=True, since_poll=0.0, due_in=0.0) == 0.15
+    assert scheduler.next_wait("Lobby", connected=True, since_poll=0.0, due_in=2.5) == 2.5
+    assert scheduler.next_wait("Lobby", connected=True, since_poll=0.0, due_in=30.0) == 5.0
+    assert scheduler.next_wait("Lobby", connected=False, since_poll=0.0, due_in=0.0) == 1.0
+    assert 'mode="due"' in scheduler.render_prometheus()
+
+
+def test_decisions_and_wakeups_are_exported():
+    scheduler = PhaseScheduler()
+    scheduler.next_wait("ChampSelect", connected=False, since_poll=0.0)
+    scheduler.record_wakeup(WAKEUP_EVENT)
+    scheduler.record_poll("ChampSelect", [CHAMP_SELECT_SESSION_URI])
+
+    text = scheduler.render_prometheus()
+    assert 'automation_wakeups_total{reason="event"} 1' in text
+    assert 'automation_schedule_decisions_total{phase="ChampSelect",mode="poll"} 1' in text
+    assert (
+        'automation_polls_total{phase="ChampSelect",uri="/lol-champ-select/v1/session"} 1' in text
+    )
+    assert "automation_next_wait_seconds 0.15" in text
+    assert "automation_wakeups_total" in api.render_metrics()
+
+
+def test_live_state_polls_only_what_the_phase_needs():
+    phase = {"value": "Matchmaking"}
+    fetched = []
+
+    class _FakeClient:
+        async def gather(self, uris):
+            fetched.append(tuple(uris))
+            data = {
+                GAMEFLOW_PHASE_URI: phase["value"],
+                READY_CHECK_URI: {"state": "InProgress"},
+                CHAMP_SELECT_SESSION_URI: {"localPlayerCellId": 0},
+            }
+            return [_Resp(data[uri]) for uri in uris]
+
+    client = _FakeClient()
+    scheduler = PhaseScheduler()
+    live = api._LiveState()
+    live.phase = "Matchmaking"
+    live.session = {"stale": True}
+
+    asyncio.run(live.poll(scheduler, client))
+    assert fetched == [(GAMEFLOW_PHASE_URI, READY_CHECK_URI)]
+    assert live.ready_check == {"state": "InProgress"} and live.session is None
+
+    # Faz değişimi aynı turda yeni fazın kaynağını da okur; eski kaynak temizlenir.
+    fetched.clear()
+    phase["value"] = "ChampSelect"
+    asyncio.run(live.poll(scheduler, client))
+    assert fetched == [(GAMEFLOW_PHASE_URI, READY_CHECK_URI), (CHAMP_SELECT_SESSION_URI,)]
+    assert live.session == {"localPlayerCellId": 0} and live.ready_check is None
+
+
+def test_in_game_phase_is_nearly_idle(fake_lcu):
+    fake_lcu.set_phase("InProgress")
+    api.start_automation(api.AutomationConfig(queue_id=420))
+    try:
+        time.sleep(0.8)
+    finally:
+        api.stop_automation()
+        api.AUTOMATION_ENGINE.join(5)
+
+    server = fake_lcu.server
+    # Yalnızca faz henüz bilinmezken yapılan ilk tam senkronizasyon.
+    assert server.request_count("GET", CHAMP_SELECT_SESSION_URI) <= 1
+    assert server.request_count("GET", READY_CHECK_URI) <= 1
+    assert server.request_count("GET", GAMEFLOW_PHASE_URI) <= 2
@@ -0,0 +1,116 @@
+"""
+my-selection uzlaştırıcısı testleri: mevcut seçimle karşılaştırma, tek birleşik PATCH
+ve kostümün kullanıcı değişikliğini ezmeden bir kez uygulanması.
+"""
+
+import api
+from runepilot.domain.automation_plan import AutomationRuntime, compile_plan
+from runepilot.domain.selection import (
+    Selection,
+    SelectionReconciler,
+    current_selection,
+    local_player,
+    selection_patch,
+)
+from runepilot.domain.session_index import index_session
+
+
+class _Response:
+    def __init__(self, status_code=204, text=""):
+        self.status_code = status_code
+        self.text = text
+
+
+def _session(spell1=4, spell2=14, skin=103000, champion=103):
+    return {
+        "localPlayerCellId": 2,
+        "timer": {"phase": "BAN_PICK"},
+        "myTeam": [
+            {"cellId": 1, "spell1Id": 1, "spell2Id": 1, "selectedSkinId": 1},
+            {
+                "cellId": 2,
+                "championId": champion,
+                "spell1Id": spell1,
+                "spell2Id": spell2,
+                "selectedSkinId": skin,
+            },
+        ],
+    }
+
+
+def test_current_selection_reads_local_player():
+    assert current_selection(_session()) == Selection(4, 14, 103000)
+    assert current_selection({"myTeam": []}) == Selection()
+
+    session = _session()
+    assert local_player(session) is index_session(session).local_player
+
+
+def test_selection_patch_contains_only_differences():
+    assert selection_patch(Selection(4, 14, 103000), Selection(4, 14, 103000)) == {}
+    assert selection_patch(Selection(4, 12, None), Selection(4, 14, 103000)) == {"spell2Id": 12}
+    assert selection_patch(Selection(None, None, 103001), Selection(4, 14, 103000)) == {
+        "selectedSkinId": 103001
+    }
+
+
+def test_reconciler_applies_skin_once_per_champion():
+    reconciler = SelectionReconciler()
+    desired = Selection(4, 14, 103001)
+
+    body = reconciler.plan(_session(), desired, 103)
+    assert body == {"selectedSkinId": 103001}
+    reconciler.applied(103, body)
+
+    # Kullanıcı kostümü elle değiştirdi: geri alınmaz, spell'ler yine hedefe çekilir.
+    assert reconciler.plan(_session(spell1=6, skin=103002), desired, 103) == {"spell1Id": 4}
+    # Yeni şampiyon: kostüm hedefi yeniden uygulanır.
+    assert reconciler.plan(_session(champion=1, skin=1000), Selection(4, 14, 1005), 1) == {
+        "selectedSkinId": 1005
+    }
+
+
+def test_handle_champ_select_sends_one_minimal_patch(monkeypatch):
+    sent = []
+    monkeypatch.setattr(api, "lcu_request", lambda *args: sent.append(args) or _Response())
+    runtime = AutomationRuntime()
+    plan = compile_plan(
+        {
+            "primary_role": "MIDDLE",
+            "primary_summoner_spell": 4,
+            "secondary_summoner_spell": 12,
+            "custom_skins": {"MIDDLE": {"103": 103001}},
+        }
+    )
+
+    api.handle_champ_select(_session(), plan, runtime)
+    assert sent == [
+        (
+            "PATCH",
+            "/lol-champ-select/v1/session/my-selection",
+            {"spell2Id": 12, "selectedSkinId": 103001},
+        )
+    ]
+
+    sent.clear()
+    api.handle_champ_select(_session(spell2=12, skin=103001), plan, runtime)
+    assert sent == []  # her şey zaten hedefte: istek yok
+
+
+def test_rejected_selection_patch_is_retried(monkeypatch):
+    sent = []
+    status = {"code": 400}
+    monkeypatch.setattr(
+        api,
+        "lcu_request",
+        lambda *args: sent.append(args[2]) or _Response(status["code"], "invalid skin"),
+    )
+    runtime = AutomationRuntime()
+    plan = compile_plan({"primary_role": "MIDDLE", "custom_skins": {"MIDDLE": {"103": 103001}}})
+
+    api.handle_champ_select(_session(), plan, runtime)
+    assert "_selection_step" in runtime.session_diff.pending
+    status["code"] = 204
+    api.handle_champ_select(_session(), plan, runtime)
+    assert sent == [{"selectedSkinId": 103001}] * 2
+    assert not runtime.session_diff.pending
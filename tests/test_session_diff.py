@@ -0,0 +1,204 @@
+"""
+Oturum farkı testleri: yalnızca sayaçları değişen yükün boş fark üretmesi, parça
+bazında değişiklik raporu ve handler'ların ilgili parçaya göre çağrılması/yeniden
+denenmesi.
+"""
+
+import copy
+
+import pytest
+
+import api
+from runepilot.domain.automation_plan import AutomationRuntime, compile_plan
+from runepilot.domain.session_diff import (
+    PART_ACTIONS,
+    PART_BANS,
+    PART_LOCAL_PLAYER,
+    PART_TIMER_PHASE,
+    SessionDiffer,
+    SessionDispatcher,
+)
+
+SESSION = {
+    "gameId": 1,
+    "localPlayerCellId": 1,
+    "myTeam": [
+        {"cellId": 0, "championId": 0, "championPickIntent": 0},
+        {"cellId": 1, "championId": 0, "championPickIntent": 0, "assignedPosition": "middle"},
+    ],
+    "theirTeam": [{"cellId": 5, "championId": 0}],
+    "bans": {"myTeamBans": [], "theirTeamBans": []},
+    "actions": [[{"id": 3, "type": "pick", "actorCellId": 1, "completed": False}]],
+    "timer": {"phase": "BAN_PICK", "adjustedTimeLeftInPhase": 30000},
+}
+
+
+class _NoContent:
+    status_code = 204
+    text = ""
+
+
+_NO_CONTENT = _NoContent()
+
+
+def _changed(**fields):
+    session = copy.deepcopy(SESSION)
+    session.update(fields)
+    return session
+
+
+def test_timer_countdown_alone_is_no_change():
+    differ = SessionDiffer()
+    assert differ.diff(SESSION).reset
+    assert differ.diff(SESSION).empty  # aynı nesne: özet bile hesaplanmaz
+    assert differ.diff(_changed(timer={"phase": "BAN_PICK", "adjustedTimeLeftInPhase": 1})).empty
+
+
+def test_changed_parts_are_reported():
+    differ = SessionDiffer()
+    differ.diff(SESSION)
+
+    session = copy.deepcopy(SESSION)
+    session["myTeam"][1]["championPickIntent"] = 103
+    diff = differ.diff(session)
+    assert diff.players == {1} and diff.local_player and diff.parts == {"players", "local_player"}
+
+    session = copy.deepcopy(session)
+    session["myTeam"][0]["championPickIntent"] = 7
+    diff = differ.diff(session)
+    assert diff.players == {0} and not diff.local_player
+
+    session = copy.deepcopy(session)
+    session["actions"][0][0]["completed"] = True
+    session["bans"]["theirTeamBans"] = [55]
+    session["timer"]["phase"] = "FINALIZATION"
+    diff = differ.diff(session)
+    assert diff.actions == {3} and diff.bans and diff.timer_phase
+    assert diff.parts == {PART_ACTIONS, PART_BANS, PART_TIMER_PHASE}
+
+
+def test_new_game_resets_the_diff():
+    differ = SessionDiffer()
+    differ.diff(SESSION)
+    assert differ.diff(_changed(gameId=2)).reset
+    differ.reset()
+    assert differ.diff(_changed(gameId=2)).reset
+
+
+def test_dispatcher_calls_only_subscribed_handlers_and_retries_unsettled():
+    dispatcher = SessionDispatcher()
+    calls = []
+    results = {"picker": False}
+
+    @dispatcher.subscribe(PART_ACTIONS)
+    def picker(session):
+        calls.append("picker")
+        return results["picker"]
+
+    @dispatcher.subscribe(PART_LOCAL_PLAYER, PART_TIMER_PHASE)
+    def runes(session):
+        calls.append("runes")
+
+    differ = SessionDiffer()
+    dispatcher.dispatch(differ, SESSION)
+    assert calls == ["picker", "runes"]
+
+    calls.clear()
+    dispatcher.dispatch(differ, _changed(timer={"phase": "BAN_PICK"}))
+    assert calls == ["picker"]  # değişiklik yok ama pick başarısızdı: yeniden denenir
+
+    calls.clear()
+    results["picker"] = True
+    dispatcher.dispatch(differ, _changed(timer={"phase": "BAN_PICK"}))
+    dispatcher.dispatch(differ, _changed(timer={"phase": "BAN_PICK"}))
+    assert calls == ["picker"]
+
+    calls.clear()
+    dispatcher.dispatch(differ, _changed(timer={"phase": "FINALIZATION"}))
+    assert calls == ["runes"]
+
+
+def test_handler_error_is_retried_and_unknown_parts_are_rejected():
+    dispatcher = SessionDispatcher()
+    attempts = []
+
+    @dispatcher.subscribe(PART_ACTIONS)
+    def flaky(session):
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("boom")
+
+    differ = SessionDiffer()
+    dispatcher.dispatch(differ, SESSION)
+    assert differ.pending == {"flaky"}
+    dispatcher.dispatch(differ, SESSION)
+    assert len(attempts) == 2 and not differ.pending
+
+    with pytest.raises(ValueError):
+        dispatcher.subscribe("timer")
+
+
+def test_due_peeks_without_recording_the_diff():
+    dispatcher = SessionDispatcher()
+    calls = []
+
+    @dispatcher.subscribe(PART_BANS)
+    def ban(session):
+        calls.append("ban")
+
+    differ = SessionDiffer()
+    assert dispatcher.due(differ, SESSION)
+    dispatcher.dispatch(differ, SESSION)
+    assert calls == ["ban"]
+
+    # Yalnızca sayaçlar değişti: abone olunan parça yok, thread'e geçmeye gerek yok.
+    countdown = _changed(timer={"phase": "BAN_PICK", "adjustedTimeLeftInPhase": 1000})
+    assert not dispatcher.due(differ, countdown)
+
+    banned = _changed(bans={"myTeamBans": [55], "theirTeamBans": []})
+    assert dispatcher.due(differ, banned)
+    assert dispatcher.due(differ, banned)  # kaydedilmedi
+    assert differ.diff(banned).parts == {PART_BANS}
+    assert not dispatcher.due(differ, banned)
+
+
+def test_failing_handler_does_not_skip_later_subscribers():
+    dispatcher = SessionDispatcher()
+    calls = []
+
+    @dispatcher.subscribe(PART_ACTIONS, PART_BANS)
+    def ban(session):
+        calls.append("ban")
+        raise RuntimeError("boom")
+
+    @dispatcher.subscribe(PART_ACTIONS, PART_BANS)
+    def pick(session):
+        calls.append("pick")
+
+    differ = SessionDiffer()
+    dispatcher.dispatch(differ, SESSION)
+    assert calls == ["ban", "pick"]
+    assert differ.pending == {"ban"}
+
+    calls.clear()
+    dispatcher.dispatch(differ, SESSION)
+    assert calls == ["ban"]  # yalnızca hata veren yeniden denenir
+
+
+def test_handle_champ_select_skips_unchanged_payloads(monkeypatch):
+    picks, patches = [], []
+    monkeypatch.setattr(
+        api, "auto_pick_impl", lambda session, ids: picks.append(ids) or {"status": "picked"}
+    )
+    monkeypatch.setattr(api, "lcu_request", lambda *args: patches.append(args) or _NO_CONTENT)
+    plan = compile_plan({"role_champions": {"MIDDLE": [103]}, "primary_summoner_spell": 4})
+    runtime = AutomationRuntime()
+
+    api.handle_champ_select(copy.deepcopy(SESSION), plan, runtime)
+    assert picks == [[103]] and len(patches) == 1  # pick + spell PATCH
+
+    for left in (20000, 10000, 5000):
+        api.handle_champ_select(
+            _changed(timer={"phase": "BAN_PICK", "adjustedTimeLeftInPhase": left}), plan, runtime
+        )
+    assert picks == [[103]] and len(patches) == 1
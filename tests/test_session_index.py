@@ -0,0 +1,61 @@
+"""
+Champ select oturum indeksi testleri: tek geçişte çıkarılan kümeler, yerel oyuncu,
+açık aksiyonlar ve aynı oturum yükü için indeksin yeniden kullanılması.
+"""
+
+import api
+from runepilot.domain.session_index import SessionIndex, index_session
+
+SESSION = {
+    "localPlayerCellId": 1,
+    "myTeam": [
+        {"cellId": 0, "championId": 0, "championPickIntent": 42},
+        {"cellId": 1, "championId": 0, "championPickIntent": 103, "assignedPosition": "middle"},
+    ],
+    "theirTeam": [{"cellId": 5, "championId": "7"}],
+    "bans": {"myTeamBans": [1, "x"], "theirTeamBans": [3]},
+    "actions": [
+        [
+            {"id": 1, "type": "ban", "actorCellId": 1, "completed": True},
+            {"id": 2, "type": "ban", "actorCellId": 0, "completed": False},
+        ],
+        [{"id": 3, "type": "pick", "actorCellId": 1, "completed": False}, "junk"],
+    ],
+    "timer": {"phase": "BAN_PICK"},
+}
+
+
+def test_index_extracts_sets_and_local_player():
+    index = SessionIndex(SESSION)
+    assert index.banned_ids == {1, 3}
+    assert index.picked_ids == {7}
+    assert index.teammate_shown_ids == {42, 103}
+    assert index.local_player is SESSION["myTeam"][1]
+    assert index.players_by_cell[5] is SESSION["theirTeam"][0]
+    assert index.assigned_role == "MIDDLE"
+    assert index.local_champion_id == 103
+    assert index.timer_phase == "BAN_PICK"
+
+
+def test_open_actions_are_grouped_by_type_and_actor():
+    index = SessionIndex(SESSION)
+    assert index.open_action("ban") is None  # yerel oyuncunun ban'ı tamamlandı
+    assert index.open_action("ban", 0)["id"] == 2
+    assert index.open_action("pick")["id"] == 3
+
+
+def test_index_is_reused_for_the_same_payload():
+    first = index_session(SESSION)
+    assert index_session(SESSION) is first
+    assert index_session(dict(SESSION)) is not first
+
+
+def test_malformed_session_is_tolerated():
+    index = SessionIndex({"myTeam": None, "bans": [], "actions": None, "timer": None})
+    assert index.local_player is None and index.local_champion_id == 0
+    assert not index.is_banned(1) and index.open_action("pick") is None
+
+
+def test_api_helpers_accept_string_ids():
+    assert api.is_banned(SESSION, "3") is True
+    assert api.is_picked(SESSION, "x") is False
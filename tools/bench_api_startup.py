@@ -0,0 +1,84 @@
+"""
+`api` modülünün açılış benchmark'ı: import süresi ve ilk rün önerisinin gecikmesi.
+
+Her ölçüm yeni bir yorumlayıcıda yapılır (modül önbelleği ve ısınmış veri olmadan):
+
+- `import api` — rün verisi artık import sırasında okunmaz,
+- eski (eager) davranışın karşılığı: `import api` + veri yükleme, hem `runes.bin`
+  paketiyle hem yalnızca `runes.json` ile,
+- ilk öneri: soğuk (veriyi ilk öneri yükler), lifespan ısınmasından sonra ve sıcak
+  (ikinci öneri).
+
+Öneride id → slug çözümü LCU yerine sabit bir slug'la yapılır; ölçülen yalnızca
+uygulamanın kendi maliyetidir.
+
+Kullanım: `python tools/bench_api_startup.py --runs 10`
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+_CHILD = """
+import json, sys, time
+started = time.perf_counter()
+import api
+result = {"import": time.perf_counter() - started}
+if sys.argv[1] == "json":
+    api.RUNES_PACK_FILE = ""
+api.champion_repo.get_slug_by_id = lambda champ_id: "annie"
+if sys.argv[2] == "eager":
+    started = time.perf_counter()
+    api.rune_index()
+    result["load"] = time.perf_counter() - started
+started = time.perf_counter()
+api.get_recommended_page_for_champion(1)
+result["first"] = time.perf_counter() - started
+started = time.perf_counter()
+api.get_recommended_page_for_champion(1)
+result["second"] = time.perf_counter() - started
+print(json.dumps(result))
+"""
+
+
+def _run(source: str, mode: str) -> dict[str, float]:
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD, source, mode],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def _median_ms(samples: list[dict[str, float]], key: str) -> str:
+    return f"{statistics.median(s[key] for s in samples) * 1000:8.2f} ms"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10, help="senaryo başına süreç sayısı")
+    args = parser.parse_args()
+
+    for source in ("pack", "json"):
+        lazy = [_run(source, "lazy") for _ in range(args.runs)]
+        eager = [_run(source, "eager") for _ in range(args.runs)]
+        name = "runes.bin" if source == "pack" else "runes.json"
+        print(f"{name} ({args.runs} processes, median):")
+        print(f"  import api                  {_median_ms(lazy, 'import')}")
+        print(f"  rune data load + compile    {_median_ms(eager, 'load')}")
+        print(f"  first recommendation, cold  {_median_ms(lazy, 'first')}")
+        print(f"  first recommendation, warm  {_median_ms(eager, 'first')}")
+        print(f"  second recommendation       {_median_ms(lazy, 'second')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Otomasyon döngüsünün uçtan uca gecikme benchmark'ı (League kurulumu gerektirmez).
+
+Senaryolu LCU taklidini (`runepilot.testing.scripted_lcu`) başlatır, `automation_loop`'u
+gerçek HTTP/TLS/WebSocket trafiğiyle boştan champ select sonuna kadar sürer ve her koşu
+için adımlar arası gecikmeleri ölçer:
+
+- ready-check açıldı → kabul edildi
+- champ select başladı → pick PATCH'i geldi
+- champ select başladı → spell/kostüm PATCH'i geldi
+- FINALIZATION başladı → rün sayfası yazıldı (önceden yazıldıysa 0)
+- FINALIZATION sonrası atılan rün (`/lol-perks/`) isteği
+- toplam LCU REST isteği
+
+`--prestage-runes` rün ön hazırlığını açar; varsayılan davranışla karşılaştırmak için
+aynı tohumla iki kez koşun. `--finalization-delay` yerel pick ile FINALIZATION
+arasındaki süredir (diğer oyuncuların seçimi).
+
+Kullanım: `python tools/bench_automation.py --runs 10 --latency 0.02 --jitter 0.01`
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import api  # noqa: E402
+from runepilot.testing.scripted_lcu import running_scripted_lcu  # noqa: E402
+
+CONFIG = api.AutomationConfig(
+    primary_role="MIDDLE",
+    primary_summoner_spell=4,
+    secondary_summoner_spell=14,
+    role_champions={"MIDDLE": [103]},
+    queue_id=420,
+)
+
+
+def run_once(
+    base_dir: str,
+    *,
+    seed: int,
+    latency: float,
+    jitter: float,
+    prestage_runes: bool = False,
+    finalization_delay: float = 0.0,
+) -> dict[str, float]:
+    """Tek bir boş → champ select koşusu; ölçümleri saniye cinsinden döndürür."""
+    config = CONFIG.model_copy(update={"prestage_runes": prestage_runes})
+    with running_scripted_lcu(base_dir, seed=seed, finalization_delay=finalization_delay) as script:
+        if latency or jitter:
+            script.server.set_fault("*", latency=latency, jitter=jitter)
+        api.start_automation(config)
+        try:
+            selection = script.wait_for("selection:", 30)
+            finalization = script.wait_for("finalization", 30)
+            runes = script.wait_for("runes:", 30)
+        finally:
+            api.stop_automation()
+            api.AUTOMATION_ENGINE.join(10)
+        if selection is None or finalization is None or runes is None:
+            raise RuntimeError(f"Scenario did not finish: {script.timeline}")
+
+        champ_select = script.first("phase:ChampSelect")
+        return {
+            "ready_check_to_accept": script.first("accept") - script.first("ready_check"),
+            "champ_select_to_pick": script.first("pick:") - champ_select,
+            "champ_select_to_selection": selection - champ_select,
+            "finalization_to_runes": max(0.0, runes - finalization),
+            "rune_requests_after_finalization": float(
+                sum(
+                    1
+                    for (_, path, _), ts in zip(
+                        script.server.requests, script.server.request_times, strict=True
+                    )
+                    if ts >= finalization and path.startswith("/lol-perks/")
+                )
+            ),
+            "requests": float(len(script.server.requests)),
+        }
+
+
+def _summary(values: list[float], unit: str) -> str:
+    ordered = sorted(values)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    if unit == "ms":
+        return (
+            f"median {statistics.median(ordered) * 1000:8.1f} ms   "
+            f"p95 {p95 * 1000:8.1f} ms   max {ordered[-1] * 1000:8.1f} ms"
+        )
+    return (
+        f"median {statistics.median(ordered):8.1f}      p95 {p95:8.1f}      max {ordered[-1]:8.1f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="istek başına sabit gecikme (sn)"
+    )
+    parser.add_argument("--jitter", type=float, default=0.0, help="ek rastgele gecikme üst sınırı")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--prestage-runes", action="store_true", help="rün ön hazırlığını aç")
+    parser.add_argument(
+        "--finalization-delay", type=float, default=0.5, help="pick → FINALIZATION süresi (sn)"
+    )
+    args = parser.parse_args()
+
+    results: list[dict[str, float]] = []
+    for run in range(args.runs):
+        with tempfile.TemporaryDirectory(prefix="runepilot-bench-") as base_dir:
+            results.append(
+                run_once(
+                    base_dir,
+                    seed=args.seed + run,
+                    latency=args.latency,
+                    jitter=args.jitter,
+                    prestage_runes=args.prestage_runes,
+                    finalization_delay=args.finalization_delay,
+                )
+            )
+
+    print(
+        f"runs={args.runs} latency={args.latency}s jitter={args.jitter}s seed={args.seed} "
+        f"prestage_runes={args.prestage_runes} finalization_delay={args.finalization_delay}s"
+    )
+    for key in (
+        "ready_check_to_accept",
+        "champ_select_to_pick",
+        "champ_select_to_selection",
+        "finalization_to_runes",
+    ):
+        print(f"{key:32s} {_summary([r[key] for r in results], 'ms')}")
+    for key in ("rune_requests_after_finalization", "requests"):
+        print(f"{key:32s} {_summary([r[key] for r in results], 'count')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+Rün önerisi micro-benchmark'ı: eski `get_recommended_page_for_champion` ile derlenmiş
+indeks (`runepilot.domain.rune_index`) karşılaştırması.
+
+Eski yol her çağrıda şampiyonun ham verisini dolaşır, her `Win Rate` metnini regex ile
+çözer, adayları sıralar ve sayfayı yeniden kurar. Yeni yol veriyi bir kez derler; öneri
+bir sözlük okumasıdır. Araç, `runes.json`'daki tüm şampiyonlar için iki yolun aynı
+sayfayı döndürdüğünü de doğrular.
+
+Kullanım: `python tools/bench_recommendation.py --rounds 20`
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import time
+from collections.abc import Callable
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from runepilot.domain.rune_index import (  # noqa: E402
+    STYLE_ID_BY_NAME,
+    compile_runes,
+    safe_int_list,
+)
+
+RUNES_FILE = os.path.join(os.path.dirname(__file__), "..", "runes.json")
+
+
+def legacy_recommended_page(
+    runes_data: dict, champ_id: int, get_slug_by_id: Callable[[int], str | None]
+) -> dict | None:
+    """
+    Eski `get_recommended_page_for_champion` (indeks öncesi), karşılaştırma için.
+
+    Supports 2 formats:
+    1) { "123": {"primaryStyleId":..., "subStyleId":..., "selectedPerkIds":[...]}, ... }
+    2) { "annie": {"rune_1": {"Domination":[...], "Sorcery":[...], "Shards":[...]}, ...}, ... }
+    """
+    # Format 1: direct champId -> payload
+    direct = runes_data.get(str(champ_id))
+    if (
+        isinstance(direct, dict)
+        and "primaryStyleId" in direct
+        and "subStyleId" in direct
+        and "selectedPerkIds" in direct
+    ):
+        try:
+            primary_style_id = int(direct.get("primaryStyleId"))
+            sub_style_id = int(direct.get("subStyleId"))
+        except (TypeError, ValueError):
+            return None
+
+        selected = safe_int_list(direct.get("selectedPerkIds"))
+        if len(selected) != 9:
+            return None
+
+        return {
+            "primaryStyleId": primary_style_id,
+            "subStyleId": sub_style_id,
+            "selectedPerkIds": selected,
+        }
+
+    # Format 2: slug -> rune_1 -> tree lists
+    slug = get_slug_by_id(champ_id)
+    if not slug:
+        return None
+    champ_blob = runes_data.get(slug)
+    if not isinstance(champ_blob, dict):
+        return None
+
+    def _parse_win_rate(value) -> float | None:
+        if value is None:
+            return None
+        if isinstance(value, (int, float)):
+            return float(value)
+        s = str(value).strip()
+        if not s:
+            return None
+        s = s.replace(",", ".")
+        m = re.search(r"(\d+(?:\.\d+)?)", s)
+        if not m:
+            return None
+        try:
+            return float(m.group(1))
+        except ValueError:
+            return None
+
+    rune_candidates: list[tuple[float, str, dict]] = []
+    default_blob: dict | None = None
+    fallback_blob: dict | None = None
+
+    for k, v in champ_blob.items():
+        if not (isinstance(k, str) and k.startswith("rune_") and isinstance(v, dict)):
+            continue
+        if fallback_blob is None:
+            fallback_blob = v
+        if k == "rune_1":
+            default_blob = v
+
+        win_rate = (
+            v.get("Win Rate")
+            or v.get("win_rate")
+            or v.get("WinRate")
+            or v.get("winRate")
+            or v.get("WIN RATE")
+        )
+        parsed_wr = _parse_win_rate(win_rate)
+        if parsed_wr is None:
+            parsed_wr = -1.0
+        rune_candidates.append((parsed_wr, k, v))
+
+    if not rune_candidates:
+        return None
+
+    # Sort by winrate desc, then by rune_* key for stability.
+    rune_candidates.sort(key=lambda t: (t[0], t[1]), reverse=True)
+
+    def _convert_blob_to_page(rune_blob: dict) -> dict | None:
+        style_entries: list[tuple[str, int, int]] = []
+        for k, v in rune_blob.items():
+            if not isinstance(k, str):
+                continue
+            style_id = STYLE_ID_BY_NAME.get(k.strip().lower())
+            if style_id is None:
+                continue
+            if not isinstance(v, list):
+                continue
+            style_entries.append((k, style_id, len(v)))
+
+        if len(style_entries) < 2:
+            return None
+
+        primary_key = next((k for k, _sid, ln in style_entries if ln == 4), style_entries[0][0])
+        secondary_key = next(
+            (k for k, _sid, ln in style_entries if ln == 2 and k != primary_key),
+            style_entries[1][0] if style_entries[1][0] != primary_key else style_entries[0][0],
+        )
+
+        primary_style_id = STYLE_ID_BY_NAME.get(primary_key.strip().lower())
+        secondary_style_id = STYLE_ID_BY_NAME.get(secondary_key.strip().lower())
+        if primary_style_id is None or secondary_style_id is None:
+            return None
+
+        primary_ids = safe_int_list(rune_blob.get(primary_key))
+        secondary_ids = safe_int_list(rune_blob.get(secondary_key))
+
+        shards_ids: list[int] = []
+        for k, v in rune_blob.items():
+            if isinstance(k, str) and k.strip().lower() == "shards":
+                shards_ids = safe_int_list(v)
+                break
+
+        selected = primary_ids[:4] + secondary_ids[:2] + shards_ids[:3]
+        if len(selected) != 9:
+            return None
+
+        return {
+            "primaryStyleId": primary_style_id,
+            "subStyleId": secondary_style_id,
+            "selectedPerkIds": selected,
+        }
+
+    # Try highest winrate first; if conversion fails, fall back to rune_1 then first available.
+    for _wr, _name, blob in rune_candidates:
+        page = _convert_blob_to_page(blob)
+        if page:
+            return page
+
+    if default_blob is not None:
+        page = _convert_blob_to_page(default_blob)
+        if page:
+            return page
+
+    if fallback_blob is not None:
+        page = _convert_blob_to_page(fallback_blob)
+        if page:
+            return page
+
+    return None
+
+
+def _per_call(fn: Callable[[], object], calls: int, rounds: int) -> float:
+    """`fn`'in çağrı başına süresi (sn), `rounds` turun medyanı."""
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        samples.append((time.perf_counter() - started) / calls)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runes", default=RUNES_FILE, help="öneri verisi (runes.json)")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    with open(args.runes, encoding="utf-8") as f:
+        data = json.load(f)
+    # Benchmark için sentetik id → slug eşlemesi (ChampionRepo'nun cache'li hali gibi).
+    slug_by_id = {i: slug for i, slug in enumerate(data, start=1)}
+    resolve = slug_by_id.get
+    ids = list(slug_by_id)
+
+    index = compile_runes(data)
+    mismatches = [
+        cid
+        for cid in ids
+        if legacy_recommended_page(data, cid, resolve)
+        != (page.as_page() if (page := index.best(cid, resolve)) else None)
+    ]
+    if mismatches:
+        raise SystemExit(f"Index disagrees with the legacy path for ids {mismatches[:10]}")
+
+    compile_s = _per_call(lambda: compile_runes(data), 1, args.rounds)
+
+    def legacy_all() -> None:
+        for cid in ids:
+            legacy_recommended_page(data, cid, resolve)
+
+    def index_all() -> None:
+        for cid in ids:
+            page = index.best(cid, resolve)
+            if page is not None:
+                page.as_page()
+
+    legacy_s = _per_call(legacy_all, 1, args.rounds) / len(ids)
+    index_s = _per_call(index_all, 1, args.rounds) / len(ids)
+
+    print(f"champions={len(ids)} rounds={args.rounds} (identical pages for all champions)")
+    print(f"{'compile (once)':24s} {compile_s * 1000:9.2f} ms")
+    print(f"{'legacy per call':24s} {legacy_s * 1e6:9.2f} us")
+    print(f"{'index per call':24s} {index_s * 1e6:9.2f} us   ({legacy_s / index_s:.0f}x faster)")
+    print(f"{'break-even calls':24s} {compile_s / max(legacy_s - index_s, 1e-12):9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Rol/tier/patch matrisli rün veri setinin boyut ve arama benchmark'ı.
+
+`runes.json`'dan sentetik bir matris üretir: her şampiyon için `--roles` rol ×
+`--patches` patch hücresi. Hücreler gerçek veriden türetilir (aday sayfaların bir alt
+kümesi, kaydırılmış istatistikler), yani perk düzenleri gerçekçi biçimde tekrar eder.
+Matrisin ve düz verinin JSON / paket boyutlarını, paketin açılış süresini ve rol için
+öneri maliyetini (ilk ve sonraki aramalar) raporlar.
+
+Kullanım: `python tools/bench_rune_matrix.py --roles 5 --patches 1`
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from runepilot.domain.rune_index import ROLES, compile_runes, put_variant_pages  # noqa: E402
+from runepilot.infrastructure.rune_pack import build_rune_pack, open_rune_pack  # noqa: E402
+
+RUNES_FILE = os.path.join(os.path.dirname(__file__), "..", "runes.json")
+TIER = "emerald_plus"
+
+
+def expand(data: dict, roles: int, patches: int) -> dict:
+    """Düz veriden (slug → rune_N) rol × patch matrisi üretir."""
+    matrix: dict = {}
+    for slug, blob in data.items():
+        pages = [(k, v) for k, v in blob.items() if k.startswith("rune_")]
+        for r, role in enumerate(ROLES[:roles]):
+            for p in range(patches):
+                cell = {}
+                for i, (_, page) in enumerate(pages):
+                    if (i + r + p) % 3 == 2:
+                        continue  # her hücrede adayların yaklaşık üçte ikisi
+                    shifted = dict(page, **{"Win Rate": f"{45 + (i * 7 + r * 3 + p) % 15}.00%"})
+                    cell[f"rune_{len(cell) + 1}"] = shifted
+                if cell:
+                    put_variant_pages(matrix, slug, (role, TIER, f"15.{23 - p}"), cell)
+    return matrix
+
+
+def _measure(data: dict, workdir: str, name: str) -> dict[str, float]:
+    json_path = os.path.join(workdir, f"{name}.json")
+    pack_path = os.path.join(workdir, f"{name}.bin")
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    build_rune_pack(json_path, pack_path).close()
+
+    started = time.perf_counter()
+    with open(json_path, encoding="utf-8") as f:
+        compile_runes(json.load(f))
+    json_load = time.perf_counter() - started
+
+    started = time.perf_counter()
+    pack = open_rune_pack(pack_path)
+    index = pack.index()
+    pack_open = time.perf_counter() - started
+
+    slugs = list(pack)
+    started = time.perf_counter()
+    for slug in slugs:
+        index.pages_for_slug(slug, "JUNGLE")
+    first = (time.perf_counter() - started) / len(slugs)
+    rounds = 50
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for slug in slugs:
+            index.pages_for_slug(slug, "JUNGLE")
+    warm = (time.perf_counter() - started) / (rounds * len(slugs))
+    pack.close()
+    return {
+        "json_kib": os.path.getsize(json_path) / 1024,
+        "pack_kib": os.path.getsize(pack_path) / 1024,
+        "json_load_ms": json_load * 1000,
+        "pack_open_ms": pack_open * 1000,
+        "first_us": first * 1e6,
+        "warm_us": warm * 1e6,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--roles", type=int, default=len(ROLES), choices=range(1, 6))
+    parser.add_argument("--patches", type=int, default=1)
+    args = parser.parse_args()
+
+    with open(RUNES_FILE, encoding="utf-8") as f:
+        flat = json.load(f)
+    matrix = expand(flat, args.roles, args.patches)
+    with tempfile.TemporaryDirectory(prefix="runepilot-matrix-") as workdir:
+        base = _measure(flat, workdir, "flat")
+        grown = _measure(matrix, workdir, "matrix")
+
+    print(f"{len(flat)} champions, {args.roles} roles x {args.patches} patches")
+    print(f"{'':24}{'flat':>12}{'matrix':>12}{'growth':>9}")
+    for key, label in (
+        ("json_kib", "JSON size (KiB)"),
+        ("pack_kib", "pack size (KiB)"),
+        ("json_load_ms", "JSON load+compile (ms)"),
+        ("pack_open_ms", "pack open (ms)"),
+        ("first_us", "role lookup, first (us)"),
+        ("warm_us", "role lookup, next (us)"),
+    ):
+        ratio = grown[key] / base[key] if base[key] else float("nan")
+        print(f"{label:24}{base[key]:12.2f}{grown[key]:12.2f}{ratio:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+`runes.json`'dan kompakt ikili rün paketi (`runes.bin`) üretir.
+
+Paket, öneri indeksinin derlenmiş halidir (bkz. `runepilot.infrastructure.rune_pack`);
+`api.load_runes` varsa onu tercih eder. Paket kaynak JSON'un özetini taşıdığı için
+`runes.json` güncellendikten sonra bu araç yeniden çalıştırılmalıdır (aksi halde eski
+paket yok sayılır ve JSON okunur).
+
+Araç, paketin JSON ile aynı önerileri verdiğini doğrular ve açılış sürelerini karşılaştırır.
+
+Kullanım: `python tools/build_rune_pack.py [runes.json] [-o runes.bin]`
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from runepilot.domain.rune_index import compile_runes  # noqa: E402
+from runepilot.infrastructure.rune_pack import build_rune_pack, open_rune_pack  # noqa: E402
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def _best_of(fn, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def verify(json_path: str, pack_path: str) -> int:
+    """Paket ve JSON derlemesinin her şampiyon ve varyant için aynı sayfaları verdiğini doğrular."""
+    with open(json_path, encoding="utf-8") as f:
+        expected = compile_runes(json.load(f))
+    pack = open_rune_pack(pack_path)
+    try:
+        actual = pack.index()
+        if dict(actual.direct_items()) != dict(expected.direct_items()):
+            raise SystemExit("direct pages differ between runes.json and the pack")
+        if (actual.tiers, actual.patches) != (expected.tiers, expected.patches):
+            raise SystemExit("tier/patch tables differ between runes.json and the pack")
+        slugs = dict(expected.slug_items())
+        if set(pack) != set(slugs):
+            raise SystemExit("champion sets differ between runes.json and the pack")
+        for slug, variants in slugs.items():
+            if dict(actual.variants_for_slug(slug)) != variants:
+                raise SystemExit(f"pages differ for {slug}")
+        return len(slugs)
+    finally:
+        pack.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("source", nargs="?", default=os.path.join(ROOT, "runes.json"))
+    parser.add_argument("-o", "--output", default=os.path.join(ROOT, "runes.bin"))
+    parser.add_argument("--rounds", type=int, default=20, help="süre ölçümü tekrar sayısı")
+    args = parser.parse_args()
+
+    build_rune_pack(args.source, args.output).close()
+    champions = verify(args.source, args.output)
+
+    def load_json():
+        with open(args.source, encoding="utf-8") as f:
+            compile_runes(json.load(f))
+
+    def load_pack():
+        open_rune_pack(args.output).close()
+
+    json_time = _best_of(load_json, args.rounds)
+    pack_time = _best_of(load_pack, args.rounds)
+    print(
+        f"{args.output}: {champions} champions, "
+        f"{os.path.getsize(args.source) / 1024:.1f} KiB JSON -> "
+        f"{os.path.getsize(args.output) / 1024:.1f} KiB pack"
+    )
+    print(f"  json parse + compile: {json_time * 1000:.2f} ms")
+    print(f"  pack open           : {pack_time * 1000:.2f} ms ({json_time / pack_time:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Kaydedilmiş LCU trafiğini otomasyona karşı tekrar oynatır (League kurulumu gerektirmez).
+
+Kayıt, uygulama `RUNEPILOT_LCU_RECORD=<dosya>` ile çalıştırılarak gerçek bir oturumdan
+alınır (bkz. `runepilot.infrastructure.lcu_recorder`). Bu araç kaydı sahte bir LCU
+üzerinden (`runepilot.testing.replay`) `--speed` kat hızla oynatır, otomasyonu kayıttaki
+config ile (veya `--config` JSON dosyasıyla) başlatır ve şunları raporlar:
+
+- otomasyonun kararları (GET dışı istekler) ve kayıt zaman çizelgesindeki anları,
+- her kararın tepki süresi (son olaydan karara) — kayıttaki özgün koşuyla yan yana,
+- endpoint şablonu başına istek sayıları — yine özgün koşuyla yan yana.
+
+Kullanım: `python tools/replay_lcu.py session.jsonl.gz --speed 4`
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import api  # noqa: E402
+from runepilot.infrastructure.lcu_recorder import RECORD_ENV, read_recording  # noqa: E402
+from runepilot.testing.fake_lcu import FakeLcuServer  # noqa: E402
+from runepilot.testing.replay import ReplayLcu, ReplayReport, recorded_config  # noqa: E402
+from runepilot.testing.scripted_lcu import app_bound_to  # noqa: E402
+
+
+def replay(
+    entries: list[dict],
+    base_dir: str,
+    *,
+    speed: float = 1.0,
+    config: dict | None = None,
+    tail: float = 1.0,
+) -> ReplayReport:
+    """Kaydı oynatır ve otomasyonun davranışını raporlar."""
+    config = config if config is not None else recorded_config(entries)
+    if config is None:
+        raise ValueError("Recording has no config note; pass a config explicitly")
+    with FakeLcuServer() as server, app_bound_to(server, base_dir):
+        lcu = ReplayLcu(server, entries, speed=speed)
+        api.start_automation(api.AutomationConfig(**config))
+        try:
+            return lcu.play(tail=tail)
+        finally:
+            api.stop_automation()
+            api.AUTOMATION_ENGINE.join(10)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("recording", help="RUNEPILOT_LCU_RECORD ile alınmış kayıt dosyası")
+    parser.add_argument("--speed", type=float, default=1.0, help="oynatma hızı (1 = gerçek)")
+    parser.add_argument("--config", help="kayıttaki yerine kullanılacak config (JSON dosyası)")
+    parser.add_argument("--tail", type=float, default=1.0, help="kayıt bittikten sonra bekleme")
+    args = parser.parse_args()
+
+    # Oynatmanın kendi trafiği kayda eklenmesin.
+    os.environ.pop(RECORD_ENV, None)
+    config = None
+    if args.config:
+        with open(args.config, encoding="utf-8") as f:
+            config = json.load(f)
+    entries = read_recording(args.recording)
+    with tempfile.TemporaryDirectory(prefix="runepilot-replay-") as base_dir:
+        report = replay(entries, base_dir, speed=args.speed, config=config, tail=args.tail)
+    print(report.summary())
+
+
+if __name__ == "__main__":
+    main()
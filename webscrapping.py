@@ -1,4 +1,6 @@
+import argparse
 import json
+import os
 import re
 
 from selenium import webdriver
@@ -8,9 +10,25 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
 from runepilot.domain.champions import champion_slug_from_alias
+from runepilot.domain.rune_index import ROLES, prune_patches, put_variant_pages
 from runepilot.infrastructure.lcu_client import lcu_request
 
 
+# LCU `assignedPosition` → OP.GG rol yolu.
+OPGG_ROLE_PATHS = {
+    "TOP": "top",
+    "JUNGLE": "jungle",
+    "MIDDLE": "mid",
+    "BOTTOM": "adc",
+    "UTILITY": "support",
+}
+DEFAULT_TIER = "emerald_plus"
+DEFAULT_PATCH = "15.23"
+# Her (şampiyon, rol, tier) için saklanan patch sayısı (eskiler geri düşüş içindir).
+KEEP_PATCHES = 3
+RUNES_FILE = "runes.json"
+
+
 def extract_selected_rune_ids(container):
     """
     From a 'relative box-border' container, find all
@@ -89,14 +107,20 @@ def champion_slug(champion: dict) -> str:
     return champion_slug_from_alias(str(alias))
 
 
-def scrape_runes_for_champion(driver: webdriver.Chrome, slug: str) -> dict:
+def scrape_runes_for_champion(
+    driver: webdriver.Chrome,
+    slug: str,
+    role: str = "TOP",
+    tier: str = DEFAULT_TIER,
+    patch: str = DEFAULT_PATCH,
+) -> dict:
     """
-    Verilen champion slug'ı için OP.GG runes sayfasını
+    Verilen champion slug'ı, rol, tier ve patch için OP.GG runes sayfasını
     scrape edip rune_X yapıları döndürür.
     """
     url = (
-        f"https://op.gg/lol/champions/{slug}/runes/top"
-        "?region=global&type=ranked&tier=emerald_plus&patch=15.23"
+        f"https://op.gg/lol/champions/{slug}/runes/{OPGG_ROLE_PATHS[role]}"
+        f"?region=global&type=ranked&tier={tier}&patch={patch}"
     )
 
     driver.get(url)
@@ -150,11 +174,25 @@ def scrape_runes_for_champion(driver: webdriver.Chrome, slug: str) -> dict:
     return result
 
 
-def scrape_all_champions():
+def load_existing_runes(path: str) -> dict:
+    """Önceki scrape'in verisi (başka patch/rollerin sayfaları korunur); yoksa boş."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return data if isinstance(data, dict) else {}
+
+
+def scrape_all_champions(
+    roles: tuple[str, ...] = ROLES,
+    tier: str = DEFAULT_TIER,
+    patch: str = DEFAULT_PATCH,
+    keep_patches: int = KEEP_PATCHES,
+):
     """
-    LCU'dan tüm şampiyonları alır, her biri için OP.GG'den
-    rune verisini çekip {champ_slug: {rune_1: {...}, ...}} döndürür
-    ve JSON olarak yazdırır.
+    LCU'dan tüm şampiyonları alır, her biri ve her rol için OP.GG'den
+    rune verisini çekip mevcut runes.json'a
+    {champ_slug: {ROLE: {tier: {patch: {rune_1: {...}, ...}}}}} olarak ekler.
     """
     champions = get_all_champions_from_lcu()
     print("///////////////////////////////")
@@ -166,7 +204,7 @@ def scrape_all_champions():
 
     driver = webdriver.Chrome(options=chrome_options)
 
-    all_result: dict[str, dict] = {}
+    all_result: dict[str, dict] = load_existing_runes(RUNES_FILE)
 
     try:
         for champ in champions:
@@ -179,16 +217,20 @@ def scrape_all_champions():
             print("slug: ", slug)
             print(f"Scraping runes for champion: {slug}")
 
-            try:
-                champ_result = scrape_runes_for_champion(driver, slug)
-            except Exception as e:
-                print(f"Failed to scrape {slug}: {e}")
-                continue
-
-            all_result[slug] = champ_result
-
-        print(json.dumps(all_result, ensure_ascii=False, indent=2))
-        with open("runes.json", "w", encoding="utf-8") as f:
+            for role in roles:
+                try:
+                    champ_result = scrape_runes_for_champion(driver, slug, role, tier, patch)
+                except Exception as e:
+                    # Şampiyonun bu rolde verisi olmayabilir; öneri o zaman başka role düşer.
+                    print(f"Failed to scrape {slug} {role}: {e}")
+                    continue
+                if champ_result:
+                    put_variant_pages(all_result, slug, (role, tier, patch), champ_result)
+
+        removed = prune_patches(all_result, keep_patches)
+        if removed:
+            print(f"Pruned {removed} old patch entries (keeping {keep_patches} per role)")
+        with open(RUNES_FILE, "w", encoding="utf-8") as f:
             json.dump(all_result, f, ensure_ascii=False, indent=2)
 
         input("\nrunes.json oluşturuldu. Çıkmak için Enter'a bas...")
@@ -197,5 +239,11 @@ def scrape_all_champions():
 
 
 if __name__ == "__main__":
-    scrape_all_champions()
+    parser = argparse.ArgumentParser(description="OP.GG'den rol/tier/patch bazlı rün verisi")
+    parser.add_argument("--roles", nargs="+", choices=ROLES, default=list(ROLES))
+    parser.add_argument("--tier", default=DEFAULT_TIER)
+    parser.add_argument("--patch", default=DEFAULT_PATCH)
+    parser.add_argument("--keep-patches", type=int, default=KEEP_PATCHES)
+    args = parser.parse_args()
+    scrape_all_champions(tuple(args.roles), args.tier, args.patch, args.keep_patches)
 